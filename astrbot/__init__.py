@@ -1,3 +1,19 @@
-from .core.log import LogManager
+import os
 
-logger = LogManager.GetLogger(log_name="astrbot")
+if os.environ.get("ASTRBOT_PROFILE_STARTUP", "0") == "1":
+    # 必须在导入核心模块之前安装，才能统计到完整的导入耗时
+    from .utils import startup_profiler
+
+    startup_profiler.install_import_timer()
+
+
+def __getattr__(name: str):
+    # 首次访问 logger 时才导入核心模块，astrbot.utils 下的轻量模块
+    # （如文档解析工作进程）可以单独导入而不加载整套核心组件
+    if name == "logger":
+        from .core.log import LogManager
+
+        logger = LogManager.GetLogger(log_name="astrbot")
+        globals()["logger"] = logger
+        return logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
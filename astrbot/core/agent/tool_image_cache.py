@@ -11,6 +11,7 @@ from typing import ClassVar
 
 from astrbot import logger
 from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
+from astrbot.core.utils.temp_file_registry import forget_temp_file, register_temp_file
 
 
 @dataclass
@@ -96,6 +97,7 @@ class ToolImageCache:
             image_bytes = base64.b64decode(base64_data)
             with open(file_path, "wb") as f:
                 f.write(image_bytes)
+            register_temp_file(file_path, len(image_bytes))
             logger.debug(f"Saved tool image to: {file_path}")
         except Exception as e:
             logger.error(f"Failed to save tool image: {e}")
@@ -148,6 +150,7 @@ class ToolImageCache:
                     file_age = now - os.path.getmtime(file_path)
                     if file_age > self.CACHE_EXPIRY:
                         os.remove(file_path)
+                        forget_temp_file(file_path)
                         cleaned += 1
         except Exception as e:
             logger.warning(f"Error during cache cleanup: {e}")
@@ -59,7 +59,7 @@ from astrbot.core.persona_error_reply import (
 from astrbot.core.platform.astr_message_event import AstrMessageEvent
 from astrbot.core.provider import Provider
 from astrbot.core.provider.entities import ProviderRequest
-from astrbot.core.skills.skill_manager import SkillManager, build_skills_prompt
+from astrbot.core.skills.skill_manager import skill_catalog
 from astrbot.core.star.context import Context
 from astrbot.core.star.star_handler import star_map
 from astrbot.core.tools.cron_tools import (
@@ -68,6 +68,7 @@ from astrbot.core.tools.cron_tools import (
     LIST_CRON_JOBS_TOOL,
 )
 from astrbot.core.utils.file_extract import extract_file_moonshotai
+from astrbot.core.utils.image_caption_cache import image_caption_cache
 from astrbot.core.utils.llm_metadata import LLM_METADATAS
 from astrbot.core.utils.quoted_message.settings import (
     SETTINGS as DEFAULT_QUOTED_MESSAGE_SETTINGS,
@@ -335,24 +336,15 @@ async def _ensure_persona_and_skills(
 
     # Inject skills prompt
     runtime = cfg.get("computer_use_runtime", "local")
-    skill_manager = SkillManager()
-    skills = skill_manager.list_skills(active_only=True, runtime=runtime)
-
-    if skills:
-        if persona and persona.get("skills") is not None:
-            if not persona["skills"]:
-                skills = []
-            else:
-                allowed = set(persona["skills"])
-                skills = [skill for skill in skills if skill.name in allowed]
-        if skills:
-            req.system_prompt += f"\n{build_skills_prompt(skills)}\n"
-            if runtime == "none":
-                req.system_prompt += (
-                    "User has not enabled the Computer Use feature. "
-                    "You cannot use shell or Python to perform skills. "
-                    "If you need to use these capabilities, ask the user to enable Computer Use in the AstrBot WebUI -> Config."
-                )
+    allowed_skills = persona.get("skills") if persona else None
+    if skills_prompt := skill_catalog.get_skills_prompt(runtime, allowed_skills):
+        req.system_prompt += f"\n{skills_prompt}\n"
+        if runtime == "none":
+            req.system_prompt += (
+                "User has not enabled the Computer Use feature. "
+                "You cannot use shell or Python to perform skills. "
+                "If you need to use these capabilities, ask the user to enable Computer Use in the AstrBot WebUI -> Config."
+            )
     tmgr = plugin_context.get_llm_tool_manager()
 
     # inject toolset in the persona
@@ -483,18 +475,36 @@ async def _ensure_img_caption(
     plugin_context: Context,
     image_caption_provider: str,
 ) -> None:
-    try:
-        caption = await _request_img_caption(
+    img_cap_prompt = cfg.get("image_caption_prompt", "Please describe the image.")
+
+    async def caption_image(image_url: str) -> str:
+        return await image_caption_cache.get_or_caption(
             image_caption_provider,
-            cfg,
-            req.image_urls,
-            plugin_context,
+            img_cap_prompt,
+            image_url,
+            lambda: _request_img_caption(
+                image_caption_provider,
+                cfg,
+                [image_url],
+                plugin_context,
+            ),
         )
-        if caption:
-            req.extra_user_content_parts.append(
-                TextPart(text=f"<image_caption>{caption}</image_caption>")
-            )
-            req.image_urls = []
+
+    try:
+        # 逐张并发生成描述，相同图片复用缓存
+        captions = await asyncio.gather(
+            *(caption_image(image_url) for image_url in req.image_urls)
+        )
+        for caption in captions:
+            if caption:
+                req.extra_user_content_parts.append(
+                    TextPart(text=f"<image_caption>{caption}</image_caption>")
+                )
+        req.image_urls = [
+            image_url
+            for image_url, caption in zip(req.image_urls, captions)
+            if not caption
+        ]
     except Exception as exc:  # noqa: BLE001
         logger.error("处理图片描述失败: %s", exc)
 
@@ -560,13 +570,25 @@ async def _process_quote_message(
                 prov = plugin_context.get_using_provider(event.unified_msg_origin)
 
             if prov and isinstance(prov, Provider):
-                llm_resp = await prov.text_chat(
-                    prompt="Please describe the image content.",
-                    image_urls=[await image_seg.convert_to_file_path()],
+                quote_prompt = "Please describe the image content."
+                image_path = await image_seg.convert_to_file_path()
+
+                async def caption_quoted_image() -> str:
+                    llm_resp = await prov.text_chat(
+                        prompt=quote_prompt,
+                        image_urls=[image_path],
+                    )
+                    return llm_resp.completion_text
+
+                caption = await image_caption_cache.get_or_caption(
+                    prov.provider_config.get("id", ""),
+                    quote_prompt,
+                    image_path,
+                    caption_quoted_image,
                 )
-                if llm_resp.completion_text:
+                if caption:
                     content_parts.append(
-                        f"[Image Caption in quoted message]: {llm_resp.completion_text}"
+                        f"[Image Caption in quoted message]: {caption}"
                     )
             else:
                 logger.warning("No provider found for image captioning in quote.")
@@ -76,4 +76,11 @@ def get_backup_directories() -> dict[str, str]:
 
 
 # 备份清单版本号
-BACKUP_MANIFEST_VERSION = "1.1"
+# 1.2: 主数据库按表导出为 NDJSON（databases/main_db/<table>.ndjson），支持增量备份
+BACKUP_MANIFEST_VERSION = "1.2"
+
+# 主数据库 NDJSON 文件所在目录
+MAIN_DB_NDJSON_DIR = "databases/main_db"
+
+# 导出 / 导入时每批处理的行数
+BACKUP_CHUNK_SIZE = 1000
@@ -2,8 +2,12 @@
 
 负责将所有数据导出为 ZIP 备份文件。
 导出格式为 JSON，这是数据库无关的方案，支持未来向 MySQL/PostgreSQL 迁移。
+
+主数据库按表流式导出为 NDJSON，每次只在内存中保留一批记录；
+压缩与文件写入在工作线程中进行，不阻塞事件循环。
 """
 
+import asyncio
 import hashlib
 import json
 import os
@@ -24,9 +28,11 @@ from astrbot.core.utils.astrbot_path import (
 
 # 从共享常量模块导入
 from .constants import (
+    BACKUP_CHUNK_SIZE,
     BACKUP_MANIFEST_VERSION,
     KB_METADATA_MODELS,
     MAIN_DB_MODELS,
+    MAIN_DB_NDJSON_DIR,
     get_backup_directories,
 )
 
@@ -69,16 +75,22 @@ class AstrBotExporter:
         self,
         output_dir: str | None = None,
         progress_callback: Any | None = None,
+        since: datetime | None = None,
     ) -> str:
         """导出所有数据到 ZIP 文件
 
         Args:
             output_dir: 输出目录
             progress_callback: 进度回调函数，接收参数 (stage, current, total, message)
+            since: 增量备份的起点。指定时主数据库中带 ``updated_at`` 的表只导出
+                该时间之后更新过的记录，上一次备份清单中的 ``watermark`` 可直接作为此值
 
         Returns:
             str: 生成的 ZIP 文件路径
         """
+        if since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        watermark = datetime.now(timezone.utc)
         if output_dir is None:
             output_dir = get_astrbot_backups_path()
 
@@ -94,16 +106,9 @@ class AstrBotExporter:
         try:
             with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
                 # 1. 导出主数据库
-                if progress_callback:
-                    await progress_callback("main_db", 0, 100, "正在导出主数据库...")
-                main_data = await self._export_main_database()
-                main_db_json = json.dumps(
-                    main_data, ensure_ascii=False, indent=2, default=str
+                main_stats, attachments = await self._export_main_database(
+                    zf, since, progress_callback
                 )
-                zf.writestr("databases/main_db.json", main_db_json)
-                self._add_checksum("databases/main_db.json", main_db_json)
-                if progress_callback:
-                    await progress_callback("main_db", 100, 100, "主数据库导出完成")
 
                 # 2. 导出知识库数据
                 kb_meta_data: dict[str, Any] = {
@@ -120,7 +125,9 @@ class AstrBotExporter:
                     kb_meta_json = json.dumps(
                         kb_meta_data, ensure_ascii=False, indent=2, default=str
                     )
-                    zf.writestr("databases/kb_metadata.json", kb_meta_json)
+                    await asyncio.to_thread(
+                        zf.writestr, "databases/kb_metadata.json", kb_meta_json
+                    )
                     self._add_checksum("databases/kb_metadata.json", kb_meta_json)
                     if progress_callback:
                         await progress_callback(
@@ -143,7 +150,7 @@ class AstrBotExporter:
                             doc_data, ensure_ascii=False, indent=2, default=str
                         )
                         doc_path = f"databases/kb_{kb_id}/documents.json"
-                        zf.writestr(doc_path, doc_json)
+                        await asyncio.to_thread(zf.writestr, doc_path, doc_json)
                         self._add_checksum(doc_path, doc_json)
 
                         # 导出 FAISS 索引文件
@@ -171,7 +178,7 @@ class AstrBotExporter:
                 # 4. 导出附件文件
                 if progress_callback:
                     await progress_callback("attachments", 0, 100, "正在导出附件...")
-                await self._export_attachments(zf, main_data.get("attachments", []))
+                await self._export_attachments(zf, attachments)
                 if progress_callback:
                     await progress_callback("attachments", 100, 100, "附件导出完成")
 
@@ -187,7 +194,14 @@ class AstrBotExporter:
                 # 6. 生成 manifest
                 if progress_callback:
                     await progress_callback("manifest", 0, 100, "正在生成清单...")
-                manifest = self._generate_manifest(main_data, kb_meta_data, dir_stats)
+                manifest = self._generate_manifest(
+                    main_stats,
+                    kb_meta_data,
+                    dir_stats,
+                    attachments=attachments,
+                    since=since,
+                    watermark=watermark,
+                )
                 manifest_json = json.dumps(manifest, ensure_ascii=False, indent=2)
                 zf.writestr("manifest.json", manifest_json)
                 if progress_callback:
@@ -203,26 +217,86 @@ class AstrBotExporter:
                 os.remove(zip_path)
             raise
 
-    async def _export_main_database(self) -> dict[str, list[dict]]:
-        """导出主数据库所有表"""
-        export_data: dict[str, list[dict]] = {}
+    async def _export_main_database(
+        self,
+        zf: zipfile.ZipFile,
+        since: datetime | None = None,
+        progress_callback: Any | None = None,
+    ) -> tuple[dict[str, int], list[dict]]:
+        """按表流式导出主数据库为 NDJSON
+
+        Returns:
+            tuple: (每个表导出的记录数, 附件记录列表)
+        """
+        stats: dict[str, int] = {}
+        attachments: list[dict] = []
+        total_tables = len(MAIN_DB_MODELS)
 
         async with self.main_db.get_db() as session:
-            for table_name, model_class in MAIN_DB_MODELS.items():
-                try:
-                    result = await session.execute(select(model_class))
-                    records = result.scalars().all()
-                    export_data[table_name] = [
-                        self._model_to_dict(record) for record in records
-                    ]
-                    logger.debug(
-                        f"导出表 {table_name}: {len(export_data[table_name])} 条记录"
+            for idx, (table_name, model_class) in enumerate(MAIN_DB_MODELS.items()):
+                if progress_callback:
+                    await progress_callback(
+                        "main_db",
+                        idx,
+                        total_tables,
+                        f"正在导出表 {table_name}...",
                     )
+                archive_path = f"{MAIN_DB_NDJSON_DIR}/{table_name}.ndjson"
+                hasher = hashlib.sha256()
+                count = 0
+                entry = zf.open(archive_path, "w", force_zip64=True)
+                try:
+                    async for records in self._iter_table_chunks(
+                        session, model_class, since
+                    ):
+                        rows = [self._model_to_dict(record) for record in records]
+                        if table_name == "attachments":
+                            attachments.extend(rows)
+                        payload = "".join(
+                            json.dumps(row, ensure_ascii=False, default=str) + "\n"
+                            for row in rows
+                        ).encode("utf-8")
+                        hasher.update(payload)
+                        await asyncio.to_thread(entry.write, payload)
+                        count += len(rows)
                 except Exception as e:
                     logger.warning(f"导出表 {table_name} 失败: {e}")
-                    export_data[table_name] = []
+                finally:
+                    await asyncio.to_thread(entry.close)
+                self._checksums[archive_path] = f"sha256:{hasher.hexdigest()}"
+                stats[table_name] = count
+                logger.debug(f"导出表 {table_name}: {count} 条记录")
+
+        if progress_callback:
+            await progress_callback(
+                "main_db", total_tables, total_tables, "主数据库导出完成"
+            )
+        return stats, attachments
 
-        return export_data
+    async def _iter_table_chunks(
+        self,
+        session: Any,
+        model_class: Any,
+        since: datetime | None = None,
+    ):
+        """按主键顺序分批读取表中的记录（键集分页）"""
+        table = model_class.__table__
+        pk = list(table.primary_key.columns)[0]
+        last_key = None
+        while True:
+            query = select(model_class).order_by(pk).limit(BACKUP_CHUNK_SIZE)
+            if since is not None and "updated_at" in table.c:
+                query = query.where(table.c.updated_at > since)
+            if last_key is not None:
+                query = query.where(pk > last_key)
+            result = await session.execute(query)
+            records = result.scalars().all()
+            if not records:
+                return
+            yield records
+            if len(records) < BACKUP_CHUNK_SIZE:
+                return
+            last_key = getattr(records[-1], pk.key)
 
     async def _export_kb_metadata(self) -> dict[str, list[dict]]:
         """导出知识库元数据库"""
@@ -280,7 +354,7 @@ class AstrBotExporter:
             index_path = kb_helper.kb_dir / "index.faiss"
             if index_path.exists():
                 archive_path = f"databases/kb_{kb_id}/index.faiss"
-                zf.write(str(index_path), archive_path)
+                await asyncio.to_thread(zf.write, str(index_path), archive_path)
                 logger.debug(f"导出 FAISS 索引: {archive_path}")
         except Exception as e:
             logger.warning(f"导出 FAISS 索引失败: {e}")
@@ -300,7 +374,7 @@ class AstrBotExporter:
                     # 计算相对路径
                     rel_path = file_path.relative_to(kb_helper.kb_dir)
                     archive_path = f"files/kb_media/{kb_id}/{rel_path}"
-                    zf.write(str(file_path), archive_path)
+                    await asyncio.to_thread(zf.write, str(file_path), archive_path)
         except Exception as e:
             logger.warning(f"导出知识库媒体文件失败: {e}")
 
@@ -339,7 +413,9 @@ class AstrBotExporter:
                             # 计算相对路径
                             rel_path = file_path.relative_to(full_path)
                             archive_path = f"directories/{dir_name}/{rel_path}"
-                            zf.write(str(file_path), archive_path)
+                            await asyncio.to_thread(
+                                zf.write, str(file_path), archive_path
+                            )
                             file_count += 1
                             total_size += file_path.stat().st_size
                         except Exception as e:
@@ -367,7 +443,7 @@ class AstrBotExporter:
                     attachment_id = attachment.get("attachment_id", "")
                     ext = os.path.splitext(file_path)[1]
                     archive_path = f"files/attachments/{attachment_id}{ext}"
-                    zf.write(file_path, archive_path)
+                    await asyncio.to_thread(zf.write, file_path, archive_path)
             except Exception as e:
                 logger.warning(f"导出附件失败: {e}")
 
@@ -408,11 +484,23 @@ class AstrBotExporter:
 
     def _generate_manifest(
         self,
-        main_data: dict[str, list[dict]],
+        main_stats: dict[str, int],
         kb_meta_data: dict[str, list[dict]],
         dir_stats: dict[str, dict[str, int]] | None = None,
+        attachments: list[dict] | None = None,
+        since: datetime | None = None,
+        watermark: datetime | None = None,
     ) -> dict:
-        """生成备份清单"""
+        """生成备份清单
+
+        Args:
+            main_stats: 主数据库每个表导出的记录数
+            kb_meta_data: 知识库元数据
+            dir_stats: 每个目录的统计信息
+            attachments: 附件记录列表
+            since: 增量备份的起点，全量备份为 None
+            watermark: 本次备份开始的时间，可作为下一次增量备份的起点
+        """
         if dir_stats is None:
             dir_stats = {}
         # 收集知识库 ID
@@ -423,7 +511,7 @@ class AstrBotExporter:
 
         # 收集附件文件列表
         attachment_files = []
-        for attachment in main_data.get("attachments", []):
+        for attachment in attachments or []:
             attachment_id = attachment.get("attachment_id", "")
             path = attachment.get("path", "")
             if attachment_id and path:
@@ -448,12 +536,16 @@ class AstrBotExporter:
             "astrbot_version": VERSION,
             "exported_at": datetime.now(timezone.utc).isoformat(),
             "origin": "exported",  # 标记备份来源：exported=本实例导出, uploaded=用户上传
+            "backup_type": "incremental" if since else "full",
+            "since": since.isoformat() if since else None,
+            "watermark": (watermark or datetime.now(timezone.utc)).isoformat(),
+            "main_db_format": "ndjson",
             "schema_version": {
                 "main_db": "v4",
                 "kb_db": "v1",
             },
             "tables": {
-                "main_db": list(main_data.keys()),
+                "main_db": list(main_stats.keys()),
                 "kb_metadata": list(kb_meta_data.keys()),
                 "kb_documents": kb_document_tables,
             },
@@ -464,9 +556,7 @@ class AstrBotExporter:
             "directories": list(dir_stats.keys()),
             "checksums": self._checksums,
             "statistics": {
-                "main_db": {
-                    table: len(records) for table, records in main_data.items()
-                },
+                "main_db": dict(main_stats),
                 "kb_metadata": {
                     table: len(records) for table, records in kb_meta_data.items()
                 },
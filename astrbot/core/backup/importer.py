@@ -5,18 +5,25 @@
 - 主版本（前两位）不同时直接拒绝导入
 - 小版本（第三位）不同时提示警告，用户可选择强制导入
 - 版本匹配时也需要用户确认
+
+主数据库按批读取并使用 executemany 批量写入；增量备份以 upsert 方式合并到现有数据。
 """
 
+import asyncio
+import io
+import itertools
 import json
 import os
 import shutil
 import zipfile
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import delete
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from astrbot.core import logger
 from astrbot.core.config.default import VERSION
@@ -29,8 +36,10 @@ from astrbot.core.utils.version_comparator import VersionComparator
 
 # 从共享常量模块导入
 from .constants import (
+    BACKUP_CHUNK_SIZE,
     KB_METADATA_MODELS,
     MAIN_DB_MODELS,
+    MAIN_DB_NDJSON_DIR,
     get_backup_directories,
 )
 
@@ -400,14 +409,19 @@ class AstrBotImporter:
                 if progress_callback:
                     await progress_callback("main_db", 0, 100, "正在导入主数据库...")
 
+                # 增量备份合并到现有数据，不清空数据库
+                incremental = manifest.get("backup_type") == "incremental"
                 try:
-                    main_data_content = zf.read("databases/main_db.json")
-                    main_data = json.loads(main_data_content)
+                    main_data = self._open_main_tables(zf)
 
-                    if mode == "replace":
+                    if mode == "replace" and not incremental:
                         await self._clear_main_db()
 
-                    imported = await self._import_main_database(main_data)
+                    imported = await self._import_main_database(
+                        main_data,
+                        upsert=incremental,
+                        progress_callback=progress_callback,
+                    )
                     result.imported_tables.update(imported)
                 except DatabaseClearError as e:
                     result.add_error(f"清空主数据库失败: {e}")
@@ -463,9 +477,13 @@ class AstrBotImporter:
                 if progress_callback:
                     await progress_callback("attachments", 0, 100, "正在导入附件...")
 
-                attachment_count = await self._import_attachments(
-                    zf, main_data.get("attachments", [])
-                )
+                attachments = main_data.get("attachments", [])
+                if not isinstance(attachments, list):
+                    # NDJSON 流已在导入数据库时读完，重新读取附件表
+                    attachments = list(
+                        self._open_main_tables(zf).get("attachments", [])
+                    )
+                attachment_count = await self._import_attachments(zf, attachments)
                 result.imported_files["attachments"] = attachment_count
 
                 if progress_callback:
@@ -553,41 +571,129 @@ class AstrBotImporter:
 
         self.kb_manager.kb_insts.clear()
 
+    def _open_main_tables(self, zf: zipfile.ZipFile) -> dict[str, Iterable[dict]]:
+        """打开备份中的主数据库数据
+
+        新格式（NDJSON）返回按行惰性读取的迭代器；旧格式返回 main_db.json 中的列表。
+        """
+        prefix = f"{MAIN_DB_NDJSON_DIR}/"
+        ndjson_files = {
+            name[len(prefix) : -len(".ndjson")]: name
+            for name in zf.namelist()
+            if name.startswith(prefix) and name.endswith(".ndjson")
+        }
+        if not ndjson_files:
+            return json.loads(zf.read("databases/main_db.json"))
+        # 按 MAIN_DB_MODELS 的顺序导入，未知表放在最后
+        ordered = [t for t in MAIN_DB_MODELS if t in ndjson_files]
+        ordered += [t for t in ndjson_files if t not in MAIN_DB_MODELS]
+        return {t: self._iter_ndjson(zf, ndjson_files[t]) for t in ordered}
+
+    @staticmethod
+    def _iter_ndjson(zf: zipfile.ZipFile, name: str) -> Iterator[dict]:
+        with zf.open(name) as raw:
+            for line in io.TextIOWrapper(raw, encoding="utf-8"):
+                if line.strip():
+                    yield json.loads(line)
+
     async def _import_main_database(
-        self, data: dict[str, list[dict]]
+        self,
+        data: dict[str, Iterable[dict]],
+        upsert: bool = False,
+        progress_callback: Any | None = None,
     ) -> dict[str, int]:
-        """导入主数据库数据"""
+        """导入主数据库数据
+
+        Args:
+            data: 表名到记录的映射，记录可以是列表或惰性迭代器
+            upsert: 是否按主键合并到现有数据（用于增量备份）
+            progress_callback: 进度回调函数，按表汇报进度
+        """
         imported: dict[str, int] = {}
+        total_tables = len(data)
 
         async with self.main_db.get_db() as session:
             async with session.begin():
-                for table_name, rows in data.items():
+                for idx, (table_name, rows) in enumerate(data.items()):
                     model_class = MAIN_DB_MODELS.get(table_name)
                     if not model_class:
                         logger.warning(f"未知的表: {table_name}")
                         continue
+                    if progress_callback:
+                        await progress_callback(
+                            "main_db",
+                            idx,
+                            total_tables,
+                            f"正在导入表 {table_name}...",
+                        )
                     normalized_rows = self._preprocess_main_table_rows(table_name, rows)
-
-                    count = 0
-                    for row in normalized_rows:
-                        try:
-                            # 转换 datetime 字符串为 datetime 对象
-                            row = self._convert_datetime_fields(row, model_class)
-                            obj = model_class(**row)
-                            session.add(obj)
-                            count += 1
-                        except Exception as e:
-                            logger.warning(f"导入记录到 {table_name} 失败: {e}")
-
+                    count = await self._bulk_insert(
+                        session, table_name, model_class, normalized_rows, upsert
+                    )
                     imported[table_name] = count
                     logger.debug(f"导入表 {table_name}: {count} 条记录")
 
         return imported
 
+    async def _bulk_insert(
+        self,
+        session: Any,
+        table_name: str,
+        model_class: type,
+        rows: Iterable[dict],
+        upsert: bool = False,
+    ) -> int:
+        """分批使用 executemany 写入记录"""
+        table = model_class.__table__  # type: ignore[attr-defined]
+        if upsert:
+            pk_names = [c.name for c in table.primary_key.columns]
+            stmt = sqlite_insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=pk_names,
+                set_={
+                    c.name: stmt.excluded[c.name]
+                    for c in table.columns
+                    if c.name not in pk_names
+                },
+            )
+        else:
+            stmt = insert(table)
+
+        iterator = iter(rows)
+        count = 0
+        while True:
+            # 从 ZIP 中解压与解析 JSON 放到工作线程中进行
+            chunk = await asyncio.to_thread(
+                list, itertools.islice(iterator, BACKUP_CHUNK_SIZE)
+            )
+            if not chunk:
+                break
+            values = []
+            for row in chunk:
+                try:
+                    values.append(self._row_to_column_values(row, model_class))
+                except Exception as e:
+                    logger.warning(f"导入记录到 {table_name} 失败: {e}")
+            if values:
+                await session.execute(stmt, values)
+                count += len(values)
+        return count
+
+    def _row_to_column_values(self, row: dict, model_class: type) -> dict:
+        """将备份记录转换为列值，缺失的列使用模型默认值填充"""
+        # 转换 datetime 字符串为 datetime 对象
+        row = self._convert_datetime_fields(row, model_class)
+        obj = model_class(**row)
+        return {
+            c.name: getattr(obj, c.key)
+            for c in model_class.__table__.columns  # type: ignore[attr-defined]
+        }
+
     def _preprocess_main_table_rows(
-        self, table_name: str, rows: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
+        self, table_name: str, rows: Iterable[dict[str, Any]]
+    ) -> Iterable[dict[str, Any]]:
         if table_name == "platform_stats":
+            rows = list(rows)
             normalized_rows = self._merge_platform_stats_rows(rows)
             duplicate_count = len(rows) - len(normalized_rows)
             if duplicate_count > 0:
@@ -932,10 +1038,11 @@ class AstrBotImporter:
             mapper = sa_inspect(model_class)
             for column in mapper.columns:
                 if column.name in result and result[column.name] is not None:
-                    # 检查是否是 datetime 类型的列
+                    # 检查是否是 datetime 类型的列（包括 TypeDecorator 包装的类型）
                     from sqlalchemy import DateTime
 
-                    if isinstance(column.type, DateTime):
+                    column_type = getattr(column.type, "impl", column.type)
+                    if isinstance(column_type, DateTime):
                         value = result[column.name]
                         if isinstance(value, str):
                             # 解析 ISO 格式的日期时间字符串
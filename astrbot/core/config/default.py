@@ -1637,6 +1637,9 @@ CONFIG_METADATA_2 = {
                         "embedding_api_base": "",
                         "embedding_model": "",
                         "embedding_dimensions": 1024,
+                        "embedding_max_tokens_per_request": 8192,
+                        "embedding_rpm": 0,
+                        "embedding_max_concurrency": 8,
                         "timeout": 20,
                         "proxy": "",
                     },
@@ -1651,6 +1654,9 @@ CONFIG_METADATA_2 = {
                         "embedding_api_base": "",
                         "embedding_model": "gemini-embedding-exp-03-07",
                         "embedding_dimensions": 768,
+                        "embedding_max_tokens_per_request": 8192,
+                        "embedding_rpm": 0,
+                        "embedding_max_concurrency": 8,
                         "timeout": 20,
                         "proxy": "",
                     },
@@ -1664,6 +1670,9 @@ CONFIG_METADATA_2 = {
                         "embedding_api_base": "https://api.siliconflow.cn/v1",
                         "embedding_model": "BAAI/bge-large-zh-v1.5",
                         "embedding_dimensions": 1024,
+                        "embedding_max_tokens_per_request": 8192,
+                        "embedding_rpm": 0,
+                        "embedding_max_concurrency": 8,
                         "timeout": 20,
                     },
                     "Ollama Embedding": {
@@ -1676,6 +1685,9 @@ CONFIG_METADATA_2 = {
                         "embedding_api_base": "http://localhost:11434",
                         "embedding_model": "nomic-embed-text",
                         "embedding_dimensions": 768,
+                        "embedding_max_tokens_per_request": 8192,
+                        "embedding_rpm": 0,
+                        "embedding_max_concurrency": 8,
                         "timeout": 20,
                     },
                     "vLLM Rerank": {
@@ -1966,6 +1978,21 @@ CONFIG_METADATA_2 = {
                         "description": "API Base URL",
                         "type": "string",
                     },
+                    "embedding_max_tokens_per_request": {
+                        "description": "单次请求 token 上限",
+                        "type": "int",
+                        "hint": "批量生成向量时，每个请求包含的文本按估算 token 数累计不超过该值。默认 8192。",
+                    },
+                    "embedding_rpm": {
+                        "description": "每分钟请求数上限",
+                        "type": "int",
+                        "hint": "该 Provider 所有向量请求（知识库导入与检索）共享的每分钟请求数上限，0 表示不限制。",
+                    },
+                    "embedding_max_concurrency": {
+                        "description": "最大并发请求数",
+                        "type": "int",
+                        "hint": "并发数会根据延迟与限流（429）自动调整，但不会超过该值。默认 8。",
+                    },
                     "volcengine_cluster": {
                         "type": "string",
                         "description": "火山引擎集群",
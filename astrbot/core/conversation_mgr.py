@@ -229,6 +229,7 @@ class ConversationManager:
         page_size: int = 20,
         platform_ids: list[str] | None = None,
         search_query: str = "",
+        before_cid: str | None = None,
         **kwargs,
     ) -> tuple[list[Conversation], int]:
         """获取过滤后的对话列表.
@@ -238,6 +239,8 @@ class ConversationManager:
             page_size (int): 每页大小, 默认为 20
             platform_ids (list[str]): 平台 ID 列表, 可选
             search_query (str): 搜索查询字符串, 可选
+            before_cid (str): 游标分页，返回该对话之后（更早创建）的对话，此时忽略 page。
+                搜索时不生效
         Returns:
             conversations (list[Conversation]): 对话对象列表
 
@@ -247,6 +250,7 @@ class ConversationManager:
             page_size=page_size,
             platform_ids=platform_ids,
             search_query=search_query,
+            before_cid=before_cid,
             **kwargs,
         )
         convs_res = []
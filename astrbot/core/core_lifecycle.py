@@ -15,6 +15,7 @@ import threading
 import time
 import traceback
 from asyncio import Queue
+from typing import TYPE_CHECKING
 
 from astrbot.api import logger, sp
 from astrbot.core import LogBroker, LogManager
@@ -37,15 +38,16 @@ from astrbot.core.umop_config_router import UmopConfigRouter
 from astrbot.core.updator import AstrBotUpdator
 from astrbot.core.utils.llm_metadata import update_llm_metadata
 from astrbot.core.utils.migra_helper import migra
+from astrbot.core.utils.platform_stats_aggregator import platform_stats_aggregator
 from astrbot.core.utils.temp_dir_cleaner import TempDirCleaner
-from astrbot.core.maibot.maibot_adapter import (
-    initialize_instance_manager,
-    MaibotInstanceManager,
-)
+from astrbot.utils import startup_profiler
 
 from . import astrbot_config, html_renderer
 from .event_bus import EventBus
 
+if TYPE_CHECKING:
+    from astrbot.core.maibot.maibot_adapter import MaibotInstanceManager
+
 
 class AstrBotCoreLifecycle:
     """AstrBot 核心生命周期管理类, 负责管理 AstrBot 的启动、停止、重启等操作.
@@ -59,7 +61,7 @@ class AstrBotCoreLifecycle:
         self.log_broker = log_broker  # 初始化日志代理
         self.astrbot_config = astrbot_config  # 初始化配置
         self.db = db  # 初始化数据库
-        self.maibot_manager: Optional[MaibotInstanceManager] = None  # MaiBot 实例管理器
+        self.maibot_manager: MaibotInstanceManager | None = None  # MaiBot 实例管理器
 
         self.subagent_orchestrator: SubAgentOrchestrator | None = None
         self.cron_manager: CronJobManager | None = None
@@ -121,6 +123,7 @@ class AstrBotCoreLifecycle:
         await self.db.initialize()
 
         await html_renderer.initialize()
+        startup_profiler.checkpoint("数据库与渲染器")
 
         # 初始化 UMOP 配置路由器
         self.umop_config_router = UmopConfigRouter(sp=sp)
@@ -150,6 +153,7 @@ class AstrBotCoreLifecycle:
         except Exception as e:
             logger.error(f"AstrBot migration failed: {e!s}")
             logger.error(traceback.format_exc())
+        startup_profiler.checkpoint("配置与数据迁移")
 
         # 初始化事件队列
         self.event_queue = Queue()
@@ -198,17 +202,21 @@ class AstrBotCoreLifecycle:
             self.cron_manager,
             self.subagent_orchestrator,
         )
+        startup_profiler.checkpoint("核心管理器")
 
         # 初始化插件管理器
         self.plugin_manager = PluginManager(self.star_context, self.astrbot_config)
 
         # 扫描、注册插件、实例化插件类
         await self.plugin_manager.reload()
+        startup_profiler.checkpoint("插件")
 
         # 根据配置实例化各个 Provider
         await self.provider_manager.initialize()
+        startup_profiler.checkpoint("模型提供商")
 
         await self.kb_manager.initialize()
+        startup_profiler.checkpoint("知识库")
 
         # 初始化消息事件流水线调度器
         self.pipeline_scheduler_mapping = await self.load_pipeline_scheduler()
@@ -231,6 +239,7 @@ class AstrBotCoreLifecycle:
 
         # 根据配置实例化各个平台适配器
         await self.platform_manager.initialize()
+        startup_profiler.checkpoint("平台适配器")
 
         # 初始化关闭控制面板的事件
         self.dashboard_shutdown_event = asyncio.Event()
@@ -239,6 +248,7 @@ class AstrBotCoreLifecycle:
 
         # 初始化 MaiBot 实例管理器并自动启动所有实例
         await self._initialize_maibot()
+        startup_profiler.checkpoint("MaiBot")
 
     def _load(self) -> None:
         """加载事件总线和任务并初始化."""
@@ -261,12 +271,21 @@ class AstrBotCoreLifecycle:
                 name="temp_dir_cleaner",
             )
 
+        platform_stats_task = asyncio.create_task(
+            platform_stats_aggregator.run(),
+            name="platform_stats_aggregator",
+        )
+
         # 把插件中注册的所有协程函数注册到事件总线中并执行
         extra_tasks = []
         for task in self.star_context._register_tasks:
             extra_tasks.append(asyncio.create_task(task, name=task.__name__))  # type: ignore
 
-        tasks_ = [event_bus_task, *(extra_tasks if extra_tasks else [])]
+        tasks_ = [
+            event_bus_task,
+            platform_stats_task,
+            *(extra_tasks if extra_tasks else []),
+        ]
         if cron_task:
             tasks_.append(cron_task)
         if temp_dir_cleaner_task:
@@ -334,6 +353,7 @@ class AstrBotCoreLifecycle:
         """停止 AstrBot 核心生命周期管理类, 取消所有当前任务并终止各个管理器."""
         if self.temp_dir_cleaner:
             await self.temp_dir_cleaner.stop()
+        await platform_stats_aggregator.stop()
 
         # 请求停止所有正在运行的异步任务
         for task in self.curr_tasks:
@@ -367,6 +387,7 @@ class AstrBotCoreLifecycle:
 
     async def restart(self) -> None:
         """重启 AstrBot 核心生命周期管理类, 终止各个管理器并重新加载平台实例"""
+        await platform_stats_aggregator.flush()
         await self.provider_manager.terminate()
         await self.platform_manager.terminate()
         await self.kb_manager.terminate()
@@ -380,11 +401,16 @@ class AstrBotCoreLifecycle:
     async def _initialize_maibot(self) -> None:
         """初始化 MaiBot 实例管理器并自动启动所有实例"""
         try:
+            # MaiBot 运行时依赖较多，延迟到此处再导入
+            from astrbot.core.maibot.maibot_adapter import (
+                initialize_adapter,
+                initialize_instance_manager,
+            )
+
             self.maibot_manager = await initialize_instance_manager("data/maibot")
             logger.info(f"MaiBot 实例管理器初始化完成，共 {len(self.maibot_manager.instances)} 个实例")
 
             # 初始化 AstrBot 适配器
-            from astrbot.core.maibot.maibot_adapter import initialize_adapter
             await initialize_adapter(self.maibot_manager)
 
             # 设置 AstrBot Context 引用（用于知识库 IPC 检索）
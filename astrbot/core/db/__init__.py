@@ -87,6 +87,18 @@ class BaseDatabase(abc.ABC):
         """Insert a new platform statistic record."""
         ...
 
+    @abc.abstractmethod
+    async def insert_platform_stats_batch(
+        self,
+        stats: list[tuple[datetime.datetime, str, str, int]],
+    ) -> None:
+        """Upsert multiple platform statistic records in a single transaction.
+
+        Each item is ``(timestamp, platform_id, platform_type, count)``. Counts are
+        added to the existing record with the same key.
+        """
+        ...
+
     @abc.abstractmethod
     async def count_platform_stats(self) -> int:
         """Count the number of platform statistics records."""
@@ -130,9 +142,15 @@ class BaseDatabase(abc.ABC):
         page_size: int = 20,
         platform_ids: list[str] | None = None,
         search_query: str = "",
+        before_cid: str | None = None,
         **kwargs,
     ) -> tuple[list[ConversationV2], int]:
-        """Get conversations filtered by platform IDs and search query."""
+        """Get conversations filtered by platform IDs and search query.
+
+        When ``before_cid`` is given and there is no search query, only
+        conversations after that conversation in newest-first order are returned
+        (keyset pagination) and ``page`` is ignored.
+        """
         ...
 
     @abc.abstractmethod
@@ -201,8 +219,13 @@ class BaseDatabase(abc.ABC):
         user_id: str,
         page: int = 1,
         page_size: int = 20,
+        before_id: int | None = None,
     ) -> list[PlatformMessageHistory]:
-        """Get platform message history for a specific user."""
+        """Get platform message history for a specific user, newest first.
+
+        When ``before_id`` is given, only records after that record in
+        newest-first order are returned (keyset pagination) and ``page`` is ignored.
+        """
         ...
 
     @abc.abstractmethod
@@ -669,9 +692,14 @@ class BaseDatabase(abc.ABC):
         page: int = 1,
         page_size: int = 20,
         exclude_project_sessions: bool = False,
+        before_session_id: str | None = None,
     ) -> tuple[list[dict], int]:
         """Get paginated platform sessions and total count for a creator.
 
+        When ``before_session_id`` is given, only sessions after that session in
+        most-recently-updated order are returned (keyset pagination) and ``page``
+        is ignored.
+
         Returns:
             tuple[list[dict], int]: (sessions_with_project_info, total_count)
         """
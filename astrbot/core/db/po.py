@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import TypedDict
 
-from sqlmodel import JSON, Field, SQLModel, Text, UniqueConstraint
+from sqlmodel import JSON, Field, Index, SQLModel, Text, UniqueConstraint
 
 
 class TimestampMixin(SQLModel):
@@ -69,6 +69,9 @@ class ConversationV2(TimestampMixin, SQLModel, table=True):
             "conversation_id",
             name="uix_conversation_id",
         ),
+        Index("ix_conversations_created_at", "created_at"),
+        Index("ix_conversations_user_id_created_at", "user_id", "created_at"),
+        Index("ix_conversations_platform_id_created_at", "platform_id", "created_at"),
     )
 
 
@@ -221,6 +224,15 @@ class PlatformMessageHistory(TimestampMixin, SQLModel, table=True):
     )  # Name of the sender in the platform
     content: dict = Field(sa_type=JSON, nullable=False)  # a message chain list
 
+    __table_args__ = (
+        Index(
+            "ix_platform_message_history_platform_id_user_id_created_at",
+            "platform_id",
+            "user_id",
+            "created_at",
+        ),
+    )
+
 
 class PlatformSession(TimestampMixin, SQLModel, table=True):
     """Platform session table for managing user sessions across different platforms.
@@ -256,6 +268,7 @@ class PlatformSession(TimestampMixin, SQLModel, table=True):
             "session_id",
             name="uix_platform_session_id",
         ),
+        Index("ix_platform_sessions_creator_updated_at", "creator", "updated_at"),
     )
 
 
@@ -360,6 +373,7 @@ class ChatUIProject(TimestampMixin, SQLModel, table=True):
             "project_id",
             name="uix_chatui_project_id",
         ),
+        Index("ix_chatui_projects_creator_updated_at", "creator", "updated_at"),
     )
 
 
@@ -383,6 +397,7 @@ class SessionProjectRelation(SQLModel, table=True):
             "session_id",
             name="uix_session_project_relation",
         ),
+        Index("ix_session_project_relations_project_id", "project_id"),
     )
 
 
@@ -1,10 +1,11 @@
 import asyncio
+import logging
 import threading
 import typing as T
 from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import CursorResult, Row
+from sqlalchemy import CursorResult, DateTime, Row, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col, delete, desc, func, or_, select, text, update
 
@@ -32,8 +33,16 @@ from astrbot.core.db.po import (
 from astrbot.core.db.po import (
     Stats as DeprecatedStats,
 )
+from astrbot.core.db.sqlite_fts import (
+    CONVERSATION_FTS_COLUMNS,
+    SEARCH_COUNT_LIMIT,
+    ensure_fts_indexes,
+    fts_match,
+)
 from astrbot.core.sentinels import NOT_GIVEN
 
+logger = logging.getLogger("astrbot")
+
 TxResult = T.TypeVar("TxResult")
 CRON_FIELD_NOT_SET = object()
 
@@ -43,12 +52,16 @@ class SQLiteDatabase(BaseDatabase):
         self.db_path = db_path
         self.DATABASE_URL = f"sqlite+aiosqlite:///{db_path}"
         self.inited = False
+        self.fts_enabled = False
+        """是否可用 FTS5 全文索引，不可用时搜索退化为 LIKE 扫描"""
         super().__init__()
 
     async def initialize(self) -> None:
         """Initialize the database by creating tables if they do not exist."""
         async with self.engine.begin() as conn:
             await conn.run_sync(SQLModel.metadata.create_all)
+            # create_all 不会为已存在的表补建索引
+            await conn.run_sync(self._ensure_indexes)
             await conn.execute(text("PRAGMA journal_mode=WAL"))
             await conn.execute(text("PRAGMA synchronous=NORMAL"))
             await conn.execute(text("PRAGMA cache_size=20000"))
@@ -61,6 +74,24 @@ class SQLiteDatabase(BaseDatabase):
             await self._ensure_persona_custom_error_message_column(conn)
             await conn.commit()
 
+        try:
+            async with self.engine.begin() as conn:
+                await ensure_fts_indexes(conn)
+            self.fts_enabled = True
+        except Exception as e:
+            logger.warning(f"SQLite FTS5 全文索引不可用，搜索将使用 LIKE 扫描: {e}")
+
+    @staticmethod
+    def _ensure_indexes(sync_conn) -> None:
+        """确保模型中声明的索引都已创建。
+
+        这是为了支持旧版数据库的平滑升级：新增的复合索引只会在建表时由
+        metadata.create_all 创建，已有的表需要在这里补建。
+        """
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(sync_conn, checkfirst=True)
+
     async def _ensure_persona_folder_columns(self, conn) -> None:
         """确保 personas 表有 folder_id 和 sort_order 列。
 
@@ -103,6 +134,27 @@ class SQLiteDatabase(BaseDatabase):
                 text("ALTER TABLE personas ADD COLUMN custom_error_message TEXT")
             )
 
+    @staticmethod
+    async def _keyset_before(
+        session: AsyncSession,
+        sort_col: T.Any,
+        id_col: T.Any,
+        key_col: T.Any,
+        cursor: T.Any,
+    ) -> T.Any | None:
+        """构造按 ``sort_col DESC, id_col DESC`` 排序时位于游标行之后的过滤条件。
+
+        游标行不存在时返回 None。行值比较可以直接在
+        ``(..., sort_col, rowid)`` 形式的复合索引上定位，无需像 OFFSET 那样逐行跳过。
+        """
+        result = await session.execute(
+            select(sort_col, id_col).where(key_col == cursor)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return tuple_(sort_col, id_col) < tuple_(*row)
+
     # ====
     # Platform Statistics
     # ====
@@ -115,16 +167,23 @@ class SQLiteDatabase(BaseDatabase):
         timestamp=None,
     ) -> None:
         """Insert a new platform statistic record."""
+        if timestamp is None:
+            timestamp = datetime.now().replace(
+                minute=0,
+                second=0,
+                microsecond=0,
+            )
+        await self.insert_platform_stats_batch(
+            [(timestamp, platform_id, platform_type, count)]
+        )
+
+    async def insert_platform_stats_batch(self, stats) -> None:
+        """Upsert multiple platform statistic records in a single transaction."""
+        if not stats:
+            return
         async with self.get_db() as session:
             session: AsyncSession
             async with session.begin():
-                if timestamp is None:
-                    timestamp = datetime.now().replace(
-                        minute=0,
-                        second=0,
-                        microsecond=0,
-                    )
-                current_hour = timestamp
                 await session.execute(
                     text("""
                     INSERT INTO platform_stats (timestamp, platform_id, platform_type, count)
@@ -132,12 +191,15 @@ class SQLiteDatabase(BaseDatabase):
                     ON CONFLICT(timestamp, platform_id, platform_type) DO UPDATE SET
                         count = platform_stats.count + EXCLUDED.count
                     """),
-                    {
-                        "timestamp": current_hour,
-                        "platform_id": platform_id,
-                        "platform_type": platform_type,
-                        "count": count,
-                    },
+                    [
+                        {
+                            "timestamp": timestamp,
+                            "platform_id": platform_id,
+                            "platform_type": platform_type,
+                            "count": count,
+                        }
+                        for timestamp, platform_id, platform_type, count in stats
+                    ],
                 )
 
     async def count_platform_stats(self) -> int:
@@ -158,16 +220,27 @@ class SQLiteDatabase(BaseDatabase):
             session: AsyncSession
             now = datetime.now()
             start_time = now - timedelta(seconds=offset_sec)
+            # 只读取聚合所需的列，时间范围条件走 uix_platform_stats 索引
             result = await session.execute(
                 text("""
-                SELECT * FROM platform_stats
+                SELECT platform_id, platform_type,
+                    SUM(count) AS count, MAX(timestamp) AS timestamp
+                FROM platform_stats
                 WHERE timestamp >= :start_time
-                GROUP BY platform_id
-                ORDER BY timestamp DESC
-                """),
+                GROUP BY platform_id, platform_type
+                ORDER BY MAX(timestamp) DESC
+                """).columns(timestamp=DateTime),
                 {"start_time": start_time},
             )
-            return list(result.scalars().all())
+            return [
+                PlatformStat(
+                    platform_id=platform_id,
+                    platform_type=platform_type,
+                    count=count or 0,
+                    timestamp=timestamp,
+                )
+                for platform_id, platform_type, count, timestamp in result.all()
+            ]
 
     # ====
     # Conversation Management
@@ -213,6 +286,7 @@ class SQLiteDatabase(BaseDatabase):
         page_size=20,
         platform_ids=None,
         search_query="",
+        before_cid=None,
         **kwargs,
     ):
         async with self.get_db() as session:
@@ -224,7 +298,21 @@ class SQLiteDatabase(BaseDatabase):
                 base_query = base_query.where(
                     col(ConversationV2.platform_id).in_(platform_ids),
                 )
-            if search_query:
+            order_by = [
+                desc(ConversationV2.created_at),
+                desc(ConversationV2.inner_conversation_id),
+            ]
+            search_query = search_query.strip() if search_query else ""
+            if search_query and self.fts_enabled:
+                match = fts_match(
+                    "conversations_fts", search_query, CONVERSATION_FTS_COLUMNS
+                )
+                base_query = base_query.join(
+                    match,
+                    match.c.rowid == col(ConversationV2.inner_conversation_id),
+                )
+                order_by.insert(0, match.c.score)
+            elif search_query:
                 search_query = search_query.encode("unicode_escape").decode("utf-8")
                 base_query = base_query.where(
                     or_(
@@ -244,18 +332,34 @@ class SQLiteDatabase(BaseDatabase):
                     col(ConversationV2.platform_id).in_(kwargs["platforms"]),
                 )
 
-            # Get total count matching the filters
-            count_query = select(func.count()).select_from(base_query.subquery())
+            # Get total count matching the filters. Search results are counted
+            # only up to SEARCH_COUNT_LIMIT, which is returned as an approximation.
+            offset = (page - 1) * page_size
+            count_source = base_query
+            if search_query:
+                count_source = base_query.limit(
+                    max(SEARCH_COUNT_LIMIT, offset + page_size + 1)
+                )
+            count_query = select(func.count()).select_from(count_source.subquery())
             total_count = await session.execute(count_query)
             total = total_count.scalar_one()
 
-            # Get paginated results
-            offset = (page - 1) * page_size
-            result_query = (
-                base_query.order_by(desc(ConversationV2.created_at))
-                .offset(offset)
-                .limit(page_size)
-            )
+            # Get paginated results. Search results are ordered by relevance and
+            # always use offset pagination.
+            result_query = base_query.order_by(*order_by).limit(page_size)
+            if before_cid and not search_query:
+                cursor = await self._keyset_before(
+                    session,
+                    col(ConversationV2.created_at),
+                    col(ConversationV2.inner_conversation_id),
+                    col(ConversationV2.conversation_id),
+                    before_cid,
+                )
+                if cursor is None:
+                    return [], total
+                result_query = result_query.where(cursor)
+            else:
+                result_query = result_query.offset(offset)
             result = await session.execute(result_query)
             conversations = result.scalars().all()
 
@@ -494,20 +598,36 @@ class SQLiteDatabase(BaseDatabase):
         user_id,
         page=1,
         page_size=20,
+        before_id=None,
     ):
         """Get platform message history records."""
         async with self.get_db() as session:
             session: AsyncSession
-            offset = (page - 1) * page_size
             query = (
                 select(PlatformMessageHistory)
                 .where(
                     PlatformMessageHistory.platform_id == platform_id,
                     PlatformMessageHistory.user_id == user_id,
                 )
-                .order_by(desc(PlatformMessageHistory.created_at))
+                .order_by(
+                    desc(PlatformMessageHistory.created_at),
+                    desc(PlatformMessageHistory.id),
+                )
             )
-            result = await session.execute(query.offset(offset).limit(page_size))
+            if before_id is not None:
+                cursor = await self._keyset_before(
+                    session,
+                    col(PlatformMessageHistory.created_at),
+                    col(PlatformMessageHistory.id),
+                    col(PlatformMessageHistory.id),
+                    before_id,
+                )
+                if cursor is None:
+                    return []
+                query = query.where(cursor)
+            else:
+                query = query.offset((page - 1) * page_size)
+            result = await session.execute(query.limit(page_size))
             return result.scalars().all()
 
     async def get_platform_message_history_by_id(
@@ -1498,6 +1618,7 @@ class SQLiteDatabase(BaseDatabase):
         page: int = 1,
         page_size: int = 20,
         exclude_project_sessions: bool = False,
+        before_session_id: str | None = None,
     ) -> tuple[list[dict], int]:
         """Get paginated Platform sessions for a creator with total count."""
         async with self.get_db() as session:
@@ -1510,16 +1631,51 @@ class SQLiteDatabase(BaseDatabase):
                 exclude_project_sessions=exclude_project_sessions,
             )
 
+            # The project joins are unique per session and only matter for
+            # counting when they are used to filter.
+            count_query = select(func.count()).where(
+                col(PlatformSession.creator) == creator
+            )
+            if platform_id:
+                count_query = count_query.where(
+                    PlatformSession.platform_id == platform_id
+                )
+            if exclude_project_sessions:
+                count_query = count_query.where(
+                    ~select(SessionProjectRelation.id)
+                    .join(
+                        ChatUIProject,
+                        col(SessionProjectRelation.project_id)
+                        == col(ChatUIProject.project_id),
+                    )
+                    .where(
+                        col(SessionProjectRelation.session_id)
+                        == col(PlatformSession.session_id)
+                    )
+                    .exists()
+                )
             total_result = await session.execute(
-                select(func.count()).select_from(base_query.subquery())
+                count_query.select_from(PlatformSession)
             )
             total = int(total_result.scalar_one() or 0)
 
-            result_query = (
-                base_query.order_by(desc(PlatformSession.updated_at))
-                .offset(offset)
-                .limit(page_size)
-            )
+            result_query = base_query.order_by(
+                desc(PlatformSession.updated_at),
+                desc(PlatformSession.inner_id),
+            ).limit(page_size)
+            if before_session_id:
+                cursor = await self._keyset_before(
+                    session,
+                    col(PlatformSession.updated_at),
+                    col(PlatformSession.inner_id),
+                    col(PlatformSession.session_id),
+                    before_session_id,
+                )
+                if cursor is None:
+                    return [], total
+                result_query = result_query.where(cursor)
+            else:
+                result_query = result_query.offset(offset)
             result = await session.execute(result_query)
 
             sessions_with_projects = self._rows_to_session_dicts(result.all())
@@ -0,0 +1,112 @@
+"""SQLite FTS5 全文索引
+
+为对话（标题、消息正文、用户 ID、对话 ID）建立 FTS5 索引，
+替代对整段 JSON 的 ``LIKE '%q%'`` 全表扫描。
+
+- 索引由触发器维护，任何写入路径（包括批量导入、直接 SQL 更新）都会同步；
+- 消息正文通过 ``json_tree`` 从 JSON 中提取 ``content`` / ``text`` 字段，
+  因此不会匹配到 JSON 键名或转义序列；
+- 使用 ``trigram`` 分词器，支持中文等无空格语言的子串匹配。少于 3 个字符的
+  查询无法使用三元组索引，退化为对（远小于原表的）索引表做 ``LIKE`` 扫描。
+"""
+
+from collections.abc import Sequence
+
+from sqlalchemy import Float, Integer, column, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import Subquery
+
+TRIGRAM_LENGTH = 3
+SEARCH_COUNT_LIMIT = 1000
+"""搜索结果计数的上限，超过时返回该值作为近似总数"""
+
+CONVERSATION_FTS_COLUMNS = ("title", "body", "user_id", "conversation_id")
+
+
+def _extract_text(json_expr: str) -> str:
+    return (
+        "(SELECT group_concat(value, ' ') FROM json_tree("
+        f"CASE WHEN json_valid({json_expr}) THEN {json_expr} ELSE '[]' END"
+        ") WHERE key IN ('content', 'text') AND type = 'text')"
+    )
+
+
+def _conversation_values(row: str) -> str:
+    return (
+        f"{row}.inner_conversation_id, {row}.title, "
+        f"{_extract_text(f'{row}.content')}, {row}.user_id, {row}.conversation_id"
+    )
+
+
+_CONVERSATION_INSERT = (
+    "INSERT INTO conversations_fts(rowid, title, body, user_id, conversation_id)"
+)
+
+_FTS_TABLES = {
+    "conversations_fts": (
+        f"""
+        CREATE VIRTUAL TABLE conversations_fts USING fts5(
+            {", ".join(CONVERSATION_FTS_COLUMNS)}, tokenize='trigram'
+        )
+        """,
+        f"{_CONVERSATION_INSERT} SELECT {_conversation_values('c')} "
+        "FROM conversations AS c",
+    ),
+}
+
+_FTS_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS conversations_fts_ai AFTER INSERT ON conversations
+    BEGIN
+        {_CONVERSATION_INSERT} VALUES ({_conversation_values("NEW")});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS conversations_fts_ad AFTER DELETE ON conversations
+    BEGIN
+        DELETE FROM conversations_fts WHERE rowid = OLD.inner_conversation_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS conversations_fts_au
+    AFTER UPDATE OF title, content, user_id, conversation_id ON conversations
+    BEGIN
+        DELETE FROM conversations_fts WHERE rowid = OLD.inner_conversation_id;
+        {_CONVERSATION_INSERT} VALUES ({_conversation_values("NEW")});
+    END
+    """,
+)
+
+
+async def ensure_fts_indexes(conn: AsyncConnection) -> None:
+    """创建 FTS5 索引表与触发器，首次创建时从现有数据回填。"""
+    result = await conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'table'")
+    )
+    existing = {row[0] for row in result.fetchall()}
+    for table, (create_sql, backfill_sql) in _FTS_TABLES.items():
+        if table not in existing:
+            await conn.execute(text(create_sql))
+            await conn.execute(text(backfill_sql))
+    for trigger_sql in _FTS_TRIGGERS:
+        await conn.execute(text(trigger_sql))
+
+
+def fts_match(table: str, query: str, columns: Sequence[str]) -> Subquery:
+    """构造匹配 ``query`` 的子查询，列为 ``rowid`` 与 ``score``（越小越相关）。"""
+    query = query.strip()
+    if len(query) >= TRIGRAM_LENGTH:
+        phrase = '"' + query.replace('"', '""') + '"'
+        stmt = text(
+            f"SELECT rowid, bm25({table}) AS score FROM {table} "
+            f"WHERE {table} MATCH :query"
+        ).bindparams(query=phrase)
+    else:
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        condition = " OR ".join(f"{c} LIKE :query ESCAPE '\\'" for c in columns)
+        stmt = text(
+            f"SELECT rowid, 0.0 AS score FROM {table} WHERE {condition}"
+        ).bindparams(query=f"%{escaped}%")
+    return stmt.columns(column("rowid", Integer), column("score", Float)).subquery(
+        f"{table}_match"
+    )
@@ -1,9 +1,9 @@
 import json
 import os
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import Column, Text
+from sqlalchemy import Column, Text, delete, update
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Field, MetaData, SQLModel, col, func, select, text
@@ -167,8 +167,8 @@ class DocumentStorage:
                 doc_id=doc_id,
                 text=text,
                 metadata_=json.dumps(metadata),
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc),
             )
             session.add(document)
             await session.flush()  # Flush to get the ID
@@ -202,8 +202,8 @@ class DocumentStorage:
                     doc_id=doc_id,
                     text=text,
                     metadata_=json.dumps(metadata),
-                    created_at=datetime.now(),
-                    updated_at=datetime.now(),
+                    created_at=datetime.now(timezone.utc),
+                    updated_at=datetime.now(timezone.utc),
                 )
                 documents.append(document)
                 session.add(document)
@@ -266,9 +266,62 @@ class DocumentStorage:
 
             if document:
                 document.text = new_text
-                document.updated_at = datetime.now()
+                document.updated_at = datetime.now(timezone.utc)
                 session.add(document)
 
+    async def apply_changes(
+        self,
+        delete_ids: list[int],
+        doc_ids: list[str],
+        texts: list[str],
+        metadatas: list[dict],
+        metadata_updates: dict[int, dict] | None = None,
+    ) -> list[int]:
+        """Delete, insert and re-tag documents in a single transaction.
+
+        Args:
+            delete_ids (list[int]): Integer IDs of the documents to delete.
+            doc_ids (list[str]): Document IDs (UUID strings) to insert.
+            texts (list[str]): Texts of the documents to insert.
+            metadatas (list[dict]): Metadata of the documents to insert.
+            metadata_updates (dict[int, dict] | None): New metadata keyed by the
+                integer ID of existing documents.
+
+        Returns:
+            list[int]: Integer IDs of the inserted documents.
+
+        """
+        assert self.engine is not None, "Database connection is not initialized."
+
+        now = datetime.now(timezone.utc)
+        async with self.get_session() as session, session.begin():
+            # SQLite 参数上限为 999，分片删除避免超限
+            for i in range(0, len(delete_ids), 900):
+                await session.execute(
+                    delete(Document).where(
+                        col(Document.id).in_(delete_ids[i : i + 900]),
+                    ),
+                )
+            for int_id, metadata in (metadata_updates or {}).items():
+                await session.execute(
+                    update(Document)
+                    .where(col(Document.id) == int_id)
+                    .values(metadata_=json.dumps(metadata), updated_at=now),
+                )
+            documents = [
+                Document(
+                    doc_id=doc_id,
+                    text=text,
+                    metadata_=json.dumps(metadata),
+                    created_at=now,
+                    updated_at=now,
+                )
+                for doc_id, text, metadata in zip(doc_ids, texts, metadatas)
+            ]
+            session.add_all(documents)
+            await session.flush()
+            return [doc.id for doc in documents]  # type: ignore
+
     async def delete_documents(self, metadata_filters: dict) -> None:
         """Delete documents by their metadata filters.
 
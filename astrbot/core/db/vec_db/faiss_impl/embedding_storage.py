@@ -1,13 +1,24 @@
-try:
-    import faiss
-except ModuleNotFoundError:
-    raise ImportError(
-        "faiss 未安装。请使用 'pip install faiss-cpu' 或 'pip install faiss-gpu' 安装。",
-    )
 import os
+from types import ModuleType
 
 import numpy as np
 
+_faiss: ModuleType | None = None
+
+
+def _get_faiss() -> ModuleType:
+    """首次使用向量索引时才导入 faiss，未启用知识库时不必加载它。"""
+    global _faiss
+    if _faiss is None:
+        try:
+            import faiss
+        except ModuleNotFoundError:
+            raise ImportError(
+                "faiss 未安装。请使用 'pip install faiss-cpu' 或 'pip install faiss-gpu' 安装。",
+            )
+        _faiss = faiss
+    return _faiss
+
 
 class EmbeddingStorage:
     def __init__(self, dimension: int, path: str | None = None) -> None:
@@ -15,10 +26,10 @@ class EmbeddingStorage:
         self.path = path
         self.index = None
         if path and os.path.exists(path):
-            self.index = faiss.read_index(path)
+            self.index = _get_faiss().read_index(path)
         else:
-            base_index = faiss.IndexFlatL2(dimension)
-            self.index = faiss.IndexIDMap(base_index)
+            base_index = _get_faiss().IndexFlatL2(dimension)
+            self.index = _get_faiss().IndexIDMap(base_index)
 
     async def insert(self, vector: np.ndarray, id: int) -> None:
         """插入向量
@@ -67,7 +78,7 @@ class EmbeddingStorage:
 
         """
         assert self.index is not None, "FAISS index is not initialized."
-        faiss.normalize_L2(vector)
+        _get_faiss().normalize_L2(vector)
         distances, indices = self.index.search(vector, k)
         return distances, indices
 
@@ -83,6 +94,31 @@ class EmbeddingStorage:
         self.index.remove_ids(id_array)
         await self.save_index()
 
+    async def apply_changes(
+        self,
+        delete_ids: list[int],
+        vectors: np.ndarray | None,
+        ids: list[int],
+    ) -> None:
+        """在一次变更中删除并插入向量，只写入一次索引文件
+
+        Args:
+            delete_ids (list[int]): 要删除的向量ID列表
+            vectors (np.ndarray | None): 要插入的向量数组
+            ids (list[int]): 插入向量的ID列表
+
+        """
+        assert self.index is not None, "FAISS index is not initialized."
+        if vectors is not None and len(ids) and vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"向量维度不匹配, 期望: {self.dimension}, 实际: {vectors.shape[1]}",
+            )
+        if delete_ids:
+            self.index.remove_ids(np.array(delete_ids, dtype=np.int64))
+        if vectors is not None and len(ids):
+            self.index.add_with_ids(vectors, np.array(ids))
+        await self.save_index()
+
     async def save_index(self) -> None:
         """保存索引
 
@@ -92,4 +128,4 @@ class EmbeddingStorage:
         """
         if self.index is None:
             return
-        faiss.write_index(self.index, self.path)
+        _get_faiss().write_index(self.index, self.path)
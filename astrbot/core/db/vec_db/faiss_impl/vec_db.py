@@ -1,5 +1,6 @@
 import time
 import uuid
+from typing import TYPE_CHECKING
 
 import numpy as np
 
@@ -10,6 +11,9 @@ from ..base import BaseVecDB, Result
 from .document_storage import DocumentStorage
 from .embedding_storage import EmbeddingStorage
 
+if TYPE_CHECKING:
+    from astrbot.core.knowledge_base.embedding_cache import EmbeddingCache
+
 
 class FaissVecDB(BaseVecDB):
     """A class to represent a vector database."""
@@ -20,6 +24,7 @@ class FaissVecDB(BaseVecDB):
         index_store_path: str,
         embedding_provider: EmbeddingProvider,
         rerank_provider: RerankProvider | None = None,
+        embedding_cache: "EmbeddingCache | None" = None,
     ) -> None:
         self.doc_store_path = doc_store_path
         self.index_store_path = index_store_path
@@ -31,6 +36,7 @@ class FaissVecDB(BaseVecDB):
         )
         self.embedding_provider = embedding_provider
         self.rerank_provider = rerank_provider
+        self.embedding_cache = embedding_cache
 
     async def initialize(self) -> None:
         await self.document_storage.initialize()
@@ -45,7 +51,9 @@ class FaissVecDB(BaseVecDB):
         metadata = metadata or {}
         str_id = id or str(uuid.uuid4())  # 使用 UUID 作为原始 ID
 
-        vector = await self.embedding_provider.get_embedding(content)
+        vector = (
+            await self.embedding_provider.get_embeddings_batch([content], max_retries=1)
+        )[0]
         vector = np.array(vector, dtype=np.float32)
 
         # 使用 DocumentStorage 的方法插入文档
@@ -55,6 +63,78 @@ class FaissVecDB(BaseVecDB):
         await self.embedding_storage.insert(vector, int_id)
         return int_id
 
+    async def embed_batch(
+        self,
+        contents: list[str],
+        batch_size: int = 32,
+        tasks_limit: int = 3,
+        max_retries: int = 3,
+        progress_callback=None,
+    ) -> list[list[float]]:
+        """为文本生成向量但不写入存储，返回的向量与 contents 一一对应。
+
+        配置了 embedding_cache 时，先从缓存读取，仅为未命中的文本调用 Embedding Provider。
+
+        Args:
+            progress_callback: 进度回调函数，接收参数 (current, total)
+
+        """
+        cached: list[list[float] | None] = [None] * len(contents)
+        if self.embedding_cache:
+            try:
+                cached = await self.embedding_cache.get_many(
+                    self.embedding_provider, contents
+                )
+            except Exception as e:
+                logger.warning(f"读取向量缓存失败，将重新生成全部向量: {e}")
+
+        # 未命中缓存的文本去重后再生成向量
+        misses = list(
+            dict.fromkeys(c for c, v in zip(contents, cached) if v is None),
+        )
+        hit_count = len(contents) - sum(v is None for v in cached)
+        if progress_callback and hit_count:
+            await progress_callback(hit_count, len(contents))
+
+        embedded: dict[str, list[float]] = {}
+        if misses:
+
+            async def on_progress(current, total) -> None:
+                if progress_callback:
+                    await progress_callback(
+                        min(hit_count + current, len(contents)), len(contents)
+                    )
+
+            start = time.time()
+            logger.debug(
+                f"Generating embeddings for {len(misses)} contents "
+                f"({hit_count} cached)...",
+            )
+            vectors = await self.embedding_provider.get_embeddings_batch(
+                misses,
+                batch_size=batch_size,
+                tasks_limit=tasks_limit,
+                max_retries=max_retries,
+                progress_callback=on_progress,
+            )
+            end = time.time()
+            logger.debug(
+                f"Generated embeddings for {len(misses)} contents in {end - start:.2f} seconds.",
+            )
+            embedded = dict(zip(misses, vectors))
+            if self.embedding_cache:
+                try:
+                    await self.embedding_cache.put_many(
+                        self.embedding_provider, misses, vectors
+                    )
+                except Exception as e:
+                    logger.warning(f"写入向量缓存失败: {e}")
+
+        return [
+            vector if vector is not None else embedded[content]
+            for content, vector in zip(contents, cached)
+        ]
+
     async def insert_batch(
         self,
         contents: list[str],
@@ -64,29 +144,26 @@ class FaissVecDB(BaseVecDB):
         tasks_limit: int = 3,
         max_retries: int = 3,
         progress_callback=None,
+        vectors: list[list[float]] | None = None,
     ) -> list[int]:
         """批量插入文本和其对应向量，自动生成 ID 并保持一致性。
 
         Args:
             progress_callback: 进度回调函数，接收参数 (current, total)
+            vectors: 预先通过 embed_batch 生成的向量，提供时不再重新生成
 
         """
         metadatas = metadatas or [{} for _ in contents]
         ids = ids or [str(uuid.uuid4()) for _ in contents]
 
-        start = time.time()
-        logger.debug(f"Generating embeddings for {len(contents)} contents...")
-        vectors = await self.embedding_provider.get_embeddings_batch(
-            contents,
-            batch_size=batch_size,
-            tasks_limit=tasks_limit,
-            max_retries=max_retries,
-            progress_callback=progress_callback,
-        )
-        end = time.time()
-        logger.debug(
-            f"Generated embeddings for {len(contents)} contents in {end - start:.2f} seconds.",
-        )
+        if vectors is None:
+            vectors = await self.embed_batch(
+                contents,
+                batch_size=batch_size,
+                tasks_limit=tasks_limit,
+                max_retries=max_retries,
+                progress_callback=progress_callback,
+            )
 
         # 使用 DocumentStorage 的批量插入方法
         int_ids = await self.document_storage.insert_documents_batch(
@@ -100,6 +177,40 @@ class FaissVecDB(BaseVecDB):
         await self.embedding_storage.insert_batch(vectors_array, int_ids)
         return int_ids
 
+    async def apply_changes(
+        self,
+        delete_ids: list[int],
+        contents: list[str],
+        metadatas: list[dict],
+        vectors: list[list[float]],
+        metadata_updates: dict[int, dict] | None = None,
+    ) -> list[int]:
+        """在一次变更中删除、插入文本块并更新其元数据。
+
+        文档存储在单个事务中完成全部修改，FAISS 索引只变更并写入一次。
+
+        Args:
+            delete_ids: 要删除的文本块的 int ID
+            contents: 要插入的文本块
+            metadatas: 要插入的文本块的元数据
+            vectors: 要插入的文本块的向量
+            metadata_updates: 需要更新元数据的已有文本块，键为 int ID
+
+        Returns:
+            新插入文本块的 int ID
+
+        """
+        int_ids = await self.document_storage.apply_changes(
+            delete_ids,
+            [str(uuid.uuid4()) for _ in contents],
+            contents,
+            metadatas,
+            metadata_updates,
+        )
+        vectors_array = np.array(vectors).astype("float32") if vectors else None
+        await self.embedding_storage.apply_changes(delete_ids, vectors_array, int_ids)
+        return int_ids
+
     async def retrieve(
         self,
         query: str,
@@ -121,7 +232,10 @@ class FaissVecDB(BaseVecDB):
             List[Result]: 查询结果
 
         """
-        embedding = await self.embedding_provider.get_embedding(query)
+        # 与知识库导入共享同一份并发额度与速率预算
+        embedding = (
+            await self.embedding_provider.get_embeddings_batch([query], max_retries=1)
+        )[0]
         scores, indices = await self.embedding_storage.search(
             vector=np.array([embedding]).astype("float32"),
             k=fetch_k if metadata_filters else k,
@@ -152,11 +266,10 @@ class FaissVecDB(BaseVecDB):
 
         if rerank and self.rerank_provider:
             documents = [doc.data["text"] for doc in top_k_results]
-            reranked_results = await self.rerank_provider.rerank(query, documents)
-            reranked_results = sorted(
-                reranked_results,
-                key=lambda x: x.relevance_score,
-                reverse=True,
+            reranked_results = await self.rerank_provider.rerank_with_cache(
+                query,
+                documents,
+                chunk_ids=[doc.data["doc_id"] for doc in top_k_results],
             )
             top_k_results = [
                 top_k_results[reranked_result.index]
@@ -12,6 +12,7 @@ from astrbot.core import LogBroker, logger
 from astrbot.core.core_lifecycle import AstrBotCoreLifecycle
 from astrbot.core.db import BaseDatabase
 from astrbot.dashboard.server import AstrBotDashboard
+from astrbot.utils import startup_profiler
 
 
 class InitialLoader:
@@ -24,6 +25,7 @@ class InitialLoader:
         self.webui_dir: str | None = None
 
     async def start(self) -> None:
+        startup_profiler.checkpoint("启动前准备")
         core_lifecycle = AstrBotCoreLifecycle(self.log_broker, self.db)
 
         try:
@@ -43,6 +45,8 @@ class InitialLoader:
             core_lifecycle.dashboard_shutdown_event,
             webui_dir,
         )
+        startup_profiler.checkpoint("管理面板")
+        startup_profiler.report()
 
         coro = self.dashboard_server.run()
         if coro:
@@ -1,9 +1,11 @@
 """文档分块模块"""
 
 from .base import BaseChunker
+from .content_defined import ContentDefinedChunker
 from .fixed_size import FixedSizeChunker
 
 __all__ = [
     "BaseChunker",
+    "ContentDefinedChunker",
     "FixedSizeChunker",
 ]
@@ -23,3 +23,12 @@ class BaseChunker(ABC):
             list[str]: 分块后的文本列表
 
         """
+
+    def worker_spec(self) -> dict | None:
+        """描述分块器，供文档解析进程池在工作进程中还原
+
+        工作进程不导入 ``astrbot.core``，只能执行
+        :func:`astrbot.utils.document_worker.chunk_text` 支持的分块器。
+        返回 ``None`` 时在主进程中调用 :meth:`chunk`。
+        """
+        return None
@@ -0,0 +1,56 @@
+"""内容定义分块器
+
+按内容而不是位置决定分段边界：逐行计算哈希，在哈希满足条件的行尾切分出段落，
+再交给内部分块器分块。文档局部修改只会影响修改处所在的一两个分段，其余分段切出的
+文本块与修改前完全相同，更新文档时据此按文本块哈希比对，只需处理变化的文本块。
+"""
+
+from astrbot.utils.document_worker import split_segments
+
+from .base import BaseChunker
+from .recursive import RecursiveCharacterChunker
+
+
+class ContentDefinedChunker(BaseChunker):
+    """在内容定义的分段边界上分段，再由内部分块器分块"""
+
+    ANCHOR_MODULUS = 8
+    """行哈希对该值取模为 0 的行尾可作为分段边界"""
+    MIN_SEGMENT_CHUNKS = 4
+    """分段至少包含 chunk_size 的倍数，避免产生过多短文本块"""
+    MAX_SEGMENT_CHUNKS = 64
+    """分段超过 chunk_size 的该倍数时强制切分"""
+
+    def __init__(self, inner: BaseChunker | None = None, chunk_size: int = 500) -> None:
+        self.inner = inner or RecursiveCharacterChunker(chunk_size=chunk_size)
+        self.chunk_size = chunk_size
+
+    def split_segments(self, text: str, chunk_size: int | None = None) -> list[str]:
+        """按内容定义的边界把文本切分为分段，分段直接拼接即为原文"""
+        chunk_size = chunk_size or self.chunk_size
+        return split_segments(
+            text,
+            chunk_size,
+            self.ANCHOR_MODULUS,
+            chunk_size * self.MIN_SEGMENT_CHUNKS,
+            chunk_size * self.MAX_SEGMENT_CHUNKS,
+        )
+
+    async def chunk(self, text: str, **kwargs) -> list[str]:
+        chunk_size = kwargs.get("chunk_size", self.chunk_size)
+        chunks = []
+        for segment in self.split_segments(text, chunk_size):
+            chunks.extend(await self.inner.chunk(segment, **kwargs))
+        return chunks
+
+    def worker_spec(self) -> dict | None:
+        inner = self.inner.worker_spec()
+        if inner is None:
+            return None
+        return {
+            "kind": "content_defined",
+            "inner": inner,
+            "anchor_modulus": self.ANCHOR_MODULUS,
+            "min_segment_chunks": self.MIN_SEGMENT_CHUNKS,
+            "max_segment_chunks": self.MAX_SEGMENT_CHUNKS,
+        }
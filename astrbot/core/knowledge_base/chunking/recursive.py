@@ -1,5 +1,7 @@
 from collections.abc import Callable
 
+from astrbot.utils.document_worker import split_recursive
+
 from .base import BaseChunker
 
 
@@ -51,119 +53,13 @@ class RecursiveCharacterChunker(BaseChunker):
             分割后的文本块列表
 
         """
-        if not text:
-            return []
-
         overlap = kwargs.get("chunk_overlap", self.chunk_overlap)
         chunk_size = kwargs.get("chunk_size", self.chunk_size)
-
-        text_length = self.length_function(text)
-        if text_length <= chunk_size:
-            return [text]
-
-        for separator in self.separators:
-            if separator == "":
-                return self._split_by_character(text, chunk_size, overlap)
-
-            if separator in text:
-                splits = text.split(separator)
-                # 重新添加分隔符（除了最后一个片段）
-                splits = [s + separator for s in splits[:-1]] + [splits[-1]]
-                splits = [s for s in splits if s]
-                if len(splits) == 1:
-                    continue
-
-                # 递归合并分割后的文本块
-                final_chunks = []
-                current_chunk = []
-                current_chunk_length = 0
-
-                for split in splits:
-                    split_length = self.length_function(split)
-
-                    # 如果单个分割部分已经超过了chunk_size，需要递归分割
-                    if split_length > chunk_size:
-                        # 先处理当前积累的块
-                        if current_chunk:
-                            combined_text = "".join(current_chunk)
-                            final_chunks.extend(
-                                await self.chunk(
-                                    combined_text,
-                                    chunk_size=chunk_size,
-                                    chunk_overlap=overlap,
-                                ),
-                            )
-                            current_chunk = []
-                            current_chunk_length = 0
-
-                        # 递归分割过大的部分
-                        final_chunks.extend(
-                            await self.chunk(
-                                split,
-                                chunk_size=chunk_size,
-                                chunk_overlap=overlap,
-                            ),
-                        )
-                    # 如果添加这部分会使当前块超过chunk_size
-                    elif current_chunk_length + split_length > chunk_size:
-                        # 合并当前块并添加到结果中
-                        combined_text = "".join(current_chunk)
-                        final_chunks.append(combined_text)
-
-                        # 处理重叠部分
-                        overlap_start = max(0, len(combined_text) - overlap)
-                        if overlap_start > 0:
-                            overlap_text = combined_text[overlap_start:]
-                            current_chunk = [overlap_text, split]
-                            current_chunk_length = (
-                                self.length_function(overlap_text) + split_length
-                            )
-                        else:
-                            current_chunk = [split]
-                            current_chunk_length = split_length
-                    else:
-                        # 添加到当前块
-                        current_chunk.append(split)
-                        current_chunk_length += split_length
-
-                # 处理剩余的块
-                if current_chunk:
-                    final_chunks.append("".join(current_chunk))
-
-                return final_chunks
-
-        return [text]
-
-    def _split_by_character(
-        self,
-        text: str,
-        chunk_size: int | None = None,
-        overlap: int | None = None,
-    ) -> list[str]:
-        """按字符级别分割文本
-
-        Args:
-            text: 要分割的文本
-
-        Returns:
-            分割后的文本块列表
-
-        """
-        if chunk_size is None:
-            chunk_size = self.chunk_size
-        if overlap is None:
-            overlap = self.chunk_overlap
-        if chunk_size <= 0:
-            raise ValueError("chunk_size must be greater than 0")
-        if overlap < 0:
-            raise ValueError("chunk_overlap must be non-negative")
-        if overlap >= chunk_size:
-            raise ValueError("chunk_overlap must be less than chunk_size")
-        result = []
-        for i in range(0, len(text), chunk_size - overlap):
-            end = min(i + chunk_size, len(text))
-            result.append(text[i:end])
-            if end == len(text):
-                break
-
-        return result
+        return split_recursive(
+            text, chunk_size, overlap, self.separators, self.length_function
+        )
+
+    def worker_spec(self) -> dict | None:
+        if self.length_function is not len:
+            return None
+        return {"kind": "recursive", "separators": self.separators}
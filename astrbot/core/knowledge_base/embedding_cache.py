@@ -0,0 +1,166 @@
+"""知识库向量缓存
+
+以 (Embedding Provider ID, 模型, 维度, 文本哈希) 为键，把文本向量持久化在知识库
+元数据库 ``kb.db`` 中，由所有知识库共享。重新上传稍作修改的文档、刷新 URL 来源
+或把同一文件导入多个知识库时，未变化的文本块直接复用已有向量，不再调用
+Embedding Provider。
+
+缓存条目数超过上限时按最近使用时间淘汰（LRU）。命中率统计保存在内存中，
+自进程启动起累计，在 WebUI 知识库详情页展示。
+"""
+
+import hashlib
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+from sqlalchemy import delete, func, literal_column, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import col
+
+from astrbot.core import logger
+from astrbot.core.provider.provider import EmbeddingProvider
+
+from .models import KBEmbeddingCache
+
+if TYPE_CHECKING:
+    from .kb_db_sqlite import KBSQLiteDatabase
+
+DEFAULT_MAX_ENTRIES = 50_000
+# SQLite 参数上限为 999，分片查询避免超限
+_QUERY_CHUNK_SIZE = 900
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """持久化的文本向量缓存，带 LRU 容量上限与命中率统计。"""
+
+    def __init__(
+        self,
+        kb_db: "KBSQLiteDatabase",
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.kb_db = kb_db
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def namespace(provider: EmbeddingProvider) -> tuple[str, str, int]:
+        """返回缓存键中与 Provider 相关的部分 (provider_id, model, dim)"""
+        config = provider.provider_config
+        model = config.get("embedding_model") or provider.get_model()
+        return config.get("id", ""), model or "", provider.get_dim()
+
+    async def get_many(
+        self,
+        provider: EmbeddingProvider,
+        contents: list[str],
+    ) -> list[list[float] | None]:
+        """查询缓存，返回与 contents 一一对应的向量，未命中的位置为 None。"""
+        if not contents:
+            return []
+        provider_id, model, dim = self.namespace(provider)
+        hashes = [content_hash(c) for c in contents]
+        unique_hashes = list(dict.fromkeys(hashes))
+        found: dict[str, list[float]] = {}
+
+        async with self.kb_db.get_db() as session, session.begin():
+            for i in range(0, len(unique_hashes), _QUERY_CHUNK_SIZE):
+                chunk = unique_hashes[i : i + _QUERY_CHUNK_SIZE]
+                where = (
+                    col(KBEmbeddingCache.provider_id) == provider_id,
+                    col(KBEmbeddingCache.model) == model,
+                    col(KBEmbeddingCache.dim) == dim,
+                    col(KBEmbeddingCache.content_hash).in_(chunk),
+                )
+                result = await session.execute(
+                    select(
+                        col(KBEmbeddingCache.content_hash),
+                        col(KBEmbeddingCache.vector),
+                    ).where(*where),
+                )
+                rows = result.all()
+                if not rows:
+                    continue
+                for hash_, vector in rows:
+                    found[hash_] = np.frombuffer(vector, dtype=np.float32).tolist()
+                await session.execute(
+                    update(KBEmbeddingCache)
+                    .where(*where[:3])
+                    .where(col(KBEmbeddingCache.content_hash).in_([r[0] for r in rows]))
+                    .values(last_used_at=time.time()),
+                )
+
+        vectors = [found.get(h) for h in hashes]
+        hit_count = sum(v is not None for v in vectors)
+        self.hits += hit_count
+        self.misses += len(vectors) - hit_count
+        return vectors
+
+    async def put_many(
+        self,
+        provider: EmbeddingProvider,
+        contents: list[str],
+        vectors: list[list[float]],
+    ) -> None:
+        """写入缓存，并在超出容量时淘汰最久未使用的条目。"""
+        if not contents:
+            return
+        provider_id, model, dim = self.namespace(provider)
+        now = time.time()
+        rows: dict[str, dict] = {}
+        for content, vector in zip(contents, vectors):
+            hash_ = content_hash(content)
+            rows[hash_] = {
+                "provider_id": provider_id,
+                "model": model,
+                "dim": dim,
+                "content_hash": hash_,
+                "vector": np.asarray(vector, dtype=np.float32).tobytes(),
+                "last_used_at": now,
+            }
+        stmt = sqlite_insert(KBEmbeddingCache)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["provider_id", "model", "dim", "content_hash"],
+            set_={
+                "vector": stmt.excluded.vector,
+                "last_used_at": stmt.excluded.last_used_at,
+            },
+        )
+        async with self.kb_db.get_db() as session, session.begin():
+            await session.execute(stmt, list(rows.values()))
+            await self._evict(session)
+
+    async def _evict(self, session) -> None:
+        count = await session.scalar(select(func.count()).select_from(KBEmbeddingCache))
+        excess = (count or 0) - self.max_entries
+        if excess <= 0:
+            return
+        rowid = literal_column("rowid")
+        oldest = (
+            select(rowid)
+            .select_from(KBEmbeddingCache)
+            .order_by(col(KBEmbeddingCache.last_used_at))
+            .limit(excess)
+        )
+        await session.execute(delete(KBEmbeddingCache).where(rowid.in_(oldest)))
+        logger.debug(f"向量缓存超出上限，已淘汰 {excess} 条最久未使用的条目")
+
+    async def stats(self) -> dict:
+        """返回缓存统计信息"""
+        async with self.kb_db.get_db() as session:
+            entries = await session.scalar(
+                select(func.count()).select_from(KBEmbeddingCache),
+            )
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries or 0,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,194 @@
+"""文档解析与分块进程池
+
+解析 PDF、Office 文档以及递归分块都是 CPU 密集型操作，在事件循环中直接执行时，
+上传一份几百页的文档会让机器人在此期间无法回复消息。:class:`DocumentIngestionPool`
+把这些工作交给一个有界的进程池，并以 :class:`IngestionBatch` 的形式流式交回结果：
+
+- PDF 按页分批解析，每批解析完成后立即分块交回，调用方可以在后续页面仍在解析时
+  就开始为已产出的文本块生成向量；
+- 其他格式整体解析后分块；
+- 相邻批次之间保留最后一个文本块，与下一批文本一起重新分块，避免在批次边界处
+  产生过短的文本块。
+
+工作进程以 spawn 方式启动，避免在多线程的主进程中 fork。工作进程只执行
+:mod:`astrbot.utils.document_worker` 中的函数，不导入 ``astrbot.core``，日志只在主进程记录。
+"""
+
+import asyncio
+import multiprocessing
+import os
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any
+
+from astrbot.core import logger
+from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
+from astrbot.core.utils.temp_file_registry import remove_temp_file
+from astrbot.utils.document_worker import (
+    chunk_text,
+    parse_document,
+    parse_pdf_pages,
+    pdf_page_count,
+)
+
+from .chunking.base import BaseChunker
+from .parsers.base import MediaItem, ParseResult
+
+DEFAULT_MAX_WORKERS = 2
+PDF_PAGES_PER_BATCH = 16
+
+
+@dataclass
+class IngestionBatch:
+    """一批解析并分块完成的内容"""
+
+    chunks: list[str]
+    media: list[MediaItem] = field(default_factory=list)
+    parsed: int = 1
+    """截至本批已解析的单位数，PDF 为页数，其他格式为 1"""
+    total: int = 1
+
+
+def _to_parse_result(result: tuple[str, list]) -> ParseResult:
+    text, media = result
+    return ParseResult(text=text, media=[MediaItem(*item) for item in media])
+
+
+def _write_file(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+class DocumentIngestionPool:
+    """在有界进程池中解析并分块文档，流式交回文本块。"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """在进程池中执行，进程池不可用时退化为在线程中执行。"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool as e:
+            logger.warning(f"文档解析进程池不可用，改为在线程中执行: {e}")
+            self.shutdown()
+            return await asyncio.to_thread(fn, *args)
+
+    async def _chunk(
+        self, chunker: BaseChunker, text: str, chunk_size: int, chunk_overlap: int
+    ) -> list[str]:
+        spec = chunker.worker_spec()
+        if spec is None:
+            # 工作进程无法还原的分块器仍在主进程中执行
+            return await chunker.chunk(
+                text, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            )
+        return await self._run(chunk_text, spec, text, chunk_size, chunk_overlap)
+
+    async def _iter_pdf(self, path: str) -> AsyncIterator[tuple[int, int, ParseResult]]:
+        total = await self._run(pdf_page_count, path)
+        if total == 0:
+            yield 0, 0, ParseResult(text="", media=[])
+            return
+        page_ranges = iter(
+            (start, min(start + PDF_PAGES_PER_BATCH, total))
+            for start in range(0, total, PDF_PAGES_PER_BATCH)
+        )
+        pending: deque[tuple[int, asyncio.Future]] = deque()
+
+        def submit_next() -> None:
+            page_range = next(page_ranges, None)
+            if page_range is not None:
+                future = asyncio.ensure_future(
+                    self._run(parse_pdf_pages, path, *page_range)
+                )
+                pending.append((page_range[1], future))
+
+        # 预先提交与工作进程数相同的批次，按页序交回结果
+        for _ in range(self.max_workers):
+            submit_next()
+        try:
+            while pending:
+                end, future = pending.popleft()
+                result = await future
+                submit_next()
+                yield end, total, _to_parse_result(result)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    async def _iter_document(
+        self, path: str, file_name: str, file_type: str
+    ) -> AsyncIterator[tuple[int, int, ParseResult]]:
+        result = await self._run(parse_document, path, file_name, file_type)
+        yield 1, 1, _to_parse_result(result)
+
+    async def iter_chunks(
+        self,
+        file_content: bytes,
+        file_name: str,
+        file_type: str,
+        chunker: BaseChunker,
+        chunk_size: int = 512,
+        chunk_overlap: int = 50,
+    ) -> AsyncIterator[IngestionBatch]:
+        """解析并分块文档，每完成一批就交回。
+
+        Args:
+            file_content: 文件内容
+            file_name: 文件名
+            file_type: 文件扩展名（不含点）
+            chunker: 分块器
+            chunk_size: 文本块大小
+            chunk_overlap: 文本块重叠大小
+
+        """
+        # 文件只写入一次，工作进程按路径读取，避免每个批次都序列化整份文件
+        path = os.path.join(
+            get_astrbot_temp_path(), f"kb_ingest_{uuid.uuid4().hex}.{file_type}"
+        )
+        await asyncio.to_thread(_write_file, path, file_content)
+        try:
+            if file_type == "pdf":
+                results = self._iter_pdf(path)
+            else:
+                results = self._iter_document(path, file_name, file_type)
+            carry = ""
+            async for parsed, total, result in results:
+                text = "\n\n".join(t for t in (carry, result.text) if t)
+                chunks = []
+                if text:
+                    chunks = await self._chunk(chunker, text, chunk_size, chunk_overlap)
+                # 最后一个文本块可能在批次边界处被截断，留到下一批一起分块
+                carry = chunks.pop() if parsed < total and chunks else ""
+                yield IngestionBatch(
+                    chunks=chunks, media=result.media, parsed=parsed, total=total
+                )
+        finally:
+            try:
+                remove_temp_file(path)
+            except OSError:
+                pass
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+document_ingestion_pool = DocumentIngestionPool()
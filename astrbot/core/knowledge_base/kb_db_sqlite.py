@@ -7,6 +7,7 @@ from sqlmodel import col, desc
 
 from astrbot.core import logger
 from astrbot.core.db.vec_db.faiss_impl import FaissVecDB
+from astrbot.core.knowledge_base.embedding_cache import EmbeddingCache
 from astrbot.core.knowledge_base.models import (
     BaseKBModel,
     KBDocument,
@@ -48,6 +49,9 @@ class KBSQLiteDatabase:
             expire_on_commit=False,
         )
 
+        # 所有知识库共享的向量缓存
+        self.embedding_cache = EmbeddingCache(self)
+
     @asynccontextmanager
     async def get_db(self):
         """获取数据库会话
@@ -1,15 +1,18 @@
 import asyncio
 import json
 import re
-import time
 import uuid
+from datetime import datetime, timezone
 from pathlib import Path
 
 import aiofiles
+from sqlalchemy import delete
+from sqlmodel import col
 
 from astrbot.core import logger
 from astrbot.core.db.vec_db.base import BaseVecDB
 from astrbot.core.db.vec_db.faiss_impl.vec_db import FaissVecDB
+from astrbot.core.provider.embedding_batching import RateBudget
 from astrbot.core.provider.manager import ProviderManager
 from astrbot.core.provider.provider import (
     EmbeddingProvider,
@@ -21,41 +24,18 @@ from astrbot.core.provider.provider import (
 
 from .chunking.base import BaseChunker
 from .chunking.recursive import RecursiveCharacterChunker
+from .embedding_cache import content_hash
+from .ingestion import document_ingestion_pool
 from .kb_db_sqlite import KBSQLiteDatabase
 from .models import KBDocument, KBMedia, KnowledgeBase
 from .parsers.url_parser import extract_text_from_url
-from .parsers.util import select_parser
 from .prompts import TEXT_REPAIR_SYSTEM_PROMPT
 
 
-class RateLimiter:
-    """一个简单的速率限制器"""
-
-    def __init__(self, max_rpm: int) -> None:
-        self.max_per_minute = max_rpm
-        self.interval = 60.0 / max_rpm if max_rpm > 0 else 0
-        self.last_call_time = 0
-
-    async def __aenter__(self):
-        if self.interval == 0:
-            return
-
-        now = time.monotonic()
-        elapsed = now - self.last_call_time
-
-        if elapsed < self.interval:
-            await asyncio.sleep(self.interval - elapsed)
-
-        self.last_call_time = time.monotonic()
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
-
-
 async def _repair_and_translate_chunk_with_retry(
     chunk: str,
     repair_llm_service: LLMProvider,
-    rate_limiter: RateLimiter,
+    rate_limiter: RateBudget,
     max_retries: int = 2,
 ) -> list[str]:
     """
@@ -169,6 +149,7 @@ class KBHelper:
             index_store_path=str(self.kb_dir / "index.faiss"),
             embedding_provider=ep,
             rerank_provider=rp,
+            embedding_cache=self.kb_db.embedding_cache,
         )
         await vec_db.initialize()
         self.vec_db = vec_db
@@ -227,8 +208,9 @@ class KBHelper:
         #     await f.write(file_content)
 
         try:
-            chunks_text = []
-            saved_media = []
+            chunks_text: list[str] = []
+            saved_media: list[KBMedia] = []
+            vectors = None
 
             if pre_chunked_text is not None:
                 # 如果提供了预分块文本，直接使用
@@ -243,39 +225,20 @@ class KBHelper:
                     )
 
                 file_size = len(file_content)
-
-                # 阶段1: 解析文档
-                if progress_callback:
-                    await progress_callback("parsing", 0, 100)
-
-                parser = await select_parser(f".{file_type}")
-                parse_result = await parser.parse(file_content, file_name)
-                text_content = parse_result.text
-                media_items = parse_result.media
-
-                if progress_callback:
-                    await progress_callback("parsing", 100, 100)
-
-                # 保存媒体文件
-                for media_item in media_items:
-                    media = await self._save_media(
-                        doc_id=doc_id,
-                        media_type=media_item.media_type,
-                        file_name=media_item.file_name,
-                        content=media_item.content,
-                        mime_type=media_item.mime_type,
-                    )
-                    saved_media.append(media)
-                    media_paths.append(Path(media.file_path))
-
-                # 阶段2: 分块
-                if progress_callback:
-                    await progress_callback("chunking", 0, 100)
-
-                chunks_text = await self.chunker.chunk(
-                    text_content,
+                vectors = await self._parse_chunk_and_embed(
+                    doc_id=doc_id,
+                    file_name=file_name,
+                    file_content=file_content,
+                    file_type=file_type,
+                    chunks_text=chunks_text,
+                    saved_media=saved_media,
+                    media_paths=media_paths,
                     chunk_size=chunk_size,
                     chunk_overlap=chunk_overlap,
+                    batch_size=batch_size,
+                    tasks_limit=tasks_limit,
+                    max_retries=max_retries,
+                    progress_callback=progress_callback,
                 )
             contents = []
             metadatas = []
@@ -289,9 +252,6 @@ class KBHelper:
                     },
                 )
 
-            if progress_callback:
-                await progress_callback("chunking", 100, 100)
-
             # 阶段3: 生成向量（带进度回调）
             async def embedding_progress_callback(current, total) -> None:
                 if progress_callback:
@@ -304,6 +264,7 @@ class KBHelper:
                 tasks_limit=tasks_limit,
                 max_retries=max_retries,
                 progress_callback=embedding_progress_callback,
+                vectors=vectors,
             )
 
             # 保存文档的元数据
@@ -346,6 +307,304 @@ class KBHelper:
 
             raise e
 
+    async def _parse_chunk_and_embed(
+        self,
+        doc_id: str,
+        file_name: str,
+        file_content: bytes,
+        file_type: str,
+        chunks_text: list[str],
+        saved_media: list[KBMedia],
+        media_paths: list[Path],
+        chunk_size: int,
+        chunk_overlap: int,
+        batch_size: int,
+        tasks_limit: int,
+        max_retries: int,
+        progress_callback=None,
+    ) -> list[list[float]]:
+        """在文档解析进程池中解析并分块，同时为已产出的文本块生成向量
+
+        文本块与保存的媒体依次追加到 chunks_text、saved_media 与 media_paths 中，
+        返回与 chunks_text 一一对应的向量。
+        """
+        chunk_queue: asyncio.Queue[list[str] | None] = asyncio.Queue()
+
+        async def embed_chunks() -> list[list[float]]:
+            vectors: list[list[float]] = []
+            while (chunks := await chunk_queue.get()) is not None:
+                embedded = len(vectors)
+
+                async def on_progress(current, total, embedded=embedded) -> None:
+                    if progress_callback:
+                        await progress_callback(
+                            "embedding", embedded + current, len(chunks_text)
+                        )
+
+                vectors.extend(
+                    await self.vec_db.embed_batch(  # type: ignore[attr-defined]
+                        chunks,
+                        batch_size=batch_size,
+                        tasks_limit=tasks_limit,
+                        max_retries=max_retries,
+                        progress_callback=on_progress,
+                    )
+                )
+            return vectors
+
+        if progress_callback:
+            await progress_callback("parsing", 0, 100)
+
+        embed_task = asyncio.create_task(embed_chunks())
+        batches = document_ingestion_pool.iter_chunks(
+            file_content,
+            file_name,
+            file_type,
+            self.chunker,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+        )
+        try:
+            async for batch in batches:
+                for media_item in batch.media:
+                    media = await self._save_media(
+                        doc_id=doc_id,
+                        media_type=media_item.media_type,
+                        file_name=media_item.file_name,
+                        content=media_item.content,
+                        mime_type=media_item.mime_type,
+                    )
+                    saved_media.append(media)
+                    media_paths.append(Path(media.file_path))
+
+                if batch.chunks:
+                    chunks_text.extend(batch.chunks)
+                    chunk_queue.put_nowait(batch.chunks)
+                if embed_task.done():
+                    # 生成向量失败时不再继续解析
+                    break
+                if progress_callback:
+                    await progress_callback("parsing", batch.parsed, batch.total)
+                    await progress_callback("chunking", batch.parsed, batch.total)
+        except BaseException:
+            embed_task.cancel()
+            raise
+        finally:
+            await batches.aclose()
+        chunk_queue.put_nowait(None)
+        return await embed_task
+
+    async def update_document(
+        self,
+        doc_id: str,
+        file_content: bytes | None = None,
+        file_type: str | None = None,
+        chunk_size: int = 512,
+        chunk_overlap: int = 50,
+        batch_size: int = 32,
+        tasks_limit: int = 3,
+        max_retries: int = 3,
+        progress_callback=None,
+        pre_chunked_text: list[str] | None = None,
+        file_name: str | None = None,
+    ) -> dict:
+        """用新内容增量更新已有文档
+
+        新内容分块后按文本块哈希与现有文本块比对：未变化的文本块原样保留（仅在位置
+        变化时更新 chunk_index），只为新增的文本块生成向量，删除与插入在文档存储的
+        一个事务与 FAISS 索引的一次变更中完成。
+
+        Args:
+            doc_id: 要更新的文档 ID
+            file_content: 新的文件内容，未提供 pre_chunked_text 时必填
+            file_type: 文件扩展名，默认沿用原文档的类型
+            pre_chunked_text: 预先分好的文本块
+            file_name: 新的文档名，默认沿用原文档名
+            progress_callback: 进度回调函数，接收参数 (stage, current, total)
+
+        Returns:
+            dict: {"document": KBDocument, "added": int, "removed": int, "unchanged": int}
+
+        """
+        await self._ensure_vec_db()
+        vec_db: FaissVecDB = self.vec_db  # type: ignore
+        doc = await self.get_document(doc_id)
+        if not doc or doc.kb_id != self.kb.kb_id:
+            raise ValueError(f"无法找到 ID 为 {doc_id} 的文档")
+        file_type = file_type or doc.file_type
+
+        saved_media: list[KBMedia] = []
+        try:
+            if pre_chunked_text is not None:
+                chunks_text = pre_chunked_text
+                file_size = sum(len(chunk) for chunk in chunks_text)
+            else:
+                if file_content is None:
+                    raise ValueError(
+                        "当未提供 pre_chunked_text 时，file_content 不能为空。"
+                    )
+                file_size = len(file_content)
+                chunks_text = []
+                if progress_callback:
+                    await progress_callback("parsing", 0, 100)
+                async for batch in document_ingestion_pool.iter_chunks(
+                    file_content,
+                    file_name or doc.doc_name,
+                    file_type,
+                    self.chunker,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                ):
+                    chunks_text.extend(batch.chunks)
+                    for media_item in batch.media:
+                        saved_media.append(
+                            await self._save_media(
+                                doc_id=doc_id,
+                                media_type=media_item.media_type,
+                                file_name=media_item.file_name,
+                                content=media_item.content,
+                                mime_type=media_item.mime_type,
+                            )
+                        )
+                    if progress_callback:
+                        await progress_callback("parsing", batch.parsed, batch.total)
+
+            if progress_callback:
+                await progress_callback("chunking", 100, 100)
+
+            # 按文本块哈希比对新旧文本块，相同内容的文本块可能出现多次
+            old_chunks = await vec_db.document_storage.get_documents(
+                metadata_filters={"kb_doc_id": doc_id},
+                offset=None,
+                limit=None,
+            )
+            old_by_hash: dict[str, list[dict]] = {}
+            for chunk in old_chunks:
+                old_by_hash.setdefault(content_hash(chunk["text"]), []).append(chunk)
+
+            added_contents: list[str] = []
+            added_metadatas: list[dict] = []
+            metadata_updates: dict[int, dict] = {}
+            for idx, chunk_text in enumerate(chunks_text):
+                matches = old_by_hash.get(content_hash(chunk_text))
+                if matches:
+                    old = matches.pop(0)
+                    metadata = json.loads(old["metadata"])
+                    if metadata.get("chunk_index") != idx:
+                        metadata["chunk_index"] = idx
+                        metadata_updates[old["id"]] = metadata
+                    continue
+                added_contents.append(chunk_text)
+                added_metadatas.append(
+                    {
+                        "kb_id": self.kb.kb_id,
+                        "kb_doc_id": doc_id,
+                        "chunk_index": idx,
+                    },
+                )
+            removed_ids = [
+                chunk["id"] for matches in old_by_hash.values() for chunk in matches
+            ]
+
+            async def embedding_progress_callback(current, total) -> None:
+                if progress_callback:
+                    await progress_callback("embedding", current, total)
+
+            vectors = await vec_db.embed_batch(
+                added_contents,
+                batch_size=batch_size,
+                tasks_limit=tasks_limit,
+                max_retries=max_retries,
+                progress_callback=embedding_progress_callback,
+            )
+            if removed_ids or added_contents or metadata_updates:
+                await vec_db.apply_changes(
+                    delete_ids=removed_ids,
+                    contents=added_contents,
+                    metadatas=added_metadatas,
+                    vectors=vectors,
+                    metadata_updates=metadata_updates,
+                )
+        except Exception as e:
+            logger.error(f"更新文档失败: {e}")
+            for media in saved_media:
+                try:
+                    Path(media.file_path).unlink(missing_ok=True)
+                except Exception as me:
+                    logger.warning(f"清理多媒体文件失败 {media.file_path}: {me}")
+            raise
+
+        # 文本块更新完成后替换文档的元数据与多媒体资源
+        old_media = await self.kb_db.list_media_by_doc(doc_id)
+        async with self.kb_db.get_db() as session:
+            async with session.begin():
+                await session.execute(
+                    delete(KBMedia).where(col(KBMedia.doc_id) == doc_id),
+                )
+                for media in saved_media:
+                    session.add(media)
+                doc.file_size = file_size
+                doc.file_type = file_type
+                doc.chunk_count = len(chunks_text)
+                doc.updated_at = datetime.now(timezone.utc)
+                if file_name:
+                    doc.doc_name = file_name
+                session.add(doc)
+            await session.refresh(doc)
+        for media in old_media:
+            try:
+                Path(media.file_path).unlink(missing_ok=True)
+            except Exception as e:
+                logger.warning(f"清理多媒体文件失败 {media.file_path}: {e}")
+
+        await self.kb_db.update_kb_stats(kb_id=self.kb.kb_id, vec_db=vec_db)
+        await self.refresh_kb()
+
+        unchanged = len(chunks_text) - len(added_contents)
+        logger.info(
+            f"文档 {doc.doc_name} 已增量更新: 新增 {len(added_contents)} 个文本块，"
+            f"删除 {len(removed_ids)} 个，保留 {unchanged} 个。"
+        )
+        return {
+            "document": doc,
+            "added": len(added_contents),
+            "removed": len(removed_ids),
+            "unchanged": unchanged,
+        }
+
+    async def update_from_url(
+        self,
+        doc_id: str,
+        url: str,
+        chunk_size: int = 512,
+        chunk_overlap: int = 50,
+        batch_size: int = 32,
+        tasks_limit: int = 3,
+        max_retries: int = 3,
+        progress_callback=None,
+        enable_cleaning: bool = False,
+        cleaning_provider_id: str | None = None,
+    ) -> dict:
+        """重新抓取 URL 并增量更新对应的文档，参数与返回值见 upload_from_url 与 update_document"""
+        _, final_chunks = await self._fetch_url_chunks(
+            url=url,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            progress_callback=progress_callback,
+            enable_cleaning=enable_cleaning,
+            cleaning_provider_id=cleaning_provider_id,
+        )
+        return await self.update_document(
+            doc_id=doc_id,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            batch_size=batch_size,
+            tasks_limit=tasks_limit,
+            max_retries=max_retries,
+            progress_callback=progress_callback,
+            pre_chunked_text=final_chunks,
+        )
+
     async def list_documents(
         self,
         offset: int = 0,
@@ -497,6 +756,39 @@ class KBHelper:
             ValueError: 如果 URL 为空或无法提取内容
             IOError: 如果网络请求失败
         """
+        file_name, final_chunks = await self._fetch_url_chunks(
+            url=url,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            progress_callback=progress_callback,
+            enable_cleaning=enable_cleaning,
+            cleaning_provider_id=cleaning_provider_id,
+        )
+
+        # 复用现有的 upload_document 方法，但传入预分块文本
+        return await self.upload_document(
+            file_name=file_name,
+            file_content=None,
+            file_type="url",  # 使用 'url' 作为特殊文件类型
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            batch_size=batch_size,
+            tasks_limit=tasks_limit,
+            max_retries=max_retries,
+            progress_callback=progress_callback,
+            pre_chunked_text=final_chunks,
+        )
+
+    async def _fetch_url_chunks(
+        self,
+        url: str,
+        chunk_size: int,
+        chunk_overlap: int,
+        progress_callback=None,
+        enable_cleaning: bool = False,
+        cleaning_provider_id: str | None = None,
+    ) -> tuple[str, list[str]]:
+        """提取 URL 内容并（可选）清洗、分块，返回 (虚拟文件名, 文本块)"""
         # 获取 Tavily API 密钥
         config = self.prov_mgr.acm.default_conf
         tavily_keys = config.get("provider_settings", {}).get(
@@ -544,19 +836,7 @@ class KBHelper:
         if not Path(file_name).suffix:
             file_name += ".url"
 
-        # 复用现有的 upload_document 方法，但传入预分块文本
-        return await self.upload_document(
-            file_name=file_name,
-            file_content=None,
-            file_type="url",  # 使用 'url' 作为特殊文件类型
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            batch_size=batch_size,
-            tasks_limit=tasks_limit,
-            max_retries=max_retries,
-            progress_callback=progress_callback,
-            pre_chunked_text=final_chunks,
-        )
+        return file_name, final_chunks
 
     async def _clean_and_rechunk_content(
         self,
@@ -609,7 +889,7 @@ class KBHelper:
             logger.info(f"初步分块完成，生成 {len(initial_chunks)} 个块用于修复。")
 
             # 并发处理所有块
-            rate_limiter = RateLimiter(repair_max_rpm)
+            rate_limiter = RateBudget(repair_max_rpm)
             tasks = [
                 _repair_and_translate_chunk_with_retry(
                     chunk, llm_provider, rate_limiter
@@ -6,7 +6,9 @@ from astrbot.core.provider.manager import ProviderManager
 from astrbot.core.utils.astrbot_path import get_astrbot_knowledge_base_path
 
 # from .chunking.fixed_size import FixedSizeChunker
+from .chunking.content_defined import ContentDefinedChunker
 from .chunking.recursive import RecursiveCharacterChunker
+from .ingestion import document_ingestion_pool
 from .kb_db_sqlite import KBSQLiteDatabase
 from .kb_helper import KBHelper
 from .models import KBDocument, KnowledgeBase
@@ -17,7 +19,7 @@ from .retrieval.sparse_retriever import SparseRetriever
 FILES_PATH = get_astrbot_knowledge_base_path()
 DB_PATH = Path(FILES_PATH) / "kb.db"
 """Knowledge Base storage root directory"""
-CHUNKER = RecursiveCharacterChunker()
+CHUNKER = ContentDefinedChunker(RecursiveCharacterChunker())
 
 
 class KnowledgeBaseManager:
@@ -285,6 +287,7 @@ class KnowledgeBaseManager:
                 logger.error(f"关闭知识库 {kb_id} 失败: {e}")
 
         self.kb_insts.clear()
+        document_ingestion_pool.shutdown()
 
         # 关闭元数据数据库
         if hasattr(self, "kb_db") and self.kb_db:
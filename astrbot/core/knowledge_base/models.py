@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlmodel import Field, MetaData, SQLModel, Text, UniqueConstraint
+from sqlmodel import Field, LargeBinary, MetaData, SQLModel, Text, UniqueConstraint
 
 
 class BaseKBModel(SQLModel, table=False):
@@ -118,3 +118,22 @@ class KBMedia(BaseKBModel, table=True):
     file_size: int = Field(nullable=False)
     mime_type: str = Field(max_length=100, nullable=False)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class KBEmbeddingCache(BaseKBModel, table=True):
+    """向量缓存表
+
+    以 (Embedding Provider ID, 模型, 维度, 文本哈希) 为键缓存文本向量，
+    所有知识库共享，重复导入相同文本时无需再次调用 Embedding Provider。
+    """
+
+    __tablename__ = "kb_embedding_cache"  # type: ignore
+
+    provider_id: str = Field(max_length=100, primary_key=True)
+    model: str = Field(max_length=255, primary_key=True)
+    dim: int = Field(primary_key=True)
+    content_hash: str = Field(max_length=64, primary_key=True)
+    vector: bytes = Field(sa_type=LargeBinary, nullable=False)
+    """float32 向量的原始字节"""
+    last_used_at: float = Field(nullable=False, index=True)
+    """最近一次写入或命中的时间戳，用于 LRU 淘汰"""
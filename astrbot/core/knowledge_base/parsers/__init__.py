@@ -1,9 +1,21 @@
 """文档解析器模块"""
 
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .base import BaseParser, MediaItem, ParseResult
-from .pdf_parser import PDFParser
 from .text_parser import TextParser
 
+if TYPE_CHECKING:
+    from .pdf_parser import PDFParser
+
+# PDF 解析依赖较重，按需导入
+_LAZY_EXPORTS = {
+    "PDFParser": ("astrbot.core.knowledge_base.parsers.pdf_parser", "PDFParser"),
+}
+
 __all__ = [
     "BaseParser",
     "MediaItem",
@@ -11,3 +23,13 @@ __all__ = [
     "ParseResult",
     "TextParser",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_path, attr_name = _LAZY_EXPORTS[name]
+    module = import_module(module_path)
+    value = getattr(module, attr_name)
+    globals()[name] = value
+    return value
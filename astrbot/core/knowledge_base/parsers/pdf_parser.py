@@ -4,6 +4,7 @@
 """
 
 import io
+from collections.abc import Iterable
 
 from pypdf import PdfReader
 
@@ -12,6 +13,7 @@ from astrbot.core.knowledge_base.parsers.base import (
     MediaItem,
     ParseResult,
 )
+from astrbot.utils.document_worker import extract_pdf_pages
 
 
 class PDFParser(BaseParser):
@@ -31,71 +33,22 @@ class PDFParser(BaseParser):
             ParseResult: 包含文本和图片的解析结果
 
         """
-        pdf_file = io.BytesIO(file_content)
-        reader = PdfReader(pdf_file)
-
-        text_parts = []
-        media_items = []
-
-        # 提取文本
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
-
-        # 提取图片
-        image_counter = 0
-        for page_num, page in enumerate(reader.pages):
-            try:
-                # 安全检查 Resources
-                if "/Resources" not in page:
-                    continue
-
-                resources = page["/Resources"]
-                if not resources or "/XObject" not in resources:  # type: ignore
-                    continue
-
-                xobjects = resources["/XObject"].get_object()  # type: ignore
-                if not xobjects:
-                    continue
-
-                for obj_name in xobjects:
-                    try:
-                        obj = xobjects[obj_name]
-
-                        if obj.get("/Subtype") != "/Image":
-                            continue
-
-                        # 提取图片数据
-                        image_data = obj.get_data()
-
-                        # 确定格式
-                        filter_type = obj.get("/Filter", "")
-                        if filter_type == "/DCTDecode":
-                            ext = "jpg"
-                            mime_type = "image/jpeg"
-                        elif filter_type == "/FlateDecode":
-                            ext = "png"
-                            mime_type = "image/png"
-                        else:
-                            ext = "png"
-                            mime_type = "image/png"
-
-                        image_counter += 1
-                        media_items.append(
-                            MediaItem(
-                                media_type="image",
-                                file_name=f"page_{page_num}_img_{image_counter}.{ext}",
-                                content=image_data,
-                                mime_type=mime_type,
-                            ),
-                        )
-                    except Exception:
-                        # 单个图片提取失败不影响整体
-                        continue
-            except Exception:
-                # 页面处理失败不影响其他页面
-                continue
-
-        full_text = "\n\n".join(text_parts)
-        return ParseResult(text=full_text, media=media_items)
+        reader = PdfReader(io.BytesIO(file_content))
+        return self.parse_pages(reader, range(len(reader.pages)))
+
+    @staticmethod
+    def parse_pages(reader: PdfReader, page_numbers: Iterable[int]) -> ParseResult:
+        """同步解析指定页的文本和图片
+
+        文档解析进程池按页分批调用此方法，以便尽早产出文本块。
+
+        Args:
+            reader: PDF 读取器
+            page_numbers: 要解析的页码（从 0 开始）
+
+        Returns:
+            ParseResult: 这些页的文本（以空行连接）和图片
+
+        """
+        text, media = extract_pdf_pages(reader, page_numbers)
+        return ParseResult(text=text, media=[MediaItem(*item) for item in media])
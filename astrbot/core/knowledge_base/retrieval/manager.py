@@ -263,10 +263,11 @@ class RetrievalManager:
         # 准备文档列表
         docs = [r.content for r in results]
 
-        # 调用 Rerank Provider
-        rerank_results = await rerank_provider.rerank(
+        # 调用 Rerank Provider，已缓存的文本块不再重复发送
+        rerank_results = await rerank_provider.rerank_with_cache(
             query=query,
             documents=docs,
+            chunk_ids=[r.chunk_id for r in results],
         )
 
         # 更新分数并重新排序
@@ -11,13 +11,17 @@ import asyncio
 import json
 import multiprocessing
 import os
+import queue
 import shutil
 import sys
 import time
+import uuid
 from datetime import datetime
 from multiprocessing import Process, Queue
 from typing import Optional, Dict, Any, List
 
+from ..ipc.bridge import QueueReader
+
 # Windows 下必须使用 spawn 方式启动子进程
 if sys.platform == "win32":
     try:
@@ -54,6 +58,9 @@ logger = LogManager.GetLogger("maibot_instance")
 # 心跳超时时间（秒）
 HEARTBEAT_TIMEOUT = 30
 
+# 进程间队列容量上限：对端消费跟不上时 put 会阻塞/失败，而不是无限堆积内存
+IPC_QUEUE_MAXSIZE = 4096
+
 
 # 先导入 model 中的类
 from .model import MaibotInstance, InstanceStatus
@@ -387,8 +394,8 @@ class MaibotInstanceManager:
                 return False
 
             # 2. 创建进程间通信队列
-            instance.input_queue = Queue()
-            instance.output_queue = Queue()
+            instance.input_queue = Queue(maxsize=IPC_QUEUE_MAXSIZE)
+            instance.output_queue = Queue(maxsize=IPC_QUEUE_MAXSIZE)
 
             # 3. 构建配置字典
             data_root = self.data_root
@@ -424,18 +431,20 @@ class MaibotInstanceManager:
             )
             instance.process.start()
             logger.info(f"子进程已启动，PID: {instance.process.pid}")
+            instance._output_reader = QueueReader(
+                instance.output_queue, name=f"maibot-ipc-out-{instance_id}"
+            ).start()
 
             # 5. 等待子进程初始化并接收初始状态
             init_timeout = 300
             start_time = time.time()
 
             while time.time() - start_time < init_timeout:
-                if instance.output_queue.empty():
-                    await asyncio.sleep(0.1)
+                msg = await instance._output_reader.get_with_timeout(1.0)
+                if msg is None:
                     continue
 
                 try:
-                    msg = instance.output_queue.get(timeout=1.0)
                     msg_type = msg.get("type", "")
                     payload = msg.get("payload", {})
 
@@ -471,14 +480,10 @@ class MaibotInstanceManager:
                                 instance.status = InstanceStatus.STARTING
                                 continue
                     elif msg_type == "log":
-                        level = payload.get("level", "info")
-                        msg_text = payload.get("message", "")
-                        if level == "error":
-                            logger.error(f"[{instance_id}] {msg_text}")
-                        elif level == "warning":
-                            logger.warning(f"[{instance_id}] {msg_text}")
-                        else:
-                            logger.info(f"[{instance_id}] {msg_text}")
+                        self._log_subprocess_record(instance_id, payload)
+                    elif msg_type == "log_batch":
+                        for record in payload.get("records", []):
+                            self._log_subprocess_record(instance_id, record)
 
                 except Exception as e:
                     logger.warning(f"解析子进程消息时出错: {e}")
@@ -497,8 +502,29 @@ class MaibotInstanceManager:
             self._cleanup_instance(instance)
             return False
 
+    @staticmethod
+    def _log_subprocess_record(instance_id: str, record: Dict[str, Any]) -> None:
+        """输出子进程启动阶段转发过来的一条日志"""
+        level = record.get("level", "info")
+        msg_text = record.get("message", "")
+        if level == "error":
+            logger.error(f"[{instance_id}] {msg_text}")
+        elif level == "warning":
+            logger.warning(f"[{instance_id}] {msg_text}")
+        else:
+            logger.info(f"[{instance_id}] {msg_text}")
+
     def _cleanup_instance(self, instance: MaibotInstance) -> None:
         """清理实例资源"""
+        if instance._output_reader:
+            instance._output_reader.stop()
+            instance._output_reader = None
+
+        for future in instance._pending_results.values():
+            if not future.done():
+                future.set_result({"success": False, "error": "实例已停止"})
+        instance._pending_results.clear()
+
         if instance.process and instance.process.is_alive():
             instance.process.terminate()
             instance.process.join(timeout=5)
@@ -632,54 +658,45 @@ class MaibotInstanceManager:
 
         while instance.status == InstanceStatus.RUNNING:
             try:
-                if instance.output_queue:
-                    if instance.output_queue.empty():
-                        await asyncio.sleep(0.05)
-                        continue
-
-                    try:
-                        msg = instance.output_queue.get_nowait()
-                    except Exception:
-                        await asyncio.sleep(0.05)
-                        continue
-
-                    msg_type = msg.get("type", "")
-                    payload = msg.get("payload", {})
+                reader = instance._output_reader
+                if reader is None:
+                    return
 
-                    if msg_type == "pong":
-                        instance.last_heartbeat = datetime.now()
-                    elif msg_type == "status":
-                        status = payload.get("status", "")
-                        if status == "stopped":
-                            logger.info(f"实例 {instance_id} 已停止")
-                            instance.status = InstanceStatus.STOPPED
-                            instance.started_at = None
-                            self._cleanup_instance(instance)
-                            return
-                    elif msg_type == "log":
-                        level = payload.get("level", "info")
-                        msg_text = payload.get("message", "")
-                        if level == "error":
-                            print(f"[{instance_id}] {msg_text}")
-                        elif level == "warning":
-                            print(f"[{instance_id}] {msg_text}")
-                        else:
-                            print(f"[{instance_id}] {msg_text}")
-                    elif msg_type == "signal":
-                        signum = payload.get("signal", "")
-                        logger.info(f"实例 {instance_id} 收到信号: {signum}")
-                    elif msg_type == "message_reply":
-                        unified_msg_origin = payload.get("unified_msg_origin", "")
-                        segments = payload.get("segments", [])
-                        processed_plain_text = payload.get("processed_plain_text", "")
-                        logger.info(f"[{instance_id}] 📩 收到 message_reply")
-                        asyncio.create_task(self._handle_instance_reply(instance_id, unified_msg_origin, segments, processed_plain_text))
-                    elif msg_type == "kb_retrieve":
-                        asyncio.create_task(self._handle_kb_retrieve(instance, payload))
-                    elif msg_type == "tool_execute":
-                        asyncio.create_task(self._handle_tool_execute(instance, payload))
-
-                await asyncio.sleep(0.05)
+                # 阻塞等待下一条消息，到达即处理，无需轮询
+                msg = await reader.get()
+                msg_type = msg.get("type", "")
+                payload = msg.get("payload", {})
+
+                if msg_type == "pong":
+                    instance.last_heartbeat = datetime.now()
+                elif msg_type == "status":
+                    status = payload.get("status", "")
+                    if status == "stopped":
+                        logger.info(f"实例 {instance_id} 已停止")
+                        instance.status = InstanceStatus.STOPPED
+                        instance.started_at = None
+                        self._cleanup_instance(instance)
+                        return
+                elif msg_type == "log":
+                    print(f"[{instance_id}] {payload.get('message', '')}")
+                elif msg_type == "log_batch":
+                    for record in payload.get("records", []):
+                        print(f"[{instance_id}] {record.get('message', '')}")
+                elif msg_type == "signal":
+                    signum = payload.get("signal", "")
+                    logger.info(f"实例 {instance_id} 收到信号: {signum}")
+                elif msg_type == "message_result":
+                    self._resolve_message_result(instance, payload)
+                elif msg_type == "message_reply":
+                    unified_msg_origin = payload.get("unified_msg_origin", "")
+                    segments = payload.get("segments", [])
+                    processed_plain_text = payload.get("processed_plain_text", "")
+                    logger.info(f"[{instance_id}] 📩 收到 message_reply")
+                    asyncio.create_task(self._handle_instance_reply(instance_id, unified_msg_origin, segments, processed_plain_text))
+                elif msg_type == "kb_retrieve":
+                    asyncio.create_task(self._handle_kb_retrieve(instance, payload))
+                elif msg_type == "tool_execute":
+                    asyncio.create_task(self._handle_tool_execute(instance, payload))
 
             except asyncio.CancelledError:
                 logger.info(f"实例 {instance_id} 消息循环已取消")
@@ -688,6 +705,23 @@ class MaibotInstanceManager:
                 logger.error(f"实例 {instance_id} 消息循环出错: {e}", exc_info=True)
                 await asyncio.sleep(1.0)
 
+    @staticmethod
+    def _resolve_message_result(instance: MaibotInstance, payload: Dict[str, Any]) -> None:
+        """按 request_id 唤醒等待中的 send_message 调用"""
+        request_id = payload.get("request_id")
+        future = instance._pending_results.get(request_id) if request_id else None
+        if future is None and not request_id and instance._pending_results:
+            # 兼容未回带 request_id 的结果：交给最早发出的请求
+            future = next(iter(instance._pending_results.values()))
+        if future is None or future.done():
+            logger.debug(f"实例 {instance.instance_id} 收到无人等待的消息结果: {request_id}")
+            return
+        future.set_result({
+            "success": payload.get("success", False),
+            "result": payload.get("result"),
+            "error": payload.get("error", ""),
+        })
+
     async def _handle_crash(self, instance_id: str, instance: MaibotInstance, exit_code: int, restart_count: int, max_restarts: int) -> None:
         """处理进程崩溃"""
         for task_name, task in [("心跳", instance._heartbeat_task), ("消息", instance._message_task)]:
@@ -1066,40 +1100,39 @@ class MaibotInstanceManager:
         if not instance.input_queue:
             raise ValueError(f"实例 {instance_id} 未初始化消息队列")
 
-        cmd = {"type": "message", "payload": {"message_data": message_data, "unified_msg_origin": unified_msg_origin}}
+        request_id = uuid.uuid4().hex
+        cmd = {
+            "type": "message",
+            "payload": {
+                "message_data": message_data,
+                "unified_msg_origin": unified_msg_origin,
+                "request_id": request_id,
+            },
+        }
 
+        # 结果由 _message_loop 收到 message_result 后按 request_id 写入
+        future = asyncio.get_running_loop().create_future()
+        instance._pending_results[request_id] = future
         try:
-            instance.input_queue.put_nowait(cmd)
-            logger.debug(f"消息已发送到实例 {instance_id}")
-        except Exception as e:
-            logger.error(f"发送消息到实例 {instance_id} 失败: {e}")
-            return {"success": False, "error": str(e)}
-
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            import multiprocessing
             try:
-                if instance.output_queue.empty():
-                    await asyncio.sleep(0.05)
-                    continue
-                msg = instance.output_queue.get(timeout=1.0)
-                msg_type = msg.get("type", "")
-                if msg_type == "message_result":
-                    payload = msg.get("payload", {})
-                    success = payload.get("success", False)
-                    result = payload.get("result")
-                    error = payload.get("error", "")
-                    logger.debug(f"实例 {instance_id} 消息处理结果: success={success}")
-                    return {"success": success, "result": result, "error": error}
-                else:
-                    continue
-            except multiprocessing.queues.Empty:
-                continue
+                instance.input_queue.put_nowait(cmd)
+                logger.debug(f"消息已发送到实例 {instance_id}")
+            except queue.Full:
+                logger.warning(f"实例 {instance_id} 输入队列已满，消息被丢弃")
+                return {"success": False, "error": "实例繁忙，输入队列已满"}
             except Exception as e:
-                logger.error(f"获取消息处理结果时出错: {e}")
+                logger.error(f"发送消息到实例 {instance_id} 失败: {e}")
                 return {"success": False, "error": str(e)}
-        logger.warning(f"等待实例 {instance_id} 消息处理结果超时")
-        return {"success": False, "error": "处理超时"}
+
+            try:
+                result = await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"等待实例 {instance_id} 消息处理结果超时")
+                return {"success": False, "error": "处理超时"}
+            logger.debug(f"实例 {instance_id} 消息处理结果: success={result.get('success')}")
+            return result
+        finally:
+            instance._pending_results.pop(request_id, None)
 
 
 _instance_manager: Optional[MaibotInstanceManager] = None
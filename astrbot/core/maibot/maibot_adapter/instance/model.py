@@ -93,6 +93,10 @@ class MaibotInstance:
         self.input_queue: Optional[Queue] = None   # 主进程 -> 子进程
         self.output_queue: Optional[Queue] = None  # 子进程 -> 主进程
         self.last_heartbeat: Optional[datetime] = None
+        # output_queue 的桥接读取器（QueueReader），消息到达即唤醒消费者
+        self._output_reader = None
+        # 等待子进程 message_result 的请求：request_id -> Future
+        self._pending_results: Dict[str, asyncio.Future] = {}
 
         # 异步任务
         self._status_monitor_task: Optional[asyncio.Task] = None
@@ -5,12 +5,14 @@ IPC 进程间通信模块
 """
 
 from .protocol import MessageType, IPCMessage
+from .bridge import QueueReader
 from .client import LocalClient
 from .server import LocalServer
 
 __all__ = [
     "MessageType",
     "IPCMessage",
+    "QueueReader",
     "LocalClient",
     "LocalServer",
 ]
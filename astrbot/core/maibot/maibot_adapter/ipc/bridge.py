@@ -0,0 +1,105 @@
+"""
+multiprocessing.Queue → asyncio 桥接
+
+用一个守护线程阻塞读取 multiprocessing.Queue，再把消息投递到事件循环里的
+asyncio.Queue。消费者直接 ``await reader.get()``，消息到达即被唤醒，不再需要
+``Queue.empty()`` + ``asyncio.sleep`` 轮询，也不会在事件循环上调用阻塞的
+``Queue.get(timeout=...)``。
+
+asyncio 侧队列有界：消费者跟不上时读线程会阻塞在投递上，不再读取底层队列，
+压力由此传回对端进程（对端 put 到有界的 multiprocessing.Queue 时会等待）。
+"""
+
+import asyncio
+import queue
+import threading
+from multiprocessing import Queue
+from typing import Any, Optional
+
+# 读线程检查停止标志的间隔（秒）；只影响关闭时的响应速度，不影响消息延迟
+_STOP_CHECK_INTERVAL = 0.5
+
+
+class QueueReader:
+    """把一个 multiprocessing.Queue 桥接为可 await 的 asyncio 队列"""
+
+    def __init__(
+        self,
+        mp_queue: Queue,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        maxsize: int = 1024,
+        name: str = "ipc-reader",
+    ):
+        """
+        Args:
+            mp_queue: 要读取的 multiprocessing.Queue
+            loop: 消息投递到的事件循环，默认为当前运行中的循环
+            maxsize: asyncio 侧缓冲上限，用于背压
+            name: 读线程名称
+        """
+        self._mp_queue = mp_queue
+        self._loop = loop or asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> "QueueReader":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止读线程。已读入 asyncio 队列但未消费的消息会被丢弃。"""
+        self._stopped.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive() and not self._stopped.is_set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                item = self._mp_queue.get(timeout=_STOP_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError, ValueError):
+                # 队列已关闭或对端进程已退出
+                break
+            if not self._deliver(item):
+                break
+
+    def _deliver(self, item: Any) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop)
+        except RuntimeError:
+            # 事件循环已关闭
+            return False
+        while not self._stopped.is_set():
+            try:
+                future.result(timeout=_STOP_CHECK_INTERVAL)
+                return True
+            except TimeoutError:
+                continue
+            except Exception:
+                return False
+        future.cancel()
+        return False
+
+    async def get(self) -> Any:
+        """等待下一条消息"""
+        return await self._queue.get()
+
+    async def get_with_timeout(self, timeout: float) -> Optional[Any]:
+        """等待下一条消息，超时返回 None"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def get_nowait(self) -> Optional[Any]:
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+
+__all__ = ["QueueReader"]
@@ -26,7 +26,10 @@ class MessageType:
     REPLY = "message_reply"                # 回复消息
     PONG = "pong"                          # 心跳响应
     KB_REQUEST = "kb_retrieve_request"     # 知识库检索请求
+    KB_RETRIEVE = "kb_retrieve"            # 知识库检索请求（KnowledgeBaseAdapter 使用）
+    TOOL_EXECUTE = "tool_execute"          # AstrBot 工具执行请求
     MESSAGE_RESULT = "message_result"      # 消息处理结果
+    LOG_BATCH = "log_batch"                # 批量日志，payload["records"] 为 LOG 载荷列表
 
 
 @dataclass
@@ -4,15 +4,42 @@ IPC 服务端（子进程侧）
 负责：
 1. 从主进程接收消息（input_queue）
 2. 向主进程发送回复（output_queue）
+3. 发往主进程的请求（工具执行等）按 request_id 关联响应
+4. 日志按批发送，避免每行日志一次跨进程传输
+
+所有跨进程 put 都由一个发送线程完成：输出队列有容量上限，主进程消费跟不上时
+put 会阻塞，不能让它阻塞子进程的事件循环或日志调用方。
 """
 
 import asyncio
+import contextvars
+import queue
+import threading
+import time
+import uuid
 from datetime import datetime
 from multiprocessing import Queue
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+from .bridge import QueueReader
 from .protocol import MessageType, IPCMessage, ReplyPayload, StatusPayload
 
+# 日志批量发送：攒满 LOG_BATCH_SIZE 条立即发送，否则最多等待 LOG_FLUSH_INTERVAL 秒
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 0.05
+# 主进程消费过慢、输出队列已满时，日志最多等待这么久，超时则丢弃并计数
+LOG_PUT_TIMEOUT = 1.0
+# 待发送的日志批次超过该数量时直接丢弃新日志，避免发送积压无限增长
+LOG_BACKLOG_LIMIT = 256
+# close() 等待发送线程发完剩余消息的最长时间（秒）
+CLOSE_DRAIN_TIMEOUT = 5.0
+
+# 当前正在处理的主进程消息的 request_id，随 asyncio 任务上下文传递，
+# 使 send_message_result() 无需改动消息处理器签名即可回带 request_id
+_current_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "maibot_ipc_request_id", default=None
+)
+
 
 class LocalServer:
     """子进程侧的 IPC 服务端"""
@@ -39,6 +66,59 @@ class LocalServer:
         self._message_handler: Optional[Callable] = None
         self._kb_result_handler: Optional[Callable] = None
 
+        # 等待主进程响应的请求：request_id -> Future
+        self._pending_requests: Dict[str, asyncio.Future] = {}
+        self._input_reader: Optional[QueueReader] = None
+
+        # 日志批量发送
+        self._log_buffer: List[Dict[str, Any]] = []
+        self._log_lock = threading.Lock()
+        self._log_event = threading.Event()
+        self._log_flusher: Optional[threading.Thread] = None
+        self._pending_log_batches = 0
+        self.dropped_logs = 0
+
+        # 发送线程：(消息, 日志条数) 按入队顺序写入输出队列，日志条数为 0 表示非日志消息
+        self._outbox: queue.SimpleQueue[Optional[tuple[Dict[str, Any], int]]] = (
+            queue.SimpleQueue()
+        )
+        self._sender: Optional[threading.Thread] = None
+        self._sender_lock = threading.Lock()
+
+    def _enqueue(self, data: Dict[str, Any], log_count: int = 0) -> None:
+        """交给发送线程，调用方不会被输出队列阻塞"""
+        with self._sender_lock:
+            if self._sender is None:
+                self._sender = threading.Thread(
+                    target=self._send_loop,
+                    name=f"maibot-ipc-send-{self.instance_id}",
+                    daemon=True,
+                )
+                self._sender.start()
+        self._outbox.put((data, log_count))
+
+    def _send_loop(self) -> None:
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                return
+            data, log_count = item
+            if not log_count:
+                self.output_queue.put(data)
+                continue
+            try:
+                self.output_queue.put(data, timeout=LOG_PUT_TIMEOUT)
+            except queue.Full:
+                self.dropped_logs += log_count
+            with self._log_lock:
+                self._pending_log_batches -= 1
+
+    def _put(self, data: Dict[str, Any]) -> None:
+        """发送一条非日志消息；先冲刷缓冲的日志以保持先后顺序"""
+        with self._log_lock:
+            self._flush_logs_locked()
+            self._enqueue(data)
+
     # ========== 发送方法 ==========
 
     def send_reply(
@@ -67,7 +147,7 @@ class LocalServer:
             payload=payload.to_dict(),
         )
 
-        self.output_queue.put(msg.to_dict())
+        self._put(msg.to_dict())
 
     def send_status(
         self,
@@ -95,7 +175,7 @@ class LocalServer:
             payload=payload.to_dict(),
         )
 
-        self.output_queue.put(msg.to_dict())
+        self._put(msg.to_dict())
 
     def send_log(self, level: str, message: str) -> None:
         """
@@ -105,16 +185,54 @@ class LocalServer:
             level: 日志级别（info, warning, error 等）
             message: 日志消息
         """
-        msg = IPCMessage(
-            type=MessageType.LOG,
-            payload={
-                "level": level,
-                "message": message,
-                "timestamp": datetime.now().isoformat(),
-            },
-        )
-
-        self.output_queue.put(msg.to_dict())
+        record = {
+            "level": level,
+            "message": message,
+            "timestamp": datetime.now().isoformat(),
+        }
+        with self._log_lock:
+            self._log_buffer.append(record)
+            full = len(self._log_buffer) >= LOG_BATCH_SIZE
+            if self._log_flusher is None:
+                self._log_flusher = threading.Thread(
+                    target=self._log_flush_loop,
+                    name=f"maibot-ipc-log-{self.instance_id}",
+                    daemon=True,
+                )
+                self._log_flusher.start()
+        if full:
+            self.flush_logs()
+        else:
+            self._log_event.set()
+
+    def _log_flush_loop(self) -> None:
+        while True:
+            self._log_event.wait()
+            self._log_event.clear()
+            time.sleep(LOG_FLUSH_INTERVAL)
+            self.flush_logs()
+
+    def flush_logs(self) -> None:
+        """把缓冲中的日志交给发送线程（单条时保持 LOG 格式，多条合并为 LOG_BATCH）"""
+        with self._log_lock:
+            self._flush_logs_locked()
+
+    def _flush_logs_locked(self) -> None:
+        if not self._log_buffer:
+            return
+        records, self._log_buffer = self._log_buffer, []
+        if self._pending_log_batches >= LOG_BACKLOG_LIMIT:
+            self.dropped_logs += len(records)
+            return
+        if len(records) == 1:
+            msg = IPCMessage(type=MessageType.LOG, payload=records[0])
+        else:
+            msg = IPCMessage(
+                type=MessageType.LOG_BATCH,
+                payload={"records": records},
+            )
+        self._pending_log_batches += 1
+        self._enqueue(msg.to_dict(), len(records))
 
     def send_pong(self) -> None:
         """发送心跳响应"""
@@ -122,7 +240,7 @@ class LocalServer:
             type=MessageType.PONG,
             payload={"instance_id": self.instance_id},
         )
-        self.output_queue.put(msg.to_dict())
+        self._put(msg.to_dict())
 
     def send_message_result(
         self,
@@ -141,6 +259,7 @@ class LocalServer:
         msg = IPCMessage(
             type=MessageType.MESSAGE_RESULT,
             payload={
+                "request_id": _current_request_id.get(),
                 "success": success,
                 "result": result,
                 "error": error,
@@ -148,7 +267,7 @@ class LocalServer:
             },
         )
 
-        self.output_queue.put(msg.to_dict())
+        self._put(msg.to_dict())
 
     def send_kb_request(self, request_id: str, query: str, **kwargs) -> None:
         """
@@ -169,7 +288,44 @@ class LocalServer:
             },
         )
 
-        self.output_queue.put(msg.to_dict())
+        self._put(msg.to_dict())
+
+    async def request(
+        self,
+        msg_type: str,
+        payload: Dict[str, Any],
+        timeout: float = 30.0,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        向主进程发送请求并等待按 request_id 关联的响应
+
+        Args:
+            msg_type: 请求类型（如 MessageType.TOOL_EXECUTE）
+            payload: 请求载荷，会自动补充 request_id
+            timeout: 超时时间（秒）
+
+        Returns:
+            响应载荷，超时返回 None
+        """
+        request_id = payload.get("request_id") or uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending_requests[request_id] = future
+        try:
+            self._put(
+                {"type": msg_type, "payload": {**payload, "request_id": request_id}}
+            )
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending_requests.pop(request_id, None)
+
+    def _resolve_request(self, payload: Dict[str, Any]) -> bool:
+        future = self._pending_requests.get(payload.get("request_id", ""))
+        if future is None or future.done():
+            return False
+        future.set_result(payload)
+        return True
 
     # ========== 接收方法 ==========
 
@@ -201,15 +357,29 @@ class LocalServer:
         Returns:
             IPCMessage 或 None
         """
+        if self._input_reader is None:
+            self._input_reader = QueueReader(
+                self.input_queue, name=f"maibot-ipc-in-{self.instance_id}"
+            ).start()
         try:
-            if self.input_queue.empty():
-                await asyncio.sleep(timeout)
-                return None
-
-            data = self.input_queue.get_nowait()
-            return IPCMessage.from_dict(data)
+            data = await self._input_reader.get_with_timeout(timeout)
         except Exception:
             return None
+        if data is None:
+            return None
+        return IPCMessage.from_dict(data)
+
+    def close(self) -> None:
+        """停止输入桥接线程，冲刷剩余日志并等待发送线程发完"""
+        if self._input_reader is not None:
+            self._input_reader.stop()
+            self._input_reader = None
+        self.flush_logs()
+        with self._sender_lock:
+            sender, self._sender = self._sender, None
+        if sender is not None:
+            self._outbox.put(None)
+            sender.join(CLOSE_DRAIN_TIMEOUT)
 
     async def process_input(self, msg: IPCMessage) -> Optional[str]:
         """
@@ -224,12 +394,17 @@ class LocalServer:
         if msg.type == MessageType.MESSAGE:
             if self._message_handler:
                 payload = msg.payload
-                result = self._message_handler(
-                    payload.get("message_data"),
-                    payload.get("unified_msg_origin"),
-                )
-                if asyncio.iscoroutine(result):
-                    asyncio.create_task(result)
+                token = _current_request_id.set(payload.get("request_id"))
+                try:
+                    result = self._message_handler(
+                        payload.get("message_data"),
+                        payload.get("unified_msg_origin"),
+                    )
+                    if asyncio.iscoroutine(result):
+                        # 任务创建时复制当前上下文，request_id 随之进入任务
+                        asyncio.create_task(result)
+                finally:
+                    _current_request_id.reset(token)
 
         elif msg.type == MessageType.PING:
             self.send_pong()
@@ -238,9 +413,12 @@ class LocalServer:
             return "stop"
 
         elif msg.type == MessageType.KB_RESULT:
-            if self._kb_result_handler:
+            if not self._resolve_request(msg.payload) and self._kb_result_handler:
                 payload = msg.payload
                 request_id = payload.get("request_id")
                 self._kb_result_handler(request_id, payload)
 
+        elif msg.type == MessageType.TOOL_EXECUTE_RESULT:
+            self._resolve_request(msg.payload)
+
         return None
@@ -240,23 +240,15 @@ async def subprocess_main_async(
         from astrbot.core.maibot.src.chat.knowledge.knowledge_base_adapter import (
             KnowledgeBaseAdapter,
             create_kb_adapter,
-            cache_kb_response,
         )
-        KnowledgeBaseAdapter.set_ipc_queues(output_queue, instance_id)
-
-        # 注册知识库结果处理器
-        ipc_server.register_kb_result_handler(cache_kb_response)
+        # 检索请求与工具请求一样经 ipc_server.request() 发出，结果按 request_id 分发
+        KnowledgeBaseAdapter.set_ipc_server(ipc_server, instance_id)
 
         # 7. 设置 ToolExecutor 的 IPC 客户端（用于调用 AstrBot 工具）
         from astrbot.core.maibot.src.plugin_system.core.tool_use import set_ipc_client
 
-        # 创建一个简单的客户端对象，包含 input_queue 和 output_queue
-        class SimpleIPCClient:
-            def __init__(self, input_q, output_q):
-                self.input_queue = input_q
-                self.output_queue = output_q
-
-        set_ipc_client(SimpleIPCClient(input_queue, output_queue))
+        # 工具请求经 output_queue 发往主进程，结果由命令循环按 request_id 分发
+        set_ipc_client(ipc_server)
         send_log("info", "[子进程] ToolExecutor IPC 客户端已设置")
 
         # 从配置中读取知识库设置
@@ -309,8 +301,8 @@ async def subprocess_main_async(
         send_log("info", "开始处理命令...")
         while running:
             try:
-                # 轮询输入队列
-                msg = await ipc_server.poll_input(timeout=0.05)
+                # 等待输入消息（由桥接线程推送，到达即唤醒）
+                msg = await ipc_server.poll_input(timeout=1.0)
                 if msg is None:
                     continue
 
@@ -344,6 +336,7 @@ async def subprocess_main_async(
 
         ipc_server.send_status("stopped", "子进程已停止")
         send_log("info", "子进程退出")
+        ipc_server.close()
 
 
 # 保持向后兼容
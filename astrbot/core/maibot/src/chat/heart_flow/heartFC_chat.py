@@ -10,6 +10,7 @@ from astrbot.core.maibot.src.common.logger import get_logger
 from astrbot.core.maibot.src.common.data_models.info_data_model import ActionPlannerInfo
 from astrbot.core.maibot.src.common.data_models.message_data_model import ReplyContentType
 from astrbot.core.maibot.src.chat.message_receive.chat_stream import ChatStream, get_chat_manager
+from astrbot.core.maibot.src.chat.message_receive.message_notifier import new_message_notifier
 from astrbot.core.maibot.src.chat.utils.prompt_builder import global_prompt_manager
 from astrbot.core.maibot.src.chat.utils.timer_calculator import Timer
 from astrbot.core.maibot.src.chat.planner_actions.planner import ActionPlanner
@@ -66,6 +67,11 @@ install(extra_lines=3)
 
 # 注释：原来的动作修改超时常量已移除，因为改为顺序执行
 
+# 空闲等待新消息通知的兜底超时（秒），超时后重新检查一次
+IDLE_WAIT_TIMEOUT = 30.0
+# 未读消息不足回复阈值时，重新判断前最多等待的时间（秒）
+PENDING_RECHECK_INTERVAL = 1.0
+
 logger = get_logger("hfc")  # Logger Name Changed
 
 
@@ -190,6 +196,12 @@ class HeartFChatting:
         )
 
     async def _loopbody(self):
+        # 自上次读取后没有新消息时阻塞等待入库通知，空闲的聊天流不查询数据库
+        if not new_message_notifier.has_new_since(self.stream_id, self.last_read_time):
+            await new_message_notifier.wait(self.stream_id, timeout=IDLE_WAIT_TIMEOUT)
+            if not new_message_notifier.has_new_since(self.stream_id, self.last_read_time):
+                return True
+
         recent_messages_list = message_api.get_messages_by_time_in_chat(
             chat_id=self.stream_id,
             start_time=self.last_read_time,
@@ -240,7 +252,8 @@ class HeartFChatting:
                 await asyncio.sleep(10)
                 return True
         else:
-            await asyncio.sleep(0.2)
+            # 未读消息数不足阈值：等下一条消息到达，或稍后重新掷一次阈值
+            await new_message_notifier.wait(self.stream_id, timeout=PENDING_RECHECK_INTERVAL)
             return True
         return True
 
@@ -480,6 +493,9 @@ class HeartFChatting:
             print(traceback.format_exc())
             await asyncio.sleep(3)
             self._loop_task = asyncio.create_task(self._main_chat_loop())
+        if self._loop_task is asyncio.current_task():
+            # 聊天循环没有重新启动，释放该聊天流的新消息通知状态
+            new_message_notifier.remove(self.stream_id)
         logger.error(f"{self.log_prefix} 结束了当前聊天循环")
 
     async def _handle_action(
@@ -6,13 +6,11 @@ AstrBot 知识库适配器
 因此通过进程间队列发送检索请求，由主进程执行检索并返回结果。
 
 IPC 通信流程：
-1. 子进程通过 output_queue 发送 kb_retrieve 请求给主进程
+1. 子进程通过 LocalServer.request() 发送 kb_retrieve 请求给主进程
 2. 主进程处理请求，调用 KnowledgeBaseManager.retrieve()
-3. 主进程通过 input_queue 发送 kb_retrieve_result 响应给子进程
+3. 主进程通过 input_queue 发送 kb_retrieve_result 响应，LocalServer 按 request_id 唤醒等待方
 """
 
-import asyncio
-import time
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 
@@ -28,31 +26,14 @@ class KBRetrievalResult:
     doc_name: str = ""    # 来源文档名称
 
 
-# 全局响应缓存：存储从主进程收到的检索结果
-# key: request_id, value: response payload
-_response_cache: Dict[str, Dict] = {}
-_response_cache_lock = asyncio.Lock()
-
-
-def cache_kb_response(request_id: str, payload: Dict) -> None:
-    """缓存知识库检索响应（由命令循环调用）
-
-    Args:
-        request_id: 请求 ID
-        payload: 响应数据
-    """
-    _response_cache[request_id] = payload
-    logger.debug(f"[KB Adapter] 缓存响应: request_id={request_id}")
-
-
 class KnowledgeBaseAdapter:
     """AstrBot 知识库适配器
 
     通过 IPC 与主进程通信，实现知识库检索功能。
     """
 
-    # 类变量：存储 IPC 队列引用
-    _output_queue = None  # 发送请求到主进程（子进程的 output_queue）
+    # 类变量：存储子进程 IPC 服务端引用（LocalServer）
+    _ipc_server = None
     _instance_id: str = "default"
 
     def __init__(
@@ -77,21 +58,21 @@ class KnowledgeBaseAdapter:
         self._enabled = True
 
     @classmethod
-    def set_ipc_queues(cls, output_queue, instance_id: str = "default"):
-        """设置 IPC 队列（由子进程入口调用）
+    def set_ipc_server(cls, ipc_server, instance_id: str = "default"):
+        """设置 IPC 服务端（由子进程入口调用）
 
         Args:
-            output_queue: 发送请求到主进程的队列（子进程的 output_queue）
+            ipc_server: 子进程侧的 LocalServer
             instance_id: 实例 ID
         """
-        cls._output_queue = output_queue
+        cls._ipc_server = ipc_server
         cls._instance_id = instance_id
-        logger.info(f"[KB Adapter] IPC 队列已设置: instance_id={instance_id}")
+        logger.info(f"[KB Adapter] IPC 服务端已设置: instance_id={instance_id}")
 
     @classmethod
     def is_available(cls) -> bool:
-        """检查适配器是否可用（IPC 队列是否已设置）"""
-        return cls._output_queue is not None
+        """检查适配器是否可用（IPC 服务端是否已设置）"""
+        return cls._ipc_server is not None
 
     async def retrieve(
         self,
@@ -114,7 +95,7 @@ class KnowledgeBaseAdapter:
             return []
 
         if not self.is_available():
-            logger.warning("[KB Adapter] IPC 队列未设置，无法检索")
+            logger.warning("[KB Adapter] IPC 服务端未设置，无法检索")
             return []
 
         # 使用参数或默认配置
@@ -126,49 +107,37 @@ class KnowledgeBaseAdapter:
             logger.debug("[KB Adapter] 未指定知识库，将请求主进程获取所有知识库")
 
         try:
-            # 发送检索请求到主进程
-            request_id = f"kb_{int(time.time() * 1000)}_{id(self)}"
-            request = {
-                "type": "kb_retrieve",
-                "payload": {
-                    "request_id": request_id,
+            logger.debug(f"[KB Adapter] 发送检索请求: query={query[:50]}..., kb_names={kb_names}")
+            # 经 IPC 服务端发送检索请求，主进程的 kb_retrieve_result 按 request_id 唤醒这里的等待
+            payload = await self._ipc_server.request(
+                "kb_retrieve",
+                {
                     "instance_id": self._instance_id,
                     "query": query,
                     "kb_names": kb_names,
                     "top_k_fusion": top_k,
                     "top_m_final": self.return_top_k,
-                }
-            }
-
-            logger.debug(f"[KB Adapter] 发送检索请求: query={query[:50]}..., kb_names={kb_names}")
-            self._output_queue.put_nowait(request)
-
-            # 等待响应（从全局缓存中获取）
-            start_time = time.time()
-            while time.time() - start_time < self.timeout:
-                # 检查缓存中是否有响应
-                if request_id in _response_cache:
-                    payload = _response_cache.pop(request_id)
-                    if payload.get("success"):
-                        results = payload.get("results", [])
-                        logger.info(f"[KB Adapter] 检索成功，返回 {len(results)} 条结果")
-                        return [
-                            KBRetrievalResult(
-                                content=r.get("content", ""),
-                                score=r.get("score", 0.0),
-                                kb_name=r.get("kb_name", ""),
-                                doc_name=r.get("doc_name", ""),
-                            )
-                            for r in results
-                        ]
-                    else:
-                        error = payload.get("error", "未知错误")
-                        logger.warning(f"[KB Adapter] 检索失败: {error}")
-                        return []
-
-                await asyncio.sleep(0.05)
-
-            logger.warning(f"[KB Adapter] 检索超时: {self.timeout}s")
+                },
+                timeout=self.timeout,
+            )
+            if payload is None:
+                logger.warning(f"[KB Adapter] 检索超时: {self.timeout}s")
+                return []
+
+            if payload.get("success"):
+                results = payload.get("results", [])
+                logger.info(f"[KB Adapter] 检索成功，返回 {len(results)} 条结果")
+                return [
+                    KBRetrievalResult(
+                        content=r.get("content", ""),
+                        score=r.get("score", 0.0),
+                        kb_name=r.get("kb_name", ""),
+                        doc_name=r.get("doc_name", ""),
+                    )
+                    for r in results
+                ]
+            error = payload.get("error", "未知错误")
+            logger.warning(f"[KB Adapter] 检索失败: {error}")
             return []
 
         except Exception as e:
@@ -239,5 +208,4 @@ __all__ = [
     "get_kb_adapter",
     "set_kb_adapter",
     "create_kb_adapter",
-    "cache_kb_response",
 ]
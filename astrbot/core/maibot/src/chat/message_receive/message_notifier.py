@@ -0,0 +1,62 @@
+"""新消息通知
+
+消息接收路径在消息入库后调用 ``notify``，聊天循环通过 ``wait`` 阻塞等待，
+替代按固定间隔查询数据库的轮询：没有新消息的聊天流不产生任何查询，
+有新消息时循环立即被唤醒。聊天循环结束时调用 ``remove`` 释放该聊天流的状态。
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class NewMessageNotifier:
+    """按聊天流分发"有新消息"通知"""
+
+    def __init__(self):
+        self._events: Dict[str, asyncio.Event] = {}
+        # 每个聊天流最近一条入库消息的时间，用于判断是否存在未读消息
+        self._last_message_time: Dict[str, float] = {}
+
+    def _get_event(self, stream_id: str) -> asyncio.Event:
+        event = self._events.get(stream_id)
+        if event is None:
+            event = self._events[stream_id] = asyncio.Event()
+        return event
+
+    def notify(self, stream_id: str, message_time: Optional[float] = None) -> None:
+        """记录聊天流收到新消息并唤醒等待方"""
+        message_time = message_time or time.time()
+        if message_time > self._last_message_time.get(stream_id, 0.0):
+            self._last_message_time[stream_id] = message_time
+        # 只唤醒已有的等待方；wait() 开始时本就会清除此前的通知
+        if (event := self._events.get(stream_id)) is not None:
+            event.set()
+
+    def has_new_since(self, stream_id: str, since: float) -> bool:
+        """聊天流在 since 之后是否收到过消息"""
+        return self._last_message_time.get(stream_id, 0.0) > since
+
+    async def wait(self, stream_id: str, timeout: Optional[float] = None) -> bool:
+        """等待聊天流的下一条新消息通知
+
+        调用时会先清除此前的通知，因此只会被之后到达的消息唤醒。
+
+        Returns:
+            是否在超时前收到通知
+        """
+        event = self._get_event(stream_id)
+        event.clear()
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def remove(self, stream_id: str) -> None:
+        """聊天循环结束后释放聊天流的通知状态"""
+        self._events.pop(stream_id, None)
+        self._last_message_time.pop(stream_id, None)
+
+
+new_message_notifier = NewMessageNotifier()
@@ -7,6 +7,7 @@ from astrbot.core.maibot.src.common.database.database_model import Messages, Ima
 from astrbot.core.maibot.src.common.logger import get_logger
 from .chat_stream import ChatStream
 from .message import MessageSending, MessageRecv
+from .message_notifier import new_message_notifier
 
 logger = get_logger("message_storage")
 
@@ -146,6 +147,8 @@ class MessageStorage:
                 astr_instance_id=getattr(message.message_info, "astr_instance_id", None),
                 astr_stream_id=getattr(message.message_info, "astr_stream_id", None),
             )
+            if isinstance(message, MessageRecv):
+                new_message_notifier.notify(chat_stream.stream_id, float(message.message_info.time))  # type: ignore
         except Exception:
             logger.exception("存储消息失败")
             logger.error(f"消息：{message}")
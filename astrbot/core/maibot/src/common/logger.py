@@ -7,11 +7,13 @@
 
 import logging
 import json
+import queue
 import threading
 import time
 import structlog
 import tomlkit
 
+from collections import deque
 from pathlib import Path
 from typing import Callable, Optional
 from datetime import datetime, timedelta
@@ -97,8 +99,31 @@ def initialize_ws_handler(loop):
         print("[日志系统] ✅ WebSocket 日志推送已启用")
 
 
+# 文件日志写入线程：待写队列上限，以及缓冲写入的刷新间隔（秒）/字节阈值
+FILE_LOG_QUEUE_MAXSIZE = 10000
+FILE_LOG_FLUSH_INTERVAL = 0.5
+FILE_LOG_FLUSH_BYTES = 64 * 1024
+# WebSocket 日志环形缓冲区大小，推送跟不上时丢弃最旧的记录
+WS_LOG_BUFFER_SIZE = 1000
+
+_CLOSE_SENTINEL = object()
+
+
+def _prepare_record(record: logging.LogRecord) -> logging.LogRecord:
+    """在调用方线程固定普通日志的消息文本，避免参数对象在写入线程格式化前被修改"""
+    if record.args and not isinstance(record.msg, dict):
+        record.msg = record.getMessage()
+        record.args = None
+    return record
+
+
 class TimestampedFileHandler(logging.Handler):
-    """基于时间戳的文件处理器，简单的轮转份数限制"""
+    """基于时间戳的文件处理器，简单的轮转份数限制
+
+    emit 只把记录放入有界队列，格式化、写入与轮转都在专用写入线程中完成；
+    文件按时间或累计字节数批量 flush，而不是每条记录 flush 一次。
+    队列满时丢弃记录并计入 dropped_records。
+    """
 
     def __init__(self, log_dir, max_bytes=5 * 1024 * 1024, backup_count=30, encoding="utf-8"):
         super().__init__()
@@ -112,19 +137,29 @@ class TimestampedFileHandler(logging.Handler):
         # 当前活跃的日志文件
         self.current_file = None
         self.current_stream = None
+        self._current_size = 0
         self._init_current_file()
 
+        self.dropped_records = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=FILE_LOG_QUEUE_MAXSIZE)
+        self._writer = threading.Thread(target=self._writer_loop, name="maibot-log-writer", daemon=True)
+        self._writer.start()
+
     def _init_current_file(self):
         """初始化当前日志文件"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.current_file = self.log_dir / f"app_{timestamp}.log.jsonl"
+        # 同一秒内再次轮转时避免重新打开已写满的文件
+        seq = 1
+        while self.current_file.exists() and self.current_file.stat().st_size >= self.max_bytes:
+            self.current_file = self.log_dir / f"app_{timestamp}_{seq}.log.jsonl"
+            seq += 1
         self.current_stream = open(self.current_file, "a", encoding=self.encoding)
+        self._current_size = self.current_file.stat().st_size
 
     def _should_rollover(self):
         """检查是否需要轮转"""
-        if self.current_file and self.current_file.exists():
-            return self.current_file.stat().st_size >= self.max_bytes
-        return False
+        return self._current_size >= self.max_bytes
 
     def _do_rollover(self):
         """执行轮转：关闭当前文件，创建新文件"""
@@ -158,24 +193,82 @@ class TimestampedFileHandler(logging.Handler):
             print(f"[日志清理] 清理过程出错: {e}")
 
     def emit(self, record):
-        """发出日志记录"""
+        """发出日志记录（仅入队，不阻塞调用方）"""
         try:
-            with self._lock:
-                # 检查是否需要轮转
-                if self._should_rollover():
-                    self._do_rollover()
-
-                # 写入日志
-                if self.current_stream:
-                    msg = self.format(record)
-                    self.current_stream.write(msg + "\n")
-                    self.current_stream.flush()
-
+            self._queue.put_nowait(_prepare_record(record))
+        except queue.Full:
+            self.dropped_records += 1
         except Exception:
             self.handleError(record)
 
+    def _writer_loop(self):
+        """写入线程：格式化并缓冲写入，按时间或字节数 flush"""
+        pending_bytes = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=FILE_LOG_FLUSH_INTERVAL)
+            except queue.Empty:
+                record = None
+
+            if record is _CLOSE_SENTINEL:
+                with self._lock:
+                    if self.current_stream:
+                        self.current_stream.flush()
+                self._queue.task_done()
+                return
+
+            with self._lock:
+                if record is not None:
+                    try:
+                        if self._should_rollover():
+                            self._do_rollover()
+                            pending_bytes = 0
+                        if self.current_stream:
+                            line = self.format(record) + "\n"
+                            self.current_stream.write(line)
+                            size = len(line.encode(self.encoding, errors="replace"))
+                            self._current_size += size
+                            pending_bytes += size
+                    except Exception:
+                        self.handleError(record)
+
+                now = time.monotonic()
+                if pending_bytes and (
+                    pending_bytes >= FILE_LOG_FLUSH_BYTES or now - last_flush >= FILE_LOG_FLUSH_INTERVAL
+                ):
+                    try:
+                        if self.current_stream:
+                            self.current_stream.flush()
+                    except Exception as e:
+                        print(f"[日志系统] 写入日志文件失败: {e}")
+                    pending_bytes = 0
+                    last_flush = now
+            if record is not None:
+                self._queue.task_done()
+
+    def flush(self):
+        """等待已入队的记录写入磁盘"""
+        deadline = time.monotonic() + 2.0
+        # 按 unfinished_tasks 等待，写入线程已取出但尚未写入的记录也要等到
+        with self._queue.all_tasks_done:
+            while self._writer.is_alive() and self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._queue.all_tasks_done.wait(remaining)
+        with self._lock:
+            if self.current_stream:
+                self.current_stream.flush()
+
     def close(self):
-        """关闭处理器"""
+        """关闭处理器：写完队列中剩余的记录后关闭文件"""
+        if self._writer.is_alive():
+            try:
+                self._queue.put(_CLOSE_SENTINEL, timeout=2.0)
+            except queue.Full:
+                pass
+            self._writer.join(timeout=5.0)
         with self._lock:
             if self.current_stream:
                 self.current_stream.close()
@@ -184,7 +277,11 @@ class TimestampedFileHandler(logging.Handler):
 
 
 class WebSocketLogHandler(logging.Handler):
-    """WebSocket 日志处理器 - 将日志实时推送到前端"""
+    """WebSocket 日志处理器 - 将日志实时推送到前端
+
+    记录先进入有界环形缓冲区，事件循环每个 tick 最多调度一次批量推送，
+    推送跟不上时丢弃最旧的记录并计入 dropped_records。
+    """
 
     _log_counter = 0  # 类级别计数器,确保 ID 唯一性
 
@@ -192,6 +289,10 @@ class WebSocketLogHandler(logging.Handler):
         super().__init__()
         self.loop = loop
         self._initialized = False
+        self._buffer: deque = deque(maxlen=WS_LOG_BUFFER_SIZE)
+        self._flush_scheduled = False
+        self._schedule_lock = threading.Lock()
+        self.dropped_records = 0
 
     def set_loop(self, loop):
         """设置事件循环"""
@@ -199,53 +300,67 @@ class WebSocketLogHandler(logging.Handler):
         self._initialized = True
 
     def emit(self, record):
-        """发送日志到 WebSocket 客户端"""
+        """把日志放入推送缓冲区"""
         if not self._initialized or self.loop is None:
             return
 
         try:
-            # 获取格式化后的消息
-            # 对于 structlog,formatted message 包含完整的日志信息
-            formatted_msg = self.format(record) if self.formatter else record.getMessage()
-
-            # 如果是 JSON 格式(文件格式化器),解析它
-            message = formatted_msg
-            try:
-                import json
-
-                log_dict = json.loads(formatted_msg)
-                message = log_dict.get("event", formatted_msg)
-            except (json.JSONDecodeError, ValueError):
-                # 不是 JSON,直接使用消息
-                message = formatted_msg
+            # structlog 记录的 msg 是事件字典，直接取 event，无需格式化后再解析 JSON
+            if isinstance(record.msg, dict):
+                message = str(record.msg.get("event", ""))
+            else:
+                message = record.getMessage()
 
             # 生成唯一 ID: 时间戳毫秒 + 自增计数器
             WebSocketLogHandler._log_counter += 1
             log_id = f"{int(record.created * 1000)}_{WebSocketLogHandler._log_counter}"
 
-            # 格式化日志数据
-            log_data = {
-                "id": log_id,
-                "timestamp": datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S"),
-                "level": record.levelname,
-                "module": record.name,
-                "message": message,
-            }
-
-            # 异步广播日志(不阻塞日志记录)
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped_records += 1
+            self._buffer.append(
+                {
+                    "id": log_id,
+                    "timestamp": datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S"),
+                    "level": record.levelname,
+                    "module": record.name,
+                    "message": message,
+                }
+            )
+
+            with self._schedule_lock:
+                if self._flush_scheduled:
+                    return
+                self._flush_scheduled = True
             try:
-                import asyncio
-                from astrbot.core.maibot.src.webui.logs_ws import broadcast_log
-
-                asyncio.run_coroutine_threadsafe(broadcast_log(log_data), self.loop)
-            except Exception:
-                # WebSocket 推送失败不影响日志记录
-                pass
+                self.loop.call_soon_threadsafe(self._flush)
+            except RuntimeError:
+                # 事件循环已关闭
+                self._flush_scheduled = False
 
         except Exception:
             # 不要让 WebSocket 错误影响日志系统
             self.handleError(record)
 
+    def _flush(self):
+        """在事件循环中取出本 tick 累积的记录并批量广播"""
+        with self._schedule_lock:
+            self._flush_scheduled = False
+        batch = []
+        while self._buffer:
+            try:
+                batch.append(self._buffer.popleft())
+            except IndexError:
+                break
+        if not batch:
+            return
+        try:
+            from astrbot.core.maibot.src.webui.logs_ws import broadcast_logs
+
+            broadcast_logs(batch)
+        except Exception:
+            # WebSocket 推送失败不影响日志记录
+            pass
+
 
 # 旧的轮转文件处理器已移除，现在使用基于时间戳的处理器
 
@@ -1,8 +1,14 @@
+import atexit
 import base64
 import io
+import queue
+import threading
+import time
 
 from PIL import Image
+from dataclasses import dataclass, asdict
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 from astrbot.core.maibot.src.common.logger import get_logger
 from astrbot.core.maibot.src.common.database.database import db  # 确保 db 被导入用于 create_tables
@@ -152,9 +158,58 @@ def compress_messages(messages: list[Message], img_target_size: int = 1 * 1024 *
     return compressed_messages
 
 
+# 后台写入线程每批最多插入的记录数，以及凑批的最长等待时间（秒）
+USAGE_BATCH_SIZE = 200
+USAGE_FLUSH_INTERVAL = 1.0
+# 待写入记录的上限，数据库持续不可用时丢弃新记录而不是无限占用内存
+USAGE_QUEUE_MAXSIZE = 10000
+# 延迟与错误率 EWMA 的平滑系数
+USAGE_EWMA_ALPHA = 0.2
+# 近期 token 用量的半衰期（秒），负载均衡按近期用量而不是累计用量比较模型
+USAGE_TOKEN_HALF_LIFE = 300.0
+
+
+@dataclass
+class ModelUsageStats:
+    """单个模型在本进程内的累计使用情况"""
+
+    model_name: str
+    request_count: int = 0
+    error_count: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    total_cost: float = 0.0
+    latency_ewma: float = 0.0
+    """成功请求耗时（秒）的指数加权移动平均"""
+    error_rate_ewma: float = 0.0
+    """最近请求失败比例的指数加权移动平均"""
+    last_used: float = 0.0
+    decayed_tokens: float = 0.0
+    """按 USAGE_TOKEN_HALF_LIFE 指数衰减的 token 用量，截至 last_used"""
+
+    def recent_tokens(self, now: float | None = None) -> float:
+        """近期 token 用量：每过一个半衰期，更早的用量权重减半"""
+        if not self.decayed_tokens:
+            return 0.0
+        elapsed = max((now or time.time()) - self.last_used, 0.0)
+        return self.decayed_tokens * 0.5 ** (elapsed / USAGE_TOKEN_HALF_LIFE)
+
+    def _update_error_rate(self, failed: bool) -> None:
+        sample = 1.0 if failed else 0.0
+        if self.request_count + self.error_count <= 1:
+            self.error_rate_ewma = sample
+        else:
+            self.error_rate_ewma += USAGE_EWMA_ALPHA * (sample - self.error_rate_ewma)
+
+
 class LLMUsageRecorder:
     """
     LLM使用情况记录器
+
+    记录先进入内存队列，由后台线程批量写入数据库，调用方不会被数据库写入阻塞；
+    同时维护进程内按模型汇总的使用统计（token、延迟 EWMA、错误率），
+    供模型负载均衡与 WebUI 实时统计直接读取。
     """
 
     def __init__(self):
@@ -165,6 +220,16 @@ class LLMUsageRecorder:
         except Exception as e:
             logger.error(f"创建 LLMUsage 表失败: {str(e)}")
 
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=USAGE_QUEUE_MAXSIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        # 保证同一时刻只有一个线程在写入（后台线程或 flush 调用方）
+        self._write_lock = threading.Lock()
+        self._stats: Dict[str, ModelUsageStats] = {}
+        self._stats_lock = threading.Lock()
+        self.dropped_records = 0
+        atexit.register(self.flush)
+
     def record_usage_to_database(
         self,
         model_info: ModelInfo,
@@ -177,31 +242,116 @@ class LLMUsageRecorder:
         input_cost = (model_usage.prompt_tokens / 1000000) * model_info.price_in
         output_cost = (model_usage.completion_tokens / 1000000) * model_info.price_out
         total_cost = round(input_cost + output_cost, 6)
+        row = {
+            "model_name": model_info.model_identifier,
+            "model_assign_name": model_info.name,
+            "model_api_provider": model_info.api_provider,
+            "user_id": user_id,
+            "request_type": request_type,
+            "endpoint": endpoint,
+            "prompt_tokens": model_usage.prompt_tokens or 0,
+            "completion_tokens": model_usage.completion_tokens or 0,
+            "total_tokens": model_usage.total_tokens or 0,
+            "cost": total_cost or 0.0,
+            "time_cost": round(time_cost or 0.0, 3),
+            "status": "success",
+            "timestamp": datetime.now(),
+        }
+        self._update_stats(row)
         try:
-            # 使用 Peewee 模型创建记录
-            LLMUsage.create(
-                model_name=model_info.model_identifier,
-                model_assign_name=model_info.name,
-                model_api_provider=model_info.api_provider,
-                user_id=user_id,
-                request_type=request_type,
-                endpoint=endpoint,
-                prompt_tokens=model_usage.prompt_tokens or 0,
-                completion_tokens=model_usage.completion_tokens or 0,
-                total_tokens=model_usage.total_tokens or 0,
-                cost=total_cost or 0.0,
-                time_cost=round(time_cost or 0.0, 3),
-                status="success",
-                timestamp=datetime.now(),  # Peewee 会处理 DateTimeField
-            )
-            logger.debug(
-                f"Token使用情况 - 模型: {model_usage.model_name}, "
-                f"用户: {user_id}, 类型: {request_type}, "
-                f"提示词: {model_usage.prompt_tokens}, 完成: {model_usage.completion_tokens}, "
-                f"总计: {model_usage.total_tokens}"
-            )
-        except Exception as e:
-            logger.error(f"记录token使用情况失败: {str(e)}")
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped_records += 1
+            logger.warning("LLM 使用记录队列已满，丢弃一条记录")
+            return
+        self._ensure_writer()
+        logger.debug(
+            f"Token使用情况 - 模型: {model_usage.model_name}, "
+            f"用户: {user_id}, 类型: {request_type}, "
+            f"提示词: {model_usage.prompt_tokens}, 完成: {model_usage.completion_tokens}, "
+            f"总计: {model_usage.total_tokens}"
+        )
+
+    def record_failure(self, model_name: str) -> None:
+        """记录一次模型请求失败（仅计入内存统计，不写数据库）"""
+        with self._stats_lock:
+            stats = self._stats.setdefault(model_name, ModelUsageStats(model_name=model_name))
+            stats.error_count += 1
+            stats._update_error_rate(failed=True)
+            now = time.time()
+            stats.decayed_tokens = stats.recent_tokens(now)
+            stats.last_used = now
+
+    def _update_stats(self, row: Dict[str, Any]) -> None:
+        name = row["model_assign_name"]
+        with self._stats_lock:
+            stats = self._stats.setdefault(name, ModelUsageStats(model_name=name))
+            stats.request_count += 1
+            stats.prompt_tokens += row["prompt_tokens"]
+            stats.completion_tokens += row["completion_tokens"]
+            stats.total_tokens += row["total_tokens"]
+            stats.total_cost += row["cost"]
+            if stats.request_count == 1:
+                stats.latency_ewma = row["time_cost"]
+            else:
+                stats.latency_ewma += USAGE_EWMA_ALPHA * (row["time_cost"] - stats.latency_ewma)
+            stats._update_error_rate(failed=False)
+            now = time.time()
+            stats.decayed_tokens = stats.recent_tokens(now) + row["total_tokens"]
+            stats.last_used = now
+
+    def get_model_stats(self, model_name: str) -> Optional[ModelUsageStats]:
+        """获取单个模型的进程内统计（只读，勿修改返回对象）"""
+        return self._stats.get(model_name)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """获取所有模型统计的副本"""
+        with self._stats_lock:
+            return [asdict(stats) for stats in self._stats.values()]
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, name="llm-usage-writer", daemon=True)
+                self._writer.start()
+
+    def _writer_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + USAGE_FLUSH_INTERVAL
+            while len(batch) < USAGE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        with self._write_lock:
+            try:
+                with db.atomic():
+                    LLMUsage.insert_many(batch).execute()
+            except Exception as e:
+                logger.error(f"记录token使用情况失败: {str(e)}")
+
+    def flush(self) -> None:
+        """把队列中尚未写入的记录立即写入数据库（同步）"""
+        batch: List[Dict[str, Any]] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= USAGE_BATCH_SIZE:
+                self._write_batch(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch)
 
 
 llm_usage_recorder = LLMUsageRecorder()
@@ -27,6 +27,11 @@ install(extra_lines=3)
 
 logger = get_logger("model_utils")
 
+# 负载均衡评分的基础负载，保证空闲模型的错误率倍数依然生效
+BALANCE_BASE_LOAD = 1000
+# 错误率为 1 时负载放大的倍数（在 1 倍基础上额外增加）
+BALANCE_ERROR_FACTOR = 9
+
 
 class RequestType(Enum):
     """请求类型枚举"""
@@ -265,6 +270,21 @@ class LLMRequest:
             raise RuntimeError("获取embedding失败")
         return embedding, model_info.name
 
+    @staticmethod
+    def _balance_score(model_name: str, scores: Tuple[int, int, int]) -> float:
+        """负载均衡评分，越小越优先
+
+        负载由近期 token 用量（按半衰期衰减）、延迟与本对象上正在进行的请求数
+        （usage_penalty）组成，错误率以倍数放大负载：持续失败的模型即使空闲也会被
+        排在健康模型之后，而不是被累计 token 用量掩盖。
+        """
+        _, penalty, usage_penalty = scores
+        load = BALANCE_BASE_LOAD + usage_penalty * 1000
+        if stats := llm_usage_recorder.get_model_stats(model_name):
+            load += stats.recent_tokens() + stats.latency_ewma * 100
+            return load * (1 + stats.error_rate_ewma * BALANCE_ERROR_FACTOR)
+        return load * (1 + penalty * BALANCE_ERROR_FACTOR)
+
     def _select_model(self, exclude_models: Optional[Set[str]] = None) -> Tuple[ModelInfo, APIProvider, BaseClient]:
         """
         根据配置的策略选择模型：balance（负载均衡）或 random（随机选择）
@@ -286,14 +306,14 @@ class LLMRequest:
             # 负载均衡策略：根据总tokens和惩罚值选择
             selected_model_name = min(
                 available_models,
-                key=lambda k: available_models[k][0] + available_models[k][1] * 300 + available_models[k][2] * 1000,
+                key=lambda k: self._balance_score(k, available_models[k]),
             )
         else:
             # 默认使用负载均衡策略
             logger.warning(f"未知的选择策略 '{strategy}'，使用默认的负载均衡策略")
             selected_model_name = min(
                 available_models,
-                key=lambda k: available_models[k][0] + available_models[k][1] * 300 + available_models[k][2] * 1000,
+                key=lambda k: self._balance_score(k, available_models[k]),
             )
         
         model_info = model_config.get_model_info(selected_model_name)
@@ -498,6 +518,7 @@ class LLMRequest:
                 logger.warning(f"模型 '{model_info.name}' 尝试失败，切换到下一个模型。原因: {e}")
                 total_tokens, penalty, usage_penalty = self.model_usage[model_info.name]
                 self.model_usage[model_info.name] = (total_tokens, penalty + 1, usage_penalty - 1)
+                llm_usage_recorder.record_failure(model_info.name)
                 failed_models_this_request.add(model_info.name)
 
                 if isinstance(last_exception, RespNotOkException) and last_exception.status_code == 400:
@@ -340,63 +340,29 @@ class ToolExecutor:
         Returns:
             工具执行结果，如果失败则返回 None
         """
-        import uuid
-        from multiprocessing import Queue
-
         # 检查是否有 IPC 客户端
         client = get_ipc_client()
         if not client:
             logger.warning(f"IPC 客户端未设置，无法执行 AstrBot 工具: {tool_name}")
             return None
 
-        request_id = str(uuid.uuid4())
-
-        # 发送工具执行请求到主进程
-        # 注意：这里我们需要使用同步的方式发送，然后等待结果
         try:
-            # 直接使用 Queue 发送（LocalClient 内部也是用 Queue）
-            # 构造消息
-            msg = {
-                "type": "tool_execute",
-                "payload": {
-                    "request_id": request_id,
-                    "tool_name": tool_name,
-                    "tool_args": tool_args,
-                }
-            }
-
-            # 发送到主进程
-            client.input_queue.put_nowait(msg)
-
-            # 等待结果（从 output_queue）
-            start_time = time.time()
-            timeout = 30.0  # 30 秒超时
-
-            while time.time() - start_time < timeout:
-                await asyncio.sleep(0.1)
-
-                if client.output_queue.empty():
-                    continue
-
-                try:
-                    result_msg = client.output_queue.get_nowait()
-                    msg_type = result_msg.get("type", "")
-                    if msg_type == "tool_execute_result":
-                        payload = result_msg.get("payload", {})
-                        req_id = payload.get("request_id", "")
-                        if req_id == request_id:
-                            if payload.get("success"):
-                                result = payload.get("result", {})
-                                return result.get("content", "")
-                            else:
-                                error = payload.get("error", "未知错误")
-                                logger.error(f"AstrBot 工具执行失败: {error}")
-                                return f"工具执行失败: {error}"
-                except Exception:
-                    continue
-
-            logger.warning(f"AstrBot 工具执行超时: {tool_name}")
-            return None
+            # 通过子进程 IPC 服务端发送请求（经 output_queue 发往主进程），
+            # 主进程的 tool_execute_result 按 request_id 唤醒这里的等待
+            payload = await client.request(
+                "tool_execute",
+                {"tool_name": tool_name, "tool_args": tool_args},
+                timeout=30.0,
+            )
+            if payload is None:
+                logger.warning(f"AstrBot 工具执行超时: {tool_name}")
+                return None
+            if payload.get("success"):
+                result = payload.get("result") or {}
+                return result.get("content", "")
+            error = payload.get("error", "未知错误")
+            logger.error(f"AstrBot 工具执行失败: {error}")
+            return f"工具执行失败: {error}"
 
         except Exception as e:
             logger.error(f"通过 IPC 执行 AstrBot 工具失败: {e}")
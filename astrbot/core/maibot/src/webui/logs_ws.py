@@ -1,7 +1,9 @@
 """WebSocket 日志推送模块"""
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-from typing import Set, Optional
+from typing import Dict, Set, Optional
+from collections import deque
+import asyncio
 import json
 from pathlib import Path
 from astrbot.core.maibot.src.common.logger import get_logger
@@ -14,6 +16,55 @@ router = APIRouter()
 # 全局 WebSocket 连接池
 active_connections: Set[WebSocket] = set()
 
+# 每个客户端待发送日志的上限，慢客户端积压超过后丢弃最旧的日志
+CLIENT_LOG_BUFFER_SIZE = 500
+
+
+class _ClientLogChannel:
+    """单个客户端的日志发送通道：有界缓冲 + 独立发送任务，慢客户端不拖累其他客户端"""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.buffer: deque = deque(maxlen=CLIENT_LOG_BUFFER_SIZE)
+        self.dropped = 0
+        self._event = asyncio.Event()
+        self._task = asyncio.create_task(self._send_loop())
+
+    def push(self, messages: list[str]) -> None:
+        for message in messages:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(message)
+        self._event.set()
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                await self._event.wait()
+                self._event.clear()
+                while self.buffer:
+                    await self.websocket.send_text(self.buffer.popleft())
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # 发送失败，视为断开
+            _remove_connection(self.websocket)
+
+    def close(self) -> None:
+        self._task.cancel()
+        if self.dropped:
+            logger.debug(f"WebSocket 客户端断开，累计丢弃 {self.dropped} 条积压日志")
+
+
+_channels: Dict[WebSocket, _ClientLogChannel] = {}
+
+
+def _remove_connection(websocket: WebSocket) -> None:
+    active_connections.discard(websocket)
+    channel = _channels.pop(websocket, None)
+    if channel:
+        channel.close()
+
 
 def load_recent_logs(limit: int = 100) -> list[dict]:
     """从日志文件中加载最近的日志
@@ -128,6 +179,9 @@ async def websocket_logs(websocket: WebSocket, token: Optional[str] = Query(None
     except Exception as e:
         logger.error(f"发送历史日志失败: {e}")
 
+    # 历史日志发送完毕后再接入实时推送，保证顺序
+    _channels[websocket] = _ClientLogChannel(websocket)
+
     try:
         # 保持连接，等待客户端消息或断开
         while True:
@@ -141,37 +195,31 @@ async def websocket_logs(websocket: WebSocket, token: Optional[str] = Query(None
                 await websocket.send_text("pong")
 
     except WebSocketDisconnect:
-        active_connections.discard(websocket)
+        _remove_connection(websocket)
         logger.info(f"📡 WebSocket 客户端已断开，当前连接数: {len(active_connections)}")
     except Exception as e:
         logger.error(f"❌ WebSocket 错误: {e}")
-        active_connections.discard(websocket)
+        _remove_connection(websocket)
 
 
-async def broadcast_log(log_data: dict):
-    """广播日志到所有连接的 WebSocket 客户端
+def broadcast_logs(batch: list[dict]) -> None:
+    """把一批日志分发到所有客户端的发送通道（不等待发送完成）
 
     Args:
-        log_data: 日志数据字典
+        batch: 日志数据字典列表
     """
-    if not active_connections:
+    if not _channels:
         return
 
-    # 格式化为 JSON
-    message = json.dumps(log_data, ensure_ascii=False)
+    messages = [json.dumps(log_data, ensure_ascii=False) for log_data in batch]
+    for channel in list(_channels.values()):
+        channel.push(messages)
 
-    # 记录需要断开的连接
-    disconnected = set()
 
-    # 广播到所有客户端
-    for connection in active_connections:
-        try:
-            await connection.send_text(message)
-        except Exception:
-            # 发送失败，标记为断开
-            disconnected.add(connection)
+async def broadcast_log(log_data: dict):
+    """广播单条日志到所有连接的 WebSocket 客户端
 
-    # 清理断开的连接
-    if disconnected:
-        active_connections.difference_update(disconnected)
-        logger.debug(f"清理了 {len(disconnected)} 个断开的 WebSocket 连接")
+    Args:
+        log_data: 日志数据字典
+    """
+    broadcast_logs([log_data])
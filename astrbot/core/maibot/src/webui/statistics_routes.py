@@ -8,6 +8,7 @@ from peewee import fn
 
 from astrbot.core.maibot.src.common.logger import get_logger
 from astrbot.core.maibot.src.common.database.database_model import LLMUsage, OnlineTime, Messages
+from astrbot.core.maibot.src.llm_models.utils import llm_usage_recorder
 from astrbot.core.maibot.src.webui.auth import verify_auth_token_from_cookie_or_header
 
 logger = get_logger("webui.statistics")
@@ -301,6 +302,16 @@ async def get_summary(hours: int = 24, _auth: bool = Depends(require_auth)):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/models/live")
+async def get_live_model_stats(_auth: bool = Depends(require_auth)):
+    """
+    获取本次运行以来各模型的实时统计（内存汇总，不查询数据库）
+
+    包含 token 用量、请求/失败次数、延迟与错误率的指数加权移动平均
+    """
+    return llm_usage_recorder.snapshot()
+
+
 @router.get("/models")
 async def get_model_stats(hours: int = 24, _auth: bool = Depends(require_auth)):
     """
@@ -26,17 +26,15 @@ import base64
 import json
 import os
 import sys
-import uuid
 from enum import Enum
 
 if sys.version_info >= (3, 14):
-    from pydantic import BaseModel
+    from pydantic import BaseModel, PrivateAttr
 else:
-    from pydantic.v1 import BaseModel
+    from pydantic.v1 import BaseModel, PrivateAttr
 
 from astrbot.core import astrbot_config, file_token_service, logger
-from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
-from astrbot.core.utils.io import download_file, download_image_by_url, file_to_base64
+from astrbot.core.message.media import MediaHandle
 
 
 class ComponentType(str, Enum):
@@ -69,10 +67,19 @@ class ComponentType(str, Enum):
 
 class BaseMessageComponent(BaseModel):
     type: ComponentType
+    _media: MediaHandle | None = PrivateAttr(default=None)
+    _media_source: str | None = PrivateAttr(default=None)
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
+    def _media_handle(self, source: str, **kwargs) -> MediaHandle:
+        """返回 source 对应的惰性媒体句柄。source 变化时重建，否则复用已缓存的转换结果。"""
+        if self._media is None or self._media_source != source:
+            self._media = MediaHandle.from_source(source, **kwargs)
+            self._media_source = source
+        return self._media
+
     def toDict(self):
         data = {}
         for k, v in self.__dict__.items():
@@ -145,6 +152,13 @@ class Record(BaseMessageComponent):
     def fromBase64(bs64_data: str, **_):
         return Record(file=f"base64://{bs64_data}", **_)
 
+    @property
+    def media(self) -> MediaHandle:
+        """语音数据的惰性句柄，下载、解码与 base64 编码的结果都会被缓存。"""
+        return self._media_handle(
+            self.file or "", prefix="recordseg_", download_as_image=True
+        )
+
     async def convert_to_file_path(self) -> str:
         """将这个语音统一转换为本地文件路径。这个方法避免了手动判断语音数据类型，直接返回语音数据的本地路径（如果是网络 URL, 则会自动进行下载）。
 
@@ -156,18 +170,8 @@ class Record(BaseMessageComponent):
             raise Exception(f"not a valid file: {self.file}")
         if self.file.startswith("file:///"):
             return self.file[8:]
-        if self.file.startswith("http"):
-            file_path = await download_image_by_url(self.file)
-            return os.path.abspath(file_path)
-        if self.file.startswith("base64://"):
-            bs64_data = self.file.removeprefix("base64://")
-            image_bytes = base64.b64decode(bs64_data)
-            file_path = os.path.join(
-                get_astrbot_temp_path(), f"recordseg_{uuid.uuid4()}.jpg"
-            )
-            with open(file_path, "wb") as f:
-                f.write(image_bytes)
-            return os.path.abspath(file_path)
+        if self.file.startswith("http") or self.file.startswith("base64://"):
+            return await self.media.get_path()
         if os.path.exists(self.file):
             return os.path.abspath(self.file)
         raise Exception(f"not a valid file: {self.file}")
@@ -179,22 +183,17 @@ class Record(BaseMessageComponent):
             str: 语音的 base64 编码，不以 base64:// 或者 data:image/jpeg;base64, 开头。
 
         """
-        # convert to base64
         if not self.file:
             raise Exception(f"not a valid file: {self.file}")
-        if self.file.startswith("file:///"):
-            bs64_data = file_to_base64(self.file[8:])
-        elif self.file.startswith("http"):
-            file_path = await download_image_by_url(self.file)
-            bs64_data = file_to_base64(file_path)
-        elif self.file.startswith("base64://"):
-            bs64_data = self.file
-        elif os.path.exists(self.file):
-            bs64_data = file_to_base64(self.file)
-        else:
-            raise Exception(f"not a valid file: {self.file}")
-        bs64_data = bs64_data.removeprefix("base64://")
-        return bs64_data
+        if self.file.startswith("base64://"):
+            return self.file.removeprefix("base64://")
+        if (
+            self.file.startswith("file:///")
+            or self.file.startswith("http")
+            or os.path.exists(self.file)
+        ):
+            return await self.media.get_base64()
+        raise Exception(f"not a valid file: {self.file}")
 
     async def register_to_file_service(self) -> str:
         """将语音注册到文件服务。
@@ -241,6 +240,11 @@ class Video(BaseMessageComponent):
             return Video(file=url, **_)
         raise Exception("not a valid url")
 
+    @property
+    def media(self) -> MediaHandle:
+        """视频数据的惰性句柄，远程视频只会被下载一次。"""
+        return self._media_handle(self.file, prefix="videoseg_")
+
     async def convert_to_file_path(self) -> str:
         """将这个视频统一转换为本地文件路径。这个方法避免了手动判断视频数据类型，直接返回视频数据的本地路径（如果是网络 URL，则会自动进行下载）。
 
@@ -252,13 +256,7 @@ class Video(BaseMessageComponent):
         if url and url.startswith("file:///"):
             return url[8:]
         if url and url.startswith("http"):
-            video_file_path = os.path.join(
-                get_astrbot_temp_path(), f"videoseg_{uuid.uuid4().hex}"
-            )
-            await download_file(url, video_file_path)
-            if os.path.exists(video_file_path):
-                return os.path.abspath(video_file_path)
-            raise Exception(f"download failed: {url}")
+            return await self.media.get_path()
         if os.path.exists(url):
             return os.path.abspath(url)
         raise Exception(f"not a valid file: {url}")
@@ -430,12 +428,27 @@ class Image(BaseMessageComponent):
 
     @staticmethod
     def fromBytes(byte: bytes):
-        return Image.fromBase64(base64.b64encode(byte).decode())
+        bs64_data = base64.b64encode(byte).decode()
+        image = Image.fromBase64(bs64_data)
+        # 句柄与组件共用同一个 base64 字符串，不再额外持有一份原始字节
+        image._media = MediaHandle(b64=bs64_data, prefix="imgseg_")
+        image._media_source = image.file
+        return image
 
     @staticmethod
     def fromIO(IO):
         return Image.fromBytes(IO.read())
 
+    @property
+    def media(self) -> MediaHandle:
+        """图片数据的惰性句柄，下载、解码与 base64 编码的结果都会被缓存。"""
+        return self._media_handle(
+            self.url or self.file or "",
+            prefix="imgseg_",
+            suffix=".jpg",
+            download_as_image=True,
+        )
+
     async def convert_to_file_path(self) -> str:
         """将这个图片统一转换为本地文件路径。这个方法避免了手动判断图片数据类型，直接返回图片数据的本地路径（如果是网络 URL, 则会自动进行下载）。
 
@@ -448,18 +461,8 @@ class Image(BaseMessageComponent):
             raise ValueError("No valid file or URL provided")
         if url.startswith("file:///"):
             return url[8:]
-        if url.startswith("http"):
-            image_file_path = await download_image_by_url(url)
-            return os.path.abspath(image_file_path)
-        if url.startswith("base64://"):
-            bs64_data = url.removeprefix("base64://")
-            image_bytes = base64.b64decode(bs64_data)
-            image_file_path = os.path.join(
-                get_astrbot_temp_path(), f"imgseg_{uuid.uuid4()}.jpg"
-            )
-            with open(image_file_path, "wb") as f:
-                f.write(image_bytes)
-            return os.path.abspath(image_file_path)
+        if url.startswith("http") or url.startswith("base64://"):
+            return await self.media.get_path()
         if os.path.exists(url):
             return os.path.abspath(url)
         raise Exception(f"not a valid file: {url}")
@@ -471,23 +474,14 @@ class Image(BaseMessageComponent):
             str: 图片的 base64 编码，不以 base64:// 或者 data:image/jpeg;base64, 开头。
 
         """
-        # convert to base64
         url = self.url or self.file
         if not url:
             raise ValueError("No valid file or URL provided")
-        if url.startswith("file:///"):
-            bs64_data = file_to_base64(url[8:])
-        elif url.startswith("http"):
-            image_file_path = await download_image_by_url(url)
-            bs64_data = file_to_base64(image_file_path)
-        elif url.startswith("base64://"):
-            bs64_data = url
-        elif os.path.exists(url):
-            bs64_data = file_to_base64(url)
-        else:
-            raise Exception(f"not a valid file: {url}")
-        bs64_data = bs64_data.removeprefix("base64://")
-        return bs64_data
+        if url.startswith("base64://"):
+            return url.removeprefix("base64://")
+        if url.startswith("file:///") or url.startswith("http") or os.path.exists(url):
+            return await self.media.get_base64()
+        raise Exception(f"not a valid file: {url}")
 
     async def register_to_file_service(self) -> str:
         """将图片注册到文件服务。
@@ -786,15 +780,21 @@ class File(BaseMessageComponent):
         """下载文件"""
         if not self.url:
             raise ValueError("Download failed: No URL provided in File component.")
-        download_dir = get_astrbot_temp_path()
+        # 通过媒体句柄下载，同一组件上并发的 get_file() 只会触发一次下载
+        self.file_ = await self._url_media_handle().get_path()
+
+    def _url_media_handle(self) -> MediaHandle:
         if self.name:
             name, ext = os.path.splitext(self.name)
-            filename = f"fileseg_{name}_{uuid.uuid4().hex[:8]}{ext}"
-        else:
-            filename = f"fileseg_{uuid.uuid4().hex}"
-        file_path = os.path.join(download_dir, filename)
-        await download_file(self.url, file_path)
-        self.file_ = os.path.abspath(file_path)
+            return self._media_handle(self.url, prefix=f"fileseg_{name}_", suffix=ext)
+        return self._media_handle(self.url, prefix="fileseg_")
+
+    @property
+    def media(self) -> MediaHandle:
+        """文件数据的惰性句柄。本地文件可通过 iter_chunks() 流式上传而无需整体读入内存。"""
+        if self.file_ and os.path.exists(self.file_):
+            return self._media_handle(self.file_)
+        return self._url_media_handle()
 
     async def register_to_file_service(self) -> str:
         """将文件注册到文件服务。
@@ -0,0 +1,294 @@
+"""Lazy media handle shared by the media message components.
+
+A :class:`MediaHandle` wraps whatever a component was created from (a local
+path, an http(s) URL, a ``base64://`` payload or raw bytes) and converts it on
+demand. The local path, base64 string, digest and MIME type are cached on the
+handle, so a component that is passed between the platform adapter, the
+pipeline and a provider downloads or base64-encodes its payload at most once.
+Raw bytes decoded from base64 or read from disk are not cached: the handle never
+keeps a second full copy of a payload it already holds in another form.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import mimetypes
+import os
+import uuid
+from collections.abc import AsyncIterator
+
+from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
+from astrbot.core.utils.io import download_file, download_image_by_url
+from astrbot.core.utils.temp_file_registry import register_temp_file
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_MAGIC_MIME = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"#!AMR", "audio/amr"),
+    (b"\x02#!SILK", "audio/silk"),
+    (b"#!SILK", "audio/silk"),
+    (b"OggS", "audio/ogg"),
+    (b"ID3", "audio/mpeg"),
+    (b"fLaC", "audio/flac"),
+)
+
+
+def _sniff_mime(head: bytes) -> str | None:
+    for magic, mime in _MAGIC_MIME:
+        if head.startswith(magic):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "audio/wav"
+    if head[4:8] == b"ftyp":
+        return "video/mp4"
+    return None
+
+
+def _strip_file_uri(path: str) -> str:
+    # fromFileSystem() 生成 file:///{abspath}，与各组件原有的 [8:] 截取保持一致
+    if path.startswith("file:///"):
+        return path[8:]
+    if path.startswith("file://"):
+        path = path[7:]
+        # 兼容 Windows: file:///C:/path -> /C:/path -> C:/path
+        if os.name == "nt" and len(path) > 2 and path[0] == "/" and path[2] == ":":
+            path = path[1:]
+    return path
+
+
+class MediaHandle:
+    """Lazily converted view over one piece of media.
+
+    Only the representation the handle was created from is held eagerly; the
+    local path, base64 string, sha256 digest and MIME type are each computed on
+    first use and cached. Raw bytes are only held when the handle was created
+    from them.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: str | None = None,
+        url: str | None = None,
+        data: bytes | bytearray | memoryview | None = None,
+        b64: str | None = None,
+        mime: str | None = None,
+        prefix: str = "mediaseg_",
+        suffix: str = "",
+        download_as_image: bool = False,
+    ) -> None:
+        self._path = os.path.abspath(_strip_file_uri(path)) if path else None
+        self._url = url
+        self._data = memoryview(data).toreadonly() if data is not None else None
+        self._b64 = b64
+        self._mime = mime
+        self._prefix = prefix
+        self._suffix = suffix
+        self._download_as_image = download_as_image
+        self._sha256: str | None = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_source(
+        cls,
+        source: str,
+        *,
+        prefix: str = "mediaseg_",
+        suffix: str = "",
+        download_as_image: bool = False,
+    ) -> "MediaHandle":
+        """Build a handle from a component ``file``/``url`` string."""
+        if source.startswith("base64://"):
+            return cls(
+                b64=source.removeprefix("base64://"), prefix=prefix, suffix=suffix
+            )
+        if source.startswith("http"):
+            return cls(
+                url=source,
+                prefix=prefix,
+                suffix=suffix,
+                download_as_image=download_as_image,
+            )
+        return cls(path=source, prefix=prefix, suffix=suffix)
+
+    def __deepcopy__(self, memo) -> "MediaHandle":
+        # 句柄内容只读，拷贝后的组件可以安全地共享同一份缓存
+        return self
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if state["_data"] is not None:
+            state["_data"] = bytes(state["_data"])
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        if state["_data"] is not None:
+            state["_data"] = memoryview(state["_data"]).toreadonly()
+        self.__dict__.update(state)
+        self._lock = asyncio.Lock()
+
+    @property
+    def url(self) -> str | None:
+        return self._url
+
+    @property
+    def is_local(self) -> bool:
+        """Whether the payload is available without a network round trip."""
+        return self._path is not None or self._data is not None or self._b64 is not None
+
+    async def get_path(self) -> str:
+        """Return an absolute local path, downloading or spilling bytes once."""
+        if self._path is not None:
+            return self._path
+        async with self._lock:
+            if self._path is not None:
+                return self._path
+            if self._url is not None:
+                if self._download_as_image:
+                    path = await download_image_by_url(self._url)
+                else:
+                    path = os.path.join(
+                        get_astrbot_temp_path(),
+                        f"{self._prefix}{uuid.uuid4().hex}{self._suffix}",
+                    )
+                    await download_file(self._url, path)
+                if not os.path.exists(path):
+                    raise Exception(f"download failed: {self._url}")
+                self._path = os.path.abspath(path)
+                return self._path
+            data = await self.get_bytes()
+            path = os.path.join(
+                get_astrbot_temp_path(),
+                f"{self._prefix}{uuid.uuid4().hex}{self._suffix}",
+            )
+            await asyncio.to_thread(self._write_file, path, data)
+            register_temp_file(path, len(data))
+            self._path = os.path.abspath(path)
+            return self._path
+
+    @staticmethod
+    def _write_file(path: str, data: memoryview) -> None:
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    async def get_bytes(self) -> memoryview:
+        """Return the raw payload as a read-only memoryview.
+
+        Bytes decoded from base64 or read from disk are not cached on the handle;
+        prefer :meth:`iter_chunks` or :meth:`get_path` for large payloads.
+        """
+        if self._data is not None:
+            return self._data
+        if self._b64 is not None:
+            return memoryview(base64.b64decode(self._b64)).toreadonly()
+        path = await self.get_path()
+        if not os.path.exists(path):
+            raise Exception(f"not a valid file: {path}")
+        return memoryview(await asyncio.to_thread(self._read_file, path)).toreadonly()
+
+    async def get_base64(self) -> str:
+        """Return the payload base64-encoded, without any ``base64://`` prefix."""
+        if self._b64 is None:
+            if self._data is not None:
+                self._b64 = base64.b64encode(self._data).decode()
+            else:
+                # File-backed media: encode straight from disk without also
+                # keeping the raw bytes alive on the handle.
+                path = await self.get_path()
+                if not os.path.exists(path):
+                    raise Exception(f"not a valid file: {path}")
+                raw = await asyncio.to_thread(self._read_file, path)
+                self._b64 = base64.b64encode(raw).decode()
+        return self._b64
+
+    async def size(self) -> int:
+        if self._data is not None:
+            return self._data.nbytes
+        if self._b64 is not None and self._path is None:
+            b64 = self._b64.rstrip()
+            return len(b64) * 3 // 4 - (len(b64) - len(b64.rstrip("=")))
+        if self._path is not None and os.path.exists(self._path):
+            return os.path.getsize(self._path)
+        return (await self.get_bytes()).nbytes
+
+    async def sha256(self) -> str:
+        """Hex sha256 of the payload, computed once."""
+        if self._sha256 is None:
+            if self._data is not None or self._b64 is not None:
+                data = await self.get_bytes()
+                self._sha256 = hashlib.sha256(data).hexdigest()
+            else:
+                path = await self.get_path()
+                self._sha256 = await asyncio.to_thread(self._hash_file, path)
+        return self._sha256
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(STREAM_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    async def mime_type(self) -> str | None:
+        """Best-effort MIME type from magic bytes, falling back to the extension."""
+        if self._mime is None:
+            if self._data is not None:
+                head = bytes(self._data[:16])
+            elif self._b64 is not None:
+                # 只解码开头的 24 个字符（18 字节）用于识别文件头
+                try:
+                    head = base64.b64decode(self._b64[:24])
+                except binascii.Error:
+                    head = bytes((await self.get_bytes())[:16])
+            else:
+                path = await self.get_path()
+                head = await asyncio.to_thread(self._read_head, path)
+            self._mime = (
+                _sniff_mime(head)
+                or mimetypes.guess_type(self._path or self._url or f"x{self._suffix}")[
+                    0
+                ]
+            )
+        return self._mime
+
+    @staticmethod
+    def _read_head(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read(16)
+
+    async def iter_chunks(
+        self,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream the payload, e.g. as an aiohttp request body.
+
+        Local files are read chunk by chunk in a worker thread and never loaded
+        whole; in-memory payloads are sliced without copying the full buffer.
+        """
+        if self._data is None and (self._b64 is None or self._path is not None):
+            path = await self.get_path()
+            f = await asyncio.to_thread(open, path, "rb")
+            try:
+                while chunk := await asyncio.to_thread(f.read, chunk_size):
+                    yield chunk
+            finally:
+                await asyncio.to_thread(f.close)
+            return
+        data = await self.get_bytes()
+        for offset in range(0, data.nbytes, chunk_size):
+            yield bytes(data[offset : offset + chunk_size])
@@ -13,6 +13,7 @@ from astrbot.core.platform.message_type import MessageType
 from astrbot.core.star.session_llm_manager import SessionServiceManager
 from astrbot.core.star.star import star_map
 from astrbot.core.star.star_handler import EventType, star_handlers_registry
+from astrbot.core.utils.sentence_segmenter import SentenceSegmenter
 
 from ..context import PipelineContext
 from ..stage import Stage, register_stage, registered_stages
@@ -74,15 +75,6 @@ class ResultDecorateStage(Stage):
         self.split_words = ctx.astrbot_config["platform_settings"][
             "segmented_reply"
         ].get("split_words", ["。", "？", "！", "~", "…"])
-        if self.split_words:
-            escaped_words = sorted(
-                [re.escape(word) for word in self.split_words], key=len, reverse=True
-            )
-            self.split_words_pattern = re.compile(
-                f"(.*?({'|'.join(escaped_words)})|.+$)", re.DOTALL
-            )
-        else:
-            self.split_words_pattern = None
         self.content_cleanup_rule = ctx.astrbot_config["platform_settings"][
             "segmented_reply"
         ]["content_cleanup_rule"]
@@ -103,25 +95,10 @@ class ResultDecorateStage(Stage):
 
     def _split_text_by_words(self, text: str) -> list[str]:
         """使用分段词列表分段文本"""
-        if not self.split_words_pattern:
+        if not self.split_words:
             return [text]
-
-        segments = self.split_words_pattern.findall(text)
-        result = []
-        for seg in segments:
-            if isinstance(seg, tuple):
-                content = seg[0]
-                if not isinstance(content, str):
-                    continue
-                for word in self.split_words:
-                    if content.endswith(word):
-                        content = content[: -len(word)]
-                        break
-                if content.strip():
-                    result.append(content)
-            elif seg and seg.strip():
-                result.append(seg)
-        return result if result else [text]
+        segmenter = SentenceSegmenter(self.split_words, keep_delimiters=False)
+        return segmenter.split(text) or [text]
 
     async def process(
         self,
@@ -233,10 +210,8 @@ class ResultDecorateStage(Stage):
                                     logger.error(
                                         f"分段回复正则表达式错误，使用默认分段方式: {traceback.format_exc()}",
                                     )
-                                    split_response = re.findall(
-                                        r".*?[。？！~…]+|.+$",
-                                        comp.text,
-                                        re.DOTALL | re.MULTILINE,
+                                    split_response = SentenceSegmenter().split(
+                                        comp.text
                                     )
 
                             if not split_response:
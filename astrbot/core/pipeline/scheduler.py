@@ -2,10 +2,6 @@ from collections.abc import AsyncGenerator
 
 from astrbot.core import logger
 from astrbot.core.platform import AstrMessageEvent
-from astrbot.core.platform.sources.webchat.webchat_event import WebChatMessageEvent
-from astrbot.core.platform.sources.wecom_ai_bot.wecomai_event import (
-    WecomAIBotMessageEvent,
-)
 from astrbot.core.utils.active_event_registry import active_event_registry
 
 from .bootstrap import ensure_builtin_stages_registered
@@ -13,6 +9,9 @@ from .context import PipelineContext
 from .stage import registered_stages
 from .stage_order import STAGES_ORDER
 
+_STREAM_FINISH_PLATFORMS = frozenset({"webchat", "wecom_ai_bot"})
+"""需要在流水线结束后发送空消息以结束会话的平台类型"""
+
 
 class PipelineScheduler:
     """管道调度器，负责调度各个阶段的执行"""
@@ -87,7 +86,8 @@ class PipelineScheduler:
             await self._process_stages(event)
 
             # 如果没有发送操作, 则发送一个空消息, 以便于后续的处理
-            if isinstance(event, WebChatMessageEvent | WecomAIBotMessageEvent):
+            # 按平台类型判断，避免为 isinstance 检查导入未启用的平台适配器
+            if event.get_platform_name() in _STREAM_FINISH_PLATFORMS:
                 await event.send(None)
 
             logger.debug("pipeline 执行完毕。")
@@ -24,11 +24,13 @@ from astrbot.core.message.message_event_result import MessageChain, MessageEvent
 from astrbot.core.platform.message_type import MessageType
 from astrbot.core.provider.entities import ProviderRequest
 from astrbot.core.utils.metrics import Metric
+from astrbot.core.utils.sentence_segmenter import SentenceSegmenter
 from astrbot.core.utils.trace import TraceSpan
 
-from .astrbot_message import AstrBotMessage, Group
+from .astrbot_message import AstrBotMessage, Group, MessageMember
 from .message_session import MessageSesion, MessageSession  # noqa
 from .platform_metadata import PlatformMetadata
+from .send_scheduler import OutboundScheduler
 
 
 class AstrMessageEvent(abc.ABC):
@@ -86,6 +88,8 @@ class AstrMessageEvent(abc.ABC):
 
         self._has_send_oper = False
         """在此次事件中是否有过至少一次发送消息的操作"""
+        self.send_scheduler: OutboundScheduler | None = None
+        """平台的出站消息调度器。由适配器设置后，发送限速交由调度器统一处理"""
         self.call_llm = False
         """是否在此消息事件中禁止默认的 LLM 请求"""
 
@@ -249,9 +253,37 @@ class AstrMessageEvent(abc.ABC):
             matched_text = match.group()
             await self.send(MessageChain([Plain(matched_text)]))
             buffer = buffer[match.end() :]
-            await asyncio.sleep(1.5)  # 限速
+            if self.send_scheduler is None:
+                await asyncio.sleep(1.5)  # 限速
         return buffer
 
+    async def send_streaming_segmented(
+        self,
+        generator: AsyncGenerator[MessageChain, None],
+        segmenter: SentenceSegmenter | None = None,
+    ) -> None:
+        """逐句发送流式消息，作为不支持流式输出平台的 Fallback。
+
+        每个句子一完整就立即发送，非文本消息段单独发送。
+        """
+        segmenter = segmenter or SentenceSegmenter()
+        async for chain in generator:
+            if not isinstance(chain, MessageChain):
+                continue
+            for comp in chain.chain:
+                if isinstance(comp, Plain):
+                    for sentence in segmenter.feed(comp.text):
+                        await self.send(MessageChain([Plain(sentence)]))
+                        if self.send_scheduler is None:
+                            await asyncio.sleep(1.5)  # 限速
+                else:
+                    await self.send(MessageChain(chain=[comp]))
+                    if self.send_scheduler is None:
+                        await asyncio.sleep(1.5)  # 限速
+
+        if (rest := segmenter.flush()).strip():
+            await self.send(MessageChain([Plain(rest)]))
+
     async def send_streaming(
         self,
         generator: AsyncGenerator[MessageChain, None],
@@ -467,3 +499,17 @@ class AstrMessageEvent(abc.ABC):
 
         - aiocqhttp(OneBotv11)
         """
+
+    async def get_group_member(
+        self,
+        user_id: str,
+        group_id: str | None = None,
+    ) -> MessageMember | None:
+        """按用户 id 获取群成员。group_id 的含义同 get_group。
+
+        群数据由适配器缓存，重复调用不会重复请求平台接口。
+        """
+        group = await self.get_group(group_id)
+        if group is None:
+            return None
+        return group.get_member(user_id)
@@ -1,5 +1,5 @@
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from astrbot.core.message.components import BaseMessageComponent
 
@@ -33,6 +33,33 @@ class Group:
     """群管理员 id"""
     members: list[MessageMember] | None = None
     """所有群成员"""
+    _member_index: dict[str, MessageMember] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def get_member(self, user_id: str) -> MessageMember | None:
+        """按用户 id 查找群成员"""
+        if self._member_index is None or len(self._member_index) != len(
+            self.members or []
+        ):
+            self._member_index = {str(m.user_id): m for m in self.members or []}
+        return self._member_index.get(str(user_id))
+
+    def add_member(self, member: MessageMember) -> None:
+        """添加群成员，已存在时替换"""
+        self.remove_member(member.user_id)
+        if self.members is None:
+            self.members = []
+        self.members.append(member)
+        self._member_index = None
+
+    def remove_member(self, user_id: str) -> None:
+        """移除群成员"""
+        if not self.members:
+            return
+        user_id = str(user_id)
+        self.members = [m for m in self.members if str(m.user_id) != user_id]
+        self._member_index = None
 
     def __str__(self) -> str:
         # 使用 f-string 来构建返回的字符串表示形式
@@ -0,0 +1,160 @@
+"""群聊元数据缓存
+
+平台适配器获取群信息与成员列表的代价很高（大群的成员列表可达数百 KB），
+而插件和主 Agent 往往每条消息都会调用 ``get_group``。本模块提供按平台实例
+划分的群元数据缓存：
+
+- 条目按 TTL 过期，过期后下一次访问重新拉取；
+- 同一个群的并发拉取只会真正请求一次（single-flight）；
+- 适配器可根据平台的通知事件（进群、退群、管理员变更、名片变更）增量更新条目，
+  无需整表重新拉取。
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from .astrbot_message import Group, MessageMember
+
+DEFAULT_GROUP_TTL = 300.0
+"""群元数据默认缓存时间（秒）"""
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # 所有等待方都已取消时避免 "exception was never retrieved" 警告
+    if not task.cancelled():
+        task.exception()
+
+
+@dataclass
+class _CacheEntry:
+    group: Group
+    expires_at: float
+
+
+class GroupMetadataCache:
+    """按群号缓存 :class:`Group`，支持 TTL、single-flight 与增量更新。
+
+    返回的 ``Group`` 对象在缓存中共享，调用方不应直接修改它。
+    """
+
+    def __init__(self, ttl: float = DEFAULT_GROUP_TTL, max_groups: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_groups = max_groups
+        self._entries: dict[str, _CacheEntry] = {}
+        self._inflight: dict[str, asyncio.Task[Group | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, group_id: str) -> Group | None:
+        """返回未过期的缓存条目，不触发拉取。"""
+        entry = self._entries.get(str(group_id))
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._entries.pop(str(group_id), None)
+            return None
+        return entry.group
+
+    async def get(
+        self,
+        group_id: str,
+        fetch: Callable[[], Awaitable[Group | None]],
+    ) -> Group | None:
+        """获取群数据，未命中时调用 ``fetch`` 拉取。
+
+        同一群号的并发调用共享同一次 ``fetch``；``fetch`` 抛出的异常会传给
+        所有等待方，且不会被缓存。拉取在独立的任务中执行，取消某个调用方
+        （包括发起拉取的调用方）不会影响其他等待方。
+        """
+        group_id = str(group_id)
+        if (group := self.peek(group_id)) is not None:
+            return group
+
+        task = self._inflight.get(group_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(group_id, fetch))
+            task.add_done_callback(_retrieve_exception)
+            self._inflight[group_id] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        group_id: str,
+        fetch: Callable[[], Awaitable[Group | None]],
+    ) -> Group | None:
+        try:
+            group = await fetch()
+            if group is not None:
+                self.put(group)
+            return group
+        finally:
+            self._inflight.pop(group_id, None)
+
+    def put(self, group: Group) -> None:
+        """写入或替换一个群的缓存条目。"""
+        if (
+            len(self._entries) >= self.max_groups
+            and group.group_id not in self._entries
+        ):
+            self._evict()
+        self._entries[group.group_id] = _CacheEntry(
+            group=group,
+            expires_at=time.monotonic() + self.ttl,
+        )
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [gid for gid, e in self._entries.items() if e.expires_at <= now]
+        for gid in expired:
+            del self._entries[gid]
+        if len(self._entries) >= self.max_groups:
+            # 淘汰最早过期（即最早写入）的条目
+            oldest = min(self._entries, key=lambda gid: self._entries[gid].expires_at)
+            del self._entries[oldest]
+
+    def invalidate(self, group_id: str | None = None) -> None:
+        """使一个群（或全部群）的缓存失效。"""
+        if group_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(str(group_id), None)
+
+    # ===== 增量更新 =====
+
+    def add_member(self, group_id: str, member: MessageMember) -> None:
+        group = self.peek(group_id)
+        if group is None:
+            return
+        group.add_member(member)
+
+    def remove_member(self, group_id: str, user_id: str) -> None:
+        group = self.peek(group_id)
+        if group is None:
+            return
+        group.remove_member(user_id)
+
+    def set_admin(self, group_id: str, user_id: str, is_admin: bool) -> None:
+        group = self.peek(group_id)
+        if group is None:
+            return
+        # 管理员 id 统一为字符串，与 Group.group_admins 的声明一致
+        user_id = str(user_id)
+        admins = [str(a) for a in group.group_admins or [] if str(a) != user_id]
+        if is_admin:
+            admins.append(user_id)
+        group.group_admins = admins
+
+    def update_member_nickname(
+        self,
+        group_id: str,
+        user_id: str,
+        nickname: str | None,
+    ) -> None:
+        group = self.peek(group_id)
+        if group is None:
+            return
+        if (member := group.get_member(user_id)) is not None:
+            member.nickname = nickname
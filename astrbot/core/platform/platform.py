@@ -11,6 +11,7 @@ from astrbot.core.message.message_event_result import MessageChain
 from astrbot.core.utils.metrics import Metric
 
 from .astr_message_event import AstrMessageEvent
+from .group_cache import GroupMetadataCache
 from .message_session import MessageSesion
 from .platform_metadata import PlatformMetadata
 
@@ -41,6 +42,8 @@ class Platform(abc.ABC):
         # 维护了消息平台的事件队列，EventBus 会从这里取出事件并处理。
         self._event_queue = event_queue
         self.client_self_id = uuid.uuid4().hex
+        # 群元数据缓存，由支持 get_group 的适配器使用
+        self.group_cache = GroupMetadataCache()
 
         # 平台运行状态
         self._status: PlatformStatus = PlatformStatus.PENDING
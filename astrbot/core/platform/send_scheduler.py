@@ -0,0 +1,201 @@
+"""出站消息调度器
+
+接入统一限速的平台适配器（目前为 aiocqhttp）持有一个 :class:`OutboundScheduler`，
+所有发往平台的 API 调用都经由它统一限速，而不是在各处硬编码 ``asyncio.sleep``：
+
+- 每个发送目标（群 / 用户）一个令牌桶，同一目标的消息按提交顺序依次发出；
+- 整个机器人账号共享一个令牌桶，等待全局令牌时按优先级排队，
+  对事件的回复先于主动消息发出；
+- 平台返回限流错误时按指数退避重试。
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from astrbot import logger
+
+T = TypeVar("T")
+
+PRIORITY_REPLY = 0
+"""对消息事件的回复"""
+PRIORITY_PROACTIVE = 10
+"""主动消息（定时任务、插件主动推送等）"""
+
+
+class TokenBucket:
+    """令牌桶：以 ``rate`` 个/秒的速度补充，最多积累 ``burst`` 个。"""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> float:
+        """尝试取走一个令牌。成功返回 0，否则返回还需等待的秒数。"""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def give_back(self) -> None:
+        """归还一个未使用的令牌，不超过桶容量。"""
+        self._refill()
+        self._tokens = min(self.burst, self._tokens + 1)
+
+    @property
+    def idle(self) -> bool:
+        """令牌已补满，可以安全丢弃此桶。"""
+        self._refill()
+        return self._tokens >= self.burst
+
+
+class _Target:
+    __slots__ = ("bucket", "lock", "users")
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.bucket = TokenBucket(rate, burst)
+        # asyncio.Lock 按等待顺序唤醒，保证同一目标的消息保持提交顺序
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class OutboundScheduler:
+    """按目标与账号限速、带优先级和限流重试的出站发送调度器。"""
+
+    SWEEP_INTERVAL = 60.0
+    """清理空闲目标的最小间隔（秒）"""
+
+    def __init__(
+        self,
+        per_target_rate: float = 1.0,
+        per_target_burst: float = 3,
+        global_rate: float = 5.0,
+        global_burst: float = 10,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        is_rate_limited: Callable[[BaseException], bool] | None = None,
+    ) -> None:
+        """
+        Args:
+            per_target_rate: 单个目标每秒最多发送的消息数
+            per_target_burst: 单个目标允许的突发消息数
+            global_rate: 整个账号每秒最多发送的消息数
+            global_burst: 整个账号允许的突发消息数
+            max_retries: 遇到限流错误时的最大重试次数
+            retry_base_delay: 限流重试的初始退避时间（秒），每次翻倍
+            is_rate_limited: 判断异常是否为平台限流错误，默认不重试
+        """
+        self.per_target_rate = per_target_rate
+        self.per_target_burst = per_target_burst
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.is_rate_limited = is_rate_limited or (lambda _: False)
+
+        self._global = TokenBucket(global_rate, global_burst)
+        self._targets: dict[str, _Target] = {}
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+        self._last_sweep = time.monotonic()
+
+    async def submit(
+        self,
+        target: str,
+        send: Callable[[], Awaitable[T]],
+        priority: int = PRIORITY_REPLY,
+    ) -> T:
+        """在目标与账号的配额允许时执行一次发送。
+
+        Args:
+            target: 发送目标标识，如 ``group:123``
+            send: 实际执行平台 API 调用的协程函数，重试时会被再次调用
+            priority: 优先级，数值越小越先发送
+        """
+        self._sweep_idle_targets()
+        state = self._targets.get(target)
+        if state is None:
+            state = self._targets[target] = _Target(
+                self.per_target_rate, self.per_target_burst
+            )
+        state.users += 1
+        try:
+            async with state.lock:
+                attempt = 0
+                while True:
+                    await self._acquire_target(state)
+                    await self._acquire_global(priority)
+                    try:
+                        return await send()
+                    except Exception as e:
+                        if attempt >= self.max_retries or not self.is_rate_limited(e):
+                            raise
+                        delay = self.retry_base_delay * (2**attempt)
+                        attempt += 1
+                        logger.warning(
+                            f"发送到 {target} 时触发平台限流，{delay:.1f}s 后重试 ({attempt}/{self.max_retries})"
+                        )
+                        await asyncio.sleep(delay)
+        finally:
+            state.users -= 1
+            if state.users == 0 and state.bucket.idle:
+                self._targets.pop(target, None)
+
+    def _sweep_idle_targets(self) -> None:
+        """丢弃没有进行中发送且令牌已补满的目标，避免目标表无限增长。
+
+        目标在最后一次发送结束时令牌通常尚未补满，无法当场丢弃，由此处定期回收。
+        """
+        now = time.monotonic()
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        idle = [
+            key
+            for key, state in self._targets.items()
+            if state.users == 0 and state.bucket.idle
+        ]
+        for key in idle:
+            del self._targets[key]
+
+    @staticmethod
+    async def _acquire_target(state: _Target) -> None:
+        wait = state.bucket.try_take()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = state.bucket.try_take()
+
+    async def _acquire_global(self, priority: int) -> None:
+        if not self._waiters and self._global.try_take() == 0:
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self) -> None:
+        """按优先级把账号令牌分配给等待者"""
+        while self._waiters:
+            if (wait := self._global.try_take()) > 0:
+                await asyncio.sleep(wait)
+                continue
+            granted = False
+            while self._waiters and not granted:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    future.set_result(None)
+                    granted = True
+            if not granted:
+                # 等待者均已取消，归还令牌
+                self._global.give_back()
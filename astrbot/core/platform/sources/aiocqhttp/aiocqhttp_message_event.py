@@ -1,5 +1,4 @@
 import asyncio
-import re
 from collections.abc import AsyncGenerator
 
 from aiocqhttp import CQHttp, Event
@@ -16,6 +15,12 @@ from astrbot.api.message_components import (
     Video,
 )
 from astrbot.api.platform import Group, MessageMember
+from astrbot.core.platform.group_cache import GroupMetadataCache
+from astrbot.core.platform.send_scheduler import (
+    PRIORITY_PROACTIVE,
+    PRIORITY_REPLY,
+    OutboundScheduler,
+)
 
 
 class AiocqhttpMessageEvent(AstrMessageEvent):
@@ -26,9 +31,13 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
         platform_meta,
         session_id,
         bot: CQHttp,
+        group_cache: GroupMetadataCache | None = None,
+        send_scheduler: OutboundScheduler | None = None,
     ) -> None:
         super().__init__(message_str, message_obj, platform_meta, session_id)
         self.bot = bot
+        self.group_cache = group_cache
+        self.send_scheduler = send_scheduler
 
     @staticmethod
     async def _from_segment_to_dict(segment: BaseMessageComponent) -> dict:
@@ -110,6 +119,8 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
         event: Event | None = None,
         is_group: bool = False,
         session_id: str | None = None,
+        scheduler: OutboundScheduler | None = None,
+        priority: int = PRIORITY_PROACTIVE,
     ) -> None:
         """发送消息至 QQ 协议端（aiocqhttp）。
 
@@ -119,8 +130,18 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
             event (Event | None, optional): aiocqhttp 事件对象.
             is_group (bool, optional): 是否为群消息.
             session_id (str | None, optional): 会话 ID（群号或 QQ 号
+            scheduler (OutboundScheduler | None, optional): 出站调度器，
+                提供时每次 API 调用都经由其限速与限流重试.
+            priority (int, optional): 调度优先级，回复事件时为 PRIORITY_REPLY.
 
         """
+        target = f"{'group' if is_group else 'private'}:{session_id}"
+
+        async def submit(call):
+            if scheduler is None:
+                return await call()
+            return await scheduler.submit(target, call, priority)
+
         # 转发消息、文件消息不能和普通消息混在一起发送
         send_one_by_one = any(
             isinstance(seg, Node | Nodes | File) for seg in message_chain.chain
@@ -129,10 +150,30 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
             ret = await cls._parse_onebot_json(message_chain)
             if not ret:
                 return
-            await cls._dispatch_send(bot, event, is_group, session_id, ret)
+            await submit(
+                lambda: cls._dispatch_send(bot, event, is_group, session_id, ret)
+            )
             return
+
+        # 相邻的普通消息段合并为一次发送
+        pending: list[BaseMessageComponent] = []
+
+        async def flush_pending() -> None:
+            if not pending:
+                return
+            messages = await cls._parse_onebot_json(MessageChain(list(pending)))
+            pending.clear()
+            if not messages:
+                return
+            await submit(
+                lambda: cls._dispatch_send(bot, event, is_group, session_id, messages)
+            )
+            if scheduler is None:
+                await asyncio.sleep(0.5)
+
         for seg in message_chain.chain:
             if isinstance(seg, Node | Nodes):
+                await flush_pending()
                 # 合并转发消息
                 if isinstance(seg, Node):
                     nodes = Nodes([seg])
@@ -142,19 +183,20 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
 
                 if is_group:
                     payload["group_id"] = session_id
-                    await bot.call_action("send_group_forward_msg", **payload)
+                    action = "send_group_forward_msg"
                 else:
                     payload["user_id"] = session_id
-                    await bot.call_action("send_private_forward_msg", **payload)
+                    action = "send_private_forward_msg"
+                await submit(lambda: bot.call_action(action, **payload))
             elif isinstance(seg, File):
+                await flush_pending()
                 d = await cls._from_segment_to_dict(seg)
-                await cls._dispatch_send(bot, event, is_group, session_id, [d])
+                await submit(
+                    lambda: cls._dispatch_send(bot, event, is_group, session_id, [d])
+                )
             else:
-                messages = await cls._parse_onebot_json(MessageChain([seg]))
-                if not messages:
-                    continue
-                await cls._dispatch_send(bot, event, is_group, session_id, messages)
-                await asyncio.sleep(0.5)
+                pending.append(seg)
+        await flush_pending()
 
     async def send(self, message: MessageChain) -> None:
         """发送消息"""
@@ -169,6 +211,8 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
             event=event,  # 不强制要求一定是 Event
             is_group=is_group,
             session_id=session_id,
+            scheduler=self.send_scheduler,
+            priority=PRIORITY_REPLY,
         )
         await super().send(message)
 
@@ -190,22 +234,7 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
             await self.send(buffer)
             return await super().send_streaming(generator, use_fallback)
 
-        buffer = ""
-        pattern = re.compile(r"[^。？！~…]+[。？！~…]+")
-
-        async for chain in generator:
-            if isinstance(chain, MessageChain):
-                for comp in chain.chain:
-                    if isinstance(comp, Plain):
-                        buffer += comp.text
-                        if any(p in buffer for p in "。？！~…"):
-                            buffer = await self.process_buffer(buffer, pattern)
-                    else:
-                        await self.send(MessageChain(chain=[comp]))
-                        await asyncio.sleep(1.5)  # 限速
-
-        if buffer.strip():
-            await self.send(MessageChain([Plain(buffer)]))
+        await self.send_streaming_segmented(generator)
         return await super().send_streaming(generator, use_fallback)
 
     async def get_group(self, group_id=None, **kwargs):
@@ -216,6 +245,13 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
         else:
             return None
 
+        if self.group_cache is None:
+            return await self._fetch_group(group_id)
+        return await self.group_cache.get(
+            str(group_id), lambda: self._fetch_group(group_id)
+        )
+
+    async def _fetch_group(self, group_id: int) -> Group:
         info: dict = await self.bot.call_action(
             "get_group_info",
             group_id=group_id,
@@ -232,7 +268,7 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
             if member["role"] == "owner":
                 owner_id = member["user_id"]
             if member["role"] == "admin":
-                admin_ids.append(member["user_id"])
+                admin_ids.append(str(member["user_id"]))
 
         group = Group(
             group_id=str(group_id),
@@ -242,7 +278,7 @@ class AiocqhttpMessageEvent(AstrMessageEvent):
             group_owner=str(owner_id),
             members=[
                 MessageMember(
-                    user_id=member["user_id"],
+                    user_id=str(member["user_id"]),
                     nickname=member.get("nickname") or member.get("card"),
                 )
                 for member in members
@@ -21,6 +21,7 @@ from astrbot.api.platform import (
     PlatformMetadata,
 )
 from astrbot.core.platform.astr_message_event import MessageSesion
+from astrbot.core.platform.send_scheduler import OutboundScheduler
 
 from ...register import register_platform_adapter
 from .aiocqhttp_message_event import *
@@ -52,6 +53,10 @@ class AiocqhttpAdapter(Platform):
             support_streaming_message=False,
         )
 
+        self.send_scheduler = OutboundScheduler(
+            is_rate_limited=self._is_rate_limited,
+        )
+
         self.bot = CQHttp(
             use_ws_reverse=True,
             import_name="aiocqhttp",
@@ -75,6 +80,7 @@ class AiocqhttpAdapter(Platform):
         @self.bot.on_notice()
         async def notice(event: Event) -> None:
             try:
+                self._update_group_cache(event)
                 abm = await self.convert_message(event)
                 if abm:
                     await self.handle_msg(abm)
@@ -122,6 +128,7 @@ class AiocqhttpAdapter(Platform):
             event=None,  # 这里不需要 event，因为是通过 session 发送的
             is_group=is_group,
             session_id=session_id,
+            scheduler=self.send_scheduler,
         )
         await super().send_by_session(session, message_chain)
 
@@ -165,6 +172,45 @@ class AiocqhttpAdapter(Platform):
         abm.raw_message = event
         return abm
 
+    @staticmethod
+    def _is_rate_limited(exc: BaseException) -> bool:
+        """协议端是否因发送过快拒绝了请求"""
+        if not isinstance(exc, ActionFailed):
+            return False
+        result = getattr(exc, "result", None) or {}
+        text = f"{result.get('message', '')} {result.get('wording', '')}".lower()
+        return any(k in text for k in ("频率", "频繁", "rate limit", "too fast"))
+
+    def _update_group_cache(self, event: Event) -> None:
+        """根据群成员变动通知增量更新群元数据缓存"""
+        notice_type = event.get("notice_type")
+        group_id = event.get("group_id")
+        if not group_id or not notice_type:
+            return
+        group_id = str(group_id)
+        user_id = str(event.get("user_id"))
+
+        if notice_type == "group_increase":
+            self.group_cache.add_member(group_id, MessageMember(user_id=user_id))
+        elif notice_type == "group_decrease":
+            if user_id == str(event.get("self_id")):
+                # 机器人自己退群或被踢
+                self.group_cache.invalidate(group_id)
+            else:
+                self.group_cache.remove_member(group_id, user_id)
+        elif notice_type == "group_admin":
+            self.group_cache.set_admin(
+                group_id, user_id, event.get("sub_type") == "set"
+            )
+        elif notice_type == "group_card":
+            # 成员名称优先使用昵称，仅当名称来自旧群名片时才更新
+            group = self.group_cache.peek(group_id)
+            member = group.get_member(user_id) if group else None
+            if member and member.nickname == (event.get("card_old") or None):
+                self.group_cache.update_member_nickname(
+                    group_id, user_id, event.get("card_new") or None
+                )
+
     async def _convert_handle_notice_event(self, event: Event) -> AstrBotMessage:
         """OneBot V11 通知类事件"""
         abm = AstrBotMessage()
@@ -488,6 +534,8 @@ class AiocqhttpAdapter(Platform):
             platform_meta=self.meta(),
             session_id=message.session_id,
             bot=self.bot,
+            group_cache=self.group_cache,
+            send_scheduler=self.send_scheduler,
         )
 
         self.commit_event(message_event)
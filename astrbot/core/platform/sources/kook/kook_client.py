@@ -5,13 +5,14 @@ import os
 import random
 import time
 import zlib
+from collections.abc import AsyncIterator
 from pathlib import Path
 
-import aiofiles
 import aiohttp
 import websockets
 
 from astrbot import logger
+from astrbot.core.message.media import MediaHandle
 from astrbot.core.platform.message_type import MessageType
 
 from .kook_config import KookConfig
@@ -351,7 +352,7 @@ class KookClient:
         if not file_url:
             return ""
 
-        bytes_data: bytes | None = None
+        bytes_data: bytes | AsyncIterator[bytes] | None = None
         filename = "unknown"
         if file_url.startswith(("http://", "https://")):
             filename = file_url.split("/")[-1]
@@ -378,8 +379,8 @@ class KookClient:
                 raise FileNotFoundError(f"文件不存在: {target_path.name}")
 
             filename = target_path.name
-            async with aiofiles.open(target_path, "rb") as f:
-                bytes_data = await f.read()
+            # 分块流式上传，不把整个文件读入内存
+            bytes_data = MediaHandle(path=str(target_path)).iter_chunks()
 
         else:
             raise ValueError(f'[KOOK] 不支持的文件资源类型: "{file_url}"')
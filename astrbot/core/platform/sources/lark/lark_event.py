@@ -38,6 +38,7 @@ from astrbot.core.utils.media_utils import (
     get_media_duration,
 )
 from astrbot.core.utils.metrics import Metric
+from astrbot.core.utils.temp_file_registry import remove_temp_file
 
 
 class LarkMessageEvent(AstrMessageEvent):
@@ -454,7 +455,7 @@ class LarkMessageEvent(AstrMessageEvent):
         # 清理转换后的临时音频文件
         if converted_audio_path and os.path.exists(converted_audio_path):
             try:
-                os.remove(converted_audio_path)
+                remove_temp_file(converted_audio_path)
                 logger.debug(f"[Lark] 已删除转换后的音频文件: {converted_audio_path}")
             except Exception as e:
                 logger.warning(f"[Lark] 删除转换后的音频文件失败: {e}")
@@ -527,7 +528,7 @@ class LarkMessageEvent(AstrMessageEvent):
         # 清理转换后的临时视频文件
         if converted_video_path and os.path.exists(converted_video_path):
             try:
-                os.remove(converted_video_path)
+                remove_temp_file(converted_video_path)
                 logger.debug(f"[Lark] 已删除转换后的视频文件: {converted_video_path}")
             except Exception as e:
                 logger.warning(f"[Lark] 删除转换后的视频文件失败: {e}")
@@ -1,6 +1,5 @@
 import asyncio
 import os
-import re
 import uuid
 from collections.abc import AsyncGenerator
 from pathlib import Path
@@ -264,20 +263,5 @@ class LineMessageEvent(AstrMessageEvent):
             await self.send(buffer)
             return await super().send_streaming(generator, use_fallback)
 
-        buffer = ""
-        pattern = re.compile(r"[^。？！~…]+[。？！~…]+")
-
-        async for chain in generator:
-            if isinstance(chain, MessageChain):
-                for comp in chain.chain:
-                    if isinstance(comp, Plain):
-                        buffer += comp.text
-                        if any(p in buffer for p in "。？！~…"):
-                            buffer = await self.process_buffer(buffer, pattern)
-                    else:
-                        await self.send(MessageChain(chain=[comp]))
-                        await asyncio.sleep(1.5)
-
-        if buffer.strip():
-            await self.send(MessageChain([Plain(buffer)]))
+        await self.send_streaming_segmented(generator)
         return await super().send_streaming(generator, use_fallback)
@@ -1,10 +1,7 @@
-import asyncio
-import re
 from collections.abc import AsyncGenerator
 
 from astrbot.api import logger
 from astrbot.api.event import AstrMessageEvent, MessageChain
-from astrbot.api.message_components import Plain
 from astrbot.api.platform import AstrBotMessage, PlatformMetadata
 
 from .misskey_utils import (
@@ -144,20 +141,5 @@ class MisskeyPlatformEvent(AstrMessageEvent):
             await self.send(buffer)
             return await super().send_streaming(generator, use_fallback)
 
-        buffer = ""
-        pattern = re.compile(r"[^。？！~…]+[。？！~…]+")
-
-        async for chain in generator:
-            if isinstance(chain, MessageChain):
-                for comp in chain.chain:
-                    if isinstance(comp, Plain):
-                        buffer += comp.text
-                        if any(p in buffer for p in "。？！~…"):
-                            buffer = await self.process_buffer(buffer, pattern)
-                    else:
-                        await self.send(MessageChain(chain=[comp]))
-                        await asyncio.sleep(1.5)  # 限速
-
-        if buffer.strip():
-            await self.send(MessageChain([Plain(buffer)]))
+        await self.send_streaming_segmented(generator)
         return await super().send_streaming(generator, use_fallback)
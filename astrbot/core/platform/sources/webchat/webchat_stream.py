@@ -0,0 +1,217 @@
+import asyncio
+import json
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable
+
+from astrbot import logger
+
+
+class GenerationStream:
+    """Replayable output of a single webchat generation.
+
+    Events are kept in a bounded ring buffer and addressed by a monotonically
+    increasing offset, so any number of subscribers can follow the same
+    generation and a reconnecting client can resume from the last offset it saw.
+
+    Events evicted from the ring buffer are folded into a compact history in
+    which consecutive streaming text deltas are merged into one event. A late or
+    reconnecting subscriber that fell behind the buffer replays that history
+    first, so it still receives the full text of the generation.
+    """
+
+    def __init__(self, message_id: str, session_id: str, capacity: int = 2048):
+        self.message_id = message_id
+        self.session_id = session_id
+        self._events: deque[dict] = deque(maxlen=capacity)
+        self._start_offset = 0
+        """Offset of the oldest event still held in the buffer"""
+        self._next_offset = 0
+        self._history: list[_CompactedEvent] = []
+        """Evicted events, oldest first, with streaming text deltas merged"""
+        self._changed = asyncio.Event()
+        self.finished = False
+
+    @property
+    def next_offset(self) -> int:
+        return self._next_offset
+
+    def publish(self, event: dict) -> int:
+        """Append an event and wake up subscribers. Returns the event offset."""
+        if self.finished:
+            raise RuntimeError(f"Stream {self.message_id} is already finished")
+        if len(self._events) == self._events.maxlen:
+            self._compact(self._start_offset, self._events[0])
+            self._start_offset += 1
+        self._events.append(event)
+        offset = self._next_offset
+        self._next_offset += 1
+        self._notify()
+        return offset
+
+    def _compact(self, offset: int, event: dict) -> None:
+        last = self._history[-1] if self._history else None
+        if (
+            last is not None
+            and last.last_offset == offset - 1
+            and _is_text_delta(event)
+            and _is_text_delta(last.event)
+            and _same_kind(last.event, event)
+        ):
+            last.append(offset, event["data"])
+        else:
+            self._history.append(_CompactedEvent(offset, event))
+
+    def _replay_history(self, offset: int) -> list[tuple[int, dict]]:
+        """Events evicted at or after ``offset``, each paired with the last
+        offset it covers so that a client resuming from it continues correctly."""
+        replay = []
+        for compacted in self._history:
+            if compacted.last_offset < offset:
+                continue
+            replay.append((compacted.last_offset, compacted.since(offset)))
+        return replay
+
+    def finish(self) -> None:
+        self.finished = True
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self, offset: int = 0) -> AsyncIterator[tuple[int, dict]]:
+        """Yield ``(offset, event)`` pairs starting at ``offset``.
+
+        Events that have already been evicted from the ring buffer are skipped.
+        The iterator ends once the generation is finished and fully replayed.
+        """
+        offset = max(offset, 0)
+        while True:
+            changed = self._changed
+            while True:
+                if offset < self._start_offset:
+                    # The subscriber fell behind the ring buffer
+                    logger.debug(
+                        f"WebChat stream {self.message_id}: replaying evicted offsets "
+                        f"{offset}-{self._start_offset - 1} from compacted history"
+                    )
+                    start_offset = self._start_offset
+                    for item in self._replay_history(offset):
+                        yield item
+                    offset = max(offset, start_offset)
+                    continue
+                if offset >= self._next_offset:
+                    break
+                yield offset, self._events[offset - self._start_offset]
+                offset += 1
+            if self.finished:
+                return
+            await changed.wait()
+
+    async def iter_sse(self, offset: int = 0) -> AsyncIterator[str]:
+        """Subscribe and format events as SSE ``data:`` lines carrying their offset."""
+        async for event_offset, event in self.subscribe(offset):
+            payload = {**event, "offset": event_offset}
+            yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _is_text_delta(event: dict) -> bool:
+    return (
+        event.get("type") == "plain"
+        and bool(event.get("streaming"))
+        and event.get("chain_type") not in ("tool_call", "tool_call_result")
+        and isinstance(event.get("data"), str)
+    )
+
+
+def _same_kind(a: dict, b: dict) -> bool:
+    return a.keys() == b.keys() and all(a[k] == b[k] for k in a if k != "data")
+
+
+class _CompactedEvent:
+    """One evicted event, or a run of merged streaming text deltas."""
+
+    __slots__ = ("first_offset", "last_offset", "event", "_ends")
+
+    def __init__(self, offset: int, event: dict) -> None:
+        self.first_offset = offset
+        self.last_offset = offset
+        self.event = dict(event)
+        self._ends: list[int] | None = None
+        """End position in the merged text of every delta, once merged"""
+
+    def append(self, offset: int, text: str) -> None:
+        if self._ends is None:
+            self._ends = [len(self.event["data"])]
+        self.event["data"] += text
+        self._ends.append(len(self.event["data"]))
+        self.last_offset = offset
+
+    def since(self, offset: int) -> dict:
+        """The event as seen from ``offset``: merged text starts at that delta."""
+        if offset <= self.first_offset or self._ends is None:
+            return self.event
+        start = self._ends[offset - self.first_offset - 1]
+        return {**self.event, "data": self.event["data"][start:]}
+
+
+class WebChatStreamRegistry:
+    """Tracks in-flight generation streams by message ID and session ID.
+
+    Finished streams are kept for ``retention`` seconds so that clients which
+    reconnect shortly after the generation ends can still replay it.
+    """
+
+    def __init__(self, capacity: int = 2048, retention: float = 120.0) -> None:
+        self.capacity = capacity
+        self.retention = retention
+        self._streams: dict[str, GenerationStream] = {}
+        self._session_streams: dict[str, str] = {}
+        """Session ID to the latest message ID mapping"""
+        self._tasks: set[asyncio.Task] = set()
+
+    def create(self, message_id: str, session_id: str) -> GenerationStream:
+        stream = GenerationStream(message_id, session_id, self.capacity)
+        self._streams[message_id] = stream
+        self._session_streams[session_id] = message_id
+        return stream
+
+    def get(self, message_id: str) -> GenerationStream | None:
+        return self._streams.get(message_id)
+
+    def get_by_session(self, session_id: str) -> GenerationStream | None:
+        message_id = self._session_streams.get(session_id)
+        if message_id is None:
+            return None
+        return self._streams.get(message_id)
+
+    def run(self, stream: GenerationStream, producer: Awaitable[None]) -> asyncio.Task:
+        """Run ``producer`` in the background, finishing ``stream`` when it exits.
+
+        The producer is independent of any HTTP connection, so a generation keeps
+        going (and keeps being recorded) after every subscriber has disconnected.
+        """
+
+        async def _run():
+            try:
+                await producer
+            finally:
+                stream.finish()
+                asyncio.get_running_loop().call_later(
+                    self.retention, self._remove, stream.message_id
+                )
+
+        task = asyncio.create_task(_run(), name=f"webchat_stream_{stream.message_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _remove(self, message_id: str) -> None:
+        stream = self._streams.pop(message_id, None)
+        if stream is None:
+            return
+        if self._session_streams.get(stream.session_id) == message_id:
+            self._session_streams.pop(stream.session_id, None)
+
+
+webchat_stream_registry = WebChatStreamRegistry()
@@ -29,13 +29,19 @@ class PlatformMessageHistoryManager:
         user_id: str,
         page: int = 1,
         page_size: int = 200,
+        before_id: int | None = None,
     ) -> list[PlatformMessageHistory]:
-        """Get platform message history for a specific user."""
+        """Get platform message history for a specific user in chronological order.
+
+        Pass the smallest ID of the previous page as ``before_id`` to load the
+        next older page.
+        """
         history = await self.db.get_platform_message_history(
             platform_id=platform_id,
             user_id=user_id,
             page=page,
             page_size=page_size,
+            before_id=before_id,
         )
         history.reverse()
         return history
@@ -0,0 +1,243 @@
+"""Embedding 请求的自适应批处理
+
+:meth:`EmbeddingProvider.get_embeddings_batch` 通过 :class:`EmbeddingBatcher`
+发出请求：
+
+- 按估算的 token 数装箱，每个请求不超过 Provider 的单次 token 上限与条数上限；
+- 并发数按 AIMD 调整：请求顺利且延迟正常时逐步加一，遇到限流（429）时减半；
+- 同一个 Provider 实例的所有调用（知识库导入、检索时的查询向量）共享同一份
+  并发额度与每分钟请求数预算，多个导入同时进行时也不会超出 Provider 的限制。
+"""
+
+import asyncio
+import re
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager
+
+DEFAULT_MAX_TOKENS_PER_REQUEST = 8192
+DEFAULT_MAX_CONCURRENCY = 8
+
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+
+_RATE_LIMIT_RE = re.compile(r"\b429\b|rate.?limit|too many requests", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算文本的 token 数：中日韩字符按每字 1 个，其余按每 4 个字符 1 个。"""
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4 + 1
+
+
+def pack_batches(
+    texts: list[str],
+    max_items: int,
+    max_tokens: int,
+) -> Iterator[tuple[int, int]]:
+    """按条数与估算 token 数装箱，返回每批的 ``(start, end)`` 下标。
+
+    单条文本超过 token 上限时独占一批，由 Provider 自行截断或报错。
+    """
+    start = 0
+    tokens = 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if i > start and (i - start >= max_items or tokens + cost > max_tokens):
+            yield start, i
+            start, tokens = i, 0
+        tokens += cost
+    if start < len(texts):
+        yield start, len(texts)
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """判断异常是否为 Provider 的限流错误（HTTP 429）"""
+    for attr in ("status_code", "status", "code"):
+        if getattr(error, attr, None) == 429:
+            return True
+    return bool(_RATE_LIMIT_RE.search(str(error)))
+
+
+def retry_after(error: BaseException) -> float | None:
+    """读取限流错误中的 Retry-After 秒数"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateBudget:
+    """每分钟请求数预算（令牌桶），可被多个协程共享。
+
+    令牌以 ``rpm / 60`` 每秒的速度补充，桶容量为 ``burst``，默认每次只放行一个请求，
+    请求在一分钟内均匀分布。``rpm`` 为 0 时不限制请求速率，但仍可通过
+    :meth:`pause` 在限流后暂停所有请求。
+    """
+
+    def __init__(self, rpm: int = 0, burst: int = 1) -> None:
+        self.rpm = rpm
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rpm > 0:
+            elapsed = now - self._updated_at
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rpm / 60)
+        self._updated_at = now
+
+    def pause(self, seconds: float) -> None:
+        """在接下来的 ``seconds`` 秒内暂停发放请求额度"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._paused_until - now
+                if wait <= 0:
+                    self._refill(now)
+                    if self.rpm <= 0:
+                        return
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) * 60 / self.rpm
+                await asyncio.sleep(wait)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+class AdaptiveConcurrency:
+    """AIMD 并发控制：成功且延迟正常时每轮加一，限流时减半。"""
+
+    LATENCY_SPIKE_FACTOR = 2.0
+    """延迟超过基线的倍数时视为拥塞，不再增加并发"""
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1) -> None:
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.limit = min(max(initial, minimum), self.maximum)
+        self.in_flight = 0
+        self.baseline_latency: float | None = None
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        baseline = self.baseline_latency
+        self.baseline_latency = (
+            latency
+            if baseline is None
+            else min(latency, baseline * 0.9 + latency * 0.1)
+        )
+        if baseline is not None and latency > baseline * self.LATENCY_SPIKE_FACTOR:
+            self._successes = 0
+            return
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self) -> None:
+        self.limit = max(self.minimum, self.limit // 2)
+        self._successes = 0
+
+
+class EmbeddingBatcher:
+    """为一个 Embedding Provider 共享的批处理引擎"""
+
+    MAX_THROTTLE_RETRIES = 8
+    """限流导致的重试次数上限，不占用调用方的 max_retries"""
+
+    def __init__(
+        self,
+        embed: Callable[[list[str]], Awaitable[list[list[float]]]],
+        max_tokens_per_request: int = DEFAULT_MAX_TOKENS_PER_REQUEST,
+        rpm: int = 0,
+        initial_concurrency: int = 3,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        self.embed = embed
+        self.max_tokens_per_request = max_tokens_per_request
+        self.budget = RateBudget(rpm)
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, max_concurrency)
+
+    async def _request(self, texts: list[str], max_retries: int) -> list[list[float]]:
+        attempt = 0
+        throttled = 0
+        while True:
+            async with self.concurrency.slot():
+                await self.budget.acquire()
+                start = time.monotonic()
+                try:
+                    vectors = await self.embed(texts)
+                except Exception as e:
+                    if is_rate_limited(e) and throttled < self.MAX_THROTTLE_RETRIES:
+                        throttled += 1
+                        self.concurrency.on_throttle()
+                        self.budget.pause(retry_after(e) or min(2**throttled, 60))
+                        continue
+                    attempt += 1
+                    if attempt >= max_retries:
+                        raise
+                else:
+                    self.concurrency.on_success(time.monotonic() - start)
+                    return vectors
+            # 其他错误在释放并发额度后指数退避再重试
+            await asyncio.sleep(2 ** (attempt - 1))
+
+    async def embed_all(
+        self,
+        texts: list[str],
+        max_items: int,
+        max_retries: int = 3,
+        progress_callback=None,
+    ) -> list[list[float]]:
+        """分批获取全部文本的向量，结果与输入顺序一致。"""
+        batches = list(pack_batches(texts, max_items, self.max_tokens_per_request))
+        results: list[list[list[float]]] = [[] for _ in batches]
+        completed = 0
+
+        async def run(idx: int, start: int, end: int) -> None:
+            nonlocal completed
+            try:
+                results[idx] = await self._request(texts[start:end], max_retries)
+            except Exception as e:
+                raise Exception(
+                    f"批次 {idx} 处理失败，已重试 {max_retries} 次: {e!s}"
+                ) from e
+            completed += end - start
+            if progress_callback:
+                await progress_callback(completed, len(texts))
+
+        outcomes = await asyncio.gather(
+            *(run(idx, start, end) for idx, (start, end) in enumerate(batches)),
+            return_exceptions=True,
+        )
+        errors = [r for r in outcomes if isinstance(r, Exception)]
+        if errors:
+            raise Exception(
+                f"有 {len(errors)} 个批次处理失败: {'; '.join(str(e) for e in errors)}"
+            )
+        return [vector for batch in results for vector in batch]
@@ -4,11 +4,7 @@ import base64
 import enum
 import json
 from dataclasses import dataclass, field
-from typing import Any
-
-from anthropic.types import Message as AnthropicMessage
-from google.genai.types import GenerateContentResponse
-from openai.types.chat.chat_completion import ChatCompletion
+from typing import TYPE_CHECKING, Any
 
 import astrbot.core.message.components as Comp
 from astrbot import logger
@@ -23,6 +19,12 @@ from astrbot.core.db.po import Conversation
 from astrbot.core.message.message_event_result import MessageChain
 from astrbot.core.utils.io import download_image_by_url
 
+if TYPE_CHECKING:
+    # 各家 SDK 的类型模块导入开销很大，仅用于类型标注
+    from anthropic.types import Message as AnthropicMessage
+    from google.genai.types import GenerateContentResponse
+    from openai.types.chat.chat_completion import ChatCompletion
+
 
 class ProviderType(enum.Enum):
     CHAT_COMPLETION = "chat_completion"
@@ -6,6 +6,11 @@ from typing import TypeAlias, Union
 
 from astrbot.core.agent.message import ContentPart, Message
 from astrbot.core.agent.tool import ToolSet
+from astrbot.core.provider.embedding_batching import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_TOKENS_PER_REQUEST,
+    EmbeddingBatcher,
+)
 from astrbot.core.provider.entities import (
     LLMResponse,
     ProviderMeta,
@@ -13,7 +18,9 @@ from astrbot.core.provider.entities import (
     ToolCallsResult,
 )
 from astrbot.core.provider.register import provider_cls_map
+from astrbot.core.provider.rerank_batching import RerankBatcher
 from astrbot.core.utils.astrbot_path import get_astrbot_path
+from astrbot.core.utils.temp_file_registry import remove_temp_file
 
 Providers: TypeAlias = Union[
     "Provider",
@@ -296,12 +303,14 @@ class TTSProvider(AbstractProvider):
 
         # 清理测试文件
         try:
-            os.remove(audio_path)
+            remove_temp_file(audio_path)
         except Exception:
             pass
 
 
 class EmbeddingProvider(AbstractProvider):
+    _batcher: EmbeddingBatcher | None = None
+
     def __init__(self, provider_config: dict, provider_settings: dict) -> None:
         super().__init__(provider_config)
         self.provider_config = provider_config
@@ -325,6 +334,31 @@ class EmbeddingProvider(AbstractProvider):
     async def test(self) -> None:
         await self.get_embedding("astrbot")
 
+    def get_batcher(self, initial_concurrency: int = 3) -> EmbeddingBatcher:
+        """获取该 Provider 共享的批处理引擎，所有向量请求共用同一份并发额度与速率预算
+
+        Args:
+            initial_concurrency: 初始并发数，仅在首次创建时生效
+
+        """
+        if self._batcher is None:
+            config = self.provider_config
+            self._batcher = EmbeddingBatcher(
+                self.get_embeddings,
+                max_tokens_per_request=int(
+                    config.get(
+                        "embedding_max_tokens_per_request",
+                        DEFAULT_MAX_TOKENS_PER_REQUEST,
+                    )
+                ),
+                rpm=int(config.get("embedding_rpm", 0)),
+                initial_concurrency=initial_concurrency,
+                max_concurrency=int(
+                    config.get("embedding_max_concurrency", DEFAULT_MAX_CONCURRENCY)
+                ),
+            )
+        return self._batcher
+
     async def get_embeddings_batch(
         self,
         texts: list[str],
@@ -333,67 +367,34 @@ class EmbeddingProvider(AbstractProvider):
         max_retries: int = 3,
         progress_callback=None,
     ) -> list[list[float]]:
-        """批量获取文本的向量，分批处理以节省内存
+        """批量获取文本的向量
+
+        文本按估算的 token 数装箱，单个请求不超过 embedding_max_tokens_per_request；
+        并发数根据延迟与限流（429）自适应调整，并与该 Provider 的其他调用共享
+        embedding_rpm 速率预算。
 
         Args:
             texts: 文本列表
-            batch_size: 每批处理的文本数量
-            tasks_limit: 并发任务数量限制
-            max_retries: 失败时的最大重试次数
+            batch_size: 每个请求最多包含的文本数量
+            tasks_limit: 初始并发数，仅在首次调用时生效，之后由自适应并发控制接管
+            max_retries: 失败时的最大重试次数（限流导致的重试不计入）
             progress_callback: 进度回调函数，接收参数 (current, total)
 
         Returns:
-            向量列表
+            向量列表，与 texts 一一对应
 
         """
-        semaphore = asyncio.Semaphore(tasks_limit)
-        all_embeddings: list[list[float]] = []
-        failed_batches: list[tuple[int, list[str]]] = []
-        completed_count = 0
-        total_count = len(texts)
-
-        async def process_batch(batch_idx: int, batch_texts: list[str]) -> None:
-            nonlocal completed_count
-            async with semaphore:
-                for attempt in range(max_retries):
-                    try:
-                        batch_embeddings = await self.get_embeddings(batch_texts)
-                        all_embeddings.extend(batch_embeddings)
-                        completed_count += len(batch_texts)
-                        if progress_callback:
-                            await progress_callback(completed_count, total_count)
-                        return
-                    except Exception as e:
-                        if attempt == max_retries - 1:
-                            # 最后一次重试失败，记录失败的批次
-                            failed_batches.append((batch_idx, batch_texts))
-                            raise Exception(
-                                f"批次 {batch_idx} 处理失败，已重试 {max_retries} 次: {e!s}",
-                            )
-                        # 等待一段时间后重试，使用指数退避
-                        await asyncio.sleep(2**attempt)
-
-        tasks = []
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i : i + batch_size]
-            batch_idx = i // batch_size
-            tasks.append(process_batch(batch_idx, batch_texts))
-
-        # 收集所有任务的结果，包括失败的任务
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 检查是否有失败的任务
-        errors = [r for r in results if isinstance(r, Exception)]
-        if errors:
-            error_msg = (
-                f"有 {len(errors)} 个批次处理失败: {'; '.join(str(e) for e in errors)}"
-            )
-            raise Exception(error_msg)
-
-        return all_embeddings
+        return await self.get_batcher(tasks_limit).embed_all(
+            texts,
+            max_items=batch_size,
+            max_retries=max_retries,
+            progress_callback=progress_callback,
+        )
 
 
 class RerankProvider(AbstractProvider):
+    _rerank_batcher: RerankBatcher | None = None
+
     def __init__(self, provider_config: dict, provider_settings: dict) -> None:
         super().__init__(provider_config)
         self.provider_config = provider_config
@@ -409,6 +410,40 @@ class RerankProvider(AbstractProvider):
         """获取查询和文档的重排序分数"""
         ...
 
+    def get_rerank_batcher(self) -> RerankBatcher:
+        """获取该 Provider 共享的 Rerank 缓存与请求合并器"""
+        if self._rerank_batcher is None:
+            self._rerank_batcher = RerankBatcher(self.rerank)
+        return self._rerank_batcher
+
+    async def rerank_with_cache(
+        self,
+        query: str,
+        documents: list[str],
+        chunk_ids: list[str],
+        top_n: int | None = None,
+    ) -> list[RerankResult]:
+        """带缓存的重排序，只有未命中缓存的文本块会发送给 Provider
+
+        Args:
+            query: 查询文本
+            documents: 候选文本
+            chunk_ids: 与 documents 一一对应的文本块 ID，作为缓存键
+            top_n: 返回分数最高的前 N 个结果
+
+        Returns:
+            按分数降序排列的结果，index 为在 documents 中的下标
+
+        """
+        scores = await self.get_rerank_batcher().scores(query, chunk_ids, documents)
+        results = [
+            RerankResult(index=idx, relevance_score=score)
+            for idx, score in enumerate(scores)
+            if score is not None
+        ]
+        results.sort(key=lambda r: r.relevance_score, reverse=True)
+        return results[:top_n] if top_n else results
+
     async def test(self) -> None:
         result = await self.rerank("Apple", documents=["apple", "banana"])
         if not result:
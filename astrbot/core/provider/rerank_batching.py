@@ -0,0 +1,155 @@
+"""Rerank 结果缓存与请求合并
+
+:meth:`RerankProvider.rerank_with_cache` 通过 :class:`RerankBatcher` 发出请求：
+
+- 以 (查询哈希, 文本块 ID) 为键缓存相关性分数，带 TTL 与容量上限。每个 Provider
+  实例各有一份缓存，重新加载 Provider 后缓存随之失效；
+- 只把未命中缓存的候选文本块发送给 Provider，命中的部分直接复用；
+- 短时间窗口内对同一查询的并发调用合并为一次请求，正在请求中的文本块不会被
+  重复发送。群聊中多人几乎同时触发相同的检索时，只需一次 Rerank 往返。
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from astrbot.core.provider.entities import RerankResult
+
+DEFAULT_TTL_SECONDS = 600.0
+DEFAULT_MAX_ENTRIES = 20_000
+DEFAULT_BATCH_WINDOW_SECONDS = 0.01
+
+RerankKey = tuple[str, str]
+"""(查询哈希, 文本块 ID)"""
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _PendingBatch:
+    query: str
+    documents: dict[str, str] = field(default_factory=dict)
+    """文本块 ID -> 文本"""
+
+
+class RerankBatcher:
+    """为一个 Rerank Provider 共享的缓存与请求合并器"""
+
+    def __init__(
+        self,
+        rerank: Callable[[str, list[str]], Awaitable[list[RerankResult]]],
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        batch_window: float = DEFAULT_BATCH_WINDOW_SECONDS,
+    ) -> None:
+        self.rerank = rerank
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.batch_window = batch_window
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[RerankKey, tuple[float, float]] = OrderedDict()
+        """键 -> (分数, 过期时间)"""
+        self._inflight: dict[RerankKey, asyncio.Future[float | None]] = {}
+        self._pending: dict[str, _PendingBatch] = {}
+
+    def _get_cached(self, key: RerankKey, now: float) -> float | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        score, expires_at = entry
+        if expires_at <= now:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return score
+
+    def _put_cached(self, key: RerankKey, score: float, now: float) -> None:
+        self._cache[key] = (score, now + self.ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def scores(
+        self,
+        query: str,
+        chunk_ids: list[str],
+        documents: list[str],
+    ) -> list[float | None]:
+        """返回与 documents 一一对应的相关性分数，Provider 未返回分数的位置为 None"""
+        qhash = query_hash(query)
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        scores: dict[str, float | None] = {}
+        waiting: dict[str, asyncio.Future[float | None]] = {}
+
+        for chunk_id, document in zip(chunk_ids, documents):
+            if chunk_id in scores or chunk_id in waiting:
+                continue
+            key = (qhash, chunk_id)
+            cached = self._get_cached(key, now)
+            if cached is not None:
+                self.hits += 1
+                scores[chunk_id] = cached
+                continue
+            self.misses += 1
+            future = self._inflight.get(key)
+            if future is None:
+                future = loop.create_future()
+                # 所有等待方都被取消时避免 "exception was never retrieved" 警告
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                self._inflight[key] = future
+                batch = self._pending.get(qhash)
+                if batch is None:
+                    batch = self._pending[qhash] = _PendingBatch(query=query)
+                    loop.call_later(self.batch_window, self._start_flush, qhash)
+                batch.documents[chunk_id] = document
+            waiting[chunk_id] = future
+
+        if waiting:
+            results = await asyncio.gather(
+                *(asyncio.shield(f) for f in waiting.values()),
+            )
+            scores.update(zip(waiting, results))
+        return [scores[chunk_id] for chunk_id in chunk_ids]
+
+    def _start_flush(self, qhash: str) -> None:
+        batch = self._pending.pop(qhash, None)
+        if batch is not None:
+            asyncio.create_task(self._flush(qhash, batch))
+
+    async def _flush(self, qhash: str, batch: _PendingBatch) -> None:
+        chunk_ids = list(batch.documents)
+        futures = [self._inflight.pop((qhash, chunk_id)) for chunk_id in chunk_ids]
+        try:
+            results = await self.rerank(batch.query, list(batch.documents.values()))
+        except BaseException as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        returned: dict[int, float] = {r.index: r.relevance_score for r in results}
+        now = time.monotonic()
+        for idx, (chunk_id, future) in enumerate(zip(chunk_ids, futures)):
+            score = returned.get(idx)
+            if score is not None:
+                self._put_cached((qhash, chunk_id), score, now)
+            if not future.done():
+                future.set_result(score)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -7,6 +7,7 @@ import edge_tts
 
 from astrbot.core import logger
 from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
+from astrbot.core.utils.temp_file_registry import remove_temp_file
 
 from ..entities import ProviderType
 from ..provider import TTSProvider
@@ -99,7 +100,7 @@ class ProviderEdgeTTS(TTSProvider):
                 logger.debug(f"FFmpeg错误输出: {stderr.decode().strip()}")
                 logger.info(f"[EdgeTTS] 返回值(0代表成功): {p.returncode}")
 
-            os.remove(mp3_path)
+            remove_temp_file(mp3_path)
             if os.path.exists(wav_path) and os.path.getsize(wav_path) > 0:
                 return wav_path
             logger.error("生成的WAV文件不存在或为空")
@@ -111,7 +112,7 @@ class ProviderEdgeTTS(TTSProvider):
             )
             try:
                 if os.path.exists(mp3_path):
-                    os.remove(mp3_path)
+                    remove_temp_file(mp3_path)
             except Exception:
                 pass
             raise RuntimeError(f"FFmpeg 转换失败: {e!s}")
@@ -120,7 +121,7 @@ class ProviderEdgeTTS(TTSProvider):
             logger.error(f"音频生成失败: {e!s}")
             try:
                 if os.path.exists(mp3_path):
-                    os.remove(mp3_path)
+                    remove_temp_file(mp3_path)
             except Exception:
                 pass
             raise RuntimeError(f"音频生成失败: {e!s}")
@@ -6,6 +6,7 @@ import re
 import shlex
 import shutil
 import tempfile
+import time
 import zipfile
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -235,6 +236,7 @@ class SkillManager:
     def _save_config(self, config: dict) -> None:
         with open(self.config_path, "w", encoding="utf-8") as f:
             json.dump(config, f, ensure_ascii=False, indent=4)
+        skill_catalog.invalidate()
 
     def _load_sandbox_skills_cache(self) -> dict:
         if not os.path.exists(self.sandbox_skills_cache_path):
@@ -260,6 +262,7 @@ class SkillManager:
         cache["updated_at"] = datetime.now(timezone.utc).isoformat()
         with open(self.sandbox_skills_cache_path, "w", encoding="utf-8") as f:
             json.dump(cache, f, ensure_ascii=False, indent=2)
+        skill_catalog.invalidate()
 
     def set_sandbox_skills_cache(self, skills: list[dict]) -> None:
         """Persist sandbox skill metadata discovered from runtime side."""
@@ -465,6 +468,7 @@ class SkillManager:
         skill_dir = Path(self.skills_root) / name
         if skill_dir.exists():
             shutil.rmtree(skill_dir)
+            skill_catalog.invalidate()
 
         # Ensure UI consistency even when there is no active sandbox session
         # to refresh cache from runtime side.
@@ -536,6 +540,113 @@ class SkillManager:
                         raise FileExistsError("Skill already exists.")
                     shutil.rmtree(dest_dir)
                 shutil.move(str(src_dir), str(dest_dir))
+                skill_catalog.invalidate()
 
         self.set_skill_active(skill_name, True)
         return skill_name
+
+
+class SkillCatalog:
+    """Process-wide cache of active skills and their rendered prompts.
+
+    ``list_skills`` reads the skills config, the sandbox skills cache and every
+    ``SKILL.md`` on each call. The catalog keeps the result per runtime and the
+    output of :func:`build_skills_prompt` per (runtime, persona skill filter),
+    and rebuilds only when a fingerprint of the involved files' mtimes changes.
+    The fingerprint is re-checked at most every ``CHECK_INTERVAL`` seconds;
+    writes made through :class:`SkillManager` invalidate the catalog at once.
+    """
+
+    CHECK_INTERVAL = 2.0
+
+    def __init__(self, skills_root: str | None = None) -> None:
+        self._skills_root = skills_root
+        self._manager: SkillManager | None = None
+        self._fingerprint: tuple | None = None
+        self._checked_at = 0.0
+        self._skills: dict[str, list[SkillInfo]] = {}
+        self._prompts: dict[tuple[str, frozenset[str] | None], str] = {}
+
+    @property
+    def manager(self) -> SkillManager:
+        if self._manager is None:
+            self._manager = SkillManager(skills_root=self._skills_root)
+        return self._manager
+
+    def invalidate(self) -> None:
+        self._fingerprint = None
+        self._checked_at = 0.0
+
+    def _compute_fingerprint(self) -> tuple:
+        mgr = self.manager
+
+        def stat(path: str) -> tuple[int, int] | None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            return st.st_mtime_ns, st.st_size
+
+        skill_files = []
+        try:
+            with os.scandir(mgr.skills_root) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        skill_md = os.path.join(entry.path, "SKILL.md")
+                        skill_files.append((entry.name, stat(skill_md)))
+        except OSError:
+            pass
+        skill_files.sort()
+        return (
+            stat(mgr.config_path),
+            stat(mgr.sandbox_skills_cache_path),
+            stat(mgr.skills_root),
+            tuple(skill_files),
+        )
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if (
+            self._fingerprint is not None
+            and now - self._checked_at < self.CHECK_INTERVAL
+        ):
+            return
+        self._checked_at = now
+        fingerprint = self._compute_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._skills.clear()
+            self._prompts.clear()
+            self._fingerprint = fingerprint
+
+    def list_active_skills(self, runtime: str = "local") -> list[SkillInfo]:
+        self._refresh()
+        skills = self._skills.get(runtime)
+        if skills is None:
+            skills = self.manager.list_skills(active_only=True, runtime=runtime)
+            # list_skills may persist newly discovered skills to the config
+            self._fingerprint = self._compute_fingerprint()
+            self._skills[runtime] = skills
+        return skills
+
+    def get_skills_prompt(
+        self,
+        runtime: str = "local",
+        allowed: list[str] | None = None,
+    ) -> str:
+        """Return the skills prompt for a runtime, or "" if no skill applies.
+
+        ``allowed`` is the persona's skill filter; ``None`` allows all skills.
+        """
+        key = (runtime, frozenset(allowed) if allowed is not None else None)
+        self._refresh()
+        prompt = self._prompts.get(key)
+        if prompt is None:
+            skills = self.list_active_skills(runtime)
+            if key[1] is not None:
+                skills = [skill for skill in skills if skill.name in key[1]]
+            prompt = build_skills_prompt(skills) if skills else ""
+            self._prompts[key] = prompt
+        return prompt
+
+
+skill_catalog = SkillCatalog()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from dataclasses import dataclass, field
 from types import ModuleType
 from typing import TYPE_CHECKING
@@ -67,6 +69,37 @@ class StarMetadata:
     astrbot_version: str | None = None
     """插件要求的 AstrBot 版本范围（PEP 440 specifier，如 >=4.13.0,<4.17.0）"""
 
+    lazy_init: bool = False
+    """是否延迟到插件的 Handler 首次被触发时才执行 initialize()"""
+
+    startup_timings: dict[str, float] = field(default_factory=dict, compare=False)
+    """插件各载入阶段（import / register / initialize）的耗时，单位秒"""
+
+    _init_task: asyncio.Task | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    async def ensure_initialized(self) -> None:
+        """执行插件的 initialize()。并发或重复调用时只会执行一次。"""
+        if self._init_task is None:
+            if self.star_cls is None:
+                return
+            self._init_task = asyncio.create_task(self._initialize())
+            self._init_task.add_done_callback(self._on_init_done)
+        await asyncio.shield(self._init_task)
+
+    def _on_init_done(self, task: asyncio.Task) -> None:
+        # 初始化失败或被取消时清除任务，下次调用会重新执行 initialize()
+        if task.cancelled() or task.exception() is not None:
+            if self._init_task is task:
+                self._init_task = None
+
+    async def _initialize(self) -> None:
+        assert self.star_cls is not None
+        start = time.perf_counter()
+        await self.star_cls.initialize()
+        self.startup_timings["initialize"] = time.perf_counter() - start
+
     def __str__(self) -> str:
         return f"Plugin {self.name} ({self.version}) by {self.author}: {self.desc}"
 
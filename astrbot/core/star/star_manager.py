@@ -1,12 +1,15 @@
 """插件的重载、启停、安装、卸载等操作。"""
 
 import asyncio
+import contextlib
 import functools
+import hashlib
 import inspect
 import json
 import logging
 import os
 import sys
+import time
 import traceback
 from types import ModuleType
 
@@ -78,15 +81,24 @@ async def _install_requirements_with_precheck(
     *,
     plugin_label: str,
     requirements_path: str,
+    install_lock: asyncio.Lock | None = None,
 ) -> None:
+    """预检查插件依赖，仅在有缺失时安装。
+
+    预检查在线程中执行，可与其他插件的预检查并发；传入 ``install_lock`` 时
+    实际的 pip 安装会串行执行。
+    """
     try:
-        missing = find_missing_requirements_or_raise(requirements_path)
+        missing = await asyncio.to_thread(
+            find_missing_requirements_or_raise, requirements_path
+        )
     except RequirementsPrecheckFailed:
         logger.info(
             f"正在安装插件 {plugin_label} 的依赖库（预检查失败，回退到完整安装）: "
             f"{requirements_path}"
         )
-        await pip_installer.install(requirements_path=requirements_path)
+        async with install_lock or contextlib.nullcontext():
+            await pip_installer.install(requirements_path=requirements_path)
         return
 
     if not missing:
@@ -97,7 +109,36 @@ async def _install_requirements_with_precheck(
         f"检测到插件 {plugin_label} 缺失依赖，正在按 requirements.txt 安装: "
         f"{requirements_path} -> {sorted(missing)}"
     )
-    await pip_installer.install(requirements_path=requirements_path)
+    async with install_lock or contextlib.nullcontext():
+        await pip_installer.install(requirements_path=requirements_path)
+
+
+def _wrap_lazy_init_handler(handler, metadata: StarMetadata):
+    """包装延迟初始化插件的 Handler，在首次调用前执行插件的 initialize()。"""
+    if inspect.isasyncgenfunction(handler):
+
+        @functools.wraps(handler)
+        async def async_gen_wrapper(*args, **kwargs):
+            await metadata.ensure_initialized()
+            async for item in handler(*args, **kwargs):
+                yield item
+
+        return async_gen_wrapper
+
+    @functools.wraps(handler)
+    async def wrapper(*args, **kwargs):
+        await metadata.ensure_initialized()
+        result = handler(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    return wrapper
+
+
+def _hash_requirements_file(requirements_path: str) -> str:
+    with open(requirements_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
 
 
 class PluginManager:
@@ -129,6 +170,12 @@ class PluginManager:
         """加载失败插件的信息，用于后续可能的热重载"""
 
         self.failed_plugin_info = ""
+
+        self._satisfied_requirements: dict[str, str] = {}
+        """已确认满足的 requirements.txt 路径 -> 文件内容哈希"""
+        self._requirements_install_lock = asyncio.Lock()
+        """pip 安装互斥锁，依赖预检查可以并发，但安装需要串行"""
+
         if os.getenv("ASTRBOT_RELOAD", "0") == "1":
             asyncio.create_task(self._watch_plugins_changes())
 
@@ -248,9 +295,17 @@ class PluginManager:
         else:
             for p in self.context.get_all_stars():
                 to_update.append(p.root_dir_name)
-        for p in to_update:
-            plugin_path = os.path.join(plugin_dir, p)
-            await self._ensure_plugin_requirements(plugin_path, p)
+        # 各插件的依赖预检查并发执行，全部完成后再抛出第一个错误
+        results = await asyncio.gather(
+            *(
+                self._ensure_plugin_requirements(os.path.join(plugin_dir, p), p)
+                for p in to_update
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
         return True
 
     async def _ensure_plugin_requirements(
@@ -262,11 +317,18 @@ class PluginManager:
         if not os.path.exists(requirements_path):
             return
 
+        requirements_hash = _hash_requirements_file(requirements_path)
+        if self._satisfied_requirements.get(requirements_path) == requirements_hash:
+            logger.debug(f"插件 {plugin_label} 的依赖文件未变化，跳过检查。")
+            return
+
         try:
             await _install_requirements_with_precheck(
                 plugin_label=plugin_label,
                 requirements_path=requirements_path,
+                install_lock=self._requirements_install_lock,
             )
+            self._satisfied_requirements[requirements_path] = requirements_hash
         except asyncio.CancelledError:
             raise
         except DependencyConflictError as e:
@@ -309,6 +371,8 @@ class PluginManager:
                         f"插件 {root_dir_name} 已安装依赖恢复失败，将重新安装依赖: {recover_exc!s}"
                     )
 
+            # 导入失败说明依赖并不满足，不能沿用之前的检查结果
+            self._satisfied_requirements.pop(requirements_path, None)
             await self._check_plugin_dept_update(target_plugin=root_dir_name)
             return __import__(path, fromlist=[module_str])
 
@@ -367,6 +431,7 @@ class PluginManager:
                     if isinstance(metadata.get("astrbot_version"), str)
                     else None
                 ),
+                lazy_init=metadata.get("lazy_init") is True,
             )
 
         return metadata
@@ -664,6 +729,8 @@ class PluginManager:
             return False, "未找到任何插件模块"
 
         has_load_error = False
+        # 已完成注册、等待执行 initialize() 的插件
+        registered: list[tuple[StarMetadata, str, str, bool, str]] = []
 
         # 导入插件模块，并尝试实例化插件类
         for plugin_module in plugin_modules:
@@ -692,6 +759,8 @@ class PluginManager:
                     continue
 
                 logger.info(f"正在载入插件 {root_dir_name} ...")
+                timings: dict[str, float] = {}
+                stage_start = time.perf_counter()
 
                 # 尝试导入模块
                 try:
@@ -721,6 +790,8 @@ class PluginManager:
                         if metadata in star_registry:
                             star_registry.remove(metadata)
                     continue
+                timings["import"] = time.perf_counter() - stage_start
+                stage_start = time.perf_counter()
 
                 # 检查 _conf_schema.json
                 plugin_config = None
@@ -758,6 +829,7 @@ class PluginManager:
                             metadata.display_name = metadata_yaml.display_name
                             metadata.support_platforms = metadata_yaml.support_platforms
                             metadata.astrbot_version = metadata_yaml.astrbot_version
+                            metadata.lazy_init = metadata_yaml.lazy_init
                     except Exception as e:
                         logger.warning(
                             f"插件 {root_dir_name} 元数据载入失败: {e!s}。使用默认元数据。",
@@ -830,6 +902,10 @@ class PluginManager:
                             handler.handler,
                             metadata.star_cls,  # type: ignore
                         )
+                        if metadata.lazy_init:
+                            handler.handler = _wrap_lazy_init_handler(
+                                handler.handler, metadata
+                            )
                     # 绑定 llm_tool handler
                     for func_tool in llm_tools.func_list:
                         if isinstance(func_tool, HandoffTool):
@@ -852,6 +928,10 @@ class PluginManager:
                                     ft.handler,
                                     metadata.star_cls,  # type: ignore
                                 )
+                                if metadata.lazy_init:
+                                    ft.handler = _wrap_lazy_init_handler(
+                                        ft.handler, metadata
+                                    )
                             if ft.name in inactivated_llm_tools:
                                 ft.active = False
 
@@ -899,6 +979,8 @@ class PluginManager:
                             )
 
                     metadata.star_cls = obj
+                    # 旧版插件的 Handler 不经过绑定流程，不支持延迟初始化
+                    metadata.lazy_init = False
                     metadata.config = plugin_config
                     metadata.module = module
                     metadata.root_dir_name = root_dir_name
@@ -956,46 +1038,57 @@ class PluginManager:
                         )
 
                 metadata.star_handler_full_names = full_names
-
-                # 执行 initialize() 方法
-                if hasattr(metadata.star_cls, "initialize") and metadata.star_cls:
-                    await metadata.star_cls.initialize()
-
-                # 触发插件加载事件
-                handlers = star_handlers_registry.get_handlers_by_event_type(
-                    EventType.OnPluginLoadedEvent,
+                timings["register"] = time.perf_counter() - stage_start
+                metadata.startup_timings = timings
+                registered.append(
+                    (metadata, root_dir_name, plugin_dir_path, reserved, path)
                 )
-                for handler in handlers:
-                    try:
-                        logger.info(
-                            f"hook(on_plugin_loaded) -> {star_map[handler.handler_module_path].name} - {handler.handler_name}",
-                        )
-                        await handler.handler(metadata)
-                    except Exception:
-                        logger.error(traceback.format_exc())
 
             except BaseException as e:
-                logger.error(f"----- 插件 {root_dir_name} 载入失败 -----")
-                errors = traceback.format_exc()
-                for line in errors.split("\n"):
-                    logger.error(f"| {line}")
-                logger.error("----------------------------------")
                 has_load_error = True
-                self.failed_plugin_dict[root_dir_name] = (
-                    self._build_failed_plugin_record(
-                        root_dir_name=root_dir_name,
-                        plugin_dir_path=plugin_dir_path,
-                        reserved=reserved,
-                        error=e,
-                        error_trace=errors,
-                    )
+                self._handle_plugin_load_failure(
+                    root_dir_name=root_dir_name,
+                    plugin_dir_path=plugin_dir_path,
+                    reserved=reserved,
+                    path=path,
+                    error=e,
+                    error_trace=traceback.format_exc(),
                 )
-                # 记录注册失败的插件名称，以便后续重载插件
-                if path in star_map:
-                    logger.info("失败插件依旧在插件列表中，正在清理...")
-                    metadata = star_map.pop(path)
-                    if metadata in star_registry:
-                        star_registry.remove(metadata)
+
+        # 并发执行各插件的 initialize()，单个插件初始化缓慢不会拖慢其他插件
+        init_results = await asyncio.gather(
+            *(self._initialize_plugin(item[0]) for item in registered),
+            return_exceptions=True,
+        )
+        for (metadata, root_dir_name, plugin_dir_path, reserved, path), result in zip(
+            registered, init_results
+        ):
+            if isinstance(result, BaseException):
+                has_load_error = True
+                self._handle_plugin_load_failure(
+                    root_dir_name=root_dir_name,
+                    plugin_dir_path=plugin_dir_path,
+                    reserved=reserved,
+                    path=path,
+                    error=result,
+                    error_trace="".join(traceback.format_exception(result)),
+                )
+                continue
+
+            # 触发插件加载事件
+            handlers = star_handlers_registry.get_handlers_by_event_type(
+                EventType.OnPluginLoadedEvent,
+            )
+            for handler in handlers:
+                try:
+                    logger.info(
+                        f"hook(on_plugin_loaded) -> {star_map[handler.handler_module_path].name} - {handler.handler_name}",
+                    )
+                    await handler.handler(metadata)
+                except Exception:
+                    logger.error(traceback.format_exc())
+
+        self._log_startup_timings([item[0] for item in registered])
 
         # 清除 pip.main 导致的多余的 logging handlers
         for handler in logging.root.handlers[:]:
@@ -1011,6 +1104,63 @@ class PluginManager:
             return False, self.failed_plugin_info
         return True, None
 
+    def _handle_plugin_load_failure(
+        self,
+        *,
+        root_dir_name: str,
+        plugin_dir_path: str,
+        reserved: bool,
+        path: str,
+        error: BaseException,
+        error_trace: str,
+    ) -> None:
+        logger.error(f"----- 插件 {root_dir_name} 载入失败 -----")
+        for line in error_trace.split("\n"):
+            logger.error(f"| {line}")
+        logger.error("----------------------------------")
+        self.failed_plugin_dict[root_dir_name] = self._build_failed_plugin_record(
+            root_dir_name=root_dir_name,
+            plugin_dir_path=plugin_dir_path,
+            reserved=reserved,
+            error=error,
+            error_trace=error_trace,
+        )
+        # 记录注册失败的插件名称，以便后续重载插件
+        if path in star_map:
+            logger.info("失败插件依旧在插件列表中，正在清理...")
+            metadata = star_map.pop(path)
+            if metadata in star_registry:
+                star_registry.remove(metadata)
+
+    @staticmethod
+    async def _initialize_plugin(metadata: StarMetadata) -> None:
+        if metadata.star_cls is None or not hasattr(metadata.star_cls, "initialize"):
+            return
+        if metadata.lazy_init:
+            logger.info(
+                f"插件 {metadata.name} 声明了延迟初始化，将在其 Handler 首次触发时执行 initialize()。"
+            )
+            return
+        await metadata.ensure_initialized()
+
+    @staticmethod
+    def _log_startup_timings(loaded: list[StarMetadata]) -> None:
+        """输出各插件载入耗时，按总耗时从高到低排列。"""
+        if len(loaded) <= 1:
+            return
+        rows = sorted(
+            loaded,
+            key=lambda md: sum(md.startup_timings.values()),
+            reverse=True,
+        )
+        lines = [
+            f"  {md.root_dir_name}: {sum(md.startup_timings.values()):.3f}s ("
+            + ", ".join(f"{k} {v:.3f}s" for k, v in md.startup_timings.items())
+            + ")"
+            for md in rows
+        ]
+        logger.info("插件载入耗时：\n" + "\n".join(lines))
+
     async def _cleanup_failed_plugin_install(
         self,
         dir_name: str,
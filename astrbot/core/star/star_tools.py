@@ -28,12 +28,6 @@ from astrbot.api.platform import AstrBotMessage, MessageMember, MessageType
 from astrbot.core.message.components import BaseMessageComponent
 from astrbot.core.message.message_event_result import MessageChain
 from astrbot.core.platform.astr_message_event import MessageSesion
-from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_message_event import (
-    AiocqhttpMessageEvent,
-)
-from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_platform_adapter import (
-    AiocqhttpAdapter,
-)
 from astrbot.core.star.context import Context
 from astrbot.core.star.star import star_map
 from astrbot.core.utils.astrbot_path import get_astrbot_data_path
@@ -103,6 +97,14 @@ class StarTools:
             raise ValueError("StarTools not initialized")
         platforms = cls._context.platform_manager.get_insts()
         if platform == "aiocqhttp":
+            # 仅在用到时导入，避免未启用 aiocqhttp 的部署也加载其适配器
+            from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_message_event import (
+                AiocqhttpMessageEvent,
+            )
+            from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_platform_adapter import (
+                AiocqhttpAdapter,
+            )
+
             adapter = next(
                 (p for p in platforms if isinstance(p, AiocqhttpAdapter)),
                 None,
@@ -114,6 +116,7 @@ class StarTools:
                 message_chain=message_chain,
                 is_group=(type == "GroupMessage"),
                 session_id=id,
+                scheduler=adapter.send_scheduler,
             )
         else:
             raise ValueError(f"不支持的平台: {platform}")
@@ -183,6 +186,13 @@ class StarTools:
             raise ValueError("StarTools not initialized")
         platforms = cls._context.platform_manager.get_insts()
         if platform == "aiocqhttp":
+            from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_message_event import (
+                AiocqhttpMessageEvent,
+            )
+            from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_platform_adapter import (
+                AiocqhttpAdapter,
+            )
+
             adapter = next(
                 (p for p in platforms if isinstance(p, AiocqhttpAdapter)),
                 None,
@@ -1,15 +1,102 @@
 import fnmatch
+import re
+from collections import OrderedDict
 
 from astrbot.core.utils.shared_preferences import SharedPreferences
 
+_WILDCARD_CHARS = frozenset("*?[")
+
+_SegmentMatcher = str | re.Pattern | None
+"""None 匹配任意值，str 精确匹配，re.Pattern 为预编译的通配符模式"""
+
+
+def _compile_segment(pattern: str) -> _SegmentMatcher:
+    if pattern == "" or pattern == "*":
+        return None
+    if _WILDCARD_CHARS.isdisjoint(pattern):
+        return pattern
+    return re.compile(fnmatch.translate(pattern))
+
+
+def _segment_matches(matcher: _SegmentMatcher, value: str) -> bool:
+    if matcher is None:
+        return True
+    if isinstance(matcher, str):
+        return matcher == value
+    return matcher.match(value) is not None
+
+
+class _CompiledRoutes:
+    """编译后的路由表。
+
+    不含通配符的规则放入精确匹配字典；含通配符的规则按平台段分组并预编译。
+    多条规则都能匹配时，与原始路由表一样取排在最前面的一条。
+    """
+
+    def __init__(self, routing: dict[str, str]) -> None:
+        self.exact: dict[str, tuple[int, str]] = {}
+        self.by_platform: dict[str, list[tuple[int, tuple, str]]] = {}
+        """平台段为字面值的通配规则，按平台 ID 分组"""
+        self.any_platform: list[tuple[int, tuple, str]] = []
+        """平台段本身含通配符（或为空）的规则"""
+
+        for index, (pattern, conf_id) in enumerate(routing.items()):
+            parts = pattern.split(":")
+            if len(parts) != 3:
+                continue
+            matchers = tuple(_compile_segment(p) for p in parts)
+            if all(isinstance(m, str) for m in matchers):
+                self.exact.setdefault(pattern, (index, conf_id))
+                continue
+            platform = matchers[0]
+            if isinstance(platform, str):
+                self.by_platform.setdefault(platform, []).append(
+                    (index, matchers[1:], conf_id)
+                )
+            else:
+                self.any_platform.append((index, matchers, conf_id))
+
+    def resolve(self, umo: str) -> str | None:
+        parts = umo.split(":")
+        if len(parts) != 3:
+            return None
+        best_index: float = float("inf")
+        best_conf_id = None
+        if (exact := self.exact.get(umo)) is not None:
+            best_index, best_conf_id = exact
+
+        for index, matchers, conf_id in self.by_platform.get(parts[0], ()):
+            if index >= best_index:
+                break
+            if all(_segment_matches(m, v) for m, v in zip(matchers, parts[1:])):
+                best_index, best_conf_id = index, conf_id
+                break
+
+        for index, matchers, conf_id in self.any_platform:
+            if index >= best_index:
+                break
+            if all(_segment_matches(m, v) for m, v in zip(matchers, parts)):
+                best_index, best_conf_id = index, conf_id
+                break
+
+        return best_conf_id
+
 
 class UmopConfigRouter:
-    """UMOP 配置路由器"""
+    """UMOP 配置路由器
+
+    路由表会被编译为精确匹配字典与分组的通配符匹配器，
+    并以 LRU 缓存已解析过的 umo，路由表变更时缓存失效。
+    """
+
+    RESOLVE_CACHE_SIZE = 4096
 
     def __init__(self, sp: SharedPreferences) -> None:
         self.umop_to_conf_id: dict[str, str] = {}
         """UMOP 到配置文件 ID 的映射"""
         self.sp = sp
+        self._compiled = _CompiledRoutes({})
+        self._resolve_cache: OrderedDict[str, str | None] = OrderedDict()
 
     async def initialize(self) -> None:
         await self._load_routing_table()
@@ -24,16 +111,12 @@ class UmopConfigRouter:
             scope_id="global",
         )
         self.umop_to_conf_id = sp_data
+        self._rebuild()
 
-    def _is_umo_match(self, p1: str, p2: str) -> bool:
-        """判断 p2 umo 是否逻辑包含于 p1 umo"""
-        p1_ls = p1.split(":")
-        p2_ls = p2.split(":")
-
-        if len(p1_ls) != 3 or len(p2_ls) != 3:
-            return False  # 非法格式
-
-        return all(p == "" or fnmatch.fnmatchcase(t, p) for p, t in zip(p1_ls, p2_ls))
+    def _rebuild(self) -> None:
+        """重新编译路由表并清空解析缓存"""
+        self._compiled = _CompiledRoutes(self.umop_to_conf_id)
+        self._resolve_cache.clear()
 
     def get_conf_id_for_umop(self, umo: str) -> str | None:
         """根据 UMO 获取对应的配置文件 ID
@@ -45,10 +128,15 @@ class UmopConfigRouter:
             str | None: 配置文件 ID，如果没有找到则返回 None
 
         """
-        for pattern, conf_id in self.umop_to_conf_id.items():
-            if self._is_umo_match(pattern, umo):
-                return conf_id
-        return None
+        cache = self._resolve_cache
+        if umo in cache:
+            cache.move_to_end(umo)
+            return cache[umo]
+        conf_id = self._compiled.resolve(umo)
+        cache[umo] = conf_id
+        if len(cache) > self.RESOLVE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return conf_id
 
     async def update_routing_data(self, new_routing: dict[str, str]) -> None:
         """更新路由表
@@ -68,6 +156,7 @@ class UmopConfigRouter:
                 )
 
         self.umop_to_conf_id = new_routing
+        self._rebuild()
         await self.sp.global_put("umop_config_routing", self.umop_to_conf_id)
 
     async def update_route(self, umo: str, conf_id: str) -> None:
@@ -87,6 +176,7 @@ class UmopConfigRouter:
             )
 
         self.umop_to_conf_id[umo] = conf_id
+        self._rebuild()
         await self.sp.global_put("umop_config_routing", self.umop_to_conf_id)
 
     async def delete_route(self, umo: str) -> None:
@@ -106,4 +196,5 @@ class UmopConfigRouter:
 
         if umo in self.umop_to_conf_id:
             del self.umop_to_conf_id[umo]
+            self._rebuild()
             await self.sp.global_put("umop_config_routing", self.umop_to_conf_id)
@@ -0,0 +1,176 @@
+"""图片描述缓存
+
+以 (图片描述 Provider ID, 提示词哈希, 图片内容哈希) 为键，把图片描述持久化在
+``data/image_caption_cache.db`` 中。同一张图片被引用、重复发送或在连续几轮对话中
+出现时直接复用已有描述，不再调用视觉模型。
+
+- 内存中保留最近使用的条目，数据库条目数超过上限时按最近使用时间淘汰（LRU）；
+- 并发请求同一张图片的描述时只发出一次请求，其余调用等待该请求的结果；
+- 本地图片按文件内容计算哈希，远程 URL 与 base64 按字符串计算哈希。
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextlib import closing
+
+from astrbot.core import logger
+from astrbot.core.utils.astrbot_path import get_astrbot_data_path
+from astrbot.core.utils.image_ref_utils import resolve_file_url_path
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MEMORY_ENTRIES = 512
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_image_ref(image_ref: str) -> str:
+    """计算图片的内容哈希，本地文件读取文件内容，其他引用直接对字符串计算哈希"""
+    path = resolve_file_url_path(image_ref)
+    hasher = hashlib.sha256()
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            while block := f.read(_HASH_BLOCK_SIZE):
+                hasher.update(block)
+    else:
+        hasher.update(image_ref.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+class ImageCaptionCache:
+    """持久化的图片描述缓存，带 LRU 容量上限与请求合并"""
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ) -> None:
+        self.db_path = db_path or os.path.join(
+            get_astrbot_data_path(),
+            "image_caption_cache.db",
+        )
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+        self._initialized = False
+
+    @staticmethod
+    def make_key(provider_id: str, prompt: str, image_hash: str) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"{provider_id}:{prompt_hash}:{image_hash}"
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS image_captions ("
+                "key TEXT PRIMARY KEY, caption TEXT NOT NULL, last_used_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_image_captions_last_used_at "
+                "ON image_captions (last_used_at)"
+            )
+            self._initialized = True
+        return conn
+
+    def _db_get(self, key: str) -> str | None:
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT caption FROM image_captions WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE image_captions SET last_used_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            return row[0]
+
+    def _db_put(self, key: str, caption: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO image_captions (key, caption, last_used_at) "
+                "VALUES (?, ?, ?)",
+                (key, caption, time.time()),
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM image_captions").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM image_captions WHERE key IN ("
+                    "SELECT key FROM image_captions ORDER BY last_used_at LIMIT ?)",
+                    (excess,),
+                )
+
+    def _remember(self, key: str, caption: str) -> None:
+        self._memory[key] = caption
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get_or_caption(
+        self,
+        provider_id: str,
+        prompt: str,
+        image_ref: str,
+        caption: Callable[[], Awaitable[str]],
+    ) -> str:
+        """返回图片描述，未命中缓存时调用 caption 生成并写入缓存
+
+        空描述不会被缓存。生成描述失败时异常会传递给所有等待该图片的调用方。
+        """
+        image_hash = await asyncio.to_thread(hash_image_ref, image_ref)
+        key = self.make_key(provider_id, prompt, image_hash)
+        if (cached := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load_or_caption(key, caption))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task[str]) -> None:
+        self._inflight.pop(key, None)
+        # 所有等待方都被取消时避免 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
+
+    async def _load_or_caption(
+        self,
+        key: str,
+        caption: Callable[[], Awaitable[str]],
+    ) -> str:
+        try:
+            cached = await asyncio.to_thread(self._db_get, key)
+        except Exception as e:
+            logger.warning(f"读取图片描述缓存失败: {e}")
+            cached = None
+        if cached is not None:
+            self.hits += 1
+            self._remember(key, cached)
+            return cached
+
+        self.misses += 1
+        result = await caption()
+        if result:
+            self._remember(key, result)
+            try:
+                await asyncio.to_thread(self._db_put, key, result)
+            except Exception as e:
+                logger.warning(f"写入图片描述缓存失败: {e}")
+        return result
+
+
+image_caption_cache = ImageCaptionCache()
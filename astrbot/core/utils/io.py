@@ -15,6 +15,7 @@ import psutil
 from PIL import Image
 
 from .astrbot_path import get_astrbot_data_path, get_astrbot_path, get_astrbot_temp_path
+from .temp_file_registry import register_temp_file
 
 logger = logging.getLogger("astrbot")
 
@@ -60,6 +61,7 @@ def save_temp_img(img: Image.Image | bytes) -> str:
     else:
         with open(p, "wb") as f:
             f.write(img)
+    register_temp_file(p)
     return p
 
 
@@ -85,6 +87,7 @@ async def download_image_by_url(
                         return save_temp_img(await resp.read())
                     with open(path, "wb") as f:
                         f.write(await resp.read())
+                    register_temp_file(path)
                     return path
             else:
                 async with session.get(url) as resp:
@@ -92,6 +95,7 @@ async def download_image_by_url(
                         return save_temp_img(await resp.read())
                     with open(path, "wb") as f:
                         f.write(await resp.read())
+                    register_temp_file(path)
                     return path
     except (aiohttp.ClientConnectorSSLError, aiohttp.ClientConnectorCertificateError):
         # 关闭SSL验证（仅在证书验证失败时作为fallback）
@@ -111,6 +115,7 @@ async def download_image_by_url(
                         return save_temp_img(await resp.read())
                     with open(path, "wb") as f:
                         f.write(await resp.read())
+                    register_temp_file(path)
                     return path
             else:
                 async with session.get(url, ssl=ssl_context) as resp:
@@ -118,6 +123,7 @@ async def download_image_by_url(
                         return save_temp_img(await resp.read())
                     with open(path, "wb") as f:
                         f.write(await resp.read())
+                    register_temp_file(path)
                     return path
     except Exception as e:
         raise e
@@ -195,6 +201,7 @@ async def download_file(url: str, path: str, show_progress: bool = False) -> Non
                                 f"\r下载进度: {downloaded_size / total_size:.2%} 速度: {speed:.2f} KB/s",
                                 end="",
                             )
+    register_temp_file(path)
     if show_progress:
         print()
 
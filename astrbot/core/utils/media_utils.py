@@ -11,6 +11,10 @@ from pathlib import Path
 
 from astrbot import logger
 from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
+from astrbot.core.utils.temp_file_registry import (
+    register_temp_file,
+    remove_temp_file,
+)
 
 
 async def get_media_duration(file_path: str) -> int | None:
@@ -110,7 +114,7 @@ async def convert_audio_to_opus(audio_path: str, output_path: str | None = None)
             # 清理可能已生成但无效的临时文件
             if output_path and os.path.exists(output_path):
                 try:
-                    os.remove(output_path)
+                    remove_temp_file(output_path)
                     logger.debug(
                         f"[Media Utils] 已清理失败的opus输出文件: {output_path}"
                     )
@@ -122,6 +126,7 @@ async def convert_audio_to_opus(audio_path: str, output_path: str | None = None)
             raise Exception(f"ffmpeg conversion failed: {error_msg}")
 
         logger.debug(f"[Media Utils] 音频转换成功: {audio_path} -> {output_path}")
+        register_temp_file(output_path)
         return output_path
 
     except FileNotFoundError:
@@ -185,7 +190,7 @@ async def convert_video_format(
             # 清理可能已生成但无效的临时文件
             if output_path and os.path.exists(output_path):
                 try:
-                    os.remove(output_path)
+                    remove_temp_file(output_path)
                     logger.debug(
                         f"[Media Utils] 已清理失败的{output_format}输出文件: {output_path}"
                     )
@@ -199,6 +204,7 @@ async def convert_video_format(
             raise Exception(f"ffmpeg conversion failed: {error_msg}")
 
         logger.debug(f"[Media Utils] 视频转换成功: {video_path} -> {output_path}")
+        register_temp_file(output_path)
         return output_path
 
     except FileNotFoundError:
@@ -251,12 +257,13 @@ async def convert_audio_format(
         if process.returncode != 0:
             if output_path and os.path.exists(output_path):
                 try:
-                    os.remove(output_path)
+                    remove_temp_file(output_path)
                 except OSError as e:
                     logger.warning(f"[Media Utils] 清理失败的音频输出文件时出错: {e}")
             error_msg = stderr.decode() if stderr else "未知错误"
             raise Exception(f"ffmpeg conversion failed: {error_msg}")
         logger.debug(f"[Media Utils] 音频转换成功: {audio_path} -> {output_path}")
+        register_temp_file(output_path)
         return output_path
     except FileNotFoundError:
         raise Exception("ffmpeg not found")
@@ -308,11 +315,12 @@ async def extract_video_cover(
         if process.returncode != 0:
             if output_path and os.path.exists(output_path):
                 try:
-                    os.remove(output_path)
+                    remove_temp_file(output_path)
                 except OSError as e:
                     logger.warning(f"[Media Utils] 清理失败的视频封面文件时出错: {e}")
             error_msg = stderr.decode() if stderr else "未知错误"
             raise Exception(f"ffmpeg extract cover failed: {error_msg}")
+        register_temp_file(output_path)
         return output_path
     except FileNotFoundError:
         raise Exception("ffmpeg not found")
@@ -5,8 +5,8 @@ import uuid
 
 import aiohttp
 
-from astrbot.core import db_helper, logger
 from astrbot.core.config import VERSION
+from astrbot.core.utils.platform_stats_aggregator import platform_stats_aggregator
 
 
 class Metric:
@@ -59,14 +59,12 @@ class Metric:
             kwargs["iid"] = Metric.get_installation_id()
         except Exception:
             pass
-        try:
-            if "adapter_name" in kwargs:
-                await db_helper.insert_platform_stats(
-                    platform_id=kwargs["adapter_name"],
-                    platform_type=kwargs.get("adapter_type", "unknown"),
-                )
-        except Exception as e:
-            logger.error(f"保存指标到数据库失败: {e}")
+        if "adapter_name" in kwargs:
+            # 在内存中聚合，由 platform_stats_aggregator 定期批量写入数据库
+            platform_stats_aggregator.record(
+                platform_id=kwargs["adapter_name"],
+                platform_type=kwargs.get("adapter_type", "unknown"),
+            )
 
         try:
             async with aiohttp.ClientSession(trust_env=True) as session:
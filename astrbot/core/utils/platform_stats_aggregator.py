@@ -0,0 +1,92 @@
+"""平台消息统计聚合器
+
+每处理一条消息都会上报一次平台统计。若每次上报都执行一次
+``INSERT ... ON CONFLICT DO UPDATE`` 事务，繁忙时这些小事务会与对话写入争抢
+SQLite 唯一的写锁。:class:`PlatformStatsAggregator` 先在内存中按
+``(小时, platform_id, platform_type)`` 累加计数，每隔几秒以及关闭时一次性写入
+数据库。尚未写入的计数可以通过 :meth:`PlatformStatsAggregator.pending` 读取，
+WebUI 统计页面据此保持数据实时。
+"""
+
+import asyncio
+from collections import Counter
+from datetime import datetime
+
+from astrbot.core import db_helper, logger
+from astrbot.core.db import BaseDatabase
+
+StatKey = tuple[datetime, str, str]
+"""(整点时间, platform_id, platform_type)"""
+
+
+class PlatformStatsAggregator:
+    """在内存中聚合平台统计，定期批量写入数据库。"""
+
+    FLUSH_INTERVAL_SECONDS = 5.0
+
+    def __init__(
+        self,
+        db: BaseDatabase,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self.db = db
+        self.flush_interval = flush_interval
+        self._counts: Counter[StatKey] = Counter()
+        self._flushing: Counter[StatKey] = Counter()
+        """正在写入数据库的计数，写入完成前仍计入 pending"""
+        self._flush_lock = asyncio.Lock()
+        self._stop_event = asyncio.Event()
+
+    def record(
+        self,
+        platform_id: str,
+        platform_type: str,
+        count: int = 1,
+        timestamp: datetime | None = None,
+    ) -> None:
+        """累加一次统计，不会访问数据库。"""
+        if timestamp is None:
+            timestamp = datetime.now()
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        self._counts[(hour, platform_id, platform_type)] += count
+
+    def pending(self) -> list[tuple[datetime, str, str, int]]:
+        """返回尚未写入数据库的计数，格式为 ``(整点时间, platform_id, platform_type, count)``。"""
+        merged = self._flushing + self._counts
+        return [(*key, count) for key, count in merged.items()]
+
+    async def flush(self) -> None:
+        """把当前累积的计数以一次批量 upsert 写入数据库。写入失败时计数保留到下次。"""
+        async with self._flush_lock:
+            if not self._counts:
+                return
+            self._flushing, self._counts = self._counts, Counter()
+            try:
+                await self.db.insert_platform_stats_batch(
+                    [(*key, count) for key, count in self._flushing.items()]
+                )
+            except Exception as e:
+                logger.error(f"写入平台统计失败: {e}")
+                self._counts.update(self._flushing)
+            finally:
+                self._flushing = Counter()
+
+    async def run(self) -> None:
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(),
+                    timeout=self.flush_interval,
+                )
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def stop(self) -> None:
+        """停止定期写入，并写入剩余的计数。"""
+        self._stop_event.set()
+        await self.flush()
+
+
+platform_stats_aggregator = PlatformStatsAggregator(db_helper)
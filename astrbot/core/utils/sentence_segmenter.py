@@ -0,0 +1,99 @@
+"""增量分句器
+
+流式输出时文本是一段一段到达的。:class:`SentenceSegmenter` 只扫描新到达的字符，
+一旦某个句子以分隔符结尾就立即交出，无需在每次收到新片段时重新扫描整个缓冲区，
+总耗时与文本长度成线性关系。平台的流式 Fallback 与结果装饰阶段的分段回复共用它。
+"""
+
+from collections.abc import Iterable
+
+DEFAULT_DELIMITERS = ("。", "？", "！", "~", "…")
+
+
+class SentenceSegmenter:
+    """有状态的增量分句器。
+
+    连续的多个分隔符视为同一句的结尾；只包含空白或分隔符的句子会被丢弃。
+    """
+
+    def __init__(
+        self,
+        delimiters: Iterable[str] = DEFAULT_DELIMITERS,
+        *,
+        max_length: int = 0,
+        keep_delimiters: bool = True,
+    ) -> None:
+        """
+        Args:
+            delimiters: 分隔符，可以是多字符的词
+            max_length: 单句最大长度，超过时强制切分；0 表示不限制
+            keep_delimiters: 交出的句子是否保留结尾的分隔符
+        """
+        self.delimiters = frozenset(d for d in delimiters if d)
+        self.max_length = max_length
+        self.keep_delimiters = keep_delimiters
+        # 优先匹配最长的分隔符
+        self._delimiter_lengths = sorted(
+            {len(d) for d in self.delimiters}, reverse=True
+        )
+        self._chars: list[str] = []
+        self._body_length = 0
+        """当前句子中不含结尾分隔符部分的长度"""
+        self._in_delimiter = False
+
+    def _match_delimiter(self) -> int:
+        """返回当前句子末尾匹配到的分隔符长度，未匹配返回 0。"""
+        for length in self._delimiter_lengths:
+            if length <= len(self._chars) and (
+                "".join(self._chars[-length:]) in self.delimiters
+            ):
+                return length
+        return 0
+
+    def _emit(self, out: list[str]) -> None:
+        end = len(self._chars) if self.keep_delimiters else self._body_length
+        body = "".join(self._chars[: self._body_length])
+        if body.strip():
+            out.append("".join(self._chars[:end]))
+        self._chars = []
+        self._body_length = 0
+        self._in_delimiter = False
+
+    def feed(self, text: str) -> list[str]:
+        """追加一段文本，返回其中已经完整的句子。"""
+        out: list[str] = []
+        for ch in text:
+            self._chars.append(ch)
+            if matched := self._match_delimiter():
+                if not self._in_delimiter:
+                    self._body_length = len(self._chars) - matched
+                    self._in_delimiter = True
+            elif self._in_delimiter:
+                # 分隔符结束，当前字符属于下一句
+                self._chars.pop()
+                self._emit(out)
+                self._chars.append(ch)
+                self._body_length = 1
+            else:
+                self._body_length = len(self._chars)
+                if self.max_length and self._body_length >= self.max_length:
+                    self._emit(out)
+        if self._in_delimiter:
+            # 不等下一段文本到达，句子一完整就交出
+            self._emit(out)
+        return out
+
+    def flush(self) -> str:
+        """取出尚未以分隔符结尾的剩余文本，并重置状态。"""
+        rest = "".join(self._chars)
+        self._chars = []
+        self._body_length = 0
+        self._in_delimiter = False
+        return rest
+
+    def split(self, text: str) -> list[str]:
+        """一次性切分完整文本，剩余文本作为最后一句。"""
+        segments = self.feed(text)
+        if (rest := self.flush()).strip():
+            segments.append(rest)
+        return segments
@@ -1,7 +1,8 @@
 import asyncio
+import copy
 import os
 import threading
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from typing import Any, TypeVar, overload
 
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -13,6 +14,117 @@ from .astrbot_path import get_astrbot_data_path
 
 _VT = TypeVar("_VT")
 
+_MISSING = object()
+"""Negative cache marker: the preference is known to be absent from the database."""
+_NOT_CACHED = object()
+
+_CacheKey = tuple[str, str, str]
+
+
+class _PreferenceCache:
+    """Bounded LRU cache of preference values keyed by (scope, scope_id, key).
+
+    Shared by the event loop and the ``_sync_loop`` thread, so every access is
+    guarded by a plain lock. A write generation counter prevents a slow read
+    from re-populating a value that was overwritten while the read was in
+    flight.
+    """
+
+    def __init__(self, max_entries: int = 8192, max_prefetched: int = 2048) -> None:
+        self.max_entries = max_entries
+        self.max_prefetched = max_prefetched
+        self._entries: OrderedDict[_CacheKey, Any] = OrderedDict()
+        self._prefetched: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, ck: _CacheKey) -> Any:
+        """Return the cached value, ``_MISSING`` for a negative hit, or ``_NOT_CACHED``."""
+        with self._lock:
+            if ck not in self._entries:
+                return _NOT_CACHED
+            self._entries.move_to_end(ck)
+            return self._entries[ck]
+
+    def _store(self, ck: _CacheKey, value: Any) -> None:
+        self._entries[ck] = value
+        self._entries.move_to_end(ck)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def fill(self, ck: _CacheKey, value: Any, generation: int) -> None:
+        """Populate from a database read that started at ``generation``."""
+        with self._lock:
+            if generation == self._generation:
+                self._store(ck, value)
+
+    def fill_scope(
+        self,
+        scope: str,
+        scope_id: str,
+        values: dict[str, Any],
+        generation: int,
+    ) -> bool:
+        """Populate every key of a scope from one bulk read."""
+        with self._lock:
+            if generation != self._generation:
+                return False
+            for key, value in values.items():
+                self._store((scope, scope_id, key), value)
+            self._prefetched[(scope, scope_id)] = None
+            self._prefetched.move_to_end((scope, scope_id))
+            while len(self._prefetched) > self.max_prefetched:
+                self._prefetched.popitem(last=False)
+            return True
+
+    def is_prefetched(self, scope: str, scope_id: str) -> bool:
+        with self._lock:
+            return (scope, scope_id) in self._prefetched
+
+    def set(self, ck: _CacheKey, value: Any) -> None:
+        """Write-through update after the database write succeeded."""
+        with self._lock:
+            self._generation += 1
+            self._store(ck, value)
+
+    def invalidate(self, ck: _CacheKey) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(ck, None)
+
+    def invalidate_scope(self, scope: str, scope_id: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for ck in [
+                ck for ck in self._entries if ck[0] == scope and ck[1] == scope_id
+            ]:
+                del self._entries[ck]
+            self._prefetched.pop((scope, scope_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._prefetched.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _snapshot(value: Any) -> Any:
+    """Copy mutable values so callers cannot mutate the cached object in place."""
+    if (
+        value is None
+        or value is _MISSING
+        or isinstance(value, str | int | float | bool)
+    ):
+        return value
+    return copy.deepcopy(value)
+
 
 class SharedPreferences:
     def __init__(self, db_helper: BaseDatabase, json_storage_path=None) -> None:
@@ -25,6 +137,8 @@ class SharedPreferences:
         self.db_helper = db_helper
         self.temporary_cache: dict[str, dict[str, Any]] = defaultdict(dict)
         """automatically clear per 24 hours. Might be helpful in some cases XD"""
+        self._cache = _PreferenceCache()
+        """read-through / write-through cache in front of the preference table"""
 
         self._sync_loop = asyncio.new_event_loop()
         t = threading.Thread(target=self._sync_loop.run_forever, daemon=True)
@@ -48,12 +162,36 @@ class SharedPreferences:
     ) -> _VT:
         """获取指定范围和键的偏好设置"""
         if scope_id is not None and key is not None:
-            result = await self.db_helper.get_preference(scope, scope_id, key)
-            if result:
-                ret = result.value["val"]
-            else:
-                ret = default
-            return ret
+            ck = (scope, scope_id, key)
+            cached = self._cache.get(ck)
+            if cached is _NOT_CACHED:
+                if scope == "umo" and not self._cache.is_prefetched(scope, scope_id):
+                    generation = self._cache.generation
+                    if await self._prefetch_scope(scope, scope_id):
+                        cached = self._cache.get(ck)
+                        if cached is _NOT_CACHED:
+                            self._cache.fill(ck, _MISSING, generation)
+                            return default
+                if cached is _NOT_CACHED:
+                    generation = self._cache.generation
+                    result = await self.db_helper.get_preference(scope, scope_id, key)
+                    cached = result.value["val"] if result else _MISSING
+                    self._cache.fill(ck, _snapshot(cached), generation)
+                    return cached if cached is not _MISSING else default
+            if cached is _MISSING:
+                return default
+            return _snapshot(cached)
+
+    async def _prefetch_scope(self, scope: str, scope_id: str) -> bool:
+        """Load all preferences of one scope id (e.g. a session) in a single query."""
+        generation = self._cache.generation
+        prefs = await self.db_helper.get_preferences(scope, scope_id)
+        return self._cache.fill_scope(
+            scope,
+            scope_id,
+            {pref.key: _snapshot(pref.value["val"]) for pref in prefs},
+            generation,
+        )
 
     async def range_get_async(
         self,
@@ -140,6 +278,7 @@ class SharedPreferences:
             key,
             {"val": value},
         )
+        self._cache.set((scope, scope_id, key), _snapshot(value))
 
     async def session_put(self, umo: str, key: str, value: Any) -> None:
         await self.put_async("umo", umo, key, value)
@@ -150,6 +289,7 @@ class SharedPreferences:
     async def remove_async(self, scope: str, scope_id: str, key: str) -> None:
         """删除指定范围和键的偏好设置"""
         await self.db_helper.remove_preference(scope, scope_id, key)
+        self._cache.set((scope, scope_id, key), _MISSING)
 
     async def session_remove(self, umo: str, key: str) -> None:
         await self.remove_async("umo", umo, key)
@@ -161,6 +301,7 @@ class SharedPreferences:
     async def clear_async(self, scope: str, scope_id: str) -> None:
         """清空指定范围的所有偏好设置"""
         await self.db_helper.clear_preferences(scope, scope_id)
+        self._cache.invalidate_scope(scope, scope_id)
 
     # ====
     # DEPRECATED METHODS
@@ -181,8 +322,15 @@ class SharedPreferences:
             raise ValueError(
                 "scope_id and key cannot be None when getting a specific preference.",
             )
+        scope = scope or "unknown"
+        scope_id = scope_id or "unknown"
+        cached = self._cache.get((scope, scope_id, key))
+        if cached is _MISSING:
+            return default
+        if cached is not _NOT_CACHED:
+            return _snapshot(cached) if cached is not None else default
         result = asyncio.run_coroutine_threadsafe(
-            self.get_async(scope or "unknown", scope_id or "unknown", key, default),
+            self.get_async(scope, scope_id, key, default),
             self._sync_loop,
         ).result()
 
@@ -1,10 +1,15 @@
 import asyncio
+import time
 from collections.abc import Callable
-from dataclasses import dataclass
 from pathlib import Path
 
 from astrbot import logger
 from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
+from astrbot.core.utils.temp_file_registry import (
+    TempFileEntry,
+    TempFileRegistry,
+    temp_file_registry,
+)
 
 
 def parse_size_to_bytes(value: str | int | float | None) -> int:
@@ -23,26 +28,36 @@ def parse_size_to_bytes(value: str | int | float | None) -> int:
     return int(size_mb * 1024**2)
 
 
-@dataclass
-class TempFileInfo:
-    path: Path
-    size: int
-    mtime: float
+class TempDirCleaner:
+    """Keeps the temp directory below the configured size.
 
+    Size accounting comes from a :class:`TempFileRegistry` that producers of
+    temp files report into, so a regular tick is O(1) when below the limit and
+    O(evicted) otherwise. A full directory scan only runs on the first tick and
+    every ``RECONCILE_INTERVAL_SECONDS`` to pick up files written by code that
+    does not report to the registry.
+    """
 
-class TempDirCleaner:
     CONFIG_KEY = "temp_dir_max_size"
     DEFAULT_MAX_SIZE = 1024
     CHECK_INTERVAL_SECONDS = 10 * 60
+    RECONCILE_INTERVAL_SECONDS = 6 * 60 * 60
     CLEANUP_RATIO = 0.30
 
     def __init__(
         self,
         max_size_getter: Callable[[], str | int | float | None],
         temp_dir: Path | None = None,
+        registry: TempFileRegistry | None = None,
     ) -> None:
         self._max_size_getter = max_size_getter
         self._temp_dir = temp_dir or Path(get_astrbot_temp_path())
+        if registry is None:
+            registry = (
+                temp_file_registry if temp_dir is None else TempFileRegistry(temp_dir)
+            )
+        self._registry = registry
+        self._last_reconcile = 0.0
         self._stop_event = asyncio.Event()
 
     def _limit_bytes(self) -> int:
@@ -56,12 +71,12 @@ class TempDirCleaner:
             return fallback
         return parsed
 
-    def _scan_temp_files(self) -> tuple[int, list[TempFileInfo]]:
+    def _scan_temp_files(self) -> tuple[int, list[TempFileEntry]]:
         if not self._temp_dir.exists():
             return 0, []
 
         total_size = 0
-        files: list[TempFileInfo] = []
+        files: list[TempFileEntry] = []
         for path in self._temp_dir.rglob("*"):
             if not path.is_file():
                 continue
@@ -72,50 +87,81 @@ class TempDirCleaner:
                 continue
             total_size += stat.st_size
             files.append(
-                TempFileInfo(path=path, size=stat.st_size, mtime=stat.st_mtime)
+                TempFileEntry(
+                    path=str(path.absolute()),
+                    size=stat.st_size,
+                    mtime=stat.st_mtime,
+                )
             )
 
         return total_size, files
 
-    def _cleanup_empty_dirs(self) -> None:
-        if not self._temp_dir.exists():
-            return
-        for path in sorted(
-            self._temp_dir.rglob("*"), key=lambda p: len(p.parts), reverse=True
-        ):
-            if not path.is_dir():
-                continue
-            try:
-                path.rmdir()
-            except OSError:
-                continue
+    def reconcile(self) -> None:
+        """Rebuild the registry from a full scan of the temp directory."""
+        _, files = self._scan_temp_files()
+        self._registry.reconcile(files)
+        self._last_reconcile = time.monotonic()
+
+    def _needs_reconcile(self) -> bool:
+        if not self._registry.seeded:
+            return True
+        return (
+            time.monotonic() - self._last_reconcile >= self.RECONCILE_INTERVAL_SECONDS
+        )
+
+    def _cleanup_empty_dirs(self, dirs: set[Path]) -> None:
+        """Remove directories emptied by eviction, walking up to the temp root."""
+        root = self._temp_dir.absolute()
+        for path in sorted(dirs, key=lambda p: len(p.parts), reverse=True):
+            while path != root and root in path.parents:
+                try:
+                    path.rmdir()
+                except OSError:
+                    break
+                path = path.parent
 
     def cleanup_once(self) -> None:
         limit = self._limit_bytes()
         if limit <= 0:
             return
 
-        total_size, files = self._scan_temp_files()
+        if self._needs_reconcile():
+            self.reconcile()
+
+        if self._registry.total_size <= limit:
+            return
+
+        # Producers may have deleted files without reporting them; drop those
+        # entries so eviction is sized against what is actually on disk.
+        self._registry.prune_missing()
+        total_size = self._registry.total_size
         if total_size <= limit:
             return
 
         target_release = max(int(total_size * self.CLEANUP_RATIO), 1)
         released = 0
         removed_files = 0
+        touched_dirs: set[Path] = set()
 
-        for file_info in sorted(files, key=lambda item: item.mtime):
+        while released < target_release:
+            file_info = self._registry.pop_oldest()
+            if file_info is None:
+                break
+            path = Path(file_info.path)
             try:
-                file_info.path.unlink()
+                path.unlink()
+            except FileNotFoundError:
+                # Already removed by its producer; the registry entry was stale.
+                continue
             except OSError as e:
                 logger.warning(f"Failed to delete temp file {file_info.path}: {e}")
                 continue
 
             released += file_info.size
             removed_files += 1
-            if released >= target_release:
-                break
+            touched_dirs.add(path.parent)
 
-        self._cleanup_empty_dirs()
+        self._cleanup_empty_dirs(touched_dirs)
 
         logger.warning(
             f"Temp dir exceeded limit ({total_size} > {limit}). "
@@ -0,0 +1,176 @@
+"""Incremental accounting of files written into the AstrBot temp directory.
+
+Producers of temp files (downloaded images, converted voice/video files, tool
+image cache, ...) report the files they create through
+:func:`register_temp_file`. The registry keeps a running size total and an
+oldest-first heap so that :class:`TempDirCleaner` can decide whether cleanup is
+needed in O(1) and evict in O(evicted) instead of walking the whole tree.
+
+The registry intentionally uses only the standard library so it can be imported
+from low-level helpers such as ``astrbot.core.utils.io`` without import cycles.
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .astrbot_path import get_astrbot_temp_path
+
+logger = logging.getLogger("astrbot")
+
+
+@dataclass
+class TempFileEntry:
+    path: str
+    size: int
+    mtime: float
+
+
+class TempFileRegistry:
+    """Thread-safe registry of temp files with a running size total.
+
+    Eviction order is kept in a lazy min-heap of ``(mtime, seq, path)``: when a
+    file is re-registered or forgotten, its old heap node stays behind and is
+    skipped on pop because its ``seq`` no longer matches the live entry.
+    """
+
+    def __init__(self, root: str | Path | None = None) -> None:
+        self._root = str(root) if root is not None else None
+        self._entries: dict[str, tuple[TempFileEntry, int]] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = 0
+        self._total_size = 0
+        self._lock = threading.Lock()
+        self._seeded = False
+
+    @property
+    def root(self) -> str:
+        return os.path.abspath(self._root or get_astrbot_temp_path())
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
+
+    @property
+    def seeded(self) -> bool:
+        """Whether a full reconcile scan has populated the registry at least once."""
+        return self._seeded
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _in_root(self, path: str) -> bool:
+        root = self.root
+        return path == root or path.startswith(root + os.sep)
+
+    def _add_locked(self, entry: TempFileEntry) -> None:
+        old = self._entries.get(entry.path)
+        if old is not None:
+            self._total_size -= old[0].size
+        self._seq += 1
+        self._entries[entry.path] = (entry, self._seq)
+        self._total_size += entry.size
+        heapq.heappush(self._heap, (entry.mtime, self._seq, entry.path))
+        # Stale heap nodes accumulate when files are re-registered or forgotten.
+        if len(self._heap) > 2 * len(self._entries) + 1024:
+            self._heap = [(e.mtime, seq, p) for p, (e, seq) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def register(self, path: str | Path, size: int | None = None) -> None:
+        """Record a file that was written into the temp directory.
+
+        Paths outside the temp directory are ignored, so callers can report
+        unconditionally even when the output path was supplied by the user.
+        """
+        abs_path = os.path.abspath(str(path))
+        if not self._in_root(abs_path):
+            return
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            return
+        entry = TempFileEntry(
+            path=abs_path,
+            size=st.st_size if size is None else size,
+            mtime=st.st_mtime or time.time(),
+        )
+        with self._lock:
+            self._add_locked(entry)
+
+    def forget(self, path: str | Path) -> None:
+        """Drop a file from the accounting, e.g. after its producer deleted it."""
+        abs_path = os.path.abspath(str(path))
+        with self._lock:
+            old = self._entries.pop(abs_path, None)
+            if old is not None:
+                self._total_size -= old[0].size
+
+    def prune_missing(self) -> int:
+        """Forget tracked files that no longer exist on disk.
+
+        Returns the number of entries dropped.
+        """
+        with self._lock:
+            paths = list(self._entries)
+        missing = [path for path in paths if not os.path.exists(path)]
+        for path in missing:
+            self.forget(path)
+        return len(missing)
+
+    def pop_oldest(self) -> TempFileEntry | None:
+        """Remove and return the oldest tracked file, or ``None`` if empty."""
+        with self._lock:
+            while self._heap:
+                _, seq, path = heapq.heappop(self._heap)
+                live = self._entries.get(path)
+                if live is None or live[1] != seq:
+                    continue
+                del self._entries[path]
+                self._total_size -= live[0].size
+                return live[0]
+            return None
+
+    def reconcile(self, files: list[TempFileEntry]) -> None:
+        """Replace the registry content with the result of a full directory scan."""
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+            self._total_size = 0
+            for entry in files:
+                self._add_locked(entry)
+            self._seeded = True
+
+
+temp_file_registry = TempFileRegistry()
+"""Process-wide registry for files under ``data/temp``."""
+
+
+def register_temp_file(path: str | Path, size: int | None = None) -> None:
+    """Report a newly written temp file to the process-wide registry."""
+    try:
+        temp_file_registry.register(path, size)
+    except Exception as e:  # accounting must never break the producer
+        logger.debug(f"Failed to register temp file {path}: {e}")
+
+
+def forget_temp_file(path: str | Path) -> None:
+    """Report that a temp file was deleted by its producer."""
+    temp_file_registry.forget(path)
+
+
+def remove_temp_file(path: str | Path) -> None:
+    """Delete a temp file and drop it from the accounting.
+
+    Raises the same ``OSError`` as :func:`os.remove`; a file that is already
+    gone is still forgotten.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        forget_temp_file(path)
+        raise
+    forget_temp_file(path)
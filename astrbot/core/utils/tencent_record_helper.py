@@ -8,6 +8,7 @@ from io import BytesIO
 
 from astrbot.core import logger
 from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
+from astrbot.core.utils.temp_file_registry import remove_temp_file
 
 
 async def tencent_silk_to_wav(silk_path: str, output_path: str) -> str:
@@ -132,7 +133,7 @@ async def audio_to_tencent_silk_base64(audio_path: str) -> tuple[str, float]:
     if ext != ".wav":
         await convert_to_pcm_wav(audio_path, temp_wav)
         # 删除原文件
-        os.remove(audio_path)
+        remove_temp_file(audio_path)
         wav_path = temp_wav
     else:
         wav_path = audio_path
@@ -163,6 +164,6 @@ async def audio_to_tencent_silk_base64(audio_path: str) -> tuple[str, float]:
         return silk_b64, duration  # 已是秒
     finally:
         if os.path.exists(wav_path) and wav_path != audio_path:
-            os.remove(wav_path)
+            remove_temp_file(wav_path)
         if os.path.exists(silk_path):
-            os.remove(silk_path)
+            remove_temp_file(silk_path)
@@ -345,10 +345,22 @@ class BackupRoute(Route):
     async def export_backup(self):
         """创建备份
 
+        JSON Body（可选）:
+        - since: ISO 格式时间，指定时创建增量备份，只导出该时间之后更新过的记录。
+          通常使用上一次备份清单中的 watermark
+
         返回:
         - task_id: 任务ID，用于查询导出进度
         """
         try:
+            data = await request.get_json(silent=True) or {}
+            since = None
+            if data.get("since"):
+                try:
+                    since = datetime.fromisoformat(data["since"])
+                except (TypeError, ValueError):
+                    return Response().error("since 必须是 ISO 格式的时间").__dict__
+
             # 生成任务ID
             task_id = str(uuid.uuid4())
 
@@ -356,7 +368,7 @@ class BackupRoute(Route):
             self._init_task(task_id, "export", "pending")
 
             # 启动后台导出任务
-            asyncio.create_task(self._background_export_task(task_id))
+            asyncio.create_task(self._background_export_task(task_id, since))
 
             return (
                 Response()
@@ -373,7 +385,9 @@ class BackupRoute(Route):
             logger.error(traceback.format_exc())
             return Response().error(f"创建备份失败: {e!s}").__dict__
 
-    async def _background_export_task(self, task_id: str) -> None:
+    async def _background_export_task(
+        self, task_id: str, since: datetime | None = None
+    ) -> None:
         """后台导出任务"""
         try:
             self._update_progress(task_id, status="processing", message="正在初始化...")
@@ -394,6 +408,7 @@ class BackupRoute(Route):
             zip_path = await exporter.export_all(
                 output_dir=self.backup_dir,
                 progress_callback=progress_callback,
+                since=since,
             )
 
             # 设置成功结果
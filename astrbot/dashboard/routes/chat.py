@@ -20,12 +20,20 @@ from astrbot.core.platform.sources.webchat.message_parts_helper import (
     webchat_message_parts_have_content,
 )
 from astrbot.core.platform.sources.webchat.webchat_queue_mgr import webchat_queue_mgr
+from astrbot.core.platform.sources.webchat.webchat_stream import (
+    GenerationStream,
+    webchat_stream_registry,
+)
 from astrbot.core.utils.active_event_registry import active_event_registry
 from astrbot.core.utils.astrbot_path import get_astrbot_data_path
 from astrbot.core.utils.datetime_utils import to_utc_isoformat
+from astrbot.core.utils.temp_file_registry import remove_temp_file
 
 from .route import Response, Route, RouteContext
 
+GENERATION_IDLE_TIMEOUT = 600
+"""生成在这么多秒内没有产出任何事件时视为已失败，结束流并释放相关状态"""
+
 
 @asynccontextmanager
 async def track_conversation(convs: dict, conv_id: str):
@@ -46,6 +54,7 @@ class ChatRoute(Route):
         super().__init__(context)
         self.routes = {
             "/chat/send": ("POST", self.chat),
+            "/chat/stream": ("GET", self.resume_stream),
             "/chat/new_session": ("GET", self.new_session),
             "/chat/sessions": ("GET", self.get_sessions),
             "/chat/get_session": ("GET", self.get_session),
@@ -282,6 +291,193 @@ class ChatRoute(Route):
         )
         return record
 
+    async def _pump_generation(
+        self,
+        gen_stream: GenerationStream,
+        back_queue: asyncio.Queue,
+        message_id: str,
+        webchat_conv_id: str,
+    ) -> None:
+        """消费一次生成的回复队列，保存消息并发布到可续传的流中。
+
+        与 HTTP 连接解耦：客户端断开后生成仍会继续并被记录，重连的客户端
+        可以从上次的偏移量继续接收。
+        """
+        accumulated_parts = []
+        accumulated_text = ""
+        accumulated_reasoning = ""
+        tool_calls = {}
+        agent_stats = {}
+        refs = {}
+        try:
+            # Emit session_id first so clients can bind the stream immediately.
+            gen_stream.publish(
+                {
+                    "type": "session_id",
+                    "data": None,
+                    "session_id": webchat_conv_id,
+                }
+            )
+
+            async with track_conversation(self.running_convs, webchat_conv_id):
+                idle_seconds = 0
+                while True:
+                    try:
+                        result = await asyncio.wait_for(back_queue.get(), timeout=1)
+                    except asyncio.TimeoutError:
+                        idle_seconds += 1
+                        if idle_seconds < GENERATION_IDLE_TIMEOUT:
+                            continue
+                        # 流水线异常退出时不会再发出 end 事件，超时后主动结束
+                        logger.warning(
+                            f"WebChat generation {message_id} produced no events "
+                            f"for {GENERATION_IDLE_TIMEOUT}s, closing stream"
+                        )
+                        gen_stream.publish(
+                            {
+                                "type": "error",
+                                "data": "Generation timed out",
+                                "streaming": False,
+                            }
+                        )
+                        gen_stream.publish(
+                            {"type": "end", "data": "", "streaming": False}
+                        )
+                        break
+                    idle_seconds = 0
+
+                    if not result:
+                        continue
+
+                    if "message_id" in result and result["message_id"] != message_id:
+                        logger.warning("webchat stream message_id mismatch")
+                        continue
+
+                    result_text = result["data"]
+                    msg_type = result.get("type")
+                    streaming = result.get("streaming", False)
+                    chain_type = result.get("chain_type")
+
+                    if chain_type == "agent_stats":
+                        stats_info = {
+                            "type": "agent_stats",
+                            "data": json.loads(result_text),
+                        }
+                        gen_stream.publish(stats_info)
+                        agent_stats = stats_info["data"]
+                        continue
+
+                    gen_stream.publish(result)
+
+                    # 累积消息部分
+                    if msg_type == "plain":
+                        chain_type = result.get("chain_type")
+                        if chain_type == "tool_call":
+                            tool_call = json.loads(result_text)
+                            tool_calls[tool_call.get("id")] = tool_call
+                            if accumulated_text:
+                                # 如果累积了文本，则先保存文本
+                                accumulated_parts.append(
+                                    {"type": "plain", "text": accumulated_text}
+                                )
+                                accumulated_text = ""
+                        elif chain_type == "tool_call_result":
+                            tcr = json.loads(result_text)
+                            tc_id = tcr.get("id")
+                            if tc_id in tool_calls:
+                                tool_calls[tc_id]["result"] = tcr.get("result")
+                                tool_calls[tc_id]["finished_ts"] = tcr.get("ts")
+                                accumulated_parts.append(
+                                    {
+                                        "type": "tool_call",
+                                        "tool_calls": [tool_calls[tc_id]],
+                                    }
+                                )
+                                tool_calls.pop(tc_id, None)
+                        elif chain_type == "reasoning":
+                            accumulated_reasoning += result_text
+                        elif streaming:
+                            accumulated_text += result_text
+                        else:
+                            accumulated_text = result_text
+                    elif msg_type == "image":
+                        filename = result_text.replace("[IMAGE]", "")
+                        part = await self._create_attachment_from_file(
+                            filename, "image"
+                        )
+                        if part:
+                            accumulated_parts.append(part)
+                    elif msg_type == "record":
+                        filename = result_text.replace("[RECORD]", "")
+                        part = await self._create_attachment_from_file(
+                            filename, "record"
+                        )
+                        if part:
+                            accumulated_parts.append(part)
+                    elif msg_type == "file":
+                        # 格式: [FILE]filename
+                        filename = result_text.replace("[FILE]", "")
+                        part = await self._create_attachment_from_file(filename, "file")
+                        if part:
+                            accumulated_parts.append(part)
+
+                    # 消息结束处理
+                    if msg_type == "end":
+                        break
+                    elif (
+                        (streaming and msg_type == "complete") or not streaming
+                        # or msg_type == "break"
+                    ):
+                        if (
+                            chain_type == "tool_call"
+                            or chain_type == "tool_call_result"
+                        ):
+                            continue
+
+                        # 提取 web_search_tavily 引用
+                        try:
+                            refs = self._extract_web_search_refs(
+                                accumulated_text,
+                                accumulated_parts,
+                            )
+                        except Exception as e:
+                            logger.exception(
+                                f"Failed to extract web search refs: {e}",
+                                exc_info=True,
+                            )
+
+                        saved_record = await self._save_bot_message(
+                            webchat_conv_id,
+                            accumulated_text,
+                            accumulated_parts,
+                            accumulated_reasoning,
+                            agent_stats,
+                            refs,
+                        )
+                        # 发送保存的消息信息给前端
+                        if saved_record:
+                            gen_stream.publish(
+                                {
+                                    "type": "message_saved",
+                                    "data": {
+                                        "id": saved_record.id,
+                                        "created_at": to_utc_isoformat(
+                                            saved_record.created_at
+                                        ),
+                                    },
+                                }
+                            )
+                        accumulated_parts = []
+                        accumulated_text = ""
+                        accumulated_reasoning = ""
+                        # tool_calls = {}
+                        agent_stats = {}
+                        refs = {}
+        except Exception as e:
+            logger.exception(f"WebChat stream unexpected error: {e}", exc_info=True)
+        finally:
+            webchat_queue_mgr.remove_back_queue(message_id)
+
     async def chat(self, post_data: dict | None = None):
         username = g.get("username", "guest")
 
@@ -323,190 +519,6 @@ class ChatRoute(Route):
             webchat_conv_id,
         )
 
-        async def stream():
-            client_disconnected = False
-            accumulated_parts = []
-            accumulated_text = ""
-            accumulated_reasoning = ""
-            tool_calls = {}
-            agent_stats = {}
-            refs = {}
-            try:
-                # Emit session_id first so clients can bind the stream immediately.
-                session_info = {
-                    "type": "session_id",
-                    "data": None,
-                    "session_id": webchat_conv_id,
-                }
-                yield f"data: {json.dumps(session_info, ensure_ascii=False)}\n\n"
-
-                async with track_conversation(self.running_convs, webchat_conv_id):
-                    while True:
-                        try:
-                            result = await asyncio.wait_for(back_queue.get(), timeout=1)
-                        except asyncio.TimeoutError:
-                            continue
-                        except asyncio.CancelledError:
-                            logger.debug(f"[WebChat] 用户 {username} 断开聊天长连接。")
-                            client_disconnected = True
-                        except Exception as e:
-                            logger.error(f"WebChat stream error: {e}")
-
-                        if not result:
-                            continue
-
-                        if (
-                            "message_id" in result
-                            and result["message_id"] != message_id
-                        ):
-                            logger.warning("webchat stream message_id mismatch")
-                            continue
-
-                        result_text = result["data"]
-                        msg_type = result.get("type")
-                        streaming = result.get("streaming", False)
-                        chain_type = result.get("chain_type")
-
-                        if chain_type == "agent_stats":
-                            stats_info = {
-                                "type": "agent_stats",
-                                "data": json.loads(result_text),
-                            }
-                            yield f"data: {json.dumps(stats_info, ensure_ascii=False)}\n\n"
-                            agent_stats = stats_info["data"]
-                            continue
-
-                        # 发送 SSE 数据
-                        try:
-                            if not client_disconnected:
-                                yield f"data: {json.dumps(result, ensure_ascii=False)}\n\n"
-                        except Exception as e:
-                            if not client_disconnected:
-                                logger.debug(
-                                    f"[WebChat] 用户 {username} 断开聊天长连接。 {e}"
-                                )
-                            client_disconnected = True
-
-                        try:
-                            if not client_disconnected:
-                                await asyncio.sleep(0.05)
-                        except asyncio.CancelledError:
-                            logger.debug(f"[WebChat] 用户 {username} 断开聊天长连接。")
-                            client_disconnected = True
-
-                        # 累积消息部分
-                        if msg_type == "plain":
-                            chain_type = result.get("chain_type")
-                            if chain_type == "tool_call":
-                                tool_call = json.loads(result_text)
-                                tool_calls[tool_call.get("id")] = tool_call
-                                if accumulated_text:
-                                    # 如果累积了文本，则先保存文本
-                                    accumulated_parts.append(
-                                        {"type": "plain", "text": accumulated_text}
-                                    )
-                                    accumulated_text = ""
-                            elif chain_type == "tool_call_result":
-                                tcr = json.loads(result_text)
-                                tc_id = tcr.get("id")
-                                if tc_id in tool_calls:
-                                    tool_calls[tc_id]["result"] = tcr.get("result")
-                                    tool_calls[tc_id]["finished_ts"] = tcr.get("ts")
-                                    accumulated_parts.append(
-                                        {
-                                            "type": "tool_call",
-                                            "tool_calls": [tool_calls[tc_id]],
-                                        }
-                                    )
-                                    tool_calls.pop(tc_id, None)
-                            elif chain_type == "reasoning":
-                                accumulated_reasoning += result_text
-                            elif streaming:
-                                accumulated_text += result_text
-                            else:
-                                accumulated_text = result_text
-                        elif msg_type == "image":
-                            filename = result_text.replace("[IMAGE]", "")
-                            part = await self._create_attachment_from_file(
-                                filename, "image"
-                            )
-                            if part:
-                                accumulated_parts.append(part)
-                        elif msg_type == "record":
-                            filename = result_text.replace("[RECORD]", "")
-                            part = await self._create_attachment_from_file(
-                                filename, "record"
-                            )
-                            if part:
-                                accumulated_parts.append(part)
-                        elif msg_type == "file":
-                            # 格式: [FILE]filename
-                            filename = result_text.replace("[FILE]", "")
-                            part = await self._create_attachment_from_file(
-                                filename, "file"
-                            )
-                            if part:
-                                accumulated_parts.append(part)
-
-                        # 消息结束处理
-                        if msg_type == "end":
-                            break
-                        elif (
-                            (streaming and msg_type == "complete") or not streaming
-                            # or msg_type == "break"
-                        ):
-                            if (
-                                chain_type == "tool_call"
-                                or chain_type == "tool_call_result"
-                            ):
-                                continue
-
-                            # 提取 web_search_tavily 引用
-                            try:
-                                refs = self._extract_web_search_refs(
-                                    accumulated_text,
-                                    accumulated_parts,
-                                )
-                            except Exception as e:
-                                logger.exception(
-                                    f"Failed to extract web search refs: {e}",
-                                    exc_info=True,
-                                )
-
-                            saved_record = await self._save_bot_message(
-                                webchat_conv_id,
-                                accumulated_text,
-                                accumulated_parts,
-                                accumulated_reasoning,
-                                agent_stats,
-                                refs,
-                            )
-                            # 发送保存的消息信息给前端
-                            if saved_record and not client_disconnected:
-                                saved_info = {
-                                    "type": "message_saved",
-                                    "data": {
-                                        "id": saved_record.id,
-                                        "created_at": to_utc_isoformat(
-                                            saved_record.created_at
-                                        ),
-                                    },
-                                }
-                                try:
-                                    yield f"data: {json.dumps(saved_info, ensure_ascii=False)}\n\n"
-                                except Exception:
-                                    pass
-                            accumulated_parts = []
-                            accumulated_text = ""
-                            accumulated_reasoning = ""
-                            # tool_calls = {}
-                            agent_stats = {}
-                            refs = {}
-            except BaseException as e:
-                logger.exception(f"WebChat stream unexpected error: {e}", exc_info=True)
-            finally:
-                webchat_queue_mgr.remove_back_queue(message_id)
-
         # 将消息放入会话特定的队列
         chat_queue = webchat_queue_mgr.get_or_create_queue(webchat_conv_id)
         await chat_queue.put(
@@ -522,6 +534,11 @@ class ChatRoute(Route):
                 },
             ),
         )
+        gen_stream = webchat_stream_registry.create(message_id, webchat_conv_id)
+        webchat_stream_registry.run(
+            gen_stream,
+            self._pump_generation(gen_stream, back_queue, message_id, webchat_conv_id),
+        )
 
         message_parts_for_storage = strip_message_parts_path_fields(message_parts)
 
@@ -533,10 +550,13 @@ class ChatRoute(Route):
             sender_name=username,
         )
 
+        return await self._sse_response(gen_stream)
+
+    async def _sse_response(self, gen_stream: GenerationStream, offset: int = 0):
         response = cast(
             QuartResponse,
             await make_response(
-                stream(),
+                gen_stream.iter_sse(offset),
                 {
                     "Content-Type": "text/event-stream",
                     "Cache-Control": "no-cache",
@@ -548,6 +568,35 @@ class ChatRoute(Route):
         response.timeout = None  # fix SSE auto disconnect issue
         return response
 
+    async def resume_stream(self):
+        """Attach to an in-flight (or just finished) generation stream.
+
+        Query args: ``message_id`` or ``session_id`` selects the generation,
+        ``offset`` is the first event offset to replay (the ``offset`` of the last
+        received event plus one). Multiple tabs may subscribe to the same stream.
+        """
+        message_id = request.args.get("message_id")
+        session_id = request.args.get("session_id")
+        if message_id:
+            gen_stream = webchat_stream_registry.get(message_id)
+        elif session_id:
+            gen_stream = webchat_stream_registry.get_by_session(session_id)
+        else:
+            return Response().error("Missing key: message_id or session_id").__dict__
+        if gen_stream is None:
+            return Response().error("No active stream").__dict__
+
+        username = g.get("username", "guest")
+        session = await self.db.get_platform_session_by_id(gen_stream.session_id)
+        if not session or session.creator != username:
+            return Response().error("Permission denied").__dict__
+
+        try:
+            offset = int(request.args.get("offset", 0))
+        except ValueError:
+            return Response().error("offset must be an integer").__dict__
+        return await self._sse_response(gen_stream, offset)
+
     async def stop_session(self):
         """Stop active agent runs for a session."""
         post_data = await request.json
@@ -655,7 +704,7 @@ class ChatRoute(Route):
                 if not os.path.exists(attachment.path):
                     continue
                 try:
-                    os.remove(attachment.path)
+                    remove_temp_file(attachment.path)
                 except OSError as e:
                     logger.warning(
                         f"Failed to delete attachment file {attachment.path}: {e}"
@@ -744,20 +793,37 @@ class ChatRoute(Route):
             session_id=session_id, creator=username
         )
 
-        # Get platform message history using session_id
+        # 按游标分页加载历史：默认返回最新一页，传入 before_id 加载更早的消息
+        try:
+            page_size = min(int(request.args.get("page_size", 1000)), 1000)
+            before_id = request.args.get("before_id")
+            before_id = int(before_id) if before_id else None
+        except ValueError:
+            return Response().error("page_size and before_id must be integers").__dict__
+
+        # 多取一条用于判断是否还有更早的消息
         history_ls = await self.platform_history_mgr.get(
             platform_id=platform_id,
             user_id=session_id,
-            page=1,
-            page_size=1000,
+            page_size=page_size + 1,
+            before_id=before_id,
         )
+        has_more = len(history_ls) > page_size
+        if has_more:
+            history_ls = history_ls[1:]
 
         history_res = [history.model_dump() for history in history_ls]
 
         response_data = {
             "history": history_res,
+            "has_more": has_more,
+            "next_before_id": history_ls[0].id if has_more else None,
             "is_running": self.running_convs.get(session_id, False),
         }
+        # 正在生成时告知客户端可通过 /chat/stream 接入的流
+        gen_stream = webchat_stream_registry.get_by_session(session_id)
+        if gen_stream is not None and not gen_stream.finished:
+            response_data["stream_message_id"] = gen_stream.message_id
 
         # 如果会话属于项目，添加项目信息
         if project_info:
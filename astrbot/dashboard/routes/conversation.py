@@ -52,6 +52,7 @@ class ConversationRoute(Route):
             search_query = request.args.get("search", "")
             exclude_ids = request.args.get("exclude_ids", "")
             exclude_platforms = request.args.get("exclude_platforms", "")
+            before_cid = request.args.get("before_cid") or None
 
             # 转换为列表
             platform_list = platforms.split(",") if platforms else []
@@ -78,6 +79,7 @@ class ConversationRoute(Route):
                     search_query=search_query,
                     exclude_ids=exclude_id_list,
                     exclude_platforms=exclude_platform_list,
+                    before_cid=before_cid,
                 )
             except Exception as e:
                 logger.error(f"数据库查询出错: {e!s}\n{traceback.format_exc()}")
@@ -95,6 +97,9 @@ class ConversationRoute(Route):
                     "page_size": page_size,
                     "total": total_count,
                     "total_pages": total_pages,
+                    "next_before_cid": conversations[-1].cid
+                    if len(conversations) == page_size and not search_query
+                    else None,
                 },
             }
             return Response().ok(result).__dict__
@@ -53,6 +53,7 @@ class KnowledgeBaseRoute(Route):
             "/kb/document/import": ("POST", self.import_documents),
             "/kb/document/upload/url": ("POST", self.upload_document_from_url),
             "/kb/document/upload/progress": ("GET", self.get_upload_progress),
+            "/kb/document/update": ("POST", self.update_document),
             "/kb/document/get": ("GET", self.get_document),
             "/kb/document/delete": ("POST", self.delete_document),
             # # 块管理
@@ -441,8 +442,10 @@ class KnowledgeBaseRoute(Route):
             if not kb_helper:
                 return Response().error("知识库不存在").__dict__
             kb = kb_helper.kb
+            data = kb.model_dump()
+            data["embedding_cache"] = await kb_manager.kb_db.embedding_cache.stats()
 
-            return Response().ok(kb.model_dump()).__dict__
+            return Response().ok(data).__dict__
 
         except ValueError as e:
             return Response().error(str(e)).__dict__
@@ -582,6 +585,7 @@ class KnowledgeBaseRoute(Route):
                 "chunk_count": kb.chunk_count,
                 "created_at": kb.created_at.isoformat(),
                 "updated_at": kb.updated_at.isoformat(),
+                "embedding_cache": await kb_manager.kb_db.embedding_cache.stats(),
             }
 
             return Response().ok(stats).__dict__
@@ -776,6 +780,149 @@ class KnowledgeBaseRoute(Route):
             logger.error(traceback.format_exc())
             return Response().error(f"上传文档失败: {e!s}").__dict__
 
+    async def update_document(self):
+        """用新内容增量更新已有文档，只重新生成变化的文本块的向量
+
+        支持两种方式:
+        1. multipart/form-data: kb_id, doc_id, file (必填)
+        2. JSON: kb_id, doc_id, url (必填), enable_cleaning, cleaning_provider_id (可选)
+
+        可选参数: chunk_size, chunk_overlap, batch_size, tasks_limit, max_retries
+
+        返回:
+        - task_id: 任务ID，用于查询更新进度和结果
+        """
+        try:
+            kb_manager = self._get_kb_manager()
+            content_type = request.content_type or ""
+            file_info = None
+            if "multipart/form-data" in content_type:
+                data = dict(await request.form)
+                files = await request.files
+                file = files.get("file")
+                if not file:
+                    return Response().error("缺少文件").__dict__
+                file_name = file.filename
+                file_info = {
+                    "file_name": file_name,
+                    "file_content": file.read(),
+                    "file_type": (
+                        file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+                    ),
+                }
+            else:
+                data = await request.json
+                if not data.get("url"):
+                    return Response().error("缺少参数 url 或文件").__dict__
+
+            kb_id = data.get("kb_id")
+            doc_id = data.get("doc_id")
+            if not kb_id or not doc_id:
+                return Response().error("缺少参数 kb_id 或 doc_id").__dict__
+
+            kb_helper = await kb_manager.get_kb(kb_id)
+            if not kb_helper:
+                return Response().error("知识库不存在").__dict__
+            doc = await kb_helper.get_document(doc_id)
+            if not doc:
+                return Response().error("文档不存在").__dict__
+
+            options = {
+                "chunk_size": int(data.get("chunk_size", 512)),
+                "chunk_overlap": int(data.get("chunk_overlap", 50)),
+                "batch_size": int(data.get("batch_size", 32)),
+                "tasks_limit": int(data.get("tasks_limit", 3)),
+                "max_retries": int(data.get("max_retries", 3)),
+            }
+
+            task_id = str(uuid.uuid4())
+            self._init_task(task_id, status="pending")
+            asyncio.create_task(
+                self._background_update_task(
+                    task_id=task_id,
+                    kb_helper=kb_helper,
+                    doc_id=doc_id,
+                    file_info=file_info,
+                    url=data.get("url"),
+                    enable_cleaning=bool(data.get("enable_cleaning", False)),
+                    cleaning_provider_id=data.get("cleaning_provider_id"),
+                    **options,
+                ),
+            )
+
+            return (
+                Response()
+                .ok(
+                    {
+                        "task_id": task_id,
+                        "message": "update task created, processing in background",
+                    },
+                )
+                .__dict__
+            )
+
+        except ValueError as e:
+            return Response().error(str(e)).__dict__
+        except Exception as e:
+            logger.error(f"更新文档失败: {e}")
+            logger.error(traceback.format_exc())
+            return Response().error(f"更新文档失败: {e!s}").__dict__
+
+    async def _background_update_task(
+        self,
+        task_id: str,
+        kb_helper,
+        doc_id: str,
+        file_info: dict | None,
+        url: str | None,
+        enable_cleaning: bool,
+        cleaning_provider_id: str | None,
+        **options,
+    ) -> None:
+        """后台增量更新文档任务"""
+        name = file_info["file_name"] if file_info else f"URL: {url}"
+        try:
+            self._init_task(task_id, status="processing")
+            self.upload_progress[task_id] = {
+                "status": "processing",
+                "file_index": 0,
+                "file_total": 1,
+                "file_name": name,
+                "stage": "parsing" if file_info else "extracting",
+                "current": 0,
+                "total": 100,
+            }
+            progress_callback = self._make_progress_callback(task_id, 0, name)
+
+            if file_info:
+                result = await kb_helper.update_document(
+                    doc_id=doc_id,
+                    file_name=file_info["file_name"],
+                    file_content=file_info["file_content"],
+                    file_type=file_info["file_type"],
+                    progress_callback=progress_callback,
+                    **options,
+                )
+            else:
+                result = await kb_helper.update_from_url(
+                    doc_id=doc_id,
+                    url=url,
+                    progress_callback=progress_callback,
+                    enable_cleaning=enable_cleaning,
+                    cleaning_provider_id=cleaning_provider_id,
+                    **options,
+                )
+
+            result["document"] = result["document"].model_dump()
+            self._set_task_result(
+                task_id, "completed", result={"task_id": task_id, **result}
+            )
+
+        except Exception as e:
+            logger.error(f"后台更新文档任务 {task_id} 失败: {e}")
+            logger.error(traceback.format_exc())
+            self._set_task_result(task_id, "failed", error=str(e))
+
     def _validate_import_request(self, data: dict):
         kb_id = data.get("kb_id")
         if not kb_id:
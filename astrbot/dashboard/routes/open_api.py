@@ -560,6 +560,7 @@ class OpenApiRoute(Route):
             page_size = 100
 
         platform_id = request.args.get("platform_id")
+        before_session_id = request.args.get("before_session_id") or None
 
         (
             paginated_sessions,
@@ -570,6 +571,7 @@ class OpenApiRoute(Route):
             page=page,
             page_size=page_size,
             exclude_project_sessions=True,
+            before_session_id=before_session_id,
         )
 
         sessions_data = []
@@ -595,6 +597,9 @@ class OpenApiRoute(Route):
                     "page": page,
                     "page_size": page_size,
                     "total": total,
+                    "next_before_session_id": sessions_data[-1]["session_id"]
+                    if len(sessions_data) == page_size
+                    else None,
                 }
             )
             .__dict__
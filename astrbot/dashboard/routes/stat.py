@@ -15,8 +15,10 @@ from astrbot.core.config import VERSION
 from astrbot.core.core_lifecycle import AstrBotCoreLifecycle
 from astrbot.core.db import BaseDatabase
 from astrbot.core.db.migration.helper import check_migration_needed_v4
+from astrbot.core.db.po import Platform, Stats
 from astrbot.core.utils.astrbot_path import get_astrbot_path
 from astrbot.core.utils.io import get_dashboard_version
+from astrbot.core.utils.platform_stats_aggregator import platform_stats_aggregator
 from astrbot.core.utils.version_comparator import VersionComparator
 
 from .route import Response, Route, RouteContext
@@ -89,13 +91,41 @@ class StatRoute(Route):
     async def get_start_time(self):
         return Response().ok({"start_time": self.core_lifecycle.start_time}).__dict__
 
+    @staticmethod
+    def _merge_pending_platform_stats(
+        stat: Stats, grouped_stat: Stats, start_time: int
+    ) -> int:
+        """把尚未写入数据库的平台统计合并到查询结果中，返回未写入的消息总数。"""
+        pending_total = 0
+        grouped = {p.name: p for p in grouped_stat.platform}
+        for timestamp, platform_id, _, count in platform_stats_aggregator.pending():
+            pending_total += count
+            ts = int(timestamp.timestamp())
+            if ts < start_time:
+                continue
+            stat.platform.append(Platform(name=platform_id, count=count, timestamp=ts))
+            if platform_id in grouped:
+                grouped[platform_id].count += count
+            else:
+                grouped[platform_id] = Platform(
+                    name=platform_id, count=count, timestamp=start_time
+                )
+                grouped_stat.platform.append(grouped[platform_id])
+        stat.platform.sort(key=lambda p: p.timestamp)
+        return pending_total
+
     async def get_stat(self):
         offset_sec = request.args.get("offset_sec", 86400)
         offset_sec = int(offset_sec)
         try:
             stat = self.db_helper.get_base_stats(offset_sec)
+            grouped_stat = self.db_helper.get_grouped_base_stats(offset_sec)
+            message_count = self.db_helper.get_total_message_count() or 0
             now = int(time.time())
             start_time = now - offset_sec
+            message_count += self._merge_pending_platform_stats(
+                stat, grouped_stat, start_time
+            )
             message_time_based_stats = []
 
             idx = 0
@@ -132,10 +162,8 @@ class StatRoute(Route):
 
             stat_dict.update(
                 {
-                    "platform": self.db_helper.get_grouped_base_stats(
-                        offset_sec,
-                    ).platform,
-                    "message_count": self.db_helper.get_total_message_count() or 0,
+                    "platform": grouped_stat.platform,
+                    "message_count": message_count,
                     "platform_count": len(
                         self.core_lifecycle.platform_manager.get_insts(),
                     ),
@@ -0,0 +1,301 @@
+"""知识库文档解析与分块的工作进程函数
+
+文档解析进程池以 spawn 方式启动工作进程，进程池按模块路径加载要执行的函数。
+本模块只依赖标准库（pypdf、markitdown 在函数内按需导入），不导入 ``astrbot.core``，
+否则每个工作进程都会重新加载配置、数据库和日志等整套核心组件。
+
+- 函数的参数与返回值只使用内置类型，由主进程转换为解析结果；
+- 分块器以 :meth:`BaseChunker.worker_spec` 给出的描述传入，由 :func:`chunk_text` 还原；
+- 工作进程内不记录日志，异常原样交回主进程处理。
+"""
+
+import hashlib
+import io
+import os
+from collections.abc import Callable, Iterable
+from typing import Any
+
+MediaTuple = tuple[str, str, bytes, str]
+"""(media_type, file_name, content, mime_type)"""
+
+MARKITDOWN_EXTENSIONS = {".md", ".txt", ".markdown", ".xlsx", ".docx", ".xls"}
+
+
+# ==== 解析 ====
+
+
+def extract_pdf_pages(reader: Any, page_numbers: Iterable[int]) -> tuple[str, list]:
+    """同步提取 PDF 指定页的文本和图片
+
+    Args:
+        reader: ``pypdf.PdfReader``
+        page_numbers: 要解析的页码（从 0 开始）
+
+    Returns:
+        这些页的文本（以空行连接）和图片 :data:`MediaTuple` 列表
+
+    """
+    page_numbers = list(page_numbers)
+    text_parts = []
+    media_items: list[MediaTuple] = []
+
+    # 提取文本
+    for page_num in page_numbers:
+        text = reader.pages[page_num].extract_text()
+        if text:
+            text_parts.append(text)
+
+    # 提取图片
+    image_counter = 0
+    for page_num in page_numbers:
+        page = reader.pages[page_num]
+        try:
+            # 安全检查 Resources
+            if "/Resources" not in page:
+                continue
+
+            resources = page["/Resources"]
+            if not resources or "/XObject" not in resources:
+                continue
+
+            xobjects = resources["/XObject"].get_object()
+            if not xobjects:
+                continue
+
+            for obj_name in xobjects:
+                try:
+                    obj = xobjects[obj_name]
+
+                    if obj.get("/Subtype") != "/Image":
+                        continue
+
+                    # 提取图片数据
+                    image_data = obj.get_data()
+
+                    # 确定格式
+                    filter_type = obj.get("/Filter", "")
+                    if filter_type == "/DCTDecode":
+                        ext = "jpg"
+                        mime_type = "image/jpeg"
+                    else:
+                        ext = "png"
+                        mime_type = "image/png"
+
+                    image_counter += 1
+                    media_items.append(
+                        (
+                            "image",
+                            f"page_{page_num}_img_{image_counter}.{ext}",
+                            image_data,
+                            mime_type,
+                        )
+                    )
+                except Exception:
+                    # 单个图片提取失败不影响整体
+                    continue
+        except Exception:
+            # 页面处理失败不影响其他页面
+            continue
+
+    return "\n\n".join(text_parts), media_items
+
+
+def convert_with_markitdown(content: bytes, file_name: str) -> str:
+    """用 MarkItDown 把 docx、xls、xlsx、md 等文档转换为 Markdown 文本"""
+    from markitdown_no_magika import MarkItDown, StreamInfo
+
+    md = MarkItDown(enable_plugins=False)
+    stream_info = StreamInfo(
+        extension=os.path.splitext(file_name)[1].lower(),
+        filename=file_name,
+    )
+    return md.convert(io.BytesIO(content), stream_info=stream_info).markdown
+
+
+def pdf_page_count(path: str) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(path).pages)
+
+
+def parse_pdf_pages(path: str, start: int, end: int) -> tuple[str, list]:
+    from pypdf import PdfReader
+
+    return extract_pdf_pages(PdfReader(path), range(start, end))
+
+
+def parse_document(path: str, file_name: str, file_type: str) -> tuple[str, list]:
+    ext = f".{file_type}"
+    if ext == ".pdf":
+        return parse_pdf_pages(path, 0, pdf_page_count(path))
+    if ext not in MARKITDOWN_EXTENSIONS:
+        raise ValueError(f"暂时不支持的文件格式: {ext}")
+    with open(path, "rb") as f:
+        content = f.read()
+    return convert_with_markitdown(content, file_name), []
+
+
+# ==== 分块 ====
+
+
+def split_by_character(text: str, chunk_size: int, overlap: int) -> list[str]:
+    """按字符级别分割文本"""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
+    if overlap < 0:
+        raise ValueError("chunk_overlap must be non-negative")
+    if overlap >= chunk_size:
+        raise ValueError("chunk_overlap must be less than chunk_size")
+    result = []
+    for i in range(0, len(text), chunk_size - overlap):
+        end = min(i + chunk_size, len(text))
+        result.append(text[i:end])
+        if end == len(text):
+            break
+
+    return result
+
+
+def split_recursive(
+    text: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: list[str],
+    length_function: Callable[[str], int] = len,
+) -> list[str]:
+    """按分隔符优先级递归地将文本分割成块
+
+    Args:
+        text: 要分割的文本
+        chunk_size: 每个文本块的最大大小
+        chunk_overlap: 每个文本块之间的重叠部分大小
+        separators: 分隔符列表，按优先级从高到低
+        length_function: 计算文本长度的函数
+
+    Returns:
+        分割后的文本块列表
+
+    """
+    if not text:
+        return []
+
+    if length_function(text) <= chunk_size:
+        return [text]
+
+    def recurse(part: str) -> list[str]:
+        return split_recursive(
+            part, chunk_size, chunk_overlap, separators, length_function
+        )
+
+    for separator in separators:
+        if separator == "":
+            return split_by_character(text, chunk_size, chunk_overlap)
+
+        if separator in text:
+            splits = text.split(separator)
+            # 重新添加分隔符（除了最后一个片段）
+            splits = [s + separator for s in splits[:-1]] + [splits[-1]]
+            splits = [s for s in splits if s]
+            if len(splits) == 1:
+                continue
+
+            # 递归合并分割后的文本块
+            final_chunks = []
+            current_chunk = []
+            current_chunk_length = 0
+
+            for split in splits:
+                split_length = length_function(split)
+
+                # 如果单个分割部分已经超过了chunk_size，需要递归分割
+                if split_length > chunk_size:
+                    # 先处理当前积累的块
+                    if current_chunk:
+                        final_chunks.extend(recurse("".join(current_chunk)))
+                        current_chunk = []
+                        current_chunk_length = 0
+
+                    # 递归分割过大的部分
+                    final_chunks.extend(recurse(split))
+                # 如果添加这部分会使当前块超过chunk_size
+                elif current_chunk_length + split_length > chunk_size:
+                    # 合并当前块并添加到结果中
+                    combined_text = "".join(current_chunk)
+                    final_chunks.append(combined_text)
+
+                    # 处理重叠部分
+                    overlap_start = max(0, len(combined_text) - chunk_overlap)
+                    if overlap_start > 0:
+                        overlap_text = combined_text[overlap_start:]
+                        current_chunk = [overlap_text, split]
+                        current_chunk_length = (
+                            length_function(overlap_text) + split_length
+                        )
+                    else:
+                        current_chunk = [split]
+                        current_chunk_length = split_length
+                else:
+                    # 添加到当前块
+                    current_chunk.append(split)
+                    current_chunk_length += split_length
+
+            # 处理剩余的块
+            if current_chunk:
+                final_chunks.append("".join(current_chunk))
+
+            return final_chunks
+
+    return [text]
+
+
+def split_segments(
+    text: str, chunk_size: int, anchor_modulus: int, min_size: int, max_size: int
+) -> list[str]:
+    """在内容定义的边界上把文本切分为分段，分段直接拼接即为原文
+
+    行哈希对 ``anchor_modulus`` 取模为 0 的行尾可作为边界；分段不小于
+    ``min_size`` 个字符，超过 ``max_size`` 时强制切分。
+    """
+    segments = []
+    current: list[str] = []
+    current_size = 0
+    for line in text.splitlines(keepends=True):
+        current.append(line)
+        current_size += len(line)
+        digest = hashlib.blake2b(line.encode("utf-8"), digest_size=8).digest()
+        is_anchor = int.from_bytes(digest, "big") % anchor_modulus == 0
+        if (current_size >= min_size and is_anchor) or current_size >= max_size:
+            segments.append("".join(current))
+            current, current_size = [], 0
+    if current:
+        segments.append("".join(current))
+    return segments
+
+
+def chunk_text(
+    spec: dict[str, Any], text: str, chunk_size: int, chunk_overlap: int
+) -> list[str]:
+    """按分块器描述分块
+
+    Args:
+        spec: :meth:`BaseChunker.worker_spec` 返回的分块器描述
+        text: 要分块的文本
+        chunk_size: 文本块大小
+        chunk_overlap: 文本块重叠大小
+
+    """
+    kind = spec["kind"]
+    if kind == "recursive":
+        return split_recursive(text, chunk_size, chunk_overlap, spec["separators"])
+    if kind == "content_defined":
+        chunks = []
+        for segment in split_segments(
+            text,
+            chunk_size,
+            spec["anchor_modulus"],
+            chunk_size * spec["min_segment_chunks"],
+            chunk_size * spec["max_segment_chunks"],
+        ):
+            chunks.extend(chunk_text(spec["inner"], segment, chunk_size, chunk_overlap))
+        return chunks
+    raise ValueError(f"未知的分块器: {kind}")
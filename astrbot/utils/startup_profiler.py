@@ -0,0 +1,150 @@
+"""启动耗时分析。
+
+设置环境变量 ``ASTRBOT_PROFILE_STARTUP=1`` 后，AstrBot 会在启动完成时输出：
+
+- 导入耗时树：各模块（含其子模块）的累计导入耗时，按导入关系缩进；
+- 启动阶段耗时：``InitialLoader`` 与 ``AstrBotCoreLifecycle.initialize`` 中
+  各阶段的耗时。
+
+导入计时需要尽早安装，因此由 ``astrbot/__init__.py`` 在导入任何核心模块之前
+调用 :func:`install_import_timer`。本模块只依赖标准库。未开启时
+:func:`checkpoint` 与 :func:`report` 均不做任何事情。
+"""
+
+from __future__ import annotations
+
+import builtins
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+PROFILE_ENV = "ASTRBOT_PROFILE_STARTUP"
+IMPORT_REPORT_THRESHOLD = 0.02
+"""导入耗时树中只展示累计耗时不低于该值（秒）的模块"""
+IMPORT_REPORT_MAX_LINES = 80
+
+_logger = logging.getLogger("astrbot")
+
+
+@dataclass
+class _ImportNode:
+    name: str
+    cumulative: float = 0.0
+    children: list[_ImportNode] = field(default_factory=list)
+
+    @property
+    def self_time(self) -> float:
+        return self.cumulative - sum(c.cumulative for c in self.children)
+
+
+_original_import = None
+_import_roots: list[_ImportNode] = []
+_import_stack: list[_ImportNode] = []
+_phases: list[tuple[str, float]] = []
+_last_checkpoint = time.perf_counter()
+
+
+def is_enabled() -> bool:
+    return os.environ.get(PROFILE_ENV, "0") == "1"
+
+
+def _resolve_import_name(name: str, globals_: dict | None, level: int) -> str:
+    if not level:
+        return name
+    package = (globals_ or {}).get("__package__") or ""
+    try:
+        return importlib.util.resolve_name("." * level + name, package)
+    except (ImportError, ValueError):
+        return name
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    assert _original_import is not None
+    if threading.current_thread() is not threading.main_thread():
+        return _original_import(name, globals, locals, fromlist, level)
+
+    node = _ImportNode(_resolve_import_name(name, globals, level))
+    # ``from pkg import sub`` 加载的是子模块，以子模块名记录
+    submodules = [
+        f"{node.name}.{item}"
+        for item in fromlist or ()
+        if isinstance(item, str) and f"{node.name}.{item}" not in sys.modules
+    ]
+    siblings = _import_stack[-1].children if _import_stack else _import_roots
+    modules_before = len(sys.modules)
+    _import_stack.append(node)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        node.cumulative = time.perf_counter() - start
+        _import_stack.pop()
+        if loaded := [m for m in submodules if m in sys.modules]:
+            node.name = ", ".join(loaded)
+        # 只记录真正加载了新模块的导入，已缓存的导入不计入
+        if len(sys.modules) != modules_before:
+            siblings.append(node)
+
+
+def install_import_timer() -> None:
+    """开始记录模块导入耗时。"""
+    global _original_import
+    if _original_import is not None:
+        return
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+
+def uninstall_import_timer() -> None:
+    global _original_import
+    if _original_import is None:
+        return
+    builtins.__import__ = _original_import
+    _original_import = None
+
+
+def checkpoint(name: str) -> None:
+    """记录自上一个检查点以来的阶段耗时。"""
+    global _last_checkpoint
+    if not is_enabled():
+        return
+    now = time.perf_counter()
+    _phases.append((name, now - _last_checkpoint))
+    _last_checkpoint = now
+
+
+def _format_import_tree() -> list[str]:
+    lines: list[str] = []
+
+    def walk(nodes: list[_ImportNode], depth: int) -> None:
+        for node in sorted(nodes, key=lambda n: n.cumulative, reverse=True):
+            if node.cumulative < IMPORT_REPORT_THRESHOLD:
+                continue
+            if len(lines) >= IMPORT_REPORT_MAX_LINES:
+                return
+            lines.append(
+                f"{'  ' * depth}{node.name}: {node.cumulative * 1000:.0f}ms"
+                f" (self {node.self_time * 1000:.0f}ms)"
+            )
+            walk(node.children, depth + 1)
+
+    walk(_import_roots, 1)
+    return lines
+
+
+def report() -> None:
+    """输出导入耗时树与各启动阶段耗时，并停止导入计时。"""
+    if not is_enabled():
+        return
+    uninstall_import_timer()
+
+    total_import = sum(n.cumulative for n in _import_roots)
+    lines = [f"导入耗时（共 {total_import:.2f}s）："]
+    lines.extend(_format_import_tree())
+    lines.append("启动阶段耗时：")
+    lines.extend(f"  {name}: {duration:.3f}s" for name, duration in _phases)
+    _logger.info("启动耗时分析\n" + "\n".join(lines))
@@ -4,7 +4,7 @@ import json
 import os
 import re
 import zipfile
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -179,10 +179,10 @@ class TestAstrBotExporter:
             kb_manager=mock_kb_manager,
         )
 
-        main_data = {
-            "platform_stats": [{"id": 1}],
-            "conversations": [],
-            "attachments": [],
+        main_stats = {
+            "platform_stats": 1,
+            "conversations": 0,
+            "attachments": 0,
         }
         kb_meta_data = {
             "knowledge_bases": [],
@@ -193,7 +193,7 @@ class TestAstrBotExporter:
             "plugin_data": {"files": 5, "size": 512},
         }
 
-        manifest = exporter._generate_manifest(main_data, kb_meta_data, dir_stats)
+        manifest = exporter._generate_manifest(main_stats, kb_meta_data, dir_stats)
 
         assert manifest["version"] == BACKUP_MANIFEST_VERSION
         assert manifest["astrbot_version"] == VERSION
@@ -204,6 +204,8 @@ class TestAstrBotExporter:
         assert "directories" in manifest
         assert manifest["statistics"]["main_db"]["platform_stats"] == 1
         assert manifest["statistics"]["directories"] == dir_stats
+        assert manifest["backup_type"] == "full"
+        assert manifest["main_db_format"] == "ndjson"
 
     @pytest.mark.asyncio
     async def test_export_all_creates_zip(
@@ -237,7 +239,7 @@ class TestAstrBotExporter:
         with zipfile.ZipFile(zip_path, "r") as zf:
             namelist = zf.namelist()
             assert "manifest.json" in namelist
-            assert "databases/main_db.json" in namelist
+            assert "databases/main_db/platform_stats.ndjson" in namelist
             assert "config/cmd_config.json" in namelist
 
 
@@ -689,6 +691,52 @@ class TestAstrBotImporter:
         importer._import_main_database.assert_not_awaited()
 
 
+class TestNdjsonRoundtrip:
+    """主数据库 NDJSON 流式导出/导入测试"""
+
+    @pytest.mark.asyncio
+    async def test_full_then_incremental_roundtrip(self, temp_db, tmp_path):
+        """测试全量导出后导入，再以增量备份 upsert 更新的记录"""
+        from astrbot.core.db.sqlite import SQLiteDatabase
+
+        await temp_db.initialize()
+        await temp_db.create_conversation("user_a", "webchat", title="a", cid="c1")
+        await temp_db.create_conversation("user_b", "webchat", title="b", cid="c2")
+
+        exporter = AstrBotExporter(main_db=temp_db)
+        full_zip = tmp_path / "full.zip"
+        with zipfile.ZipFile(full_zip, "w") as zf:
+            stats, _ = await exporter._export_main_database(zf)
+        assert stats["conversations"] == 2
+
+        target = SQLiteDatabase(str(tmp_path / "target.db"))
+        await target.initialize()
+        try:
+            importer = AstrBotImporter(main_db=target)
+            with zipfile.ZipFile(full_zip, "r") as zf:
+                imported = await importer._import_main_database(
+                    importer._open_main_tables(zf)
+                )
+            assert imported["conversations"] == 2
+
+            since = datetime.now(timezone.utc)
+            await temp_db.update_conversation("c1", title="a2")
+            incremental_zip = tmp_path / "incremental.zip"
+            with zipfile.ZipFile(incremental_zip, "w") as zf:
+                stats, _ = await exporter._export_main_database(zf, since=since)
+            assert stats["conversations"] == 1
+
+            with zipfile.ZipFile(incremental_zip, "r") as zf:
+                await importer._import_main_database(
+                    importer._open_main_tables(zf), upsert=True
+                )
+            conv = await target.get_conversation_by_id("c1")
+            assert conv.title == "a2"
+            assert (await target.get_conversation_by_id("c2")).title == "b"
+        finally:
+            await target.engine.dispose()
+
+
 class TestSecureFilename:
     """安全文件名函数测试"""
 
@@ -1089,5 +1137,6 @@ class TestBackupIntegration:
             assert config["setting"] == "value"
 
             # 读取主数据库
-            main_db = json.loads(zf.read("databases/main_db.json"))
-            assert "platform_stats" in main_db
+            namelist = zf.namelist()
+            assert "databases/main_db/platform_stats.ndjson" in namelist
+            assert manifest["main_db_format"] == "ndjson"
@@ -0,0 +1,103 @@
+"""
+MaiBot 聊天循环新消息唤醒测试
+
+测试内容包括：
+1. 没有新消息时 HeartFChatting._loopbody 不查询数据库
+2. 新消息通知立即唤醒等待中的聊天循环
+3. 聊天循环结束后释放聊天流的通知状态
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from astrbot.core.maibot.src.config import config as maibot_config
+
+# 导入聊天循环需要完整配置，测试中使用模板配置
+_TEMPLATE_DIR = os.path.join(os.path.dirname(maibot_config.__file__), "..", "template")
+if maibot_config.global_config is None:
+    maibot_config.global_config = maibot_config.load_config(
+        os.path.join(_TEMPLATE_DIR, "bot_config_template.toml")
+    )
+if not hasattr(maibot_config.model_config, "model_task_config"):
+    maibot_config.model_config = maibot_config.api_ada_load_config(
+        os.path.join(_TEMPLATE_DIR, "model_config_template.toml")
+    )
+
+from astrbot.core.maibot.src.chat.heart_flow import heartFC_chat  # noqa: E402
+from astrbot.core.maibot.src.chat.message_receive.message_notifier import (  # noqa: E402
+    NewMessageNotifier,
+)
+
+
+@pytest.fixture
+def notifier(monkeypatch):
+    notifier = NewMessageNotifier()
+    monkeypatch.setattr(heartFC_chat, "new_message_notifier", notifier)
+    return notifier
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    queries = []
+
+    def get_messages_by_time_in_chat(**kwargs):
+        queries.append(kwargs)
+        return []
+
+    monkeypatch.setattr(
+        heartFC_chat.message_api,
+        "get_messages_by_time_in_chat",
+        get_messages_by_time_in_chat,
+    )
+    monkeypatch.setattr(heartFC_chat, "PENDING_RECHECK_INTERVAL", 0.01)
+    return queries
+
+
+def _make_chat() -> heartFC_chat.HeartFChatting:
+    # 跳过构造函数，避免依赖聊天流管理器与数据库
+    chat = heartFC_chat.HeartFChatting.__new__(heartFC_chat.HeartFChatting)
+    chat.stream_id = "stream"
+    chat.log_prefix = "[stream]"
+    chat.last_read_time = time.time() - 2
+    chat.consecutive_no_reply_count = 0
+    chat.running = True
+    return chat
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_does_not_query(notifier, queries, monkeypatch):
+    monkeypatch.setattr(heartFC_chat, "IDLE_WAIT_TIMEOUT", 0.05)
+    assert await _make_chat()._loopbody() is True
+    assert queries == []
+
+
+@pytest.mark.asyncio
+async def test_new_message_wakes_loop(notifier, queries):
+    chat = _make_chat()
+    task = asyncio.create_task(chat._loopbody())
+    await asyncio.sleep(0.05)
+    assert not task.done()
+    assert queries == []
+
+    notifier.notify("stream", time.time())
+    assert await asyncio.wait_for(task, timeout=1.0) is True
+    assert len(queries) == 1
+    assert queries[0]["start_time"] == chat.last_read_time
+
+
+@pytest.mark.asyncio
+async def test_loop_exit_releases_notifier_state(notifier):
+    chat = _make_chat()
+    chat._loopbody = AsyncMock(return_value=False)
+    notifier.notify("stream", time.time())
+    assert notifier.has_new_since("stream", 0)
+
+    chat._loop_task = asyncio.create_task(chat._main_chat_loop())
+    await chat._loop_task
+
+    assert not notifier.has_new_since("stream", 0)
+    assert "stream" not in notifier._events
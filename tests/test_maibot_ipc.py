@@ -0,0 +1,111 @@
+"""
+MaiBot 进程间通信测试
+
+测试内容包括：
+1. QueueReader 将 multiprocessing.Queue 桥接为可 await 的队列
+2. LocalServer 按 request_id 关联请求与响应
+3. LocalServer 日志批量发送
+4. 输出队列已满时发送不阻塞调用方，日志超时丢弃
+"""
+
+import asyncio
+import queue
+import time
+from multiprocessing import Queue
+
+import pytest
+
+from astrbot.core.maibot.maibot_adapter.ipc import LocalServer, QueueReader
+from astrbot.core.maibot.maibot_adapter.ipc import server as server_module
+from astrbot.core.maibot.maibot_adapter.ipc.protocol import IPCMessage, MessageType
+
+
+@pytest.mark.asyncio
+async def test_queue_reader_wakes_on_message():
+    mp_queue = Queue()
+    reader = QueueReader(mp_queue).start()
+    try:
+        assert await reader.get_with_timeout(0.05) is None
+        mp_queue.put({"type": "pong"})
+        assert await asyncio.wait_for(reader.get(), timeout=2.0) == {"type": "pong"}
+    finally:
+        reader.stop()
+
+
+@pytest.mark.asyncio
+async def test_server_request_resolved_by_request_id():
+    input_queue, output_queue = Queue(), Queue()
+    server = LocalServer(input_queue, output_queue)
+
+    task = asyncio.create_task(
+        server.request(MessageType.TOOL_EXECUTE, {"tool_name": "echo"}, timeout=2.0)
+    )
+    sent = await asyncio.to_thread(output_queue.get, True, 2.0)
+    assert sent["type"] == "tool_execute"
+    request_id = sent["payload"]["request_id"]
+
+    # 无关响应不会唤醒等待方
+    await server.process_input(
+        IPCMessage(
+            type=MessageType.TOOL_EXECUTE_RESULT,
+            payload={"request_id": "other", "success": False},
+        )
+    )
+    assert not task.done()
+
+    await server.process_input(
+        IPCMessage(
+            type=MessageType.TOOL_EXECUTE_RESULT,
+            payload={"request_id": request_id, "success": True},
+        )
+    )
+    result = await asyncio.wait_for(task, timeout=2.0)
+    assert result["success"] is True
+    server.close()
+
+
+def test_server_batches_logs_before_other_messages():
+    input_queue, output_queue = Queue(), Queue()
+    server = LocalServer(input_queue, output_queue)
+    for i in range(3):
+        server.send_log("info", f"line {i}")
+    server.send_pong()
+
+    # 后台冲刷线程可能先发出一部分，但日志必须全部先于 pong 到达且保持顺序
+    messages = []
+    while not messages or messages[-1]["type"] != "pong":
+        messages.append(output_queue.get(timeout=2.0))
+    records = []
+    for msg in messages[:-1]:
+        if msg["type"] == "log_batch":
+            records.extend(msg["payload"]["records"])
+        else:
+            assert msg["type"] == "log"
+            records.append(msg["payload"])
+    assert [r["message"] for r in records] == ["line 0", "line 1", "line 2"]
+    assert len(messages) < 4
+    with pytest.raises(queue.Empty):
+        output_queue.get(timeout=0.2)
+    server.close()
+
+
+def test_server_send_does_not_block_on_full_output_queue(monkeypatch):
+    monkeypatch.setattr(server_module, "LOG_PUT_TIMEOUT", 0.05)
+    input_queue, output_queue = Queue(), Queue(maxsize=1)
+    output_queue.put({"type": "filler"})
+    server = LocalServer(input_queue, output_queue)
+
+    start = time.monotonic()
+    server.send_log("info", "dropped")
+    server.flush_logs()
+    server.send_pong()
+    assert time.monotonic() - start < 0.5
+
+    # 日志等待超时后被丢弃，非日志消息在队列腾出空间后送达
+    deadline = time.monotonic() + 2
+    while server.dropped_logs == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert server.dropped_logs == 1
+    assert output_queue.get(timeout=2.0)["type"] == "filler"
+    assert output_queue.get(timeout=2.0)["type"] == "pong"
+    server.close()
@@ -0,0 +1,157 @@
+"""
+MaiBot LLM 使用统计与模型负载均衡测试
+
+测试内容包括：
+1. LLMUsageRecorder 后台线程批量写入，flush 写出剩余记录
+2. 近期 token 用量按半衰期衰减
+3. 负载均衡按近期用量选择模型，错误率以倍数放大负载
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from peewee import SqliteDatabase
+
+from astrbot.core.maibot.src.config import config as maibot_config
+
+# llm_models 包在导入时读取模型配置，测试中不加载完整配置
+if maibot_config.model_config is None:
+    maibot_config.model_config = SimpleNamespace(api_providers=[])
+
+from astrbot.core.maibot.src.common.database.database_model import LLMUsage  # noqa: E402
+from astrbot.core.maibot.src.config.api_ada_configs import ModelInfo, TaskConfig  # noqa: E402
+from astrbot.core.maibot.src.llm_models import utils as usage_utils  # noqa: E402
+from astrbot.core.maibot.src.llm_models import utils_model  # noqa: E402
+from astrbot.core.maibot.src.llm_models.model_client.base_client import (  # noqa: E402
+    UsageRecord,
+)
+
+
+def _model(name: str) -> ModelInfo:
+    return ModelInfo(model_identifier=f"{name}-id", name=name, api_provider="p")
+
+
+def _usage(total: int) -> UsageRecord:
+    return UsageRecord(
+        model_name="m",
+        provider_name="p",
+        prompt_tokens=total // 2,
+        completion_tokens=total - total // 2,
+        total_tokens=total,
+    )
+
+
+@pytest.fixture
+def usage_db(tmp_path, monkeypatch):
+    test_db = SqliteDatabase(str(tmp_path / "usage.db"))
+    with test_db.bind_ctx([LLMUsage]):
+        test_db.create_tables([LLMUsage])
+        monkeypatch.setattr(usage_utils, "db", test_db)
+        yield test_db
+    test_db.close()
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = usage_utils.LLMUsageRecorder()
+    monkeypatch.setattr(usage_utils, "llm_usage_recorder", recorder)
+    monkeypatch.setattr(utils_model, "llm_usage_recorder", recorder)
+    return recorder
+
+
+def test_recorder_batches_writes_and_flush_drains(usage_db, recorder, monkeypatch):
+    batches = []
+    write_batch = recorder._write_batch
+
+    def counting_write(batch):
+        batches.append(len(batch))
+        write_batch(batch)
+
+    monkeypatch.setattr(recorder, "_write_batch", counting_write)
+    monkeypatch.setattr(usage_utils, "USAGE_FLUSH_INTERVAL", 0.2)
+
+    for _ in range(5):
+        recorder.record_usage_to_database(_model("a"), _usage(10), "u", "chat", "/chat")
+    deadline = time.monotonic() + 5
+    while LLMUsage.select().count() < 5 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert LLMUsage.select().count() == 5
+    # 后台线程在凑批窗口内把记录合并为少量写入
+    assert len(batches) < 5
+
+    recorder._queue.put_nowait(dict(LLMUsage.select().dicts().first(), id=None))
+    recorder.flush()
+    assert recorder._queue.empty()
+    assert recorder.get_model_stats("a").total_tokens == 50
+
+
+def test_recent_tokens_decay_with_half_life(recorder, monkeypatch):
+    monkeypatch.setattr(
+        recorder, "_queue", SimpleNamespace(put_nowait=lambda row: None)
+    )
+    monkeypatch.setattr(recorder, "_ensure_writer", lambda: None)
+    recorder.record_usage_to_database(_model("a"), _usage(1000), "u", "chat", "/chat")
+    stats = recorder.get_model_stats("a")
+
+    now = stats.last_used
+    assert stats.recent_tokens(now) == pytest.approx(1000)
+    half_life = usage_utils.USAGE_TOKEN_HALF_LIFE
+    assert stats.recent_tokens(now + half_life) == pytest.approx(500)
+    assert stats.total_tokens == 1000
+
+
+def _request(models: list[str]) -> utils_model.LLMRequest:
+    return utils_model.LLMRequest(TaskConfig(model_list=models), request_type="test")
+
+
+def test_balance_prefers_model_with_less_recent_usage(recorder, monkeypatch):
+    monkeypatch.setattr(
+        recorder, "_queue", SimpleNamespace(put_nowait=lambda row: None)
+    )
+    monkeypatch.setattr(recorder, "_ensure_writer", lambda: None)
+    recorder.record_usage_to_database(
+        _model("busy"), _usage(50_000), "u", "chat", "/chat"
+    )
+    recorder.record_usage_to_database(
+        _model("idle"), _usage(50_000), "u", "chat", "/chat"
+    )
+    # idle 的用量发生在很久以前，已衰减殆尽
+    recorder.get_model_stats("idle").last_used -= 20 * usage_utils.USAGE_TOKEN_HALF_LIFE
+
+    models = {name: _model(name) for name in ("busy", "idle")}
+    monkeypatch.setattr(
+        utils_model,
+        "model_config",
+        SimpleNamespace(
+            get_model_info=models.__getitem__, get_provider=lambda name: None
+        ),
+    )
+    monkeypatch.setattr(
+        utils_model.client_registry,
+        "get_client_class_instance",
+        lambda provider, force_new=False: None,
+    )
+
+    request = _request(["busy", "idle"])
+    model_info, _, _ = request._select_model()
+    assert model_info.name == "idle"
+    assert request.model_usage["idle"] == (0, 0, 1)
+
+
+def test_error_rate_multiplies_load(recorder, monkeypatch):
+    monkeypatch.setattr(
+        recorder, "_queue", SimpleNamespace(put_nowait=lambda row: None)
+    )
+    monkeypatch.setattr(recorder, "_ensure_writer", lambda: None)
+    recorder.record_usage_to_database(
+        _model("healthy"), _usage(5000), "u", "chat", "/chat"
+    )
+    recorder.record_failure("failing")
+
+    balance = utils_model.LLMRequest._balance_score
+    # 失败的模型没有任何 token 用量，依然排在健康模型之后
+    assert balance("failing", (0, 0, 0)) > balance("healthy", (0, 0, 0))
+    # 没有统计数据时按本对象记录的失败次数放大
+    assert balance("unknown", (0, 2, 0)) > balance("unknown", (0, 0, 1))
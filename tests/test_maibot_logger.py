@@ -0,0 +1,101 @@
+"""
+MaiBot 日志处理器测试
+
+测试内容包括：
+1. TimestampedFileHandler 写入线程：flush 与 close 会写完队列中的记录
+2. TimestampedFileHandler 队列满时丢弃并计数，不阻塞调用方
+3. WebSocketLogHandler 环形缓冲区限制内存占用，每个 tick 只调度一次推送
+"""
+
+import logging
+
+import pytest
+
+from astrbot.core.maibot.src.common import logger as maibot_logger
+from astrbot.core.maibot.src.common.logger import (
+    TimestampedFileHandler,
+    WebSocketLogHandler,
+)
+from astrbot.core.maibot.src.webui import logs_ws
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+def _read_lines(handler: TimestampedFileHandler) -> list[str]:
+    return handler.current_file.read_text(encoding="utf-8").splitlines()
+
+
+@pytest.fixture
+def file_handler(tmp_path, monkeypatch):
+    # 拉长定时 flush 间隔，确保文件内容只能来自 flush()/close() 的显式冲刷
+    monkeypatch.setattr(maibot_logger, "FILE_LOG_FLUSH_INTERVAL", 30.0)
+    handler = TimestampedFileHandler(tmp_path)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    yield handler
+    handler.close()
+
+
+def test_file_handler_flush_and_close_drain_queue(file_handler):
+    for i in range(500):
+        file_handler.emit(_record(f"line {i}"))
+    file_handler.flush()
+    assert _read_lines(file_handler) == [f"line {i}" for i in range(500)]
+
+    for i in range(500, 1000):
+        file_handler.emit(_record(f"line {i}"))
+    file_handler.close()
+    assert _read_lines(file_handler) == [f"line {i}" for i in range(1000)]
+    assert file_handler.current_stream is None
+    assert not file_handler._writer.is_alive()
+
+
+def test_file_handler_drops_records_when_queue_is_full(tmp_path, monkeypatch):
+    monkeypatch.setattr(maibot_logger, "FILE_LOG_QUEUE_MAXSIZE", 2)
+    handler = TimestampedFileHandler(tmp_path)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        # 持有写入锁使写入线程停在第一条记录上，之后的记录只能堆在队列里
+        with handler._lock:
+            for i in range(10):
+                handler.emit(_record(f"line {i}"))
+            assert handler.dropped_records >= 7
+        handler.flush()
+        assert len(_read_lines(handler)) == 10 - handler.dropped_records
+    finally:
+        handler.close()
+
+
+class _FakeLoop:
+    def __init__(self) -> None:
+        self.scheduled = []
+
+    def call_soon_threadsafe(self, callback) -> None:
+        self.scheduled.append(callback)
+
+
+def test_ws_handler_ring_buffer_bounds_memory(monkeypatch):
+    monkeypatch.setattr(maibot_logger, "WS_LOG_BUFFER_SIZE", 100)
+    broadcasts = []
+    monkeypatch.setattr(logs_ws, "broadcast_logs", broadcasts.append)
+    loop = _FakeLoop()
+    handler = WebSocketLogHandler()
+    handler.set_loop(loop)
+
+    for i in range(250):
+        handler.emit(_record(f"line {i}"))
+
+    assert len(handler._buffer) == 100
+    assert handler.dropped_records == 150
+    # 推送尚未执行前不会重复调度
+    assert len(loop.scheduled) == 1
+
+    loop.scheduled.pop()()
+    assert [log["message"] for log in broadcasts[0]] == [
+        f"line {i}" for i in range(150, 250)
+    ]
+    assert not handler._buffer
+
+    handler.emit(_record("next"))
+    assert len(loop.scheduled) == 1
@@ -470,3 +470,63 @@ async def test_install_plugin_runs_dependency_install_when_precheck_fails(
 
     assert ("deps", str(plugin_path / "requirements.txt")) in events
     assert ("load", TEST_PLUGIN_DIR) in events
+
+
+@pytest.mark.asyncio
+async def test_ensure_plugin_requirements_skips_unchanged_requirements_file(
+    plugin_manager_pm: PluginManager, local_updator: Path, monkeypatch
+):
+    _write_requirements(local_updator)
+    prechecks = []
+
+    def mock_precheck(requirements_path):
+        prechecks.append(requirements_path)
+        return set()
+
+    monkeypatch.setattr(
+        "astrbot.core.star.star_manager.find_missing_requirements_or_raise",
+        mock_precheck,
+    )
+
+    await plugin_manager_pm._ensure_plugin_requirements(
+        str(local_updator), TEST_PLUGIN_DIR
+    )
+    await plugin_manager_pm._ensure_plugin_requirements(
+        str(local_updator), TEST_PLUGIN_DIR
+    )
+    assert len(prechecks) == 1
+
+    (local_updator / "requirements.txt").write_text("networkx>=3\n", encoding="utf-8")
+    await plugin_manager_pm._ensure_plugin_requirements(
+        str(local_updator), TEST_PLUGIN_DIR
+    )
+    assert len(prechecks) == 2
+
+
+@pytest.mark.asyncio
+async def test_lazy_init_handler_initializes_plugin_once():
+    from astrbot.core.star.star import StarMetadata
+    from astrbot.core.star.star_manager import _wrap_lazy_init_handler
+
+    events = []
+
+    class LazyStar:
+        async def initialize(self):
+            await asyncio.sleep(0.01)
+            events.append("initialize")
+
+    async def handler(event):
+        events.append(("handle", event))
+
+    async def gen_handler(event):
+        yield event
+
+    metadata = StarMetadata(name="lazy", star_cls=LazyStar(), lazy_init=True)
+    wrapped = _wrap_lazy_init_handler(handler, metadata)
+    wrapped_gen = _wrap_lazy_init_handler(gen_handler, metadata)
+
+    await asyncio.gather(wrapped(1), wrapped(2))
+    assert [item async for item in wrapped_gen(3)] == [3]
+    assert events.count("initialize") == 1
+    assert events[0] == "initialize"
+    assert "initialize" in metadata.startup_timings
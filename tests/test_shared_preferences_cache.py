@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from astrbot.core.utils.shared_preferences import SharedPreferences
+
+
+class _FakeDB:
+    def __init__(self):
+        self.rows: dict[tuple[str, str, str], dict] = {}
+        self.single_reads = 0
+        self.bulk_reads = 0
+
+    async def get_preference(self, scope, scope_id, key):
+        self.single_reads += 1
+        value = self.rows.get((scope, scope_id, key))
+        if value is None:
+            return None
+        return SimpleNamespace(scope=scope, scope_id=scope_id, key=key, value=value)
+
+    async def get_preferences(self, scope, scope_id=None, key=None):
+        self.bulk_reads += 1
+        return [
+            SimpleNamespace(scope=s, scope_id=sid, key=k, value=v)
+            for (s, sid, k), v in self.rows.items()
+            if s == scope
+            and (scope_id is None or sid == scope_id)
+            and (key is None or k == key)
+        ]
+
+    async def insert_preference_or_update(self, scope, scope_id, key, value):
+        self.rows[(scope, scope_id, key)] = value
+
+    async def remove_preference(self, scope, scope_id, key):
+        self.rows.pop((scope, scope_id, key), None)
+
+    async def clear_preferences(self, scope, scope_id):
+        for ck in [ck for ck in self.rows if ck[:2] == (scope, scope_id)]:
+            del self.rows[ck]
+
+
+@pytest.fixture
+def sp(tmp_path):
+    return SharedPreferences(_FakeDB(), json_storage_path=str(tmp_path / "sp.json"))
+
+
+@pytest.mark.asyncio
+async def test_session_keys_are_prefetched_in_one_query(sp):
+    db = sp.db_helper
+    db.rows[("umo", "p:GroupMessage:1", "sel_conv_id")] = {"val": "c1"}
+    db.rows[("umo", "p:GroupMessage:1", "session_variables")] = {"val": {"a": 1}}
+
+    assert await sp.session_get("p:GroupMessage:1", "sel_conv_id") == "c1"
+    assert await sp.session_get("p:GroupMessage:1", "session_variables") == {"a": 1}
+    assert await sp.session_get("p:GroupMessage:1", "absent", "dft") == "dft"
+    assert await sp.session_get("p:GroupMessage:1", "absent", "dft") == "dft"
+    assert db.bulk_reads == 1
+    # the absent key is looked up once, then served from the negative cache
+    assert db.single_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_and_write_through(sp):
+    db = sp.db_helper
+    assert await sp.global_get("alter_cmd", {}) == {}
+    assert await sp.global_get("alter_cmd", {}) == {}
+    assert db.single_reads == 1
+
+    await sp.global_put("alter_cmd", {"x": 1})
+    assert await sp.global_get("alter_cmd", {}) == {"x": 1}
+    await sp.global_remove("alter_cmd")
+    assert await sp.global_get("alter_cmd", None) is None
+    assert db.single_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_values_are_not_shared_with_callers(sp):
+    await sp.session_put("umo1", "session_variables", {"a": 1})
+    value = await sp.session_get("umo1", "session_variables", {})
+    value["b"] = 2
+    assert await sp.session_get("umo1", "session_variables", {}) == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_clear_invalidates_scope(sp):
+    await sp.put_async("plugin", "p1", "k", 1)
+    await sp.put_async("plugin", "p2", "k", 2)
+    await sp.clear_async("plugin", "p1")
+    assert await sp.get_async("plugin", "p1", "k", None) is None
+    assert await sp.get_async("plugin", "p2", "k", None) == 2
+
+
+def test_sync_get_uses_cache(sp):
+    sp.put("k", "v", scope="global", scope_id="global")
+    reads = sp.db_helper.single_reads
+    assert sp.get("k", scope="global", scope_id="global") == "v"
+    assert sp.db_helper.single_reads == reads
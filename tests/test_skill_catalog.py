@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from astrbot.core.skills import skill_manager as skill_manager_module
+from astrbot.core.skills.skill_manager import SkillCatalog, SkillManager
+
+
+def _write_skill(root: Path, name: str, description: str) -> None:
+    skill_dir = root / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    skill_dir.joinpath("SKILL.md").write_text(
+        f"---\ndescription: {description}\n---\n# {name}\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def skills_root(monkeypatch, tmp_path: Path) -> Path:
+    data_dir = tmp_path / "data"
+    root = tmp_path / "skills"
+    data_dir.mkdir()
+    root.mkdir()
+    monkeypatch.setattr(
+        "astrbot.core.skills.skill_manager.get_astrbot_data_path",
+        lambda: str(data_dir),
+    )
+    return root
+
+
+def test_catalog_reuses_prompt_until_files_change(monkeypatch, skills_root: Path):
+    _write_skill(skills_root, "alpha", "first skill")
+    _write_skill(skills_root, "beta", "second skill")
+    catalog = SkillCatalog(skills_root=str(skills_root))
+    monkeypatch.setattr(catalog, "CHECK_INTERVAL", 0)
+
+    calls = 0
+    original = SkillManager.list_skills
+
+    def counting_list_skills(self, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(self, **kwargs)
+
+    monkeypatch.setattr(SkillManager, "list_skills", counting_list_skills)
+
+    prompt = catalog.get_skills_prompt("local")
+    assert "first skill" in prompt and "second skill" in prompt
+    assert catalog.get_skills_prompt("local") is prompt
+    assert calls == 1
+
+    only_beta = catalog.get_skills_prompt("local", ["beta"])
+    assert "second skill" in only_beta and "first skill" not in only_beta
+    assert catalog.get_skills_prompt("local", []) == ""
+    assert calls == 1
+
+    _write_skill(skills_root, "alpha", "edited description that is longer")
+    assert "edited description" in catalog.get_skills_prompt("local")
+    assert calls == 2
+
+
+def test_skill_manager_writes_invalidate_catalog(monkeypatch, skills_root: Path):
+    _write_skill(skills_root, "alpha", "first skill")
+    catalog = SkillCatalog(skills_root=str(skills_root))
+    monkeypatch.setattr(skill_manager_module, "skill_catalog", catalog)
+
+    assert "first skill" in catalog.get_skills_prompt("local")
+    SkillManager(skills_root=str(skills_root)).set_skill_active("alpha", False)
+    assert catalog.get_skills_prompt("local") == ""
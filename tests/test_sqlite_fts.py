@@ -0,0 +1,47 @@
+import pytest
+from sqlmodel import text
+
+
+@pytest.mark.asyncio
+async def test_conversation_search_uses_fts_index(temp_db):
+    await temp_db.initialize()
+    assert temp_db.fts_enabled
+
+    weather = await temp_db.create_conversation(
+        user_id="qq:FriendMessage:1",
+        platform_id="qq",
+        content=[
+            {"role": "user", "content": "今天天气怎么样"},
+            {"role": "assistant", "content": [{"type": "text", "text": "晴天"}]},
+        ],
+        title="闲聊",
+    )
+    await temp_db.create_conversation(
+        user_id="qq:GroupMessage:2",
+        platform_id="qq",
+        content=[{"role": "user", "content": "hello world"}],
+    )
+
+    convs, total = await temp_db.get_filtered_conversations(search_query="天气怎")
+    assert [c.conversation_id for c in convs] == [weather.conversation_id]
+    assert total == 1
+
+    # 少于三个字符的查询退化为扫描索引表
+    convs, _ = await temp_db.get_filtered_conversations(search_query="晴天")
+    assert [c.conversation_id for c in convs] == [weather.conversation_id]
+
+    # JSON 键名不会被匹配
+    convs, total = await temp_db.get_filtered_conversations(search_query="role")
+    assert (convs, total) == ([], 0)
+
+    # 触发器随更新与删除维护索引
+    await temp_db.update_conversation(
+        weather.conversation_id,
+        content=[{"role": "user", "content": "换个话题"}],
+    )
+    convs, _ = await temp_db.get_filtered_conversations(search_query="天气怎")
+    assert convs == []
+    await temp_db.delete_conversation(weather.conversation_id)
+    async with temp_db.get_db() as session:
+        count = await session.execute(text("SELECT count(*) FROM conversations_fts"))
+        assert count.scalar_one() == 1
@@ -0,0 +1,136 @@
+"""主库热点查询的 EXPLAIN QUERY PLAN 回归测试
+
+调用 SQLiteDatabase 的真实方法并捕获其执行的 SELECT 语句，
+对每条语句执行 EXPLAIN QUERY PLAN，一旦出现对热点表的全表扫描即失败。
+"""
+
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+HOT_TABLES = {
+    "conversations",
+    "platform_message_history",
+    "platform_sessions",
+    "platform_stats",
+    "chatui_projects",
+    "session_project_relations",
+}
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@pytest_asyncio.fixture
+async def seeded_db(temp_db):
+    await temp_db.initialize()
+    now = datetime.now(timezone.utc)
+    for i in range(5):
+        await temp_db.create_conversation(
+            user_id=f"webchat:FriendMessage:user{i % 2}",
+            platform_id="webchat",
+            title=f"conv {i}",
+            cid=f"cid-{i}",
+            created_at=now - timedelta(minutes=i),
+        )
+        await temp_db.insert_platform_message_history(
+            platform_id="webchat",
+            user_id="session-1",
+            content={"type": "user", "message": [{"type": "plain", "text": "hi"}]},
+        )
+        await temp_db.create_platform_session(
+            creator="alice", session_id=f"session-{i}"
+        )
+        await temp_db.insert_platform_stats("webchat", "webchat", count=1)
+    project = await temp_db.create_chatui_project(creator="alice", title="p")
+    await temp_db.add_session_to_project("session-0", project.project_id)
+    return temp_db, project.project_id
+
+
+def _capture_selects(db) -> list[tuple[str, tuple]]:
+    captured: list[tuple[str, tuple]] = []
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, tuple(parameters or ())))
+
+    event.listen(db.engine.sync_engine, "before_cursor_execute", _on_execute)
+    return captured
+
+
+def _full_scans(db_path: str, statements: list[tuple[str, tuple]]) -> list[str]:
+    problems = []
+    with sqlite3.connect(db_path) as conn:
+        for statement, params in statements:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()
+            for *_, detail in plan:
+                match = FULL_SCAN.match(detail)
+                if match and match.group(1) in HOT_TABLES:
+                    problems.append(f"{detail}\n  in: {statement}")
+    return problems
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes(seeded_db):
+    db, project_id = seeded_db
+    captured = _capture_selects(db)
+
+    await db.get_conversations(user_id="webchat:FriendMessage:user0")
+    await db.get_filtered_conversations(page=2, page_size=2)
+    await db.get_filtered_conversations(page_size=2, platform_ids=["webchat"])
+    await db.get_filtered_conversations(page_size=2, before_cid="cid-1")
+    await db.get_platform_message_history("webchat", "session-1", page=2)
+    history = await db.get_platform_message_history("webchat", "session-1")
+    await db.get_platform_message_history(
+        "webchat", "session-1", before_id=history[1].id
+    )
+    await db.get_platform_sessions_by_creator_paginated("alice", page=2, page_size=2)
+    await db.get_platform_sessions_by_creator_paginated(
+        "alice", platform_id="webchat", exclude_project_sessions=True
+    )
+    await db.get_platform_sessions_by_creator_paginated(
+        "alice", before_session_id="session-2"
+    )
+    await db.get_platform_stats()
+    await db.get_chatui_projects_by_creator("alice")
+    await db.get_project_sessions(project_id)
+
+    assert captured
+    assert _full_scans(db.db_path, captured) == []
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_matches_offset(seeded_db):
+    db, _ = seeded_db
+
+    by_offset, total = await db.get_filtered_conversations(page=1, page_size=10)
+    first, _ = await db.get_filtered_conversations(page_size=2)
+    rest, keyset_total = await db.get_filtered_conversations(
+        page_size=10, before_cid=first[-1].conversation_id
+    )
+    assert keyset_total == total == 5
+    assert [c.conversation_id for c in first + rest] == [
+        c.conversation_id for c in by_offset
+    ]
+
+    sessions, total = await db.get_platform_sessions_by_creator_paginated(
+        "alice", page_size=10
+    )
+    first, _ = await db.get_platform_sessions_by_creator_paginated("alice", page_size=3)
+    rest, _ = await db.get_platform_sessions_by_creator_paginated(
+        "alice", page_size=10, before_session_id=first[-1]["session"].session_id
+    )
+    assert total == 5
+    assert [s["session"].session_id for s in first + rest] == [
+        s["session"].session_id for s in sessions
+    ]
+
+    _, project_total = await db.get_platform_sessions_by_creator_paginated(
+        "alice", exclude_project_sessions=True
+    )
+    assert project_total == 4
+
+    stats = await db.get_platform_stats()
+    assert [(s.platform_id, s.count) for s in stats] == [("webchat", 5)]
@@ -2,7 +2,10 @@ import os
 import time
 from pathlib import Path
 
+import pytest
+
 from astrbot.core.utils.temp_dir_cleaner import TempDirCleaner, parse_size_to_bytes
+from astrbot.core.utils.temp_file_registry import TempFileRegistry, remove_temp_file
 
 
 def test_parse_size_to_bytes():
@@ -50,3 +53,73 @@ def test_cleanup_once_noop_when_below_limit(tmp_path):
     cleaner.cleanup_once()
 
     assert file_path.exists()
+
+
+def test_registered_files_are_evicted_without_rescan(tmp_path):
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    cleaner = TempDirCleaner(max_size_getter=lambda: "0.0008", temp_dir=temp_dir)
+    cleaner.cleanup_once()  # seeds the registry from an empty directory
+
+    base_time = time.time() - 1000
+    sub_dir = temp_dir / "sub"
+    sub_dir.mkdir()
+    file_old = sub_dir / "old.bin"
+    file_new = temp_dir / "new.bin"
+    _write_file(file_old, 500, base_time)
+    _write_file(file_new, 500, base_time + 10)
+    cleaner._registry.register(file_old)
+    cleaner._registry.register(file_new)
+    # files outside the temp dir are ignored
+    cleaner._registry.register(tmp_path / "outside.bin")
+    assert cleaner._registry.total_size == 1000
+
+    cleaner._scan_temp_files = None  # a regular tick must not walk the tree
+    cleaner.cleanup_once()
+
+    assert not file_old.exists()
+    assert not sub_dir.exists()
+    assert file_new.exists()
+    assert cleaner._registry.total_size == 500
+
+
+def test_registry_tolerates_files_removed_by_producer(tmp_path):
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    cleaner = TempDirCleaner(max_size_getter=lambda: "0.0008", temp_dir=temp_dir)
+    cleaner.cleanup_once()
+
+    base_time = time.time() - 1000
+    gone = temp_dir / "gone.bin"
+    newer = temp_dir / "newer.bin"
+    _write_file(gone, 600, base_time)
+    _write_file(newer, 600, base_time + 10)
+    cleaner._registry.register(gone)
+    cleaner._registry.register(newer)
+    gone.unlink()
+
+    cleaner.cleanup_once()
+
+    # the missing file is pruned first, leaving the directory under the limit
+    assert newer.exists()
+    assert len(cleaner._registry) == 1
+    assert cleaner._registry.total_size == 600
+
+
+def test_remove_temp_file_updates_accounting(tmp_path, monkeypatch):
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    registry = TempFileRegistry(root=temp_dir)
+    monkeypatch.setattr(
+        "astrbot.core.utils.temp_file_registry.temp_file_registry", registry
+    )
+    path = temp_dir / "voice.wav"
+    _write_file(path, 100, time.time())
+    registry.register(path)
+
+    remove_temp_file(path)
+
+    assert not path.exists()
+    assert registry.total_size == 0
+    with pytest.raises(FileNotFoundError):
+        remove_temp_file(path)
@@ -0,0 +1,109 @@
+import asyncio
+import io
+import subprocess
+import sys
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from astrbot.core.knowledge_base import ingestion
+from astrbot.core.knowledge_base.chunking.content_defined import ContentDefinedChunker
+from astrbot.core.knowledge_base.chunking.recursive import RecursiveCharacterChunker
+from astrbot.core.knowledge_base.ingestion import DocumentIngestionPool
+from astrbot.core.provider.provider import EmbeddingProvider
+from astrbot.utils.document_worker import chunk_text
+
+
+def _make_pdf(pages: list[str]) -> bytes:
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for text in pages:
+        page = writer.add_blank_page(width=300, height=300)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 10 150 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_pdf_is_parsed_in_page_batches(monkeypatch):
+    monkeypatch.setattr(ingestion, "PDF_PAGES_PER_BATCH", 2)
+    pool = DocumentIngestionPool(max_workers=2)
+    pdf = _make_pdf([f"page{i}" for i in range(5)])
+    try:
+        batches = [
+            batch
+            async for batch in pool.iter_chunks(
+                pdf,
+                "doc.pdf",
+                "pdf",
+                RecursiveCharacterChunker(),
+                chunk_size=8,
+                chunk_overlap=0,
+            )
+        ]
+    finally:
+        pool.shutdown()
+
+    assert [(b.parsed, b.total) for b in batches] == [(2, 5), (4, 5), (5, 5)]
+    chunks = [chunk for batch in batches for chunk in batch.chunks]
+    # 批次边界处的最后一个文本块与下一批一起分块，页序保持不变
+    assert [chunk.strip() for chunk in chunks] == [f"page{i}" for i in range(5)]
+
+
+def test_worker_module_does_not_import_core():
+    code = (
+        "import sys, astrbot.utils.document_worker; "
+        "sys.exit('astrbot.core' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_chunks_match_chunker():
+    text = "\n".join(f"line {i} " + "word " * (i % 7) for i in range(400))
+    chunker = ContentDefinedChunker(RecursiveCharacterChunker())
+    expected = await chunker.chunk(text, chunk_size=64, chunk_overlap=8)
+    assert chunk_text(chunker.worker_spec(), text, 64, 8) == expected
+    # 自定义长度函数无法交给工作进程
+    custom = RecursiveCharacterChunker(length_function=lambda t: len(t.encode()))
+    assert ContentDefinedChunker(custom).worker_spec() is None
+
+
+class _FakeEmbeddingProvider(EmbeddingProvider):
+    def __init__(self) -> None:
+        super().__init__({}, {})
+
+    async def get_embedding(self, text: str) -> list[float]:
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(self, text: list[str]) -> list[list[float]]:
+        # 越靠前的批次越晚完成
+        await asyncio.sleep(0.01 * (10 - int(text[0])))
+        return [[float(t)] for t in text]
+
+    def get_dim(self) -> int:
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_embeddings_batch_keeps_input_order():
+    texts = [str(i) for i in range(9)]
+    vectors = await _FakeEmbeddingProvider().get_embeddings_batch(
+        texts, batch_size=2, tasks_limit=5
+    )
+    assert vectors == [[float(i)] for i in range(9)]
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from astrbot.core.provider.embedding_batching import (
+    AdaptiveConcurrency,
+    EmbeddingBatcher,
+    RateBudget,
+    estimate_tokens,
+    pack_batches,
+)
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+def test_pack_batches_respects_item_and_token_limits():
+    texts = ["a" * 40] * 5 + ["长" * 100] + ["b"]
+    cost = estimate_tokens("a" * 40)
+    batches = list(pack_batches(texts, max_items=3, max_tokens=cost * 2))
+    assert batches == [(0, 2), (2, 4), (4, 5), (5, 6), (6, 7)]
+    assert list(pack_batches(texts, max_items=10, max_tokens=10_000)) == [(0, 7)]
+
+
+def test_aimd_halves_on_throttle_and_grows_on_success():
+    concurrency = AdaptiveConcurrency(initial=4, maximum=6)
+    concurrency.on_throttle()
+    assert concurrency.limit == 2
+    for _ in range(2):
+        concurrency.on_success(0.1)
+    assert concurrency.limit == 3
+    # 延迟突增时不增加并发
+    for _ in range(3):
+        concurrency.on_success(1.0)
+    assert concurrency.limit == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_budget_spaces_requests():
+    budget = RateBudget(rpm=600)
+    start = time.monotonic()
+    for _ in range(3):
+        await budget.acquire()
+    assert time.monotonic() - start >= 0.18
+
+
+@pytest.mark.asyncio
+async def test_batcher_retries_rate_limits_and_keeps_order():
+    calls = 0
+    in_flight = 0
+    peak = 0
+
+    async def embed(texts: list[str]) -> list[list[float]]:
+        nonlocal calls, in_flight, peak
+        calls += 1
+        if calls == 1:
+            error = _RateLimitError("too many requests")
+            error.response = type("R", (), {"headers": {"retry-after": "0.01"}})()
+            raise error
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (5 - int(texts[0]) % 5))
+        in_flight -= 1
+        return [[float(t)] for t in texts]
+
+    batcher = EmbeddingBatcher(embed, initial_concurrency=4, max_concurrency=4)
+    texts = [str(i) for i in range(10)]
+    # 两次并发调用共享同一份并发额度
+    first, second = await asyncio.gather(
+        batcher.embed_all(texts, max_items=2, max_retries=1),
+        batcher.embed_all(texts[::-1], max_items=2, max_retries=1),
+    )
+    assert first == [[float(i)] for i in range(10)]
+    assert second == [[float(i)] for i in reversed(range(10))]
+    # 限流后的重试不计入 max_retries
+    assert calls == 11
+    assert peak <= 4
@@ -0,0 +1,94 @@
+import pytest
+import pytest_asyncio
+
+from astrbot.core.db.vec_db.faiss_impl.vec_db import FaissVecDB
+from astrbot.core.knowledge_base.kb_db_sqlite import KBSQLiteDatabase
+from astrbot.core.provider.provider import EmbeddingProvider
+
+
+class _CountingEmbeddingProvider(EmbeddingProvider):
+    def __init__(self, provider_id: str = "emb", dim: int = 2) -> None:
+        super().__init__({"id": provider_id, "embedding_model": "m"}, {})
+        self.dim = dim
+        self.embedded: list[str] = []
+
+    async def get_embedding(self, text: str) -> list[float]:
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(self, text: list[str]) -> list[list[float]]:
+        self.embedded.extend(text)
+        return [[float(len(t))] * self.dim for t in text]
+
+    def get_dim(self) -> int:
+        return self.dim
+
+
+@pytest_asyncio.fixture
+async def kb_db(tmp_path):
+    db = KBSQLiteDatabase(str(tmp_path / "kb.db"))
+    await db.initialize()
+    yield db
+    await db.close()
+
+
+def _vec_db(tmp_path, provider, cache) -> FaissVecDB:
+    return FaissVecDB(
+        doc_store_path=str(tmp_path / "doc.db"),
+        index_store_path=str(tmp_path / "index.faiss"),
+        embedding_provider=provider,
+        embedding_cache=cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_only_embeds_cache_misses(kb_db, tmp_path):
+    provider = _CountingEmbeddingProvider()
+    vec_db = _vec_db(tmp_path, provider, kb_db.embedding_cache)
+
+    first = await vec_db.embed_batch(["a", "bb", "a"])
+    assert provider.embedded == ["a", "bb"]
+
+    provider.embedded.clear()
+    progress = []
+
+    async def on_progress(current, total):
+        progress.append((current, total))
+
+    second = await vec_db.embed_batch(["bb", "ccc", "a"], progress_callback=on_progress)
+    assert provider.embedded == ["ccc"]
+    assert first == [[1.0, 1.0], [2.0, 2.0], [1.0, 1.0]]
+    assert second == [[2.0, 2.0], [3.0, 3.0], [1.0, 1.0]]
+    assert progress[-1] == (3, 3)
+
+    stats = await kb_db.embedding_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 4, 3)
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_provider_and_dim(kb_db):
+    cache = kb_db.embedding_cache
+    await cache.put_many(_CountingEmbeddingProvider(), ["a"], [[1.0, 1.0]])
+
+    assert await cache.get_many(_CountingEmbeddingProvider(), ["a"]) == [[1.0, 1.0]]
+    assert await cache.get_many(_CountingEmbeddingProvider("other"), ["a"]) == [None]
+    assert await cache.get_many(_CountingEmbeddingProvider(dim=3), ["a"]) == [None]
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used(kb_db):
+    cache = kb_db.embedding_cache
+    cache.max_entries = 2
+    provider = _CountingEmbeddingProvider()
+
+    await cache.put_many(provider, ["a"], [[1.0, 1.0]])
+    await cache.put_many(provider, ["b"], [[2.0, 2.0]])
+    # 命中 "a" 后 "b" 成为最久未使用的条目
+    await cache.get_many(provider, ["a"])
+    await cache.put_many(provider, ["c"], [[3.0, 3.0]])
+
+    assert await cache.get_many(provider, ["a", "b", "c"]) == [
+        [1.0, 1.0],
+        None,
+        [3.0, 3.0],
+    ]
+    assert (await cache.stats())["entries"] == 2
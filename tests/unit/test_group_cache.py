@@ -0,0 +1,138 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from astrbot.api.platform import Group, MessageMember
+from astrbot.core.platform.group_cache import GroupMetadataCache
+from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_message_event import (
+    AiocqhttpMessageEvent,
+)
+
+
+def _make_bot(members: list[dict]) -> AsyncMock:
+    async def call_action(action, **kwargs):
+        await asyncio.sleep(0.01)
+        if action == "get_group_info":
+            return {"group_name": "test group"}
+        return members
+
+    bot = AsyncMock()
+    bot.call_action = AsyncMock(side_effect=call_action)
+    return bot
+
+
+def _make_event(bot, cache) -> AiocqhttpMessageEvent:
+    message_obj = MagicMock()
+    message_obj.group_id = "1001"
+    return AiocqhttpMessageEvent(
+        message_str="",
+        message_obj=message_obj,
+        platform_meta=MagicMock(),
+        session_id="1001",
+        bot=bot,
+        group_cache=cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_group_is_cached_and_single_flight():
+    bot = _make_bot(
+        [
+            {"user_id": 1, "role": "owner", "nickname": "owner"},
+            {"user_id": 2, "role": "member", "nickname": "", "card": "card2"},
+        ]
+    )
+    event = _make_event(bot, GroupMetadataCache())
+
+    groups = await asyncio.gather(*(event.get_group() for _ in range(5)))
+    assert all(g is groups[0] for g in groups)
+    # 一次 get_group_info + 一次 get_group_member_list
+    assert bot.call_action.await_count == 2
+
+    member = await event.get_group_member("2")
+    assert member is not None
+    assert member.nickname == "card2"
+    assert bot.call_action.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_group_cache_incremental_updates():
+    cache = GroupMetadataCache()
+    cache.put(
+        Group(
+            group_id="1001",
+            group_admins=[],
+            members=[MessageMember(user_id="1", nickname="a")],
+        )
+    )
+
+    cache.add_member("1001", MessageMember(user_id="2", nickname="b"))
+    cache.set_admin("1001", "2", True)
+    cache.update_member_nickname("1001", "1", "renamed")
+    group = cache.peek("1001")
+    assert group.get_member("2").nickname == "b"
+    assert group.group_admins == ["2"]
+    assert group.get_member("1").nickname == "renamed"
+
+    cache.remove_member("1001", "2")
+    cache.set_admin("1001", "2", False)
+    assert group.get_member("2") is None
+    assert group.group_admins == []
+
+
+@pytest.mark.asyncio
+async def test_group_cache_expires_and_does_not_cache_errors():
+    cache = GroupMetadataCache(ttl=0)
+    fetch = AsyncMock(return_value=Group(group_id="1"))
+    await cache.get("1", fetch)
+    await cache.get("1", fetch)
+    assert fetch.await_count == 2
+
+    cache = GroupMetadataCache()
+    failing = AsyncMock(side_effect=RuntimeError("boom"))
+    with pytest.raises(RuntimeError):
+        await cache.get("1", failing)
+    assert cache.peek("1") is None
+
+
+@pytest.mark.asyncio
+async def test_fetched_admin_ids_are_strings():
+    bot = _make_bot(
+        [
+            {"user_id": 1, "role": "owner", "nickname": "owner"},
+            {"user_id": 2, "role": "admin", "nickname": "admin"},
+            {"user_id": 3, "role": "member", "nickname": "member"},
+        ]
+    )
+    cache = GroupMetadataCache()
+    group = await _make_event(bot, cache).get_group()
+    assert group.group_admins == ["2"]
+
+    # OneBot 通知中的 user_id 为整数
+    cache.set_admin("1001", 3, True)
+    cache.set_admin("1001", 2, False)
+    assert group.group_admins == ["3"]
+
+
+@pytest.mark.asyncio
+async def test_cancelling_initiator_does_not_cancel_waiters():
+    cache = GroupMetadataCache()
+    release = asyncio.Event()
+
+    async def fetch() -> Group:
+        await release.wait()
+        return Group(group_id="1")
+
+    initiator = asyncio.create_task(cache.get("1", fetch))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get("1", fetch))
+    await asyncio.sleep(0)
+
+    initiator.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert (await waiter).group_id == "1"
+    assert initiator.cancelled()
+    assert cache.peek("1") is not None
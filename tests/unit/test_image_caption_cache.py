@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+import astrbot.core.astr_main_agent as ama
+from astrbot.core.provider.entities import ProviderRequest
+from astrbot.core.utils.image_caption_cache import ImageCaptionCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ImageCaptionCache(db_path=str(tmp_path / "captions.db"))
+
+
+def _write_image(tmp_path, name: str, content: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_same_content_is_captioned_once_and_persisted(tmp_path, cache):
+    first = _write_image(tmp_path, "a.jpg", b"meme")
+    copy = _write_image(tmp_path, "b.jpg", b"meme")
+    calls = 0
+
+    async def caption() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "a cat"
+
+    results = await asyncio.gather(
+        cache.get_or_caption("vision", "describe", first, caption),
+        cache.get_or_caption("vision", "describe", copy, caption),
+    )
+    assert results == ["a cat", "a cat"]
+    assert calls == 1
+
+    # 新实例从数据库读取
+    reopened = ImageCaptionCache(db_path=cache.db_path)
+    assert await reopened.get_or_caption("vision", "describe", copy, caption) == (
+        "a cat"
+    )
+    # 提示词不同则不复用
+    await reopened.get_or_caption("vision", "other prompt", copy, caption)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_bound_and_failures_are_not_cached(tmp_path):
+    cache = ImageCaptionCache(
+        db_path=str(tmp_path / "captions.db"),
+        max_entries=2,
+        memory_entries=1,
+    )
+
+    async def failing() -> str:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_caption("vision", "p", "https://x/1.png", failing)
+    assert not cache._inflight
+
+    for i in range(3):
+        url = f"https://x/{i}.png"
+        await cache.get_or_caption("vision", "p", url, lambda i=i: _const(f"c{i}"))
+
+    async def must_not_run() -> str:
+        raise AssertionError("should be cached")
+
+    assert len(cache._memory) == 1
+    assert await cache.get_or_caption("vision", "p", "https://x/1.png", must_not_run)
+    # 最久未使用的条目已被淘汰
+    with pytest.raises(RuntimeError):
+        await cache.get_or_caption("vision", "p", "https://x/0.png", failing)
+
+
+async def _const(value: str) -> str:
+    return value
+
+
+@pytest.mark.asyncio
+async def test_ensure_img_caption_captions_each_image_in_parallel(
+    tmp_path, monkeypatch, cache
+):
+    monkeypatch.setattr(ama, "image_caption_cache", cache)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_request(provider_id, cfg, image_urls, plugin_context):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "" if image_urls[0].endswith("blank.png") else f"cap:{image_urls[0]}"
+
+    monkeypatch.setattr(ama, "_request_img_caption", fake_request)
+    req = ProviderRequest(
+        image_urls=["https://x/1.png", "https://x/2.png", "https://x/blank.png"]
+    )
+
+    await ama._ensure_img_caption(req, {}, MagicMock(), "vision")
+
+    assert max_in_flight == 3
+    texts = [part.text for part in req.extra_user_content_parts]
+    assert texts == [
+        "<image_caption>cap:https://x/1.png</image_caption>",
+        "<image_caption>cap:https://x/2.png</image_caption>",
+    ]
+    assert req.image_urls == ["https://x/blank.png"]
@@ -0,0 +1,114 @@
+import random
+
+import pytest
+import pytest_asyncio
+
+import astrbot.api  # noqa: F401  # 先于 provider.manager 导入，避免循环导入
+from astrbot.core.knowledge_base.chunking.content_defined import (
+    ContentDefinedChunker,
+)
+from astrbot.core.knowledge_base.kb_db_sqlite import KBSQLiteDatabase
+from astrbot.core.knowledge_base.kb_helper import KBHelper
+from astrbot.core.knowledge_base.models import KnowledgeBase
+from astrbot.core.provider.provider import EmbeddingProvider
+
+
+class _CountingEmbeddingProvider(EmbeddingProvider):
+    def __init__(self) -> None:
+        super().__init__({"id": "emb", "embedding_model": "m"}, {})
+        self.embedded: list[str] = []
+
+    async def get_embedding(self, text: str) -> list[float]:
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(self, text: list[str]) -> list[list[float]]:
+        self.embedded.extend(text)
+        return [[float(len(t)), 1.0] for t in text]
+
+    def get_dim(self) -> int:
+        return 2
+
+
+class _ProviderManager:
+    def __init__(self, provider) -> None:
+        self.provider = provider
+
+    async def get_provider_by_id(self, provider_id):
+        return self.provider
+
+
+def _manual(pages: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta"]
+    lines = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(4, 16)))
+        for _ in range(pages * 40)
+    ]
+    return "\n".join(lines)
+
+
+@pytest_asyncio.fixture
+async def kb_helper(tmp_path):
+    kb_db = KBSQLiteDatabase(str(tmp_path / "kb.db"))
+    await kb_db.initialize()
+    kb = KnowledgeBase(kb_name="manual", embedding_provider_id="emb")
+    async with kb_db.get_db() as session, session.begin():
+        session.add(kb)
+    provider = _CountingEmbeddingProvider()
+    helper = KBHelper(
+        kb_db=kb_db,
+        kb=kb,
+        provider_manager=_ProviderManager(provider),  # type: ignore[arg-type]
+        kb_root_dir=str(tmp_path),
+        chunker=ContentDefinedChunker(),
+    )
+    await helper.initialize()
+    yield helper, provider
+    await helper.terminate()
+    await kb_db.close()
+
+
+@pytest.mark.asyncio
+async def test_content_defined_chunks_resync_after_local_edit():
+    chunker = ContentDefinedChunker()
+    text = _manual(50)
+    edited = text.replace("gamma", "gamma!", 1)
+
+    before = await chunker.chunk(text, chunk_size=200, chunk_overlap=20)
+    after = await chunker.chunk(edited, chunk_size=200, chunk_overlap=20)
+
+    assert "".join(chunker.split_segments(text, 200)) == text
+    changed = len(set(after) - set(before))
+    assert 0 < changed <= len(before) // 10
+
+
+@pytest.mark.asyncio
+async def test_update_document_only_touches_changed_chunks(kb_helper):
+    helper, provider = kb_helper
+    text = _manual(20)
+    chunks = await helper.chunker.chunk(text, chunk_size=200, chunk_overlap=20)
+    doc = await helper.upload_document(
+        file_name="manual.txt",
+        file_content=None,
+        file_type="txt",
+        pre_chunked_text=chunks,
+    )
+    provider.embedded.clear()
+
+    edited = text.replace("delta", "DELTA", 1) + "\nappendix line"
+    new_chunks = await helper.chunker.chunk(edited, chunk_size=200, chunk_overlap=20)
+    result = await helper.update_document(doc.doc_id, pre_chunked_text=new_chunks)
+
+    assert result["added"] == len(provider.embedded)
+    assert 0 < result["added"] <= 4
+    assert result["added"] + result["unchanged"] == len(new_chunks)
+    assert result["unchanged"] - result["removed"] >= len(chunks) - 8
+    assert result["document"].chunk_count == len(new_chunks)
+
+    stored = await helper.get_chunks_by_doc_id(doc.doc_id, limit=None)
+    assert sorted((c["chunk_index"], c["content"]) for c in stored) == list(
+        enumerate(new_chunks)
+    )
+    vec_db = helper.vec_db
+    assert vec_db.embedding_storage.index.ntotal == len(new_chunks)  # type: ignore[attr-defined]
+    assert helper.kb.chunk_count == len(new_chunks)
@@ -0,0 +1,78 @@
+import base64
+import copy
+from unittest.mock import patch
+
+import pytest
+
+import astrbot.core.message.components as Comp
+from astrbot.core.message.media import MediaHandle
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+@pytest.mark.asyncio
+async def test_from_bytes_keeps_a_single_copy():
+    image = Comp.Image.fromBytes(PNG_BYTES)
+    handle = image.media
+    # the handle shares the component's base64 string instead of also holding bytes
+    assert handle._data is None
+    assert image.file == f"base64://{handle._b64}"
+    assert await image.convert_to_base64() == base64.b64encode(PNG_BYTES).decode()
+    assert bytes(await handle.get_bytes()) == PNG_BYTES
+    assert handle._data is None
+    assert await handle.mime_type() == "image/png"
+    assert await handle.size() == len(PNG_BYTES)
+
+
+@pytest.mark.asyncio
+async def test_base64_image_is_spilled_to_disk_once(tmp_path):
+    image = Comp.Image.fromBase64(base64.b64encode(PNG_BYTES).decode())
+    with patch(
+        "astrbot.core.message.media.get_astrbot_temp_path",
+        return_value=str(tmp_path),
+    ):
+        first = await image.convert_to_file_path()
+        second = await image.convert_to_file_path()
+    assert first == second
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_file_backed_record_is_encoded_once(tmp_path):
+    path = tmp_path / "voice.wav"
+    path.write_bytes(b"RIFF\x00\x00\x00\x00WAVEfmt ")
+    record = Comp.Record.fromFileSystem(str(path))
+    encoded = await record.convert_to_base64()
+    path.unlink()
+    # the cached conversion is reused instead of reading the file again
+    assert await record.convert_to_base64() == encoded
+
+
+@pytest.mark.asyncio
+async def test_media_handle_is_rebuilt_when_source_changes(tmp_path):
+    image = Comp.Image.fromBytes(PNG_BYTES)
+    handle = image.media
+    other = tmp_path / "other.png"
+    other.write_bytes(PNG_BYTES + b"1")
+    image.file = str(other)
+    assert image.media is not handle
+    assert bytes(await image.media.get_bytes()) == PNG_BYTES + b"1"
+
+
+@pytest.mark.asyncio
+async def test_iter_chunks_streams_local_file(tmp_path):
+    path = tmp_path / "video.mp4"
+    payload = b"\x00\x00\x00\x18ftypmp42" + b"x" * 1000
+    path.write_bytes(payload)
+    handle = MediaHandle(path=str(path))
+    chunks = [chunk async for chunk in handle.iter_chunks(256)]
+    assert b"".join(chunks) == payload
+    assert max(len(c) for c in chunks) == 256
+    assert await handle.mime_type() == "video/mp4"
+    assert await handle.size() == len(payload)
+
+
+def test_deepcopy_shares_media_cache():
+    image = Comp.Image.fromBytes(PNG_BYTES)
+    assert copy.deepcopy(image)._media is image._media
+    assert "_media" not in image.toDict()["data"]
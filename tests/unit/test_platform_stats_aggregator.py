@@ -0,0 +1,44 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from astrbot.core.utils.platform_stats_aggregator import PlatformStatsAggregator
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_aggregated_counts_in_one_batch(temp_db):
+    await temp_db.initialize()
+    aggregator = PlatformStatsAggregator(temp_db)
+    ts = datetime(2024, 1, 1, 12, 30)
+
+    for _ in range(3):
+        aggregator.record("qq", "aiocqhttp", timestamp=ts)
+    aggregator.record("tg", "telegram", count=2, timestamp=ts)
+    hour = ts.replace(minute=0)
+    assert sorted(aggregator.pending()) == [
+        (hour, "qq", "aiocqhttp", 3),
+        (hour, "tg", "telegram", 2),
+    ]
+
+    await aggregator.flush()
+    aggregator.record("qq", "aiocqhttp", timestamp=ts)
+    await aggregator.stop()
+
+    assert aggregator.pending() == []
+    assert await temp_db.count_platform_stats() == 2
+    assert temp_db.get_total_message_count() == 6
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_counts():
+    db = AsyncMock()
+    db.insert_platform_stats_batch.side_effect = RuntimeError("database is locked")
+    aggregator = PlatformStatsAggregator(db)
+    ts = datetime(2024, 1, 1, 12)
+
+    aggregator.record("qq", "aiocqhttp", timestamp=ts)
+    await aggregator.flush()
+    aggregator.record("qq", "aiocqhttp", timestamp=ts)
+
+    assert aggregator.pending() == [(ts, "qq", "aiocqhttp", 2)]
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from astrbot.core.provider.entities import RerankResult
+from astrbot.core.provider.rerank_batching import RerankBatcher
+
+
+class _FakeRerank:
+    def __init__(self, omit: set[str] | None = None):
+        self.calls: list[tuple[str, list[str]]] = []
+        self.omit = omit or set()
+
+    async def __call__(self, query: str, documents: list[str]) -> list[RerankResult]:
+        self.calls.append((query, list(documents)))
+        await asyncio.sleep(0)
+        return [
+            RerankResult(index=i, relevance_score=float(len(doc)))
+            for i, doc in enumerate(documents)
+            if doc not in self.omit
+        ]
+
+
+@pytest.mark.asyncio
+async def test_partial_hits_only_send_uncached_chunks():
+    rerank = _FakeRerank()
+    batcher = RerankBatcher(rerank, batch_window=0)
+
+    assert await batcher.scores("q", ["a", "b"], ["x", "yy"]) == [1.0, 2.0]
+    assert await batcher.scores("q", ["b", "c"], ["yy", "zzz"]) == [2.0, 3.0]
+    assert rerank.calls == [("q", ["x", "yy"]), ("q", ["zzz"])]
+    # 不同查询不共享缓存
+    await batcher.scores("other", ["a"], ["x"])
+    assert rerank.calls[-1] == ("other", ["x"])
+    assert batcher.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_for_same_query_are_merged():
+    rerank = _FakeRerank()
+    batcher = RerankBatcher(rerank, batch_window=0.01)
+
+    first, second = await asyncio.gather(
+        batcher.scores("q", ["a", "b"], ["x", "yy"]),
+        batcher.scores("q", ["b", "c"], ["yy", "zzz"]),
+    )
+
+    assert first == [1.0, 2.0]
+    assert second == [2.0, 3.0]
+    assert rerank.calls == [("q", ["x", "yy", "zzz"])]
+
+
+@pytest.mark.asyncio
+async def test_expired_and_missing_scores_are_not_reused():
+    rerank = _FakeRerank(omit={"yy"})
+    batcher = RerankBatcher(rerank, ttl=0, batch_window=0)
+
+    assert await batcher.scores("q", ["a", "b"], ["x", "yy"]) == [1.0, None]
+    await batcher.scores("q", ["a"], ["x"])
+    assert len(rerank.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_waiters():
+    async def failing(query, documents):
+        raise RuntimeError("boom")
+
+    batcher = RerankBatcher(failing, batch_window=0.01)
+    results = await asyncio.gather(
+        batcher.scores("q", ["a"], ["x"]),
+        batcher.scores("q", ["a"], ["x"]),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not batcher._inflight
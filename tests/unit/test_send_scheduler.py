@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+import astrbot.core.message.components as Comp
+from astrbot.api.event import MessageChain
+from astrbot.core.platform.send_scheduler import (
+    PRIORITY_PROACTIVE,
+    PRIORITY_REPLY,
+    OutboundScheduler,
+    TokenBucket,
+)
+from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_message_event import (
+    AiocqhttpMessageEvent,
+)
+
+
+def test_token_bucket_reports_wait_time():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.try_take() == 0
+    assert bucket.try_take() == 0
+    assert 0 < bucket.try_take() <= 0.1
+
+
+def test_token_bucket_give_back_is_clamped_to_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.give_back()
+    assert bucket.try_take() == 0
+    assert bucket.try_take() == 0
+    assert bucket.try_take() > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_sweeps_idle_targets():
+    scheduler = OutboundScheduler(per_target_rate=1000, per_target_burst=1)
+    scheduler.SWEEP_INTERVAL = 0
+    for i in range(20):
+        await scheduler.submit(f"group:{i}", AsyncMock(return_value=None))
+    await asyncio.sleep(0.01)
+    await scheduler.submit("group:last", AsyncMock(return_value=None))
+    assert set(scheduler._targets) <= {"group:last"}
+
+
+@pytest.mark.asyncio
+async def test_scheduler_keeps_per_target_order():
+    scheduler = OutboundScheduler(per_target_rate=100, per_target_burst=1)
+    sent: list[int] = []
+
+    async def make_send(i):
+        await asyncio.sleep(0.001 * (5 - i))
+        sent.append(i)
+
+    await asyncio.gather(
+        *(scheduler.submit("group:1", lambda i=i: make_send(i)) for i in range(5))
+    )
+    assert sent == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_serves_replies_before_proactive_messages():
+    scheduler = OutboundScheduler(global_rate=50, global_burst=1)
+    order: list[str] = []
+
+    async def send(name):
+        order.append(name)
+
+    # 先耗尽账号令牌，让后续请求都进入优先级队列
+    await scheduler.submit("warmup", lambda: send("warmup"))
+    await asyncio.gather(
+        scheduler.submit("a", lambda: send("proactive"), PRIORITY_PROACTIVE),
+        scheduler.submit("b", lambda: send("reply"), PRIORITY_REPLY),
+    )
+    assert order == ["warmup", "reply", "proactive"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_retries_rate_limited_sends():
+    scheduler = OutboundScheduler(
+        per_target_rate=1000,
+        global_rate=1000,
+        retry_base_delay=0.001,
+        is_rate_limited=lambda e: isinstance(e, RuntimeError),
+    )
+    send = AsyncMock(side_effect=[RuntimeError("too fast"), "ok"])
+    assert await scheduler.submit("group:1", send) == "ok"
+    assert send.await_count == 2
+
+    failing = AsyncMock(side_effect=ValueError("bad request"))
+    with pytest.raises(ValueError):
+        await scheduler.submit("group:1", failing)
+    assert failing.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_aiocqhttp_coalesces_adjacent_segments_around_files():
+    bot = AsyncMock()
+    scheduler = OutboundScheduler(per_target_rate=1000, global_rate=1000)
+    chain = MessageChain(
+        [
+            Comp.Plain("hello"),
+            Comp.Plain("world"),
+            Comp.File(name="a.txt", url="https://example.com/a.txt"),
+            Comp.Plain("bye"),
+        ]
+    )
+
+    await AiocqhttpMessageEvent.send_message(
+        bot=bot,
+        message_chain=chain,
+        is_group=True,
+        session_id="123456",
+        scheduler=scheduler,
+    )
+
+    calls = bot.send_group_msg.await_args_list
+    assert len(calls) == 3
+    assert [seg["type"] for seg in calls[0].kwargs["message"]] == ["text", "text"]
+    assert calls[1].kwargs["message"][0]["type"] == "file"
+    assert calls[2].kwargs["message"] == [{"type": "text", "data": {"text": "bye"}}]
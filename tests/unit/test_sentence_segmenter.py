@@ -0,0 +1,59 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from astrbot.api.event import MessageChain
+from astrbot.core.message.components import Image, Plain
+from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_message_event import (
+    AiocqhttpMessageEvent,
+)
+from astrbot.core.utils.sentence_segmenter import SentenceSegmenter
+
+
+def test_segmenter_emits_sentences_as_soon_as_complete():
+    segmenter = SentenceSegmenter()
+    assert segmenter.feed("你好") == []
+    assert segmenter.feed("呀！！今天") == ["你好呀！！"]
+    assert segmenter.feed("天气不错。明") == ["今天天气不错。"]
+    assert segmenter.feed("天见") == []
+    assert segmenter.flush() == "明天见"
+    assert segmenter.flush() == ""
+
+
+def test_segmenter_words_and_max_length():
+    segmenter = SentenceSegmenter(["\n\n", "。"], keep_delimiters=False)
+    assert segmenter.split("第一段\n\n第二段。。第三段") == ["第一段", "第二段", "第三段"]
+    # 只有分隔符的句子被丢弃
+    assert SentenceSegmenter().split("。。好的～") == ["好的～"]
+
+    segmenter = SentenceSegmenter(max_length=4)
+    assert segmenter.feed("abcdefghi。") == ["abcd", "efgh", "i。"]
+
+
+@pytest.mark.asyncio
+async def test_streaming_fallback_sends_each_sentence():
+    event = AiocqhttpMessageEvent(
+        message_str="",
+        message_obj=AsyncMock(),
+        platform_meta=AsyncMock(),
+        session_id="1",
+        bot=AsyncMock(),
+        send_scheduler=AsyncMock(),
+    )
+    event.send = AsyncMock()
+
+    async def generator():
+        yield MessageChain([Plain("第一句。第")])
+        yield MessageChain([Plain("二句！"), Image(file="https://example.com/a.png")])
+        yield MessageChain([Plain("剩余")])
+
+    await event.send_streaming(generator(), use_fallback=True)
+
+    sent = [call.args[0].chain[0] for call in event.send.await_args_list]
+    assert [getattr(c, "text", None) for c in sent] == [
+        "第一句。",
+        "第二句！",
+        None,
+        "剩余",
+    ]
+    assert isinstance(sent[2], Image)
@@ -1,5 +1,7 @@
 """Tests for astrbot.core.star.base module."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -164,6 +166,42 @@ class TestStarBase:
         assert len(star_registry) >= initial_count
 
 
+class TestStarMetadataLazyInit:
+    """Test cases for StarMetadata.ensure_initialized."""
+
+    @pytest.mark.asyncio
+    async def test_ensure_initialized_runs_once(self):
+        """Concurrent calls share a single initialize() run."""
+        from astrbot.core.star.star import StarMetadata
+
+        star_cls = MagicMock()
+        star_cls.initialize = AsyncMock()
+        metadata = StarMetadata(name="lazy", star_cls=star_cls)
+
+        await asyncio.gather(
+            metadata.ensure_initialized(), metadata.ensure_initialized()
+        )
+        await metadata.ensure_initialized()
+
+        star_cls.initialize.assert_awaited_once()
+        assert "initialize" in metadata.startup_timings
+
+    @pytest.mark.asyncio
+    async def test_ensure_initialized_retries_after_failure(self):
+        """A failed initialize() is retried on the next call."""
+        from astrbot.core.star.star import StarMetadata
+
+        star_cls = MagicMock()
+        star_cls.initialize = AsyncMock(side_effect=[RuntimeError("boom"), None])
+        metadata = StarMetadata(name="lazy", star_cls=star_cls)
+
+        with pytest.raises(RuntimeError):
+            await metadata.ensure_initialized()
+        await metadata.ensure_initialized()
+
+        assert star_cls.initialize.await_count == 2
+
+
 class TestNoCircularImports:
     """Test that there are no circular import issues."""
 
@@ -0,0 +1,103 @@
+import builtins
+import subprocess
+import sys
+import time
+from types import ModuleType
+from unittest.mock import MagicMock
+
+import pytest
+
+import astrbot.core.knowledge_base.parsers as parsers
+from astrbot.core.db.vec_db.faiss_impl import embedding_storage
+from astrbot.utils import startup_profiler
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.setenv(startup_profiler.PROFILE_ENV, "1")
+    monkeypatch.setattr(startup_profiler, "_import_roots", [])
+    monkeypatch.setattr(startup_profiler, "_import_stack", [])
+    monkeypatch.setattr(startup_profiler, "_phases", [])
+    monkeypatch.setattr(startup_profiler, "_logger", MagicMock())
+    yield startup_profiler
+    startup_profiler.uninstall_import_timer()
+
+
+def _write_package(tmp_path, monkeypatch) -> None:
+    package = tmp_path / "profiled_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("from . import child\n")
+    (package / "child.py").write_text("import time\ntime.sleep(0.03)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "profiled_pkg", raising=False)
+    monkeypatch.delitem(sys.modules, "profiled_pkg.child", raising=False)
+
+
+def test_import_tree_and_phases_are_reported(profiler, tmp_path, monkeypatch):
+    _write_package(tmp_path, monkeypatch)
+    original_import = builtins.__import__
+
+    profiler.install_import_timer()
+    import profiled_pkg
+
+    # 已缓存的导入不计入
+    roots = len(profiler._import_roots)
+    __import__("profiled_pkg")
+    assert len(profiler._import_roots) == roots
+    assert profiled_pkg.child
+
+    profiler.checkpoint("phase")
+
+    [root] = [n for n in profiler._import_roots if n.name == "profiled_pkg"]
+    assert [c.name for c in root.children] == ["profiled_pkg.child"]
+    assert root.cumulative >= 0.03
+    assert root.self_time < root.cumulative
+
+    profiler.report()
+    assert builtins.__import__ is original_import
+    text = profiler._logger.info.call_args[0][0]
+    assert "profiled_pkg:" in text
+    assert "  profiled_pkg.child:" in text
+    assert "phase:" in text
+
+
+def test_profiler_is_noop_when_disabled(profiler, monkeypatch):
+    monkeypatch.delenv(startup_profiler.PROFILE_ENV)
+    last = startup_profiler._last_checkpoint
+    time.sleep(0.001)
+    profiler.checkpoint("phase")
+    profiler.report()
+    assert profiler._phases == []
+    assert startup_profiler._last_checkpoint == last
+    profiler._logger.info.assert_not_called()
+
+
+def test_parsers_import_pdf_parser_lazily(monkeypatch):
+    code = (
+        "import sys, astrbot.core.knowledge_base.parsers; "
+        "sys.exit('astrbot.core.knowledge_base.parsers.pdf_parser' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+    from astrbot.core.knowledge_base.parsers.pdf_parser import PDFParser
+
+    monkeypatch.delitem(vars(parsers), "PDFParser", raising=False)
+    assert parsers.PDFParser is PDFParser
+    # 首次访问后缓存到模块属性，不再经过 __getattr__
+    assert vars(parsers)["PDFParser"] is PDFParser
+    with pytest.raises(AttributeError):
+        parsers.MissingParser  # noqa: B018
+
+
+def test_faiss_is_imported_on_first_use(monkeypatch):
+    fake_faiss = ModuleType("faiss")
+    monkeypatch.setattr(embedding_storage, "_faiss", None)
+    monkeypatch.setitem(sys.modules, "faiss", fake_faiss)
+    assert embedding_storage._get_faiss() is fake_faiss
+    # 之后直接使用缓存的模块
+    monkeypatch.setitem(sys.modules, "faiss", None)
+    assert embedding_storage._get_faiss() is fake_faiss
+
+    monkeypatch.setattr(embedding_storage, "_faiss", None)
+    with pytest.raises(ImportError, match="faiss-cpu"):
+        embedding_storage._get_faiss()
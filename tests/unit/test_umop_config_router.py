@@ -0,0 +1,72 @@
+import fnmatch
+import itertools
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from astrbot.core.umop_config_router import UmopConfigRouter
+
+
+def _make_router(routing: dict[str, str]) -> UmopConfigRouter:
+    sp = MagicMock()
+    sp.get_async = AsyncMock(return_value=routing)
+    sp.global_put = AsyncMock()
+    return UmopConfigRouter(sp)
+
+
+def _is_umo_match(pattern: str, umo: str) -> bool:
+    """逐条路由匹配的参考实现：各段为空或按 fnmatch 匹配"""
+    pattern_ls = pattern.split(":")
+    umo_ls = umo.split(":")
+    if len(pattern_ls) != 3 or len(umo_ls) != 3:
+        return False
+    return all(p == "" or fnmatch.fnmatchcase(t, p) for p, t in zip(pattern_ls, umo_ls))
+
+
+def _linear_lookup(router: UmopConfigRouter, umo: str) -> str | None:
+    for pattern, conf_id in router.umop_to_conf_id.items():
+        if _is_umo_match(pattern, umo):
+            return conf_id
+    return None
+
+
+@pytest.mark.asyncio
+async def test_compiled_routes_match_linear_first_match_semantics():
+    router = _make_router(
+        {
+            "qq:GroupMessage:1001": "exact",
+            "qq:GroupMessage:10*": "prefix",
+            "qq::": "qq-all",
+            "tg*:FriendMessage:": "tg-friends",
+            "::42": "session-42",
+            "webchat:FriendMessage:42": "shadowed",
+            "aiocqhttp:[GF]*:7": "charset",
+        }
+    )
+    await router.initialize()
+
+    platforms = ["qq", "tg", "tg_2", "webchat", "aiocqhttp"]
+    types = ["GroupMessage", "FriendMessage"]
+    sessions = ["1001", "1002", "42", "7", "x"]
+    for umo in map(":".join, itertools.product(platforms, types, sessions)):
+        assert router.get_conf_id_for_umop(umo) == _linear_lookup(router, umo), umo
+
+    assert router.get_conf_id_for_umop("webchat:FriendMessage:42") == "session-42"
+    assert router.get_conf_id_for_umop("bad-umo") is None
+
+
+@pytest.mark.asyncio
+async def test_route_updates_invalidate_resolved_cache():
+    router = _make_router({"qq::": "a"})
+    await router.initialize()
+    assert router.get_conf_id_for_umop("qq:GroupMessage:1") == "a"
+
+    await router.update_route("qq:GroupMessage:1", "b")
+    assert router.get_conf_id_for_umop("qq:GroupMessage:1") == "a"
+    await router.update_routing_data({"qq:GroupMessage:1": "b", "qq::": "a"})
+    assert router.get_conf_id_for_umop("qq:GroupMessage:1") == "b"
+
+    await router.delete_route("qq:GroupMessage:1")
+    assert router.get_conf_id_for_umop("qq:GroupMessage:1") == "a"
+    await router.delete_route("qq::")
+    assert router.get_conf_id_for_umop("qq:GroupMessage:1") is None
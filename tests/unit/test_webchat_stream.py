@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from astrbot.core.platform.sources.webchat.webchat_stream import (
+    GenerationStream,
+    WebChatStreamRegistry,
+)
+
+
+async def _collect(stream: GenerationStream, offset: int = 0) -> list[tuple[int, dict]]:
+    return [item async for item in stream.subscribe(offset)]
+
+
+@pytest.mark.asyncio
+async def test_stream_fans_out_and_resumes_from_offset():
+    stream = GenerationStream("m1", "s1")
+    first = asyncio.create_task(_collect(stream))
+    second = asyncio.create_task(_collect(stream))
+    await asyncio.sleep(0)
+
+    for i in range(3):
+        stream.publish({"type": "plain", "data": str(i)})
+        await asyncio.sleep(0)
+    stream.finish()
+
+    expected = [(i, {"type": "plain", "data": str(i)}) for i in range(3)]
+    assert await first == expected
+    assert await second == expected
+    # 重连的客户端从上次收到的偏移量之后继续
+    assert await _collect(stream, offset=2) == expected[2:]
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_evicted_events_from_history():
+    stream = GenerationStream("m1", "s1", capacity=2)
+    for i in range(5):
+        stream.publish({"data": i})
+    stream.finish()
+    assert [offset for offset, _ in await _collect(stream)] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_receives_full_text_after_eviction():
+    stream = GenerationStream("m1", "s1", capacity=3)
+    stream.publish({"type": "session_id", "data": None})
+    words = [f"w{i} " for i in range(20)]
+    for word in words:
+        stream.publish({"type": "plain", "data": word, "streaming": True})
+    stream.publish({"type": "end", "data": ""})
+    stream.finish()
+
+    events = await _collect(stream)
+    assert events[0] == (0, {"type": "session_id", "data": None})
+    # 被淘汰的文本增量合并为一条事件，偏移量指向其覆盖的最后一条
+    text = "".join(e["data"] for _, e in events if e["type"] == "plain")
+    assert text == "".join(words)
+    assert len(events) < len(words)
+    assert [offset for offset, _ in events] == sorted({o for o, _ in events})
+
+    # 从被合并区间中间重连时只收到缺失的部分
+    resumed = await _collect(stream, offset=6)
+    text = "".join(e["data"] for _, e in resumed if e["type"] == "plain")
+    assert text == "".join(words[5:])
+
+
+@pytest.mark.asyncio
+async def test_registry_keeps_stream_after_producer_finishes():
+    registry = WebChatStreamRegistry(retention=60)
+    stream = registry.create("m1", "s1")
+
+    async def producer():
+        stream.publish({"type": "end", "data": ""})
+
+    await registry.run(stream, producer())
+    assert stream.finished
+    assert registry.get_by_session("s1") is stream
+    chunks = [chunk async for chunk in stream.iter_sse()]
+    assert chunks == ['data: {"type": "end", "data": "", "offset": 0}\n\n']
+
+
+@pytest.mark.asyncio
+async def test_pump_ends_stream_when_generation_goes_idle(monkeypatch):
+    from types import SimpleNamespace
+
+    from astrbot.dashboard.routes import chat as chat_routes
+
+    monkeypatch.setattr(chat_routes, "GENERATION_IDLE_TIMEOUT", 1)
+    route = SimpleNamespace(running_convs={})
+    stream = GenerationStream("m1", "s1")
+
+    # 流水线异常退出、从未发出 end 事件时，生成任务也应结束并释放会话状态
+    await asyncio.wait_for(
+        chat_routes.ChatRoute._pump_generation(
+            route, stream, asyncio.Queue(), "m1", "s1"
+        ),
+        timeout=5,
+    )
+    stream.finish()
+    types = [event["type"] for _, event in await _collect(stream)]
+    assert types == ["session_id", "error", "end"]
+    assert route.running_convs == {}